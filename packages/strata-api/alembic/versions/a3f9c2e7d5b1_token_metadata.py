@@ -0,0 +1,38 @@
+"""token_metadata
+
+Revision ID: a3f9c2e7d5b1
+Revises: d1e8a3b7c6f9
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a3f9c2e7d5b1"
+down_revision: Union[str, Sequence[str], None] = "d1e8a3b7c6f9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "token_metadata",
+        sa.Column("chain", sa.String(length=32), nullable=False),
+        sa.Column("contract_address", sa.String(length=255), nullable=False),
+        sa.Column("symbol", sa.String(length=64), nullable=True),
+        sa.Column("name", sa.String(length=255), nullable=True),
+        sa.Column("decimals", sa.Integer(), nullable=True),
+        sa.Column("logo_url", sa.String(length=1024), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint("chain", "contract_address"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("token_metadata")
@@ -0,0 +1,74 @@
+"""recurring_detection_state
+
+Revision ID: a7b5d0e4f3c6
+Revises: f6a4c9d3e2b5
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a7b5d0e4f3c6"
+down_revision: Union[str, Sequence[str], None] = "f6a4c9d3e2b5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "recurring_merchant_stats",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("merchant_key", sa.String(length=200), nullable=False),
+        sa.Column("merchant_name", sa.String(length=200), nullable=False),
+        sa.Column("category", sa.String(length=100), nullable=True),
+        sa.Column("first_date", sa.Date(), nullable=False),
+        sa.Column("last_date", sa.Date(), nullable=False),
+        sa.Column("occurrence_count", sa.Integer(), nullable=False),
+        sa.Column("amount_total", sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.Column("last_amount", sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.Column("recent_transaction_ids", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id", "merchant_key", name="uq_recurring_stats_user_merchant"),
+    )
+    op.create_index(
+        op.f("ix_recurring_merchant_stats_user_id"),
+        "recurring_merchant_stats",
+        ["user_id"],
+        unique=False,
+    )
+    op.create_table(
+        "recurring_detection_cursors",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("scanned_through", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id"),
+    )
+    op.create_index(
+        "ix_bank_tx_account_created_at",
+        "bank_transactions",
+        ["cash_account_id", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_bank_tx_account_created_at", table_name="bank_transactions")
+    op.drop_table("recurring_detection_cursors")
+    op.drop_index(
+        op.f("ix_recurring_merchant_stats_user_id"),
+        table_name="recurring_merchant_stats",
+    )
+    op.drop_table("recurring_merchant_stats")
@@ -0,0 +1,48 @@
+"""merchant_category_votes
+
+Revision ID: a9d5e3c7b1f4
+Revises: f8c4d2b6a9e1
+Create Date: 2026-10-17 15:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a9d5e3c7b1f4"
+down_revision: Union[str, Sequence[str], None] = "f8c4d2b6a9e1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "merchant_category_votes",
+        sa.Column("merchant_key", sa.String(length=255), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("category", sa.String(length=50), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("merchant_key", "user_id"),
+    )
+    op.create_index(
+        op.f("ix_merchant_category_votes_user_id"),
+        "merchant_category_votes",
+        ["user_id"],
+    )
+    # Entries written straight from single-user corrections may carry that
+    # user's free-text merchant name; drop them so model output refills them.
+    op.execute("DELETE FROM merchant_categories WHERE source = 'user'")
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_merchant_category_votes_user_id"),
+        table_name="merchant_category_votes",
+    )
+    op.drop_table("merchant_category_votes")
@@ -0,0 +1,51 @@
+"""asset_revaluation_attempts
+
+Revision ID: b3e8f1a6c4d7
+Revises: a9d5e3c7b1f4
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b3e8f1a6c4d7"
+down_revision: Union[str, Sequence[str], None] = "a9d5e3c7b1f4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for table in ("real_estate_assets", "vehicle_assets"):
+        op.add_column(
+            table,
+            sa.Column(
+                "last_valuation_attempt_at", sa.DateTime(timezone=True), nullable=True
+            ),
+        )
+    op.create_table(
+        "asset_valuation_lookups",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("provider", sa.String(length=32), nullable=False),
+        sa.Column("looked_up_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_asset_valuation_lookups_provider_looked_up_at",
+        "asset_valuation_lookups",
+        ["provider", "looked_up_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_asset_valuation_lookups_provider_looked_up_at",
+        table_name="asset_valuation_lookups",
+    )
+    op.drop_table("asset_valuation_lookups")
+    for table in ("vehicle_assets", "real_estate_assets"):
+        op.drop_column(table, "last_valuation_attempt_at")
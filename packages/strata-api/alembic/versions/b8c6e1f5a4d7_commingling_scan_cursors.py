@@ -0,0 +1,45 @@
+"""commingling_scan_cursors
+
+Revision ID: b8c6e1f5a4d7
+Revises: a7b5d0e4f3c6
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b8c6e1f5a4d7"
+down_revision: Union[str, Sequence[str], None] = "a7b5d0e4f3c6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "commingling_scan_cursors",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("scanned_through", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("account_fingerprint", sa.String(length=64), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id"),
+    )
+    op.create_index(
+        "ix_bank_tx_account_updated_at",
+        "bank_transactions",
+        ["cash_account_id", "updated_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_bank_tx_account_updated_at", table_name="bank_transactions")
+    op.drop_table("commingling_scan_cursors")
@@ -0,0 +1,30 @@
+"""crypto_wallet_last_synced_at
+
+Revision ID: b8d4e1f6a2c7
+Revises: a3f9c2e7d5b1
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b8d4e1f6a2c7"
+down_revision: Union[str, Sequence[str], None] = "a3f9c2e7d5b1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "crypto_wallets",
+        sa.Column("last_synced_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("crypto_wallets", "last_synced_at")
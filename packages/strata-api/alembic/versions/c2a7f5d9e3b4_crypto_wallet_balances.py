@@ -0,0 +1,47 @@
+"""crypto_wallet_balances
+
+Revision ID: c2a7f5d9e3b4
+Revises: b8d4e1f6a2c7
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c2a7f5d9e3b4"
+down_revision: Union[str, Sequence[str], None] = "b8d4e1f6a2c7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "crypto_wallet_balances",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("wallet_id", sa.Uuid(), nullable=False),
+        sa.Column("symbol", sa.String(length=64), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("balance", sa.Numeric(precision=36, scale=18), nullable=False),
+        sa.Column("contract_address", sa.String(length=255), nullable=True),
+        sa.Column("logo_url", sa.String(length=1024), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["wallet_id"], ["crypto_wallets.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_crypto_wallet_balances_wallet_id"),
+        "crypto_wallet_balances",
+        ["wallet_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_crypto_wallet_balances_wallet_id"), table_name="crypto_wallet_balances")
+    op.drop_table("crypto_wallet_balances")
@@ -0,0 +1,56 @@
+"""tax_document_extraction_jobs
+
+Revision ID: c9d7f2a6b5e8
+Revises: b8c6e1f5a4d7
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c9d7f2a6b5e8"
+down_revision: Union[str, Sequence[str], None] = "b8c6e1f5a4d7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("tax_documents", sa.Column("document_type_hint", sa.String(length=64), nullable=True))
+    op.add_column(
+        "tax_documents",
+        sa.Column("extraction_attempts", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column("tax_documents", sa.Column("prefill_plan_id", sa.Uuid(), nullable=True))
+    op.add_column("tax_documents", sa.Column("prefill_version_id", sa.Uuid(), nullable=True))
+    with op.batch_alter_table("tax_documents", schema=None) as batch_op:
+        batch_op.create_foreign_key(
+            "fk_tax_documents_prefill_plan_id",
+            "tax_plans",
+            ["prefill_plan_id"],
+            ["id"],
+            ondelete="SET NULL",
+        )
+        batch_op.create_foreign_key(
+            "fk_tax_documents_prefill_version_id",
+            "tax_plan_versions",
+            ["prefill_version_id"],
+            ["id"],
+            ondelete="SET NULL",
+        )
+    op.create_index("ix_tax_documents_status", "tax_documents", ["status"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tax_documents_status", table_name="tax_documents")
+    with op.batch_alter_table("tax_documents", schema=None) as batch_op:
+        batch_op.drop_constraint("fk_tax_documents_prefill_version_id", type_="foreignkey")
+        batch_op.drop_constraint("fk_tax_documents_prefill_plan_id", type_="foreignkey")
+    op.drop_column("tax_documents", "prefill_version_id")
+    op.drop_column("tax_documents", "prefill_plan_id")
+    op.drop_column("tax_documents", "extraction_attempts")
+    op.drop_column("tax_documents", "document_type_hint")
@@ -0,0 +1,59 @@
+"""extraction_cache_entries
+
+Revision ID: d1e8a3b7c6f9
+Revises: c9d7f2a6b5e8
+Create Date: 2026-10-16 17:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d1e8a3b7c6f9"
+down_revision: Union[str, Sequence[str], None] = "c9d7f2a6b5e8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("tax_documents", sa.Column("content_sha256", sa.String(length=64), nullable=True))
+    op.create_table(
+        "extraction_cache_entries",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("content_sha256", sa.String(length=64), nullable=False),
+        sa.Column("provider_name", sa.String(length=64), nullable=False),
+        sa.Column("model_name", sa.String(length=128), nullable=False),
+        sa.Column("cache_version", sa.String(length=32), nullable=False),
+        sa.Column("document_type_hint", sa.String(length=64), nullable=False),
+        sa.Column("result", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "user_id",
+            "content_sha256",
+            "provider_name",
+            "model_name",
+            "cache_version",
+            "document_type_hint",
+            name="uq_extraction_cache_key",
+        ),
+    )
+    op.create_index(
+        "ix_extraction_cache_user_content",
+        "extraction_cache_entries",
+        ["user_id", "content_sha256"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_extraction_cache_user_content", table_name="extraction_cache_entries")
+    op.drop_table("extraction_cache_entries")
+    op.drop_column("tax_documents", "content_sha256")
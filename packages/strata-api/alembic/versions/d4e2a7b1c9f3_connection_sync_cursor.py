@@ -0,0 +1,27 @@
+"""connection_sync_cursor
+
+Revision ID: d4e2a7b1c9f3
+Revises: c3d91e2a4f10
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d4e2a7b1c9f3"
+down_revision: Union[str, Sequence[str], None] = "c3d91e2a4f10"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("connections", sa.Column("sync_cursor", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("connections", "sync_cursor")
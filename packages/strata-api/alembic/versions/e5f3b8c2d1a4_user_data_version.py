@@ -0,0 +1,30 @@
+"""user_data_version
+
+Revision ID: e5f3b8c2d1a4
+Revises: d4e2a7b1c9f3
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5f3b8c2d1a4"
+down_revision: Union[str, Sequence[str], None] = "d4e2a7b1c9f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column("data_version", sa.Integer(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("users", "data_version")
@@ -0,0 +1,46 @@
+"""adaptive_sync_schedule
+
+Revision ID: e7b3c9a1f4d2
+Revises: c2a7f5d9e3b4
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e7b3c9a1f4d2"
+down_revision: Union[str, Sequence[str], None] = "c2a7f5d9e3b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for table in ("connections", "crypto_wallets"):
+        op.add_column(
+            table,
+            sa.Column("next_sync_at", sa.DateTime(timezone=True), nullable=True),
+        )
+        op.add_column(
+            table, sa.Column("sync_interval_seconds", sa.Integer(), nullable=True)
+        )
+    op.create_index(
+        "ix_connections_status_next_sync_at",
+        "connections",
+        ["status", "next_sync_at"],
+    )
+    op.create_index(
+        op.f("ix_crypto_wallets_next_sync_at"), "crypto_wallets", ["next_sync_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_crypto_wallets_next_sync_at"), table_name="crypto_wallets")
+    op.drop_index("ix_connections_status_next_sync_at", table_name="connections")
+    for table in ("crypto_wallets", "connections"):
+        op.drop_column(table, "sync_interval_seconds")
+        op.drop_column(table, "next_sync_at")
@@ -0,0 +1,36 @@
+"""merchant_categories
+
+Revision ID: f6a4c9d3e2b5
+Revises: e5f3b8c2d1a4
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f6a4c9d3e2b5"
+down_revision: Union[str, Sequence[str], None] = "e5f3b8c2d1a4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "merchant_categories",
+        sa.Column("merchant_key", sa.String(length=255), nullable=False),
+        sa.Column("clean_merchant_name", sa.String(length=255), nullable=False),
+        sa.Column("category", sa.String(length=50), nullable=False),
+        sa.Column("source", sa.String(length=20), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint("merchant_key"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("merchant_categories")
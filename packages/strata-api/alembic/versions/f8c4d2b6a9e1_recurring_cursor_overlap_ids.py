@@ -0,0 +1,30 @@
+"""recurring_cursor_overlap_ids
+
+Revision ID: f8c4d2b6a9e1
+Revises: e7b3c9a1f4d2
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f8c4d2b6a9e1"
+down_revision: Union[str, Sequence[str], None] = "e7b3c9a1f4d2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "recurring_detection_cursors",
+        sa.Column("overlap_transaction_ids", sa.JSON(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("recurring_detection_cursors", "overlap_transaction_ids")
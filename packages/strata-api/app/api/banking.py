@@ -33,9 +33,11 @@ from app.services.everyday import (
     effective_category,
     effective_merchant,
     excluded_from_budget,
-    get_transaction_rules,
+    get_rule_index,
 )
+from app.services.merchant_categorization import record_merchant_correction
 from app.services.providers.plaid import PlaidProvider
+from app.services.recurring_detection import rebuild_recurring_items
 from app.services.subscriptions import SubscriptionService
 from app.services.user_refresh import refresh_user_financials
 
@@ -266,7 +268,7 @@ async def list_bank_transactions(
         .limit(page_size)
     )
     transactions = result.scalars().all()
-    rules = await get_transaction_rules(session, user.id)
+    rules = await get_rule_index(session, user.id)
 
     return PaginatedBankTransactions(
         transactions=[
@@ -307,6 +309,12 @@ async def update_bank_transaction_reimbursement(
         tx.user_primary_category = data.primary_category.strip() or None
     if data.merchant_name is not None:
         tx.user_merchant_name = data.merchant_name.strip() or None
+    if tx.user_primary_category and data.primary_category is not None:
+        await record_merchant_correction(
+            session, user.id, tx.name, tx.user_primary_category
+        )
+    if data.merchant_name is not None:
+        await rebuild_recurring_items(session, user.id)
     if data.exclude_from_budget is not None:
         tx.excluded_from_budget = data.exclude_from_budget
     if data.exclude_from_goals is not None:
@@ -316,7 +324,7 @@ async def update_bank_transaction_reimbursement(
 
     await session.commit()
     await session.refresh(tx)
-    rules = await get_transaction_rules(session, user.id)
+    rules = await get_rule_index(session, user.id)
     return _serialize_transaction(tx, choose_rule(rules, tx))
 
 
@@ -360,7 +368,7 @@ async def get_spending_summary(
 
     result = await session.execute(category_query)
     rows = result.all()
-    rules = await get_transaction_rules(session, user.id)
+    rules = await get_rule_index(session, user.id)
 
     tx_result = await session.execute(
         select(BankTransaction)
@@ -461,6 +469,8 @@ async def delete_banking_connection(
 
     # Finally delete the connection
     await session.delete(connection)
+    await session.flush()
+    await rebuild_recurring_items(session, user.id)
     await session.commit()
     await refresh_user_financials(session, user.id)
 
@@ -1,10 +1,15 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 
 from app.api.deps import require_scopes
 from app.models.user import User
+from app.services.compute_executor import (
+    ComputeExecutorBusyError,
+    ComputeTimeoutError,
+    compute_executor,
+)
 from app.services.monte_carlo import MonteCarloService
 
 router = APIRouter(prefix="/calculators", tags=["calculators"])
@@ -30,14 +35,24 @@ async def run_monte_carlo(
     years_to_retirement: int = Query(..., gt=0, le=60),
     retirement_duration_years: int = Query(..., gt=0, le=50),
     desired_annual_income: float = Query(..., ge=0),
+    iterations: int = Query(1000, ge=100, le=100_000),
+    seed: int | None = Query(None, ge=0),
     user: User = Depends(require_scopes(["agent:read"])),
 ) -> MonteCarloResponse:
     """Run a Monte Carlo simulation for retirement."""
-    result = MonteCarloService.run_retirement_simulation(
-        current_savings=current_savings,
-        monthly_contribution=monthly_contribution,
-        years_to_retirement=years_to_retirement,
-        retirement_duration_years=retirement_duration_years,
-        desired_annual_income=desired_annual_income,
-    )
+    try:
+        result = await compute_executor.run(
+            MonteCarloService.run_retirement_simulation,
+            current_savings=current_savings,
+            monthly_contribution=monthly_contribution,
+            years_to_retirement=years_to_retirement,
+            retirement_duration_years=retirement_duration_years,
+            desired_annual_income=desired_annual_income,
+            iterations=iterations,
+            seed=seed,
+        )
+    except ComputeExecutorBusyError as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+    except ComputeTimeoutError as exc:
+        raise HTTPException(status_code=504, detail=str(exc)) from exc
     return MonteCarloResponse.model_validate(result)
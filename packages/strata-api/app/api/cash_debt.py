@@ -19,6 +19,7 @@ from app.schemas.debt_account import (
     DebtAccountResponse,
     DebtAccountUpdate,
 )
+from app.services.recurring_detection import rebuild_recurring_items
 from app.services.user_refresh import refresh_user_financials
 
 router = APIRouter(prefix="/accounts", tags=["cash_debt"])
@@ -100,6 +101,8 @@ async def delete_cash_account(
     )
 
     await session.delete(account)
+    await session.flush()
+    await rebuild_recurring_items(session, user.id)
     await session.commit()
     await refresh_user_financials(session, user.id)
     return {"status": "deleted"}
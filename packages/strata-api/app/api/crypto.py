@@ -1,7 +1,7 @@
 import uuid
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import require_scopes
@@ -15,6 +15,7 @@ from app.schemas.crypto import (
     CryptoWallet as CryptoWalletSchema,
 )
 from app.services.crypto import CryptoService
+from app.services.jobs.cadence import pull_in_user_syncs
 
 router = APIRouter(prefix="/crypto", tags=["Crypto"])
 
@@ -80,7 +81,13 @@ async def delete_all_wallets(
 async def get_crypto_portfolio(
     user: Annotated[User, Depends(require_scopes(["portfolio:read"]))],
     session: Annotated[AsyncSession, Depends(get_async_session)],
+    refresh: bool = Query(False, description="Fetch live balances instead of the last sync"),
 ):
-    """Get the user's aggregated crypto portfolio, assets, and DeFi positions."""
+    """Get the user's aggregated crypto portfolio, assets, and DeFi positions.
+
+    Balances come from the last background sync (see ``data_age_seconds``)
+    unless ``refresh=true``.
+    """
+    await pull_in_user_syncs(session, user.id)
     service = CryptoService(session)
-    return await service.get_portfolio(user.id)
+    return await service.get_portfolio(user.id, refresh=refresh)
@@ -45,8 +45,10 @@ from app.services.everyday import (
     build_weekly_briefing,
     ensure_inbox_items,
     ensure_review_items,
-    sync_recurring_items,
+    get_recurring_items,
 )
+from app.services.recurring_detection import rebuild_recurring_items
+from app.services.rule_index import invalidate_rule_index
 
 router = APIRouter(tags=["everyday"])
 
@@ -268,7 +270,7 @@ async def list_recurring_items(
     user: User = Depends(require_scopes(["accounts:read"])),
     session: AsyncSession = Depends(get_async_session),
 ) -> list[RecurringItemResponse]:
-    items = await sync_recurring_items(session, user.id)
+    items = await get_recurring_items(session, user.id)
     return [RecurringItemResponse.model_validate(item) for item in items]
 
 
@@ -312,7 +314,9 @@ async def create_transaction_rule(
 ) -> TransactionRuleResponse:
     rule = TransactionRule(user_id=user.id, **data.model_dump())
     session.add(rule)
+    await rebuild_recurring_items(session, user.id)
     await session.commit()
+    invalidate_rule_index(user.id)
     await session.refresh(rule)
     return TransactionRuleResponse.model_validate(rule)
 
@@ -333,7 +337,9 @@ async def update_transaction_rule(
         raise HTTPException(status_code=404, detail="Transaction rule not found")
     for field, value in data.model_dump(exclude_unset=True).items():
         setattr(rule, field, value)
+    await rebuild_recurring_items(session, user.id)
     await session.commit()
+    invalidate_rule_index(user.id)
     await session.refresh(rule)
     return TransactionRuleResponse.model_validate(rule)
 
@@ -352,7 +358,9 @@ async def delete_transaction_rule(
     if not rule:
         raise HTTPException(status_code=404, detail="Transaction rule not found")
     await session.delete(rule)
+    await rebuild_recurring_items(session, user.id)
     await session.commit()
+    invalidate_rule_index(user.id)
     return {"status": "deleted"}
 
 
@@ -451,7 +459,7 @@ async def get_consumer_home(
     goals = (
         await session.execute(select(Goal).where(Goal.user_id == user.id).order_by(Goal.created_at.desc()))
     ).scalars().all()
-    recurring_items = await sync_recurring_items(session, user.id)
+    recurring_items = await get_recurring_items(session, user.id)
     inbox_items = await ensure_inbox_items(session, user.id)
     review_items = await ensure_review_items(session, user.id)
     briefing = await build_weekly_briefing(session, user.id)
@@ -5,6 +5,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.db.session import get_async_session
+from app.services.compute_executor import compute_executor
+from app.services.extraction_jobs import extraction_queue
+from app.services.http_clients import http_clients
+from app.services.market_prices import market_price_service
 
 router = APIRouter(tags=["health"])
 
@@ -30,3 +34,27 @@ async def health_check(
             redis_status = "error"
 
     return {"status": "ok", "database": db_status, "redis": redis_status}
+
+
+@router.get("/health/compute")
+async def compute_health() -> dict[str, object]:
+    """Queue depth and run-time metrics for the shared compute executor."""
+    return compute_executor.stats()
+
+
+@router.get("/health/extraction-jobs")
+async def extraction_jobs_health() -> dict[str, object]:
+    """Queue depth and outcome counters for tax document extraction jobs."""
+    return extraction_queue.stats()
+
+
+@router.get("/health/http-clients")
+async def http_clients_health() -> dict[str, object]:
+    """Pool utilization, retry, and circuit state per outbound upstream."""
+    return http_clients.stats()
+
+
+@router.get("/health/market-prices")
+async def market_prices_health() -> dict[str, object]:
+    """Cache hit, coalescing, and upstream quota counters for market prices."""
+    return market_price_service.stats()
@@ -28,6 +28,7 @@ from app.services.commingling import ComminglingDetectionEngine
 from app.services.debt import DebtPrioritizationService
 from app.models.equity_grant import EquityGrant
 from app.services.equity_valuation import equity_valuation_service
+from app.services.jobs.cadence import pull_in_user_syncs
 from app.services.portfolio import PortfolioService
 from app.services.portfolio_analysis import PortfolioAnalysisService
 from app.services.runway import RunwayService
@@ -48,7 +49,9 @@ async def get_portfolio_summary(
     """Get a summary of the user's entire portfolio.
 
     Includes net worth calculation, asset allocation, and concentration alerts.
+    Viewing the summary also brings the user's next background syncs forward.
     """
+    await pull_in_user_syncs(session, user.id)
     portfolio_service = PortfolioService(session, user.id)
     summary_data = await portfolio_service.get_portfolio_summary_data()
 
@@ -144,9 +147,8 @@ async def get_portfolio_history(
 
     if not snapshots:
         portfolio_service = PortfolioService(session, user.id)
-        total_cash, total_debt = await portfolio_service.get_cash_and_debt_totals()
-        total_investment = await portfolio_service.get_investment_total()
-        current_value = total_cash + total_investment - total_debt
+        totals = await portfolio_service.get_balance_totals()
+        current_value = totals.cash + totals.investment - totals.debt
 
         return [
             PortfolioHistoryPoint(
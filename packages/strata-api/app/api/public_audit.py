@@ -32,7 +32,9 @@ async def _run_public_audit(
     try:
         async with async_session_factory() as session:
             service = PublicAuditService(session)
-            trace = await service.run_public_tax_audit(file_bytes, filename, mime_type)
+            trace = await service.run_public_tax_audit(
+                file_bytes, filename, mime_type, cache=store
+            )
         await store.set(
             str(session_id),
             {
@@ -2,64 +2,170 @@
 
 from __future__ import annotations
 
+import asyncio
 import uuid
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Query,
+    UploadFile,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user
+from app.core.config import settings
 from app.db.session import get_async_session
 from app.models.tax_document import TaxDocument
 from app.models.user import User
 from app.schemas.tax_document import (
+    ExtractionJobResponse,
     PrefillTaxPlanRequest,
     PrefillTaxPlanResponse,
     TaxDocumentListResponse,
     TaxDocumentResponse,
 )
 from app.services.document_extraction import MAX_FILE_SIZE, DocumentExtractionService
+from app.services.extraction_jobs import (
+    TERMINAL_STATUSES,
+    extraction_queue,
+    get_job_document,
+    prefill_tax_plan_from_document,
+)
+from app.services.tax_document_storage import (
+    UploadTooLargeError,
+    delete_uploads,
+    discard_staged_upload,
+    stage_upload,
+)
 
 router = APIRouter(prefix="/tax-documents", tags=["tax-documents"])
 
 
-@router.post("/upload", response_model=TaxDocumentResponse)
+@router.post("/upload", response_model=ExtractionJobResponse, status_code=202)
 async def upload_tax_document(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     document_type_hint: str | None = Form(default=None),
+    plan_id: uuid.UUID | None = Form(default=None),
     user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_async_session),
-) -> TaxDocumentResponse:
-    """Upload a tax document for extraction."""
+) -> ExtractionJobResponse:
+    """Upload a tax document and queue it for extraction.
+
+    Returns the extraction job; poll ``/tax-documents/jobs/{job_id}`` or
+    subscribe to its ``/events`` stream for the result. When ``plan_id`` is
+    given, the plan is pre-filled from the document once extraction succeeds.
+    """
     if not file.content_type:
         raise HTTPException(status_code=422, detail="File content type is required")
 
-    # Read with a hard cap to prevent memory exhaustion from oversized uploads.
-    # Read one extra byte beyond the limit so we can detect oversize files
-    # without reading the entire body.
-    file_bytes = await file.read(MAX_FILE_SIZE + 1)
-    if not file_bytes:
+    # Stream to disk in chunks, hashing as we go, and stop as soon as the
+    # upload passes the size cap; the body is never held in memory.
+    try:
+        staged = await stage_upload(file.read, MAX_FILE_SIZE)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if staged.size == 0:
+        await discard_staged_upload(staged)
         raise HTTPException(status_code=422, detail="Empty file")
-    if len(file_bytes) > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=422,
-            detail=f"File too large (max {MAX_FILE_SIZE // (1024 * 1024)} MB)",
-        )
 
     service = DocumentExtractionService(session)
 
     try:
-        doc = await service.process_upload(
+        doc = await service.create_document(
             user_id=user.id,
-            file_bytes=file_bytes,
+            upload=staged,
             filename=file.filename or "unknown",
             mime_type=file.content_type,
             document_type_hint=document_type_hint,
+            prefill_plan_id=plan_id,
         )
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
 
-    return TaxDocumentResponse.model_validate(doc)
+    if doc.status in TERMINAL_STATUSES:
+        # An identical earlier upload was reused; there is nothing to queue.
+        if doc.prefill_plan_id is not None:
+            await prefill_tax_plan_from_document(session, service, doc)
+        return _job_response(doc)
+
+    # Queue once the response is sent and this request's session is closed.
+    background_tasks.add_task(extraction_queue.enqueue, doc.id)
+    return _job_response(doc)
+
+
+def _job_response(doc: TaxDocument) -> ExtractionJobResponse:
+    return ExtractionJobResponse(
+        job_id=doc.id,
+        document_id=doc.id,
+        status=doc.status,
+        attempts=doc.extraction_attempts,
+        error_message=doc.error_message,
+        prefill_plan_id=doc.prefill_plan_id,
+        prefill_version_id=doc.prefill_version_id,
+        updated_at=doc.updated_at,
+    )
+
+
+@router.get("/jobs/{job_id}", response_model=ExtractionJobResponse)
+async def get_extraction_job(
+    job_id: uuid.UUID,
+    user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session),
+) -> ExtractionJobResponse:
+    """Get the status of a document extraction job."""
+    result = await session.execute(
+        select(TaxDocument).where(
+            TaxDocument.id == job_id,
+            TaxDocument.user_id == user.id,
+        )
+    )
+    doc = result.scalar_one_or_none()
+    if not doc:
+        raise HTTPException(status_code=404, detail="Extraction job not found")
+    return _job_response(doc)
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_extraction_job(
+    job_id: uuid.UUID,
+    user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    """Stream extraction job status changes via SSE until the job finishes."""
+    doc = await get_job_document(job_id, user.id)
+    if not doc:
+        raise HTTPException(status_code=404, detail="Extraction job not found")
+
+    async def generate():
+        current = doc
+        last_sent: tuple[str, int] | None = None
+        while current is not None:
+            state = (current.status, current.extraction_attempts)
+            if state != last_sent:
+                yield f"data: {_job_response(current).model_dump_json()}\n\n"
+                last_sent = state
+            if current.status in TERMINAL_STATUSES:
+                break
+            await asyncio.sleep(settings.extraction_job_poll_seconds)
+            current = await get_job_document(job_id, user.id)
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
+    )
 
 
 @router.get("/", response_model=list[TaxDocumentListResponse])
@@ -116,6 +222,7 @@ async def delete_tax_document(
         raise HTTPException(status_code=404, detail="Tax document not found")
     await session.delete(doc)
     await session.commit()
+    await delete_uploads(document_id)
 
 
 @router.post("/prefill-tax-plan", response_model=PrefillTaxPlanResponse)
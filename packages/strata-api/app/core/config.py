@@ -33,14 +33,77 @@ class Settings(BaseSettings):
     plaid_environment: str = "sandbox"  # sandbox | development | production
     banking_sync_interval_seconds: int = 3600
     banking_history_days: int = 730  # 2 years for initial fetch
+    banking_provider_max_concurrency: int = 16  # threads for blocking SDK calls
+    banking_provider_timeout_seconds: float = 30.0
 
     # Background jobs
     enable_background_jobs: bool = True
-    sync_interval_seconds: int = 3600
-    sync_stale_minutes: int = 60
+    sync_interval_seconds: int = 900  # how often due connections are looked for
+    sync_stale_minutes: int = 60  # starting interval for a newly synced connection
+    sync_max_concurrency: int = 8
+    sync_provider_concurrency: dict[str, int] = {"plaid": 4, "snaptrade": 4}
+    sync_provider_rate_per_second: dict[str, float] = {"plaid": 5.0, "snaptrade": 2.0}
+    sync_max_retries: int = 2
+    sync_retry_base_seconds: float = 2.0
     crypto_sync_interval_seconds: int = 300  # 5 minutes
-    crypto_sync_stale_minutes: int = 5
+    crypto_sync_stale_minutes: int = 5  # starting interval for a newly synced wallet
+    crypto_sync_batch_size: int = 50  # wallets per batched lookup and bulk update
+    crypto_sync_max_concurrency: int = 4
+    crypto_sync_chain_concurrency: int = 2
+    # Adaptive cadence: intervals halve on change and grow by the backoff
+    # factor when a sync finds nothing new, within these bounds.
+    sync_min_interval_seconds: int = 900
+    sync_max_interval_seconds: int = 86400
+    crypto_sync_min_interval_seconds: int = 300
+    crypto_sync_max_interval_seconds: int = 21600
+    sync_backoff_factor: float = 2.0
+    sync_active_user_seconds: int = 900  # active users' data is due within this
     snapshot_interval_seconds: int = 86400
+    # Physical asset revaluation: auto-valued real estate and vehicles older
+    # than the cooldown are revalued in the background. Identical lookups are
+    # shared; each provider is paced and capped at a rolling 24-hour quota.
+    asset_revaluation_interval_seconds: int = 900
+    asset_revaluation_cooldown_seconds: int = 86400
+    asset_revaluation_retry_seconds: int = 21600  # wait after a failed lookup
+    asset_revaluation_mileage_band: int = 10000  # vehicles within a band share a lookup
+    asset_revaluation_provider_concurrency: dict[str, int] = {
+        "zillow": 2,
+        "marketcheck": 2,
+    }
+    asset_revaluation_provider_rate_per_second: dict[str, float] = {
+        "zillow": 1.0,
+        "marketcheck": 2.0,
+    }
+    asset_revaluation_provider_daily_quota: dict[str, int] = {
+        "zillow": 500,
+        "marketcheck": 500,
+    }
+
+    # Compute executor (CPU-bound calculators run in a process pool)
+    compute_max_workers: int = 2
+    compute_max_queue: int = 32
+    compute_job_timeout_seconds: float = 30.0
+
+    # Merchant categorization (LLM batches run concurrently up to this limit)
+    merchant_categorization_max_concurrency: int = 4
+    # Users who must agree on a correction before it changes the shared
+    # merchant dictionary; until then it applies to the user's own transactions.
+    merchant_category_vote_threshold: int = 3
+
+    # Financial context cache (per-user, invalidated by data version)
+    financial_context_cache_max_entries: int = 1024
+    financial_context_cache_ttl_seconds: float = 300.0
+
+    # Recurring charge detection re-reads transactions created this long before
+    # the stored watermark, covering syncs that committed out of order
+    recurring_detection_overlap_seconds: float = 900.0
+
+    # Commingling scans re-check transactions changed this long before the
+    # stored watermark, for the same out-of-order commit reason
+    commingling_scan_overlap_seconds: float = 900.0
+
+    # Compiled transaction rule matchers kept per worker (LRU by user)
+    transaction_rule_index_max_entries: int = 1024
 
     # Clerk JWT validation (optional — if set, validates Bearer tokens)
     clerk_secret_key: str = ""
@@ -55,6 +118,8 @@ class Settings(BaseSettings):
     # Financial Data Providers (DIY)
     alpha_vantage_api_key: str = ""
     alchemy_api_key: str = ""
+    # JSON-RPC calls sent per Alchemy batch request
+    alchemy_rpc_batch_size: int = 100
 
     # Physical Asset Valuation
     zillow_api_key: str = ""
@@ -80,6 +145,8 @@ class Settings(BaseSettings):
     deepseek_base_url: str = ""  # vLLM endpoint serving DeepSeek-OCR2
     deepseek_api_key: str = ""  # API key for DeepSeek endpoint (or vLLM)
     deepseek_model: str = "deepseek-ai/DeepSeek-OCR-2"
+    extraction_upload_dir: str = ""  # defaults to <tmp>/strata-tax-uploads
+    extraction_fake_latency_seconds: float = 0.0  # "fake" provider only
     advisor_max_tokens: int = 4096
     agent_freshness_max_hours: int = 24
     agent_runtime_mode: str = "in_process"
@@ -89,6 +156,64 @@ class Settings(BaseSettings):
     data_dir: str = ""
     auto_consent_on_missing: bool = False
 
+    # Extraction jobs (uploads are extracted by an in-process worker pool)
+    extraction_job_workers: int = 4
+    extraction_provider_concurrency: dict[str, int] = {
+        "claude": 4,
+        "gemini": 4,
+        "openai": 4,
+        "deepseek": 2,
+        "tesseract": 2,
+    }
+    extraction_job_max_retries: int = 2
+    extraction_job_retry_base_seconds: float = 2.0
+    extraction_job_stale_minutes: int = 15
+    extraction_job_poll_seconds: float = 1.0
+
+    # Extraction result cache, keyed by file SHA-256, provider, model, and
+    # prompt/schema version; public audit results expire after the TTL
+    extraction_cache_enabled: bool = True
+    extraction_public_cache_ttl_seconds: int = 3600
+
+    # Multi-page PDFs are extracted in page ranges of this many pages, with up
+    # to extraction_pdf_range_concurrency ranges per document in flight
+    extraction_pdf_pages_per_request: int = 2
+    extraction_pdf_range_concurrency: int = 4
+
+    # Outbound HTTP: one pooled, keep-alive client per upstream service.
+    # Timeouts and pool sizes are per upstream; unlisted upstreams use the
+    # defaults below. Idempotent calls retry transient failures, and an
+    # upstream's circuit opens after consecutive failures.
+    http_client_timeouts: dict[str, float] = {
+        "alpha_vantage": 10.0,
+        "alchemy": 10.0,
+        "blockchain_info": 10.0,
+        "brokerage_service": 30.0,
+        "marketcheck": 10.0,
+        "zillow": 10.0,
+    }
+    http_client_max_connections: dict[str, int] = {
+        "alchemy": 32,
+        "brokerage_service": 16,
+    }
+    http_client_default_timeout_seconds: float = 10.0
+    http_client_default_max_connections: int = 8
+    http_client_keepalive_expiry_seconds: float = 30.0
+    http_client_http2: bool = False
+    http_client_retries: int = 2
+    http_client_retry_base_seconds: float = 0.25
+    http_client_breaker_failure_threshold: int = 5
+    http_client_breaker_reset_seconds: float = 30.0
+
+    # Market prices: cached per symbol (in Redis too when configured), served
+    # stale while refreshing, and fetched within a client-side upstream quota
+    market_price_fresh_seconds: int = 900
+    market_price_stale_seconds: int = 86400
+    market_price_max_local_entries: int = 4096
+    market_price_upstream_rate_per_minute: float = 5.0
+    market_price_upstream_burst: int = 5
+    market_price_rate_limit_wait_seconds: float = 2.0
+
     # Stripe configuration
     stripe_api_key: str = ""
     stripe_webhook_secret: str = ""
@@ -1,5 +1,3 @@
-import asyncio
-import contextlib
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
@@ -48,10 +46,16 @@ from app.core.rate_limit import limiter
 from app.db.session import close_db
 from app.middleware.maintenance import MaintenanceMiddleware
 from app.middleware.request_id import RequestIdMiddleware
-from app.services.jobs.background import start_background_tasks
-from app.services.providers.metal_price import metal_price_service
-from app.services.providers.vehicle_valuation import vehicle_valuation_service
-from app.services.providers.zillow import zillow_service
+from app.services.compute_executor import compute_executor
+from app.services.context_cache import close_context_cache
+from app.services.extraction_jobs import extraction_queue, recover_extraction_jobs
+from app.services.http_clients import http_clients
+from app.services.jobs.background import (
+    start_background_tasks,
+    stop_background_tasks,
+)
+from app.services.market_prices import market_price_service
+from app.services.providers.base_banking import shutdown_blocking_executor
 from app.services.session_store import create_session_store
 
 # Initialise Sentry at module level so import-time and startup errors are
@@ -76,18 +80,21 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     if settings.enable_background_jobs:
         stop_event, tasks = await start_background_tasks()
 
+    # Tax document extraction workers, resuming jobs left by a previous run
+    extraction_queue.start()
+    await recover_extraction_jobs()
+
     yield
 
     if stop_event:
-        stop_event.set()
-    for task in tasks:
-        task.cancel()
-        with contextlib.suppress(asyncio.CancelledError):
-            await task
+        await stop_background_tasks(stop_event, tasks)
+    await extraction_queue.shutdown()
     await app.state.session_store.close()
-    await zillow_service.close()
-    await vehicle_valuation_service.close()
-    await metal_price_service.close()
+    await close_context_cache()
+    await market_price_service.close()
+    await http_clients.aclose()
+    compute_executor.shutdown()
+    shutdown_blocking_executor()
     await close_db()
 
 
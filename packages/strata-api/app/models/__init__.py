@@ -9,10 +9,11 @@ from app.models.agent_session import (
 )
 from app.models.bank_transaction import BankTransaction
 from app.models.cash_account import CashAccount, CashAccountType
+from app.models.commingling import ComminglingScanCursor
 from app.models.connection import Connection, ConnectionStatus
 from app.models.consent import ConsentGrant, ConsentStatus
 from app.models.credit_cards import CardBenefit, CardCredit, CreditCard
-from app.models.crypto_wallet import CryptoChain, CryptoWallet
+from app.models.crypto_wallet import CryptoChain, CryptoWallet, CryptoWalletBalance
 from app.models.debt_account import DebtAccount, DebtType
 from app.models.decision_trace import DecisionTrace, DecisionTraceType
 from app.models.entity import EntityType, LegalEntity
@@ -27,7 +28,9 @@ from app.models.everyday import (
     InboxItemType,
     ItemSeverity,
     RecurringCadence,
+    RecurringDetectionCursor,
     RecurringItem,
+    RecurringMerchantStats,
     RecurringState,
     ReviewItem,
     ReviewItemStatus,
@@ -47,7 +50,9 @@ from app.models.holding import Holding
 from app.models.income_source import IncomeFrequency, IncomeSource, IncomeSourceType
 from app.models.institution import Institution
 from app.models.investment_account import InvestmentAccount, InvestmentAccountType
+from app.models.job_lease import JobLease
 from app.models.memory_event import MemoryEvent, MemoryEventSource
+from app.models.merchant_category import MerchantCategory, MerchantCategoryVote
 from app.models.physical_asset import (
     CollectibleAsset,
     CollectibleType,
@@ -67,7 +72,7 @@ from app.models.recommendation_review import (
 )
 from app.models.security import Security, SecurityType
 from app.models.share_report import ShareReport
-from app.models.tax_document import TaxDocument
+from app.models.tax_document import ExtractionCacheEntry, TaxDocument
 from app.models.tax_plan_workspace import (
     TaxPlan,
     TaxPlanCollaborator,
@@ -75,6 +80,7 @@ from app.models.tax_plan_workspace import (
     TaxPlanEvent,
     TaxPlanVersion,
 )
+from app.models.token_metadata import TokenMetadata
 from app.models.transaction import Transaction, TransactionType
 from app.models.user import User
 from app.models.waitlist import WaitlistUser
@@ -95,11 +101,13 @@ __all__ = [
     "CashAccountType",
     "ConsentGrant",
     "ConsentStatus",
+    "ComminglingScanCursor",
     "Connection",
     "ConnectionStatus",
     "CreditCard",
     "CryptoChain",
     "CryptoWallet",
+    "CryptoWalletBalance",
     "DebtAccount",
     "DebtType",
     "DecisionTrace",
@@ -112,7 +120,9 @@ __all__ = [
     "Goal",
     "GoalType",
     "GoalStatus",
+    "RecurringDetectionCursor",
     "RecurringItem",
+    "RecurringMerchantStats",
     "RecurringCadence",
     "RecurringState",
     "TransactionRule",
@@ -126,6 +136,7 @@ __all__ = [
     "ReviewItemStatus",
     "EquityGrant",
     "EquityGrantType",
+    "ExtractionCacheEntry",
     "FilingStatus",
     "FinancialMemory",
     "FinancialCorrection",
@@ -138,8 +149,11 @@ __all__ = [
     "Institution",
     "InvestmentAccount",
     "InvestmentAccountType",
+    "JobLease",
     "MemoryEvent",
     "MemoryEventSource",
+    "MerchantCategory",
+    "MerchantCategoryVote",
     "CollectibleAsset",
     "CollectibleType",
     "MetalType",
@@ -166,6 +180,7 @@ __all__ = [
     "TaxPlanComment",
     "TaxPlanEvent",
     "TaxPlanVersion",
+    "TokenMetadata",
     "Transaction",
     "TransactionType",
     "User",
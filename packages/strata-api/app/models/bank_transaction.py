@@ -9,6 +9,7 @@ from sqlalchemy import (
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Numeric,
     String,
     UniqueConstraint,
@@ -31,6 +32,10 @@ class BankTransaction(UUIDPrimaryKeyMixin, TimestampMixin, Base):
             "provider_transaction_id",
             name="uq_bank_tx_account_provider",
         ),
+        # Incremental recurring detection reads rows newer than a watermark.
+        Index("ix_bank_tx_account_created_at", "cash_account_id", "created_at"),
+        # Incremental commingling scans read rows changed since a watermark.
+        Index("ix_bank_tx_account_updated_at", "cash_account_id", "updated_at"),
     )
 
     cash_account_id: Mapped[uuid.UUID] = mapped_column(
@@ -0,0 +1,23 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
+
+
+class ComminglingScanCursor(UUIDPrimaryKeyMixin, TimestampMixin, Base):
+    """Per-user watermark of bank transactions already checked for commingling."""
+
+    __tablename__ = "commingling_scan_cursors"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), unique=True
+    )
+    scanned_through: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    # Digest of which accounts counted as business when the watermark was set;
+    # reclassifying an account invalidates every stored flag.
+    account_fingerprint: Mapped[str | None] = mapped_column(String(64), nullable=True)
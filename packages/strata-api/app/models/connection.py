@@ -3,7 +3,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, Enum, ForeignKey, String
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
@@ -25,6 +25,9 @@ class ConnectionStatus(str, enum.Enum):
 
 class Connection(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     __tablename__ = "connections"
+    __table_args__ = (
+        Index("ix_connections_status_next_sync_at", "status", "next_sync_at"),
+    )
 
     user_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE"), index=True
@@ -40,6 +43,13 @@ class Connection(UUIDPrimaryKeyMixin, TimestampMixin, Base):
         default=ConnectionStatus.pending,
     )
     last_synced_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    # Adaptive sync schedule (see app/services/jobs/cadence.py). None means
+    # due now: the connection has not been synced by the background job yet.
+    next_sync_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    sync_interval_seconds: Mapped[int | None] = mapped_column(Integer)
+    # Provider cursor for incremental transaction sync (e.g. Plaid
+    # /transactions/sync). None until the first cursor-based sync.
+    sync_cursor: Mapped[str | None] = mapped_column(Text)
     error_code: Mapped[str | None] = mapped_column(String(50))
     error_message: Mapped[str | None] = mapped_column(String(1000))
     continuity_status: Mapped[str] = mapped_column(
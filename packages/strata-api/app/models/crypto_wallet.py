@@ -1,9 +1,18 @@
 import enum
 import uuid
+from datetime import datetime
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Enum, ForeignKey, Numeric, String, UniqueConstraint
+from sqlalchemy import (
+    DateTime,
+    Enum,
+    ForeignKey,
+    Integer,
+    Numeric,
+    String,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
@@ -43,5 +52,32 @@ class CryptoWallet(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     last_balance_usd: Mapped[Decimal | None] = mapped_column(
         Numeric(36, 18), default=Decimal("0.0")
     )
+    # When balances were last fetched successfully; None until the first sync.
+    last_synced_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    # Adaptive sync schedule (see app/services/jobs/cadence.py); None means due.
+    next_sync_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), index=True
+    )
+    sync_interval_seconds: Mapped[int | None] = mapped_column(Integer)
 
     user: Mapped["User"] = relationship(back_populates="crypto_wallets")
+
+
+class CryptoWalletBalance(UUIDPrimaryKeyMixin, TimestampMixin, Base):
+    """One asset held by a wallet as of the wallet's last successful sync.
+
+    Rows are replaced wholesale on each sync, so portfolio reads never need
+    to call the chain provider.
+    """
+
+    __tablename__ = "crypto_wallet_balances"
+
+    wallet_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("crypto_wallets.id", ondelete="CASCADE"), index=True
+    )
+    symbol: Mapped[str] = mapped_column(String(64))
+    name: Mapped[str] = mapped_column(String(255))
+    balance: Mapped[Decimal] = mapped_column(Numeric(36, 18))
+    # None for the chain's native asset.
+    contract_address: Mapped[str | None] = mapped_column(String(255))
+    logo_url: Mapped[str | None] = mapped_column(String(1024))
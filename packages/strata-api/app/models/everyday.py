@@ -11,6 +11,7 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Integer,
     Numeric,
     String,
     UniqueConstraint,
@@ -195,6 +196,50 @@ class RecurringItem(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     user: Mapped["User"] = relationship(back_populates="recurring_items")
 
 
+class RecurringMerchantStats(UUIDPrimaryKeyMixin, TimestampMixin, Base):
+    """Running cadence and amount statistics for one merchant's debits."""
+
+    __tablename__ = "recurring_merchant_stats"
+    __table_args__ = (
+        UniqueConstraint("user_id", "merchant_key", name="uq_recurring_stats_user_merchant"),
+    )
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), index=True
+    )
+    merchant_key: Mapped[str] = mapped_column(String(200))
+    merchant_name: Mapped[str] = mapped_column(String(200))
+    category: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    first_date: Mapped[date] = mapped_column(Date)
+    last_date: Mapped[date] = mapped_column(Date)
+    occurrence_count: Mapped[int] = mapped_column(Integer, default=0)
+    amount_total: Mapped[Decimal] = mapped_column(
+        Numeric(precision=14, scale=2), default=Decimal("0.00")
+    )
+    last_amount: Mapped[Decimal] = mapped_column(
+        Numeric(precision=14, scale=2), default=Decimal("0.00")
+    )
+    # Most recently counted transaction IDs, so rows re-read inside the
+    # watermark overlap window are not counted twice.
+    recent_transaction_ids: Mapped[list | None] = mapped_column(JSON, nullable=True)
+
+
+class RecurringDetectionCursor(UUIDPrimaryKeyMixin, TimestampMixin, Base):
+    """Per-user watermark of the newest bank transaction folded into the stats."""
+
+    __tablename__ = "recurring_detection_cursors"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), unique=True
+    )
+    scanned_through: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    # Ids of the debits counted so far whose created_at is inside the overlap
+    # window before the watermark, so rescanning that window skips them.
+    overlap_transaction_ids: Mapped[list | None] = mapped_column(JSON, nullable=True)
+
+
 class TransactionRule(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     __tablename__ = "transaction_rules"
 
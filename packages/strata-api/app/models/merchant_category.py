@@ -0,0 +1,39 @@
+import uuid
+
+from sqlalchemy import ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base, TimestampMixin
+
+
+class MerchantCategory(TimestampMixin, Base):
+    """Shared merchant → category dictionary keyed by a normalized merchant key.
+
+    Keys come from ``normalize_merchant_key`` and never contain person names,
+    so entries are safe to reuse across users.
+    """
+
+    __tablename__ = "merchant_categories"
+
+    merchant_key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    clean_merchant_name: Mapped[str] = mapped_column(String(255))
+    category: Mapped[str] = mapped_column(String(50))
+    # "llm" or "votes"; a category agreed on by enough users' corrections
+    # takes precedence over model output.
+    source: Mapped[str] = mapped_column(String(20), default="llm")
+
+
+class MerchantCategoryVote(TimestampMixin, Base):
+    """One user's category correction for a merchant key.
+
+    Applies to that user's own transactions; the shared dictionary only
+    changes once enough users agree.
+    """
+
+    __tablename__ = "merchant_category_votes"
+
+    merchant_key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True, index=True
+    )
+    category: Mapped[str] = mapped_column(String(50))
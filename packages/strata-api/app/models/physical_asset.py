@@ -4,7 +4,7 @@ from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Any
 
-from sqlalchemy import JSON, DateTime, Enum, ForeignKey, Numeric, String
+from sqlalchemy import JSON, DateTime, Enum, ForeignKey, Index, Numeric, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
@@ -84,6 +84,22 @@ class AssetValuation(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     notes: Mapped[str | None] = mapped_column(String(500))
 
 
+class AssetValuationLookup(UUIDPrimaryKeyMixin, Base):
+    """One background provider lookup, kept for the rolling daily quota."""
+
+    __tablename__ = "asset_valuation_lookups"
+    __table_args__ = (
+        Index(
+            "ix_asset_valuation_lookups_provider_looked_up_at",
+            "provider",
+            "looked_up_at",
+        ),
+    )
+
+    provider: Mapped[str] = mapped_column(String(32))
+    looked_up_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+
+
 class RealEstateAsset(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     __tablename__ = "real_estate_assets"
 
@@ -117,6 +133,10 @@ class RealEstateAsset(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     # Auto-valuation metadata
     zillow_zpid: Mapped[str | None] = mapped_column(String(100))
     last_valuation_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    # Last background lookup, successful or not; failures back off from it.
+    last_valuation_attempt_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True)
+    )
 
     # Optional mortgage link (if we want to automate debt-to-asset mapping)
     # mortgage_account_id: Mapped[uuid.UUID | None] = mapped_column(ForeignKey("debt_accounts.id"))
@@ -153,6 +173,9 @@ class VehicleAsset(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     estimated_annual_growth_rate: Mapped[Decimal | None] = mapped_column(Numeric(6, 4))
 
     last_valuation_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    last_valuation_attempt_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True)
+    )
 
 
 class CollectibleAsset(UUIDPrimaryKeyMixin, TimestampMixin, Base):
@@ -3,7 +3,16 @@ from __future__ import annotations
 import uuid
 from typing import Any
 
-from sqlalchemy import JSON, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    JSON,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
@@ -20,10 +29,11 @@ class TaxDocument(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     original_filename: Mapped[str] = mapped_column(String(512), nullable=False)
     mime_type: Mapped[str] = mapped_column(String(128), nullable=False)
     file_size_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
+    content_sha256: Mapped[str | None] = mapped_column(String(64), nullable=True)
     document_type: Mapped[str | None] = mapped_column(String(64), nullable=True)
     tax_year: Mapped[int | None] = mapped_column(Integer, nullable=True)
     status: Mapped[str] = mapped_column(
-        String(32), nullable=False, default="pending"
+        String(32), nullable=False, default="pending", index=True
     )  # pending | processing | completed | failed | needs_review
     provider_used: Mapped[str | None] = mapped_column(String(64), nullable=True)
     extracted_data: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
@@ -32,5 +42,49 @@ class TaxDocument(UUIDPrimaryKeyMixin, TimestampMixin, Base):
         JSON, nullable=True
     )
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Extraction job inputs, kept so a restarted worker can resume the job
+    document_type_hint: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    extraction_attempts: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    prefill_plan_id: Mapped[uuid.UUID | None] = mapped_column(
+        ForeignKey("tax_plans.id", ondelete="SET NULL"), nullable=True
+    )
+    prefill_version_id: Mapped[uuid.UUID | None] = mapped_column(
+        ForeignKey("tax_plan_versions.id", ondelete="SET NULL"), nullable=True
+    )
 
     user = relationship("User", back_populates="tax_documents")
+
+
+class ExtractionCacheEntry(UUIDPrimaryKeyMixin, TimestampMixin, Base):
+    """A user's earlier extraction result for identical file bytes.
+
+    The key includes the provider, model, and prompt/schema version, so a
+    prompt or schema change makes older entries unreachable.
+    """
+
+    __tablename__ = "extraction_cache_entries"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id",
+            "content_sha256",
+            "provider_name",
+            "model_name",
+            "cache_version",
+            "document_type_hint",
+            name="uq_extraction_cache_key",
+        ),
+        Index("ix_extraction_cache_user_content", "user_id", "content_sha256"),
+    )
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    content_sha256: Mapped[str] = mapped_column(String(64), nullable=False)
+    provider_name: Mapped[str] = mapped_column(String(64), nullable=False)
+    model_name: Mapped[str] = mapped_column(String(128), nullable=False)
+    cache_version: Mapped[str] = mapped_column(String(32), nullable=False)
+    document_type_hint: Mapped[str] = mapped_column(String(64), nullable=False)
+    result: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
@@ -0,0 +1,23 @@
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base, TimestampMixin
+
+
+class TokenMetadata(TimestampMixin, Base):
+    """Shared contract address → token metadata for a chain.
+
+    A token's symbol, name, and decimals never change once deployed, so
+    entries are written once and reused across users and syncs.
+    """
+
+    __tablename__ = "token_metadata"
+
+    chain: Mapped[str] = mapped_column(String(32), primary_key=True)
+    # Lowercased for EVM chains.
+    contract_address: Mapped[str] = mapped_column(String(255), primary_key=True)
+    symbol: Mapped[str | None] = mapped_column(String(64))
+    name: Mapped[str | None] = mapped_column(String(255))
+    # None for contracts that report no decimals; their balances are skipped.
+    decimals: Mapped[int | None] = mapped_column(Integer)
+    logo_url: Mapped[str | None] = mapped_column(String(1024))
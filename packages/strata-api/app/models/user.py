@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import String
+from sqlalchemy import Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
@@ -30,6 +30,9 @@ class User(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     subscription_status: Mapped[str] = mapped_column(String(50), default="active")
     stripe_customer_id: Mapped[str | None] = mapped_column(String(255), unique=True, index=True, nullable=True)
     stripe_subscription_id: Mapped[str | None] = mapped_column(String(255), unique=True, index=True, nullable=True)
+    # Bumped whenever data feeding the financial context changes; see
+    # app.services.context_cache.
+    data_version: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
 
     entities: Mapped[list["LegalEntity"]] = relationship(
         back_populates="user", cascade="all, delete-orphan"
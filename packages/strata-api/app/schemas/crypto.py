@@ -22,6 +22,7 @@ class CryptoWallet(CryptoWalletBase):
     id: uuid.UUID
     user_id: uuid.UUID
     last_balance_usd: Decimal | None = Decimal("0.00")
+    last_synced_at: datetime | None = None
     created_at: datetime
     updated_at: datetime
 
@@ -60,3 +61,6 @@ class CryptoPortfolioResponse(BaseModel):
     total_value_usd: Decimal
     assets: list[CryptoAsset]
     defi_positions: list[DeFiPosition]
+    # Last sync of the least recently synced wallet; None before any sync.
+    balances_as_of: datetime | None = None
+    data_age_seconds: int | None = None
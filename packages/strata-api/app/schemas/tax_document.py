@@ -120,6 +120,19 @@ class TaxDocumentListResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class ExtractionJobResponse(BaseModel):
+    """Progress of a document's extraction job; the job ID is the document ID."""
+
+    job_id: uuid.UUID
+    document_id: uuid.UUID
+    status: DocumentStatus
+    attempts: int
+    error_message: str | None
+    prefill_plan_id: uuid.UUID | None
+    prefill_version_id: uuid.UUID | None
+    updated_at: datetime
+
+
 class PrefillTaxPlanRequest(BaseModel):
     document_ids: list[uuid.UUID]
     plan_id: uuid.UUID
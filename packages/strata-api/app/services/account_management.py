@@ -21,6 +21,7 @@ from app.services.providers.brokerage_service import (
     BrokerageServiceProvider,
     BrokerageServiceUnavailableError,
 )
+from app.services.tax_document_storage import delete_uploads
 
 logger = logging.getLogger(__name__)
 
@@ -207,11 +208,17 @@ async def delete_user_account(user_id: uuid.UUID, session: AsyncSession) -> None
                 exc_info=True,
             )
 
+    doc_result = await session.execute(
+        select(TaxDocument.id).where(TaxDocument.user_id == user_id)
+    )
+    document_ids = doc_result.scalars().all()
+
     # 3. Delete user row — cascades handle all child records
     await session.delete(user)
 
-    # 4. Commit
+    # 4. Commit, then drop any uploads still awaiting extraction
     await session.commit()
+    await delete_uploads(*document_ids)
 
     logger.info(
         "Deleted user account %s with %d connections revoked", user_id, len(connections)
@@ -1,4 +1,5 @@
 import json
+from collections.abc import AsyncIterator
 from typing import Any
 
 from fastapi import HTTPException
@@ -55,6 +56,158 @@ class AgentRuntime:
             tools=tools,
         )
 
+    async def stream_message(
+        self,
+        *,
+        model: str,
+        max_tokens: int,
+        system: str,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]],
+    ) -> AsyncIterator[dict]:
+        """Stream a model turn as events.
+
+        Yields ``{"type": "text_delta", "text": ...}`` events as text arrives,
+        then one ``{"type": "message", "message": ...}`` event carrying the
+        assembled response in the same shape ``create_message`` returns.
+        Sandbox and container modes cannot stream, so their text arrives as a
+        single delta once the runner finishes.
+        """
+        self.ensure_runtime_allowed()
+        if settings.agent_runtime_mode != "in_process":
+            response = await self.create_message(
+                model=model,
+                max_tokens=max_tokens,
+                system=system,
+                messages=messages,
+                tools=tools,
+            )
+            for block in response["content"]:
+                if block["type"] == "text" and block["text"]:
+                    yield {"type": "text_delta", "text": block["text"]}
+            yield {"type": "message", "message": response}
+            return
+
+        client = self._get_llm_client()
+        if settings.advisor_provider == "openrouter":
+            stream = await client.chat.completions.create(
+                model=model or settings.advisor_model,
+                messages=[{"role": "system", "content": system}, *messages],
+                tools=[{"type": "function", "function": t} for t in tools]
+                if tools
+                else None,
+                max_tokens=max_tokens,
+                stream=True,
+            )
+            events = self._assemble_openai_stream(stream)
+        else:
+            stream = await client.messages.create(
+                model=model,
+                max_tokens=max_tokens,
+                system=system,
+                messages=messages,
+                tools=tools,
+                stream=True,
+            )
+            events = self._assemble_anthropic_stream(stream)
+        async for event in events:
+            yield event
+
+    @staticmethod
+    async def _assemble_anthropic_stream(stream: Any) -> AsyncIterator[dict]:
+        """Forward text deltas and rebuild content blocks from raw stream events."""
+        blocks: dict[int, dict] = {}
+        partial_json: dict[int, list[str]] = {}
+        stop_reason = None
+
+        async for event in stream:
+            if event.type == "content_block_start":
+                block = event.content_block
+                if block.type == "text":
+                    blocks[event.index] = {"type": "text", "text": block.text or ""}
+                elif block.type == "tool_use":
+                    blocks[event.index] = {
+                        "type": "tool_use",
+                        "id": block.id,
+                        "name": block.name,
+                        "input": {},
+                    }
+                    partial_json[event.index] = []
+            elif event.type == "content_block_delta":
+                delta = event.delta
+                if delta.type == "text_delta":
+                    blocks[event.index]["text"] += delta.text
+                    yield {"type": "text_delta", "text": delta.text}
+                elif delta.type == "input_json_delta":
+                    partial_json[event.index].append(delta.partial_json)
+            elif event.type == "content_block_stop":
+                if event.index in partial_json:
+                    raw = "".join(partial_json.pop(event.index))
+                    blocks[event.index]["input"] = json.loads(raw) if raw else {}
+            elif event.type == "message_delta":
+                stop_reason = event.delta.stop_reason or stop_reason
+
+        yield {
+            "type": "message",
+            "message": {
+                "content": [blocks[index] for index in sorted(blocks)],
+                "stop_reason": stop_reason,
+            },
+        }
+
+    @staticmethod
+    async def _assemble_openai_stream(stream: Any) -> AsyncIterator[dict]:
+        """Forward text deltas and rebuild tool calls from chat completion chunks."""
+        text_parts: list[str] = []
+        tool_calls: dict[int, dict] = {}
+        finish_reason = None
+
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            delta = choice.delta
+            if delta.content:
+                text_parts.append(delta.content)
+                yield {"type": "text_delta", "text": delta.content}
+            for tc in delta.tool_calls or []:
+                call = tool_calls.setdefault(
+                    tc.index, {"id": None, "name": "", "arguments": []}
+                )
+                if tc.id:
+                    call["id"] = tc.id
+                if tc.function is not None:
+                    if tc.function.name:
+                        call["name"] += tc.function.name
+                    if tc.function.arguments:
+                        call["arguments"].append(tc.function.arguments)
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+
+        content: list[dict] = []
+        if text_parts:
+            content.append({"type": "text", "text": "".join(text_parts)})
+        for index in sorted(tool_calls):
+            call = tool_calls[index]
+            raw = "".join(call["arguments"])
+            content.append(
+                {
+                    "type": "tool_use",
+                    "id": call["id"],
+                    "name": call["name"],
+                    "input": json.loads(raw) if raw else {},
+                }
+            )
+        yield {
+            "type": "message",
+            "message": {
+                "content": content,
+                "stop_reason": "end_turn"
+                if finish_reason == "stop"
+                else finish_reason,
+            },
+        }
+
     def _get_llm_client(self):
         if self._client is None:
             if settings.advisor_provider == "openrouter":
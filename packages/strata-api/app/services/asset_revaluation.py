@@ -0,0 +1,298 @@
+"""Background revaluation of auto-valued real estate and vehicles.
+
+A pass loads every auto-valued asset whose last valuation is older than the
+cooldown, groups assets that would make the same provider lookup (the same
+property, or the same make/model/year within a mileage band), and fetches
+each distinct lookup once. Lookups are paced per provider and capped by a
+rolling 24-hour quota, counted from ``AssetValuationLookup`` rows; assets
+over the quota wait for budget to free up, never-valued and stalest first.
+Every attempt is stamped on the asset, so a lookup that fails or finds no
+value is retried only after ``asset_revaluation_retry_seconds``. Results are
+written with bulk statements, so interactive endpoints only ever read
+stored values.
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from sqlalchemy import bindparam, delete, func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.physical_asset import (
+    AssetType,
+    AssetValuation,
+    AssetValuationLookup,
+    RealEstateAsset,
+    ValuationType,
+    VehicleAsset,
+)
+from app.services.context_cache import bump_data_version
+from app.services.providers.vehicle_valuation import vehicle_valuation_service
+from app.services.providers.zillow import zillow_service
+
+RevaluedAsset = RealEstateAsset | VehicleAsset
+
+_CENTS = Decimal("0.01")
+_QUOTA_WINDOW = timedelta(days=1)
+
+# Provider name (as in http_clients and the revaluation settings) and the
+# source recorded on AssetValuation rows, per asset type.
+_PROVIDERS: dict[AssetType, tuple[str, str]] = {
+    AssetType.real_estate: ("zillow", "Zillow"),
+    AssetType.vehicle: ("marketcheck", "VehicleValuation"),
+}
+
+
+@dataclass
+class ValuationLookup:
+    """One provider call shared by every asset with the same lookup key."""
+
+    provider: str
+    key: tuple
+    fetch: Callable[[], Awaitable[Decimal | None]]
+    assets: list[RevaluedAsset] = field(default_factory=list)
+
+
+def _normalize(*parts: str | None) -> str:
+    return ", ".join(" ".join(part.lower().split()) for part in parts if part)
+
+
+def _property_lookup(asset: RealEstateAsset) -> tuple[tuple, Callable]:
+    if asset.zillow_zpid:
+        zpid = asset.zillow_zpid
+        return ("zpid", zpid), lambda: zillow_service.get_zestimate(zpid)
+
+    address = _normalize(asset.address, asset.city, asset.state, asset.zip_code)
+
+    async def fetch() -> Decimal | None:
+        candidates = await zillow_service.search_by_address(address)
+        for candidate in candidates:
+            if candidate.market_value:
+                return candidate.market_value
+        return None
+
+    return ("address", address), fetch
+
+
+def _vehicle_lookup(asset: VehicleAsset) -> tuple[tuple, Callable]:
+    band_size = max(1, settings.asset_revaluation_mileage_band)
+    mileage = (
+        asset.mileage // band_size * band_size if asset.mileage is not None else None
+    )
+    make, model, year = asset.make.strip(), asset.model.strip(), asset.year
+    key = (make.lower(), model.lower(), year, mileage)
+    return key, lambda: vehicle_valuation_service.get_market_value(
+        make, model, year, mileage
+    )
+
+
+def _asset_type(asset: RevaluedAsset) -> AssetType:
+    if isinstance(asset, RealEstateAsset):
+        return AssetType.real_estate
+    return AssetType.vehicle
+
+
+async def load_due_assets(session: AsyncSession) -> list[RevaluedAsset]:
+    """Auto-valued assets past the cooldown, never-valued and stalest first.
+
+    Assets whose last attempt is within the retry window are left out, so a
+    lookup that keeps failing is not repeated every pass.
+    """
+    now = datetime.now(timezone.utc)
+    cutoff = now - timedelta(seconds=settings.asset_revaluation_cooldown_seconds)
+    retry_cutoff = now - timedelta(seconds=settings.asset_revaluation_retry_seconds)
+    due: list[RevaluedAsset] = []
+    for model in (RealEstateAsset, VehicleAsset):
+        result = await session.execute(
+            select(model)
+            .where(
+                model.valuation_type == ValuationType.auto,
+                or_(
+                    model.last_valuation_at.is_(None),
+                    model.last_valuation_at < cutoff,
+                ),
+                or_(
+                    model.last_valuation_attempt_at.is_(None),
+                    model.last_valuation_attempt_at < retry_cutoff,
+                ),
+            )
+            .order_by(
+                model.last_valuation_at.is_(None).desc(),
+                model.last_valuation_at.asc(),
+            )
+        )
+        due.extend(result.scalars())
+    return due
+
+
+async def remaining_lookup_budget(session: AsyncSession) -> dict[str, int]:
+    """Lookups each quota-limited provider has left in the rolling window."""
+    since = datetime.now(timezone.utc) - _QUOTA_WINDOW
+    result = await session.execute(
+        select(AssetValuationLookup.provider, func.count())
+        .where(AssetValuationLookup.looked_up_at >= since)
+        .group_by(AssetValuationLookup.provider)
+    )
+    used = dict(result.tuples().all())
+    return {
+        provider: max(0, quota - used.get(provider, 0))
+        for provider, quota in settings.asset_revaluation_provider_daily_quota.items()
+    }
+
+
+def plan_lookups(
+    assets: Iterable[RevaluedAsset], remaining: dict[str, int]
+) -> tuple[list[ValuationLookup], list[RevaluedAsset]]:
+    """Group assets into shared lookups within each provider's remaining budget.
+
+    Providers missing from ``remaining`` are unlimited. Returns the lookups
+    to make and the assets deferred to a later pass. Assets keep their order,
+    so the most overdue use the budget first.
+    """
+    lookups: dict[tuple[str, tuple], ValuationLookup] = {}
+    used: dict[str, int] = {}
+    deferred: list[RevaluedAsset] = []
+    for asset in assets:
+        provider, _ = _PROVIDERS[_asset_type(asset)]
+        if isinstance(asset, RealEstateAsset):
+            key, fetch = _property_lookup(asset)
+        else:
+            key, fetch = _vehicle_lookup(asset)
+        lookup = lookups.get((provider, key))
+        if lookup is None:
+            quota = remaining.get(provider)
+            if quota is not None and used.get(provider, 0) >= quota:
+                deferred.append(asset)
+                continue
+            used[provider] = used.get(provider, 0) + 1
+            lookup = lookups[(provider, key)] = ValuationLookup(provider, key, fetch)
+        lookup.assets.append(asset)
+    return list(lookups.values()), deferred
+
+
+def _as_utc(value: datetime | None) -> datetime | None:
+    # SQLite returns naive datetimes for timezone-aware columns.
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+async def _current_rows(
+    session: AsyncSession, model: type, ids: list[uuid.UUID]
+) -> dict[uuid.UUID, tuple]:
+    result = await session.execute(
+        select(
+            model.id,
+            model.valuation_type,
+            model.market_value,
+            model.last_valuation_at,
+        ).where(model.id.in_(ids))
+    )
+    return {row[0]: tuple(row[1:]) for row in result}
+
+
+async def write_valuations(
+    session: AsyncSession, results: list[tuple[ValuationLookup, Decimal | None]]
+) -> int:
+    """Record a pass's lookups and store the values found; returns how many changed.
+
+    Every looked-up asset gets a fresh ``last_valuation_attempt_at`` and each
+    lookup is logged for the daily quota, whether or not it found a value.
+    Lookups can take minutes, so the rows are re-read before values are
+    written: assets deleted, switched to manual valuation, or revalued by
+    someone else since they were loaded are skipped, and changes are judged
+    against the current value. Only changed values add an ``AssetValuation``
+    history row, as on-demand refreshes do.
+    """
+    now = datetime.now(timezone.utc)
+    attempted = [asset for lookup, _ in results for asset in lookup.assets]
+    values = [
+        (asset, value)
+        for lookup, value in results
+        if value is not None
+        for asset in lookup.assets
+    ]
+    current: dict[uuid.UUID, tuple] = {}
+    for model in (RealEstateAsset, VehicleAsset):
+        ids = [asset.id for asset, _ in values if isinstance(asset, model)]
+        if ids:
+            current.update(await _current_rows(session, model, ids))
+
+    attempts: dict[type, list[dict]] = {RealEstateAsset: [], VehicleAsset: []}
+    for asset in attempted:
+        attempts[type(asset)].append({"b_id": asset.id})
+    updates: dict[type, list[dict]] = {RealEstateAsset: [], VehicleAsset: []}
+    history: list[dict] = []
+    users: set[uuid.UUID] = set()
+    for asset, value in values:
+        row = current.get(asset.id)
+        if row is None:
+            continue
+        valuation_type, market_value, last_valuation_at = row
+        if valuation_type != ValuationType.auto or _as_utc(
+            last_valuation_at
+        ) != _as_utc(asset.last_valuation_at):
+            continue
+        value = value.quantize(_CENTS)
+        asset_type = _asset_type(asset)
+        updates[type(asset)].append({"b_id": asset.id, "b_value": value})
+        if value != market_value:
+            history.append(
+                {
+                    "user_id": asset.user_id,
+                    "asset_id": asset.id,
+                    "asset_type": asset_type,
+                    "value": value,
+                    "valuation_date": now,
+                    "source": _PROVIDERS[asset_type][1],
+                }
+            )
+            users.add(asset.user_id)
+
+    # Core statements, not ORM bulk updates by primary key: an asset deleted
+    # or switched to manual while its lookup ran must not fail the whole pass
+    # on a rowcount mismatch.
+    for model in (RealEstateAsset, VehicleAsset):
+        table = model.__table__
+        if attempts[model]:
+            await session.execute(
+                update(table)
+                .where(table.c.id == bindparam("b_id"))
+                .values(last_valuation_attempt_at=now),
+                attempts[model],
+            )
+        if updates[model]:
+            await session.execute(
+                update(table)
+                .where(
+                    table.c.id == bindparam("b_id"),
+                    table.c.valuation_type == ValuationType.auto,
+                )
+                .values(market_value=bindparam("b_value"), last_valuation_at=now),
+                updates[model],
+            )
+    if history:
+        await session.execute(insert(AssetValuation), history)
+    if results:
+        await session.execute(
+            insert(AssetValuationLookup),
+            [
+                {"provider": lookup.provider, "looked_up_at": now}
+                for lookup, _ in results
+            ],
+        )
+    await session.execute(
+        delete(AssetValuationLookup).where(
+            AssetValuationLookup.looked_up_at < now - _QUOTA_WINDOW
+        )
+    )
+    for user_id in users:
+        await bump_data_version(session, user_id)
+    await session.commit()
+    return len(history)
@@ -1,19 +1,27 @@
 import logging
+import uuid
+from dataclasses import dataclass
 from datetime import date, timedelta
 
-from sqlalchemy import select
+from sqlalchemy import delete, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.db.upsert import dialect_insert
 from app.models.bank_transaction import BankTransaction
 from app.models.cash_account import CashAccount
 from app.models.connection import Connection
+from app.services.commingling import ComminglingDetectionEngine
 from app.services.merchant_categorization import merchant_categorization_service
 from app.services.providers.base_banking import (
     BaseBankingProvider,
     NormalizedBankAccount,
     NormalizedBankTransaction,
 )
+from app.services.recurring_detection import (
+    detect_recurring_items,
+    rebuild_recurring_items,
+)
 from app.services.spending_derivation import update_memory_spending_categories
 from app.services.user_refresh import refresh_user_financials
 
@@ -25,7 +33,7 @@ async def sync_banking_connection(
     connection: Connection,
     provider: BaseBankingProvider,
     full_history: bool = False,
-) -> None:
+) -> "BankingSyncResult":
     """Sync bank accounts and transactions for a connection.
 
     Args:
@@ -33,31 +41,95 @@ async def sync_banking_connection(
         connection: The connection to sync.
         provider: The banking provider instance.
         full_history: If True, fetch full transaction history (up to banking_history_days).
+
+    Returns:
+        What the sync changed, used to adapt the connection's sync cadence.
     """
-    # 1. Sync accounts
+    # 1. Sync accounts, noting balances before so balance moves count as changes
+    previous = await session.execute(
+        select(
+            CashAccount.provider_account_id,
+            CashAccount.balance,
+            CashAccount.available_balance,
+        ).where(CashAccount.connection_id == connection.id)
+    )
+    previous_balances = {row[0]: (row[1], row[2]) for row in previous}
     normalized_accounts = await provider.get_accounts(connection)
     account_map: dict[str, CashAccount] = {}
+    accounts_changed = 0
 
     for normalized in normalized_accounts:
         account = await upsert_bank_account(session, connection, normalized)
         account_map[normalized.provider_account_id] = account
+        if previous_balances.get(normalized.provider_account_id) != (
+            account.balance,
+            account.available_balance,
+        ):
+            accounts_changed += 1
 
     # 2. Sync transactions
-    days = settings.banking_history_days if full_history else 30
-    start_date = date.today() - timedelta(days=days)
-    end_date = date.today()
-
-    transactions = await provider.get_transactions(connection, start_date, end_date)
-    await upsert_bank_transactions(session, account_map, transactions)
+    removed = 0
+    if provider.supports_transaction_cursor:
+        # Only fetch what changed since the stored cursor; a full-history sync
+        # restarts from the beginning of the provider's history.
+        cursor = None if full_history else connection.sync_cursor
+        updates = await provider.get_transaction_updates(connection, cursor)
+        counts = await upsert_bank_transactions(
+            session, account_map, updates.added + updates.modified
+        )
+        removed = await remove_bank_transactions(session, connection, updates.removed)
+        connection.sync_cursor = updates.next_cursor
+    else:
+        days = settings.banking_history_days if full_history else 30
+        start_date = date.today() - timedelta(days=days)
+        end_date = date.today()
+
+        transactions = await provider.get_transactions(connection, start_date, end_date)
+        counts = await upsert_bank_transactions(session, account_map, transactions)
+
+    logger.info(
+        "Bank transactions for connection %s: %s inserted, %s updated, "
+        "%s unchanged, %s removed",
+        connection.id,
+        counts.inserted,
+        counts.updated,
+        counts.unchanged,
+        removed,
+    )
 
     await session.flush()
 
-    # 3. Derive spending categories from transactions
+    # 3. Fold new debits into recurring charge detection. Removed rows can
+    # only be subtracted by rescanning the user's history.
+    if removed:
+        recurring = await rebuild_recurring_items(session, connection.user_id)
+    else:
+        recurring = await detect_recurring_items(session, connection.user_id)
+    logger.info(
+        "Recurring detection for user %s: %s transactions scanned, "
+        "%s merchants updated, %s recurring items updated",
+        connection.user_id,
+        recurring.transactions_scanned,
+        recurring.merchants_updated,
+        recurring.items_updated,
+    )
+
+    # 4. Flag new or changed transactions for commingling risk, so the
+    # vulnerability report only has to read the stored flags.
+    await ComminglingDetectionEngine(session).scan_and_flag(
+        connection.user_id, commit=False
+    )
+
+    # 5. Derive spending categories from transactions
     await update_memory_spending_categories(session, connection.user_id)
 
-    # 4. Refresh user financial summary
+    # 6. Refresh user financial summary
     await refresh_user_financials(session, connection.user_id, commit=False)
 
+    return BankingSyncResult(
+        accounts_changed=accounts_changed, transactions=counts, removed=removed
+    )
+
 
 async def upsert_bank_account(
     session: AsyncSession,
@@ -114,12 +186,157 @@ async def upsert_bank_account(
     return account
 
 
+async def remove_bank_transactions(
+    session: AsyncSession,
+    connection: Connection,
+    provider_transaction_ids: list[str],
+) -> int:
+    """Delete transactions the provider reported as removed.
+
+    Returns:
+        Number of rows deleted.
+    """
+    if not provider_transaction_ids:
+        return 0
+
+    account_ids = select(CashAccount.id).where(
+        CashAccount.connection_id == connection.id
+    )
+    deleted = 0
+    for i in range(0, len(provider_transaction_ids), _LOOKUP_CHUNK_SIZE):
+        chunk = provider_transaction_ids[i : i + _LOOKUP_CHUNK_SIZE]
+        result = await session.execute(
+            delete(BankTransaction).where(
+                BankTransaction.cash_account_id.in_(account_ids),
+                BankTransaction.provider_transaction_id.in_(chunk),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        deleted += result.rowcount or 0
+    return deleted
+
+
+@dataclass
+class BankTransactionUpsertResult:
+    """Counts of rows written by upsert_bank_transactions."""
+
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.inserted + self.updated + self.unchanged
+
+
+@dataclass
+class BankingSyncResult:
+    """What sync_banking_connection changed."""
+
+    accounts_changed: int
+    transactions: BankTransactionUpsertResult
+    removed: int
+
+    @property
+    def changed(self) -> bool:
+        return bool(
+            self.accounts_changed
+            or self.transactions.inserted
+            or self.transactions.updated
+            or self.removed
+        )
+
+
+# Columns refreshed from the provider on every sync. iso_currency_code is
+# only set when a row is first inserted.
+_SYNC_FIELDS = (
+    "amount",
+    "transaction_date",
+    "posted_date",
+    "name",
+    "primary_category",
+    "detailed_category",
+    "plaid_category",
+    "merchant_name",
+    "payment_channel",
+    "pending",
+)
+_UPSERT_CHUNK_SIZE = 500
+_LOOKUP_CHUNK_SIZE = 1000
+
+
+async def _fetch_existing_transactions(
+    session: AsyncSession,
+    cash_account_id: uuid.UUID,
+    provider_transaction_ids: list[str],
+) -> dict[str, dict]:
+    """Load the synced columns of existing rows keyed by provider transaction ID."""
+    existing: dict[str, dict] = {}
+    columns = [getattr(BankTransaction, field) for field in _SYNC_FIELDS]
+    for i in range(0, len(provider_transaction_ids), _LOOKUP_CHUNK_SIZE):
+        chunk = provider_transaction_ids[i : i + _LOOKUP_CHUNK_SIZE]
+        result = await session.execute(
+            select(BankTransaction.provider_transaction_id, *columns).where(
+                BankTransaction.cash_account_id == cash_account_id,
+                BankTransaction.provider_transaction_id.in_(chunk),
+            )
+        )
+        for row in result.mappings():
+            existing[row["provider_transaction_id"]] = {
+                field: row[field] for field in _SYNC_FIELDS
+            }
+    return existing
+
+
+async def _write_transaction_rows(session: AsyncSession, rows: list[dict]) -> None:
+    """Insert or update rows keyed on uq_bank_tx_account_provider."""
+    insert = dialect_insert(session)
+    if insert is None:
+        await _write_transaction_rows_orm(session, rows)
+        return
+
+    for i in range(0, len(rows), _UPSERT_CHUNK_SIZE):
+        chunk = rows[i : i + _UPSERT_CHUNK_SIZE]
+        stmt = insert(BankTransaction).values(chunk)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["cash_account_id", "provider_transaction_id"],
+            set_={
+                **{field: getattr(stmt.excluded, field) for field in _SYNC_FIELDS},
+                "updated_at": func.now(),
+            },
+        )
+        await session.execute(stmt)
+
+
+async def _write_transaction_rows_orm(session: AsyncSession, rows: list[dict]) -> None:
+    # Fallback for dialects without ON CONFLICT support.
+    for row in rows:
+        result = await session.execute(
+            select(BankTransaction).where(
+                BankTransaction.cash_account_id == row["cash_account_id"],
+                BankTransaction.provider_transaction_id
+                == row["provider_transaction_id"],
+            )
+        )
+        txn = result.scalar_one_or_none()
+        if txn is None:
+            session.add(BankTransaction(**row))
+        else:
+            for field in _SYNC_FIELDS:
+                setattr(txn, field, row[field])
+    await session.flush()
+
+
 async def upsert_bank_transactions(
     session: AsyncSession,
     account_map: dict[str, CashAccount],
     transactions: list[NormalizedBankTransaction],
-) -> int:
-    """Create or update bank transactions.
+) -> BankTransactionUpsertResult:
+    """Create or update bank transactions in batches.
+
+    Existing rows are prefetched per account and compared field by field, so
+    only new or changed transactions are written, using a dialect-native
+    ``INSERT ... ON CONFLICT DO UPDATE`` in chunks.
 
     Args:
         session: Database session.
@@ -127,9 +344,9 @@ async def upsert_bank_transactions(
         transactions: List of normalized transactions from provider.
 
     Returns:
-        Number of transactions upserted.
+        Inserted, updated, and unchanged row counts.
     """
-    upserted = 0
+    counts = BankTransactionUpsertResult()
 
     # Pre-process categorization for transactions missing clean merchant info
     # or to normalize Plaid categories into our unified graph schema
@@ -138,8 +355,13 @@ async def upsert_bank_transactions(
         if not tx.merchant_name or tx.primary_category is None:
             names_to_categorize.append(tx.name)
 
-    categorizations = await merchant_categorization_service.categorize_transactions(names_to_categorize)
+    user_id = next(iter(account_map.values())).user_id if account_map else None
+    categorizations = await merchant_categorization_service.categorize_transactions(
+        names_to_categorize, session=session, user_id=user_id
+    )
 
+    # Group by account; a later duplicate of the same provider ID wins.
+    rows_by_account: dict[uuid.UUID, dict[str, dict]] = {}
     for normalized in transactions:
         # Get the account_id from the transaction (set by provider)
         provider_account_id = getattr(normalized, "_account_id", None)
@@ -157,16 +379,6 @@ async def upsert_bank_transactions(
             )
             continue
 
-        # Check if transaction exists
-        result = await session.execute(
-            select(BankTransaction).where(
-                BankTransaction.cash_account_id == account.id,
-                BankTransaction.provider_transaction_id
-                == normalized.provider_transaction_id,
-            )
-        )
-        txn = result.scalar_one_or_none()
-
         merchant_name = normalized.merchant_name
         primary_category = normalized.primary_category
 
@@ -176,8 +388,12 @@ async def upsert_bank_transactions(
             if not primary_category:
                 primary_category = cat_data.get("category")
 
-        # Fields to sync from normalized transaction
-        sync_fields = {
+        rows_by_account.setdefault(account.id, {})[
+            normalized.provider_transaction_id
+        ] = {
+            "cash_account_id": account.id,
+            "provider_transaction_id": normalized.provider_transaction_id,
+            "iso_currency_code": normalized.iso_currency_code,
             "amount": normalized.amount,
             "transaction_date": normalized.transaction_date,
             "posted_date": normalized.posted_date,
@@ -190,19 +406,24 @@ async def upsert_bank_transactions(
             "pending": normalized.pending,
         }
 
-        if txn is None:
-            txn = BankTransaction(
-                cash_account_id=account.id,
-                provider_transaction_id=normalized.provider_transaction_id,
-                iso_currency_code=normalized.iso_currency_code,
-                **sync_fields,
-            )
-            session.add(txn)
-        else:
-            # Update existing transaction (may have changed from pending to posted)
-            for field, value in sync_fields.items():
-                setattr(txn, field, value)
-
-        upserted += 1
-
-    return upserted
+    for cash_account_id, rows in rows_by_account.items():
+        existing = await _fetch_existing_transactions(
+            session, cash_account_id, list(rows)
+        )
+        to_write: list[dict] = []
+        for provider_transaction_id, row in rows.items():
+            current = existing.get(provider_transaction_id)
+            if current is None:
+                counts.inserted += 1
+            elif any(current[field] != row[field] for field in _SYNC_FIELDS):
+                # e.g. a pending transaction that has since posted
+                counts.updated += 1
+            else:
+                counts.unchanged += 1
+                continue
+            to_write.append(row)
+
+        if to_write:
+            await _write_transaction_rows(session, to_write)
+
+    return counts
@@ -6,7 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.connection import Connection
 from app.models.portfolio_snapshot import PortfolioSnapshot
-from app.services.portfolio_metrics import get_cash_and_debt_totals, get_investment_total, get_physical_asset_total
+from app.services.portfolio_metrics import get_balance_totals
 
 
 class AdvisorBriefingService:
@@ -32,11 +32,8 @@ class AdvisorBriefingService:
                 })
 
         # 2. Net worth changes
-        current_cash, current_debt = await get_cash_and_debt_totals(self.session, user_id)
-        current_inv = await get_investment_total(self.session, user_id)
-        current_physical = await get_physical_asset_total(self.session, user_id)
-
-        current_nw = current_cash + current_inv + current_physical - current_debt
+        totals = await get_balance_totals(self.session, user_id)
+        current_nw = totals.cash + totals.investment + totals.physical - totals.debt
 
         history_result = await self.session.execute(
             select(PortfolioSnapshot)
@@ -1,13 +1,17 @@
+import hashlib
+import re
 import uuid
+from datetime import timedelta
 from decimal import Decimal
 
-from sqlalchemy import select
+from sqlalchemy import and_, case, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
+from app.core.config import settings
 from app.models.bank_transaction import BankTransaction
 from app.models.cash_account import CashAccount
-from app.models.debt_account import DebtAccount
+from app.models.commingling import ComminglingScanCursor
 from app.models.entity import EntityType
 
 # Categories that are highly likely to be personal when on a business account
@@ -62,105 +66,199 @@ BUSINESS_MERCHANTS = [
 BATCH_SIZE = 500
 
 
+def _compile_merchants(merchants: list[str]) -> re.Pattern[str]:
+    # Longest first so overlapping names ("aws", "amazon web services") all
+    # resolve in a single search over the merchant name.
+    alternatives = sorted(merchants, key=len, reverse=True)
+    return re.compile("|".join(re.escape(m) for m in alternatives))
+
+
+_PERSONAL_MERCHANT_PATTERN = _compile_merchants(PERSONAL_MERCHANTS)
+_BUSINESS_MERCHANT_PATTERN = _compile_merchants(BUSINESS_MERCHANTS)
+
+
+def is_commingled(
+    is_business_account: bool, merchant_name: str | None, primary_category: str | None
+) -> bool:
+    """Whether a transaction looks out of place on its account."""
+    merchant = (merchant_name or "").lower()
+    category = primary_category or ""
+    if is_business_account:
+        # Business account: check for personal spend
+        return category in PERSONAL_SPEND_CATEGORIES or bool(
+            _PERSONAL_MERCHANT_PATTERN.search(merchant)
+        )
+    # Personal account: check for business spend
+    return category in BUSINESS_SPEND_CATEGORIES or bool(
+        _BUSINESS_MERCHANT_PATTERN.search(merchant)
+    )
+
+
 class ComminglingDetectionEngine:
     def __init__(self, session: AsyncSession):
         self._session = session
 
-    async def scan_and_flag(self, user_id: uuid.UUID) -> dict:
-        """Scan all transactions for commingling risk and set the is_commingled flag.
-
-        Returns a summary dict with total_count, commingled_count, and commingled_amount
-        so callers can use the results without re-querying.
-        """
-        # 1. Identify business and personal accounts
+    async def _classify_accounts(self, user_id: uuid.UUID) -> dict[uuid.UUID, bool]:
+        """Map each of the user's cash accounts to whether it is a business account."""
         cash_accounts = await self._session.execute(
             select(CashAccount)
             .options(joinedload(CashAccount.entity))
             .where(CashAccount.user_id == user_id)
         )
-        debt_accounts = await self._session.execute(
-            select(DebtAccount)
-            .options(joinedload(DebtAccount.entity))
-            .where(DebtAccount.user_id == user_id)
-        )
+        classified: dict[uuid.UUID, bool] = {}
+        for a in cash_accounts.scalars().all():
+            if a.entity:
+                classified[a.id] = a.entity.entity_type != EntityType.personal
+            else:
+                classified[a.id] = bool(a.is_business)
+        return classified
 
-        all_accounts = list(cash_accounts.scalars().all()) + list(
-            debt_accounts.scalars().all()
-        )
+    async def scan_and_flag(self, user_id: uuid.UUID, *, commit: bool = True) -> dict:
+        """Flag new or changed transactions for commingling risk.
 
-        biz_account_ids = set()
-        pers_account_ids = set()
+        Only transactions updated since the user's scan watermark are
+        evaluated, walked in keyset order on ``(transaction_date, id)``; all
+        transactions are re-evaluated when an account's business/personal
+        classification changed. Flags are written with one ``UPDATE`` per
+        batch and value.
 
-        for a in all_accounts:
-            if a.entity:
-                if a.entity.entity_type != EntityType.personal:
-                    biz_account_ids.add(a.id)
-                else:
-                    pers_account_ids.add(a.id)
-            else:
-                if getattr(a, "is_business", False):
-                    biz_account_ids.add(a.id)
-                else:
-                    pers_account_ids.add(a.id)
-
-        all_account_ids = biz_account_ids | pers_account_ids
-
-        # 2. Process transactions in batches to avoid loading everything at once
-        total_count = 0
-        commingled_count = 0
-        commingled_amount = Decimal("0.00")
-        offset = 0
-
-        while True:
-            transactions_result = await self._session.execute(
-                select(BankTransaction)
-                .where(BankTransaction.cash_account_id.in_(all_account_ids))
-                .order_by(BankTransaction.id)
-                .offset(offset)
-                .limit(BATCH_SIZE)
+        Returns a summary dict with total_count, commingled_count, and
+        commingled_amount over all of the user's transactions, plus
+        scanned_count for the transactions evaluated in this pass.
+        """
+        accounts = await self._classify_accounts(user_id)
+        fingerprint = hashlib.sha256(
+            ",".join(
+                f"{account_id}:{int(is_business)}"
+                for account_id, is_business in sorted(accounts.items(), key=lambda a: str(a[0]))
+            ).encode()
+        ).hexdigest()
+
+        cursor = (
+            await self._session.execute(
+                select(ComminglingScanCursor).where(ComminglingScanCursor.user_id == user_id)
+            )
+        ).scalar_one_or_none()
+        if cursor is None:
+            cursor = ComminglingScanCursor(user_id=user_id)
+            self._session.add(cursor)
+        since = None
+        if cursor.account_fingerprint == fingerprint and cursor.scanned_through is not None:
+            since = cursor.scanned_through - timedelta(
+                seconds=settings.commingling_scan_overlap_seconds
             )
-            batch = transactions_result.scalars().all()
 
+        scanned_count = 0
+        scanned_through = cursor.scanned_through if since is not None else None
+        last_key = None
+        while accounts:
+            query = select(
+                BankTransaction.id,
+                BankTransaction.transaction_date,
+                BankTransaction.cash_account_id,
+                BankTransaction.merchant_name,
+                BankTransaction.primary_category,
+                BankTransaction.is_commingled,
+                BankTransaction.updated_at,
+            ).where(BankTransaction.cash_account_id.in_(accounts))
+            if since is not None:
+                query = query.where(BankTransaction.updated_at > since)
+            if last_key is not None:
+                last_date, last_id = last_key
+                query = query.where(
+                    or_(
+                        BankTransaction.transaction_date > last_date,
+                        and_(
+                            BankTransaction.transaction_date == last_date,
+                            BankTransaction.id > last_id,
+                        ),
+                    )
+                )
+            batch = (
+                await self._session.execute(
+                    query.order_by(BankTransaction.transaction_date, BankTransaction.id).limit(
+                        BATCH_SIZE
+                    )
+                )
+            ).all()
             if not batch:
                 break
 
-            for tx in batch:
-                is_commingled = False
-                merchant_name = (tx.merchant_name or "").lower()
-                primary_category = tx.primary_category or ""
-
-                if tx.cash_account_id in biz_account_ids:
-                    # Business account: check for personal spend
-                    if primary_category in PERSONAL_SPEND_CATEGORIES:
-                        is_commingled = True
-                    elif any(m in merchant_name for m in PERSONAL_MERCHANTS):
-                        is_commingled = True
-                elif tx.cash_account_id in pers_account_ids:
-                    # Personal account: check for business spend
-                    if primary_category in BUSINESS_SPEND_CATEGORIES:
-                        is_commingled = True
-                    elif any(m in merchant_name for m in BUSINESS_MERCHANTS):
-                        is_commingled = True
-
-                tx.is_commingled = is_commingled
-                total_count += 1
-                if is_commingled:
-                    commingled_count += 1
-                    commingled_amount += abs(tx.amount)
-
-            offset += BATCH_SIZE
-
-        await self._session.commit()
+            flagged: list[uuid.UUID] = []
+            cleared: list[uuid.UUID] = []
+            for row in batch:
+                flag = is_commingled(
+                    accounts[row.cash_account_id], row.merchant_name, row.primary_category
+                )
+                if flag and not row.is_commingled:
+                    flagged.append(row.id)
+                elif not flag and row.is_commingled:
+                    cleared.append(row.id)
+                if scanned_through is None or row.updated_at > scanned_through:
+                    scanned_through = row.updated_at
+            for ids, value in ((flagged, True), (cleared, False)):
+                if ids:
+                    # The flag is derived data; keeping updated_at means the
+                    # write does not move these rows past the watermark.
+                    await self._session.execute(
+                        update(BankTransaction)
+                        .where(BankTransaction.id.in_(ids))
+                        .values(is_commingled=value, updated_at=BankTransaction.updated_at)
+                    )
+
+            scanned_count += len(batch)
+            last_key = (batch[-1].transaction_date, batch[-1].id)
+
+        cursor.scanned_through = scanned_through
+        cursor.account_fingerprint = fingerprint
+        summary = await self._summarize(list(accounts))
+        if commit:
+            await self._session.commit()
 
+        return {**summary, "scanned_count": scanned_count}
+
+    async def _summarize(self, account_ids: list[uuid.UUID]) -> dict:
+        """Aggregate the stored flags for the given accounts in one query."""
+        if not account_ids:
+            return {
+                "total_count": 0,
+                "commingled_count": 0,
+                "commingled_amount": Decimal("0.00"),
+            }
+        result = await self._session.execute(
+            select(
+                func.count(),
+                func.coalesce(
+                    func.sum(case((BankTransaction.is_commingled.is_(True), 1), else_=0)), 0
+                ),
+                func.coalesce(
+                    func.sum(
+                        case(
+                            (BankTransaction.is_commingled.is_(True), func.abs(BankTransaction.amount)),
+                            else_=0,
+                        )
+                    ),
+                    0,
+                ),
+            ).where(BankTransaction.cash_account_id.in_(account_ids))
+        )
+        total_count, commingled_count, commingled_amount = result.one()
         return {
             "total_count": total_count,
-            "commingled_count": commingled_count,
-            "commingled_amount": commingled_amount,
+            "commingled_count": int(commingled_count),
+            "commingled_amount": Decimal(commingled_amount).quantize(Decimal("0.01")),
         }
 
     async def get_vulnerability_report(self, user_id: uuid.UUID) -> dict:
-        """Calculate commingling metrics for the Founder Operating Room."""
-        scan_result = await self.scan_and_flag(user_id)
+        """Calculate commingling metrics for the Founder Operating Room.
+
+        Read-only: the totals aggregate the ``is_commingled`` flags that
+        banking sync and category corrections maintain via ``scan_and_flag``.
+        """
+        account_ids = await self._session.execute(
+            select(CashAccount.id).where(CashAccount.user_id == user_id)
+        )
+        scan_result = await self._summarize(list(account_ids.scalars()))
 
         total_count = scan_result["total_count"]
         commingled_count = scan_result["commingled_count"]
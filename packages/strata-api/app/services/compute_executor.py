@@ -0,0 +1,170 @@
+"""Shared process-pool executor for CPU-bound work.
+
+Calculators and analytics that would otherwise hold the event loop for the
+duration of a numeric loop are submitted here instead. The executor bounds
+the number of worker processes and queued jobs, applies a per-job timeout,
+and keeps lightweight counters that the health endpoint exposes.
+
+Callables must be picklable (module-level functions or static methods).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, TypeVar
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ComputeExecutorBusyError(RuntimeError):
+    """Raised when the job queue is full and new work is rejected."""
+
+
+class ComputeTimeoutError(RuntimeError):
+    """Raised when a job does not finish within its timeout."""
+
+
+class ComputeExecutor:
+    """Bounded process pool with backpressure and run-time metrics."""
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_queue: int,
+        job_timeout_seconds: float,
+        start_method: str = "forkserver",
+    ) -> None:
+        self._max_workers = max(1, max_workers)
+        self._max_queue = max(0, max_queue)
+        self._job_timeout_seconds = job_timeout_seconds
+        self._start_method = start_method
+        self._pool: ProcessPoolExecutor | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._slots_loop: asyncio.AbstractEventLoop | None = None
+
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._total_run_seconds = 0.0
+        self._max_run_seconds = 0.0
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self._max_workers,
+                mp_context=multiprocessing.get_context(self._start_method),
+            )
+        return self._pool
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        # Semaphores bind to the loop they first wait on; recreate one if the
+        # executor is reused from a different loop (e.g. across test cases).
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self._max_workers)
+            self._slots_loop = loop
+        return self._slots
+
+    async def run(
+        self,
+        fn: Callable[..., T],
+        /,
+        *args: Any,
+        timeout: float | None = None,
+        **kwargs: Any,
+    ) -> T:
+        """Run ``fn(*args, **kwargs)`` in a worker process.
+
+        Raises ComputeExecutorBusyError when the queue is full and
+        ComputeTimeoutError when the job (including time spent queued)
+        exceeds ``timeout`` seconds.
+        """
+        if self._queued >= self._max_queue and self._running >= self._max_workers:
+            self._rejected += 1
+            raise ComputeExecutorBusyError("Compute executor is at capacity")
+
+        job_timeout = self._job_timeout_seconds if timeout is None else timeout
+        slots = self._get_slots()
+        loop = asyncio.get_running_loop()
+        call = functools.partial(fn, *args, **kwargs)
+
+        try:
+            async with asyncio.timeout(job_timeout):
+                self._queued += 1
+                try:
+                    await slots.acquire()
+                finally:
+                    self._queued -= 1
+                try:
+                    self._running += 1
+                    started = time.perf_counter()
+                    try:
+                        result = await loop.run_in_executor(self._get_pool(), call)
+                    finally:
+                        self._running -= 1
+                        elapsed = time.perf_counter() - started
+                        self._total_run_seconds += elapsed
+                        self._max_run_seconds = max(self._max_run_seconds, elapsed)
+                finally:
+                    slots.release()
+        except TimeoutError as exc:
+            # A job that times out while running keeps its worker process
+            # busy until it returns; only the caller is released early.
+            self._timed_out += 1
+            logger.warning(
+                "Compute job %s timed out after %.1fs",
+                getattr(fn, "__qualname__", repr(fn)),
+                job_timeout,
+            )
+            raise ComputeTimeoutError(
+                f"Computation did not finish within {job_timeout:g}s"
+            ) from exc
+        except Exception:
+            self._failed += 1
+            raise
+
+        self._completed += 1
+        return result
+
+    def stats(self) -> dict[str, Any]:
+        """Return queue-depth and run-time counters."""
+        finished = self._completed + self._failed
+        return {
+            "max_workers": self._max_workers,
+            "max_queue": self._max_queue,
+            "queue_depth": self._queued,
+            "running": self._running,
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "timed_out": self._timed_out,
+            "avg_run_seconds": (
+                round(self._total_run_seconds / finished, 4) if finished else 0.0
+            ),
+            "max_run_seconds": round(self._max_run_seconds, 4),
+        }
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+compute_executor = ComputeExecutor(
+    max_workers=settings.compute_max_workers,
+    max_queue=settings.compute_max_queue,
+    job_timeout_seconds=settings.compute_job_timeout_seconds,
+)
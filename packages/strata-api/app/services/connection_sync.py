@@ -1,32 +1,246 @@
-from sqlalchemy import delete, select
+import logging
+import uuid
+from collections.abc import Hashable, Iterable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import and_, delete, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.connection import Connection
 from app.models.holding import Holding
 from app.models.investment_account import InvestmentAccount
-from app.models.security import Security
+from app.models.security import Security, SecurityType
 from app.models.transaction import Transaction, TransactionType
-from app.services.providers.base import BaseProvider
+from app.services.providers.base import (
+    BaseProvider,
+    NormalizedHolding,
+    NormalizedSecurity,
+    NormalizedTransaction,
+)
 from app.services.user_refresh import refresh_user_financials
 
+logger = logging.getLogger(__name__)
+
+_HOLDING_FIELDS = (
+    "security_id",
+    "quantity",
+    "cost_basis",
+    "market_value",
+    "as_of",
+)
+_TRANSACTION_FIELDS = (
+    "security_id",
+    "type",
+    "quantity",
+    "price",
+    "amount",
+    "trade_date",
+    "settlement_date",
+    "currency",
+    "description",
+    "source",
+)
+
+
+@dataclass
+class ChangeCounts:
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.inserted or self.updated or self.deleted)
+
+
+@dataclass
+class ConnectionSyncResult:
+    """Row changes written by sync_connection_accounts."""
+
+    holdings: ChangeCounts = field(default_factory=ChangeCounts)
+    transactions: ChangeCounts = field(default_factory=ChangeCounts)
+    securities_created: int = 0
+
+    @property
+    def changed(self) -> bool:
+        return self.holdings.changed or self.transactions.changed
+
+
+def _quantize(value: Decimal | None, places: int) -> Decimal | None:
+    if value is None:
+        return None
+    return value.quantize(Decimal(1).scaleb(-places))
+
+
+def _same(current: Any, new: Any) -> bool:
+    # SQLite returns naive datetimes for timezone-aware columns.
+    if isinstance(current, datetime) and isinstance(new, datetime):
+        if (current.tzinfo is None) != (new.tzinfo is None):
+            current = current.replace(tzinfo=None)
+            new = new.astimezone(timezone.utc).replace(tzinfo=None)
+    return current == new
+
+
+def _apply_diff(
+    existing: dict[Hashable, Any],
+    incoming: dict[Hashable, dict[str, Any]],
+    fields: tuple[str, ...],
+    counts: ChangeCounts,
+    session: AsyncSession,
+    model: type,
+) -> list[uuid.UUID]:
+    """Update changed rows, stage new ones, and return IDs of stale rows."""
+    for key, values in incoming.items():
+        row = existing.pop(key, None)
+        if row is None:
+            session.add(model(**values))
+            counts.inserted += 1
+            continue
+        changed = False
+        for name in fields:
+            if not _same(getattr(row, name), values[name]):
+                setattr(row, name, values[name])
+                changed = True
+        if changed:
+            counts.updated += 1
+        else:
+            counts.unchanged += 1
+
+    stale_ids = [row.id for row in existing.values()]
+    counts.deleted += len(stale_ids)
+    return stale_ids
+
+
+def _keyed(items: Iterable[tuple[Hashable, Any]]) -> dict[Hashable, Any]:
+    """Index items by key, disambiguating repeated keys with an ordinal."""
+    keyed: dict[Hashable, Any] = {}
+    seen: dict[Hashable, int] = {}
+    for key, item in items:
+        ordinal = seen.get(key, 0)
+        seen[key] = ordinal + 1
+        keyed[(key, ordinal)] = item
+    return keyed
+
+
+class SecurityResolver:
+    """Maps normalized securities to rows with one batched lookup per sync pass.
+
+    Securities are matched by ticker, then CUSIP, then (name, type) for
+    securities that have neither. Missing securities are created once and
+    reused for the rest of the pass.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+        self._by_ticker: dict[str, Security] = {}
+        self._by_cusip: dict[str, Security] = {}
+        self._by_name: dict[tuple[str, SecurityType], Security] = {}
+        self.created = 0
+
+    def _index(self, security: Security) -> None:
+        if security.ticker:
+            self._by_ticker.setdefault(security.ticker, security)
+        if security.cusip:
+            self._by_cusip.setdefault(security.cusip, security)
+        if not security.ticker and not security.cusip:
+            key = (security.name, security.security_type)
+            self._by_name.setdefault(key, security)
+
+    async def prefetch(self, securities: Iterable[NormalizedSecurity]) -> None:
+        securities = list(securities)
+        tickers = {s.ticker for s in securities if s.ticker}
+        cusips = {s.cusip for s in securities if s.cusip}
+        names = {s.name for s in securities if not s.ticker and not s.cusip}
+
+        conditions = []
+        if tickers:
+            conditions.append(Security.ticker.in_(tickers))
+        if cusips:
+            conditions.append(Security.cusip.in_(cusips))
+        if names:
+            conditions.append(
+                and_(
+                    Security.ticker.is_(None),
+                    Security.cusip.is_(None),
+                    Security.name.in_(names),
+                )
+            )
+        if conditions:
+            result = await self._session.execute(
+                select(Security).where(or_(*conditions)).order_by(Security.created_at)
+            )
+            for security in result.scalars():
+                self._index(security)
+
+    def resolve(self, normalized: NormalizedSecurity) -> Security:
+        security = None
+        if normalized.ticker:
+            security = self._by_ticker.get(normalized.ticker)
+        if security is None and normalized.cusip:
+            security = self._by_cusip.get(normalized.cusip)
+        if security is None and not normalized.ticker and not normalized.cusip:
+            security = self._by_name.get((normalized.name, normalized.security_type))
+
+        new_price_date = (
+            normalized.close_price_as_of.date()
+            if normalized.close_price_as_of
+            else None
+        )
+        if security is not None:
+            should_update = normalized.close_price is not None and (
+                security.close_price_as_of is None
+                or (new_price_date and new_price_date > security.close_price_as_of)
+            )
+            if should_update:
+                security.close_price = normalized.close_price
+                security.close_price_as_of = new_price_date
+            return security
+
+        security = Security(
+            id=uuid.uuid4(),
+            ticker=normalized.ticker,
+            name=normalized.name,
+            security_type=normalized.security_type,
+            cusip=normalized.cusip,
+            isin=normalized.isin,
+            close_price=normalized.close_price,
+            close_price_as_of=new_price_date,
+        )
+        self._session.add(security)
+        self._index(security)
+        self.created += 1
+        return security
+
 
 async def sync_connection_accounts(
     session: AsyncSession,
     connection: Connection,
     provider: BaseProvider,
-) -> None:
-    """Sync accounts, holdings, and transactions for a connection."""
+) -> ConnectionSyncResult:
+    """Sync accounts, holdings, and transactions for a connection.
+
+    Holdings and transactions are diffed against what is stored, so only
+    rows that changed are inserted, updated, or deleted.
+    """
+    result = ConnectionSyncResult()
     normalized_accounts = await provider.get_accounts(connection)
 
+    fetched: list[
+        tuple[InvestmentAccount, list[NormalizedHolding], list[NormalizedTransaction]]
+    ] = []
     for normalized_account in normalized_accounts:
-        result = await session.execute(
+        account_result = await session.execute(
             select(InvestmentAccount).where(
                 InvestmentAccount.connection_id == connection.id,
                 InvestmentAccount.provider_account_id
                 == normalized_account.provider_account_id,
             )
         )
-        account = result.scalar_one_or_none()
+        account = account_result.scalar_one_or_none()
 
         if account is None:
             account = InvestmentAccount(
@@ -51,121 +265,163 @@ async def sync_connection_accounts(
                     c.value for c in normalized_account.capabilities
                 ]
 
-        await session.flush()
-
         normalized_holdings = await provider.get_holdings(
             connection,
             normalized_account.provider_account_id,
         )
+        normalized_transactions = await provider.get_transactions(
+            connection,
+            normalized_account.provider_account_id,
+        )
+        fetched.append((account, normalized_holdings, normalized_transactions))
 
-        await session.execute(delete(Holding).where(Holding.account_id == account.id))
-
-        for normalized_holding in normalized_holdings:
-            security = await get_or_create_security(
-                session,
-                normalized_holding.security,
-            )
+    await session.flush()
 
-            holding = Holding(
-                account_id=account.id,
-                security_id=security.id,
-                quantity=normalized_holding.quantity,
-                cost_basis=normalized_holding.cost_basis,
-                market_value=normalized_holding.market_value,
-                as_of=normalized_holding.as_of,
-            )
-            session.add(holding)
+    resolver = SecurityResolver(session)
+    await resolver.prefetch(
+        [h.security for _, holdings, _ in fetched for h in holdings]
+        + [
+            t.security
+            for _, _, transactions in fetched
+            for t in transactions
+            if t.security is not None
+        ]
+    )
 
+    for account, normalized_holdings, normalized_transactions in fetched:
+        await sync_account_holdings(
+            session, account, normalized_holdings, resolver, result.holdings
+        )
         await sync_account_transactions(
             session,
             connection,
             account,
-            provider,
+            normalized_transactions,
+            resolver,
+            result.transactions,
         )
 
+    result.securities_created = resolver.created
     await session.flush()
+    logger.info(
+        "Investment sync for connection %s: holdings %s, transactions %s, "
+        "%s new securities",
+        connection.id,
+        result.holdings,
+        result.transactions,
+        result.securities_created,
+    )
     await refresh_user_financials(session, connection.user_id, commit=False)
+    return result
 
 
-async def get_or_create_security(
+async def sync_account_holdings(
     session: AsyncSession,
-    normalized_security,
-) -> Security:
-    """Get or create a security from normalized data."""
-    if normalized_security.ticker:
-        result = await session.execute(
-            select(Security).where(Security.ticker == normalized_security.ticker)
-        )
-        security = result.scalar_one_or_none()
-        if security:
-            new_price_date = (
-                normalized_security.close_price_as_of.date()
-                if normalized_security.close_price_as_of
-                else None
-            )
-            should_update = normalized_security.close_price is not None and (
-                security.close_price_as_of is None
-                or (new_price_date and new_price_date > security.close_price_as_of)
-            )
-            if should_update:
-                security.close_price = normalized_security.close_price
-                security.close_price_as_of = new_price_date
-            return security
+    account: InvestmentAccount,
+    normalized_holdings: list[NormalizedHolding],
+    resolver: SecurityResolver,
+    counts: ChangeCounts,
+) -> None:
+    """Diff an account's holdings against the provider's snapshot."""
+    existing_result = await session.execute(
+        select(Holding)
+        .where(Holding.account_id == account.id)
+        .order_by(Holding.created_at, Holding.id)
+    )
+    # Holdings have no stable provider ID column, so rows are matched by
+    # security; repeated lots of one security pair up in stored order.
+    existing = _keyed(
+        (holding.security_id, holding) for holding in existing_result.scalars()
+    )
 
-    security = Security(
-        ticker=normalized_security.ticker,
-        name=normalized_security.name,
-        security_type=normalized_security.security_type,
-        cusip=normalized_security.cusip,
-        isin=normalized_security.isin,
-        close_price=normalized_security.close_price,
-        close_price_as_of=(
-            normalized_security.close_price_as_of.date()
-            if normalized_security.close_price_as_of
-            else None
-        ),
+    def _values(normalized: NormalizedHolding) -> dict[str, Any]:
+        return {
+            "account_id": account.id,
+            "security_id": resolver.resolve(normalized.security).id,
+            "quantity": _quantize(normalized.quantity, 8),
+            "cost_basis": _quantize(normalized.cost_basis, 2),
+            "market_value": _quantize(normalized.market_value, 2),
+            "as_of": normalized.as_of,
+        }
+
+    incoming = _keyed(
+        (values["security_id"], values)
+        for values in map(_values, normalized_holdings)
     )
-    session.add(security)
-    await session.flush()
+    stale_ids = _apply_diff(
+        existing, incoming, _HOLDING_FIELDS, counts, session, Holding
+    )
+    if stale_ids:
+        await session.execute(
+            delete(Holding)
+            .where(Holding.id.in_(stale_ids))
+            .execution_options(synchronize_session=False)
+        )
+
 
-    return security
+def _transaction_key(values: dict[str, Any]) -> Hashable:
+    if values["provider_transaction_id"]:
+        return values["provider_transaction_id"]
+    # Without a provider ID, fall back to the transaction's content.
+    return tuple(values[name] for name in _TRANSACTION_FIELDS)
 
 
 async def sync_account_transactions(
     session: AsyncSession,
     connection: Connection,
     account: InvestmentAccount,
-    provider: BaseProvider,
+    normalized_transactions: list[NormalizedTransaction],
+    resolver: SecurityResolver,
+    counts: ChangeCounts,
 ) -> None:
-    normalized_transactions = await provider.get_transactions(
-        connection,
-        account.provider_account_id or "",
+    """Diff an account's transactions against the provider's list."""
+    existing_result = await session.execute(
+        select(Transaction)
+        .where(Transaction.account_id == account.id)
+        .order_by(Transaction.created_at, Transaction.id)
     )
-
-    await session.execute(
-        delete(Transaction).where(Transaction.account_id == account.id)
+    existing = _keyed(
+        (
+            _transaction_key(
+                {
+                    "provider_transaction_id": txn.provider_transaction_id,
+                    **{name: getattr(txn, name) for name in _TRANSACTION_FIELDS},
+                }
+            ),
+            txn,
+        )
+        for txn in existing_result.scalars()
     )
 
-    for normalized in normalized_transactions:
+    def _values(normalized: NormalizedTransaction) -> dict[str, Any]:
         security_id = None
         if normalized.security is not None:
-            security = await get_or_create_security(session, normalized.security)
-            security_id = security.id
-
-        transaction = Transaction(
-            account_id=account.id,
-            security_id=security_id,
-            provider_transaction_id=normalized.provider_transaction_id,
-            type=normalized.transaction_type or TransactionType.other,
-            quantity=normalized.quantity,
-            price=normalized.price,
-            amount=normalized.amount,
-            trade_date=normalized.trade_date,
-            settlement_date=normalized.settlement_date,
-            currency=normalized.currency or "USD",
-            description=normalized.description,
-            source=normalized.source or connection.provider,
-        )
-        session.add(transaction)
+            security_id = resolver.resolve(normalized.security).id
+        return {
+            "account_id": account.id,
+            "security_id": security_id,
+            "provider_transaction_id": normalized.provider_transaction_id,
+            "type": normalized.transaction_type or TransactionType.other,
+            "quantity": _quantize(normalized.quantity, 8),
+            "price": _quantize(normalized.price, 4),
+            "amount": _quantize(normalized.amount, 2),
+            "trade_date": normalized.trade_date,
+            "settlement_date": normalized.settlement_date,
+            "currency": normalized.currency or "USD",
+            "description": normalized.description,
+            "source": normalized.source or connection.provider,
+        }
 
-    await session.flush()
+    incoming = _keyed(
+        (_transaction_key(values), values)
+        for values in map(_values, normalized_transactions)
+    )
+    stale_ids = _apply_diff(
+        existing, incoming, _TRANSACTION_FIELDS, counts, session, Transaction
+    )
+    if stale_ids:
+        await session.execute(
+            delete(Transaction)
+            .where(Transaction.id.in_(stale_ids))
+            .execution_options(synchronize_session=False)
+        )
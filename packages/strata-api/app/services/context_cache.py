@@ -0,0 +1,306 @@
+"""Versioned per-user cache for the assembled financial context.
+
+Every user row carries a ``data_version`` counter. Flushing any model that
+feeds the financial context bumps the owning user's counter in the same
+transaction, so a cached context is only served while the version it was
+built from is still current. Entries are held in an in-process LRU and, when
+STRATA_REDIS_URL is configured, shared across workers through Redis.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any
+
+from sqlalchemy import event, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction
+
+from app.core.config import settings
+from app.models.cash_account import CashAccount
+from app.models.connection import Connection
+from app.models.crypto_wallet import CryptoWallet
+from app.models.debt_account import DebtAccount
+from app.models.equity_grant import EquityGrant
+from app.models.financial_memory import FinancialMemory
+from app.models.holding import Holding
+from app.models.investment_account import InvestmentAccount
+from app.models.physical_asset import (
+    AlternativeAsset,
+    CollectibleAsset,
+    PreciousMetalAsset,
+    RealEstateAsset,
+    VehicleAsset,
+)
+from app.models.transaction import Transaction
+from app.models.user import User
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # pragma: no cover
+    aioredis = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# Models read by build_financial_context that are owned directly by a user.
+_USER_OWNED_MODELS = (
+    FinancialMemory,
+    InvestmentAccount,
+    CashAccount,
+    DebtAccount,
+    EquityGrant,
+    RealEstateAsset,
+    VehicleAsset,
+    CollectibleAsset,
+    PreciousMetalAsset,
+    AlternativeAsset,
+    CryptoWallet,
+    Connection,
+)
+# Models read by build_financial_context that belong to an investment account.
+_ACCOUNT_OWNED_MODELS = (Holding, Transaction)
+
+# Users whose data changed in the session's open transaction.
+_PENDING_KEY = "context_cache_pending_users"
+
+
+class ContextCache(ABC):
+    @abstractmethod
+    async def get(self, user_id: uuid.UUID, version: int) -> dict[str, Any] | None: ...
+
+    @abstractmethod
+    async def set(
+        self, user_id: uuid.UUID, version: int, context: dict[str, Any]
+    ) -> None: ...
+
+    @abstractmethod
+    async def close(self) -> None: ...
+
+
+class InMemoryContextCache(ContextCache):
+    """LRU keeping the latest context per user, bounded by entry count and age."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[uuid.UUID, tuple[int, float, dict[str, Any]]] = (
+            OrderedDict()
+        )
+
+    async def get(self, user_id: uuid.UUID, version: int) -> dict[str, Any] | None:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        cached_version, expires_at, context = entry
+        if cached_version != version or time.monotonic() > expires_at:
+            del self._entries[user_id]
+            return None
+        self._entries.move_to_end(user_id)
+        return context
+
+    async def set(
+        self, user_id: uuid.UUID, version: int, context: dict[str, Any]
+    ) -> None:
+        self._entries[user_id] = (
+            version,
+            time.monotonic() + self._ttl_seconds,
+            context,
+        )
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def close(self) -> None:
+        self._entries.clear()
+
+
+class RedisContextCache(ContextCache):
+    """Redis-backed cache shared across workers, fronted by a local LRU."""
+
+    def __init__(self, redis_url: str, local: InMemoryContextCache) -> None:
+        if aioredis is None:
+            raise ImportError(
+                "redis package is required for RedisContextCache: pip install redis[hiredis]"
+            )
+        self._redis = aioredis.from_url(redis_url)
+        self._local = local
+        self._ttl_seconds = max(1, int(settings.financial_context_cache_ttl_seconds))
+
+    @staticmethod
+    def _key(user_id: uuid.UUID, version: int) -> str:
+        return f"financial_context:{user_id}:{version}"
+
+    async def get(self, user_id: uuid.UUID, version: int) -> dict[str, Any] | None:
+        context = await self._local.get(user_id, version)
+        if context is not None:
+            return context
+        try:
+            raw = await self._redis.get(self._key(user_id, version))
+        except Exception:
+            logger.warning("Financial context cache read failed", exc_info=True)
+            return None
+        if raw is None:
+            return None
+        # JSON rather than pickle: a payload read from a shared Redis must
+        # never be able to run code in the worker.
+        try:
+            context = json.loads(raw)
+        except ValueError:
+            logger.warning("Discarding unreadable financial context cache entry")
+            return None
+        await self._local.set(user_id, version, context)
+        return context
+
+    async def set(
+        self, user_id: uuid.UUID, version: int, context: dict[str, Any]
+    ) -> None:
+        await self._local.set(user_id, version, context)
+        try:
+            await self._redis.set(
+                self._key(user_id, version),
+                # The context is already JSON-shaped; default=str covers any
+                # stray Decimal, date, or UUID.
+                json.dumps(context, default=str),
+                ex=self._ttl_seconds,
+            )
+        except Exception:
+            logger.warning("Financial context cache write failed", exc_info=True)
+
+    async def close(self) -> None:
+        await self._local.close()
+        await self._redis.aclose()
+
+
+def create_context_cache(redis_url: str = "") -> ContextCache:
+    """Factory: returns a Redis-backed cache if URL is set, else in-memory."""
+    local = InMemoryContextCache(
+        max_entries=settings.financial_context_cache_max_entries,
+        ttl_seconds=settings.financial_context_cache_ttl_seconds,
+    )
+    if redis_url:
+        logger.info("Using Redis financial context cache")
+        return RedisContextCache(redis_url, local)
+    return local
+
+
+_cache: ContextCache | None = None
+
+
+def get_context_cache() -> ContextCache:
+    global _cache
+    if _cache is None:
+        _cache = create_context_cache(settings.redis_url)
+    return _cache
+
+
+async def close_context_cache() -> None:
+    global _cache
+    if _cache is not None:
+        await _cache.close()
+        _cache = None
+
+
+async def get_data_version(session: AsyncSession, user_id: uuid.UUID) -> int:
+    result = await session.execute(
+        select(User.data_version).where(User.id == user_id)
+    )
+    return result.scalar_one_or_none() or 0
+
+
+async def bump_data_version(session: AsyncSession, user_id: uuid.UUID) -> None:
+    """Invalidate cached context for writes the flush hook cannot see.
+
+    Bulk ``insert``/``update``/``delete`` statements bypass the unit of work,
+    so code that uses them for context data must call this explicitly.
+    """
+    await session.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(data_version=User.data_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    session.info.setdefault(_PENDING_KEY, set()).add(user_id)
+
+
+def has_pending_changes(session: AsyncSession, user_id: uuid.UUID) -> bool:
+    """True if the session's open transaction changed this user's data.
+
+    A context built from uncommitted data must not be cached: if the
+    transaction rolls back, the version it was keyed on can be reused.
+    """
+    return user_id in session.info.get(_PENDING_KEY, ())
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_versions_after_flush(session: Session, flush_context: Any) -> None:
+    user_ids: set[uuid.UUID] = set()
+    account_ids: set[uuid.UUID] = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, _USER_OWNED_MODELS):
+            if obj in session.dirty and not session.is_modified(obj):
+                continue
+            if obj.user_id is not None:
+                user_ids.add(obj.user_id)
+        elif isinstance(obj, _ACCOUNT_OWNED_MODELS):
+            if obj in session.dirty and not session.is_modified(obj):
+                continue
+            if obj.account_id is not None:
+                account_ids.add(obj.account_id)
+
+    if account_ids:
+        owners = session.connection().execute(
+            select(InvestmentAccount.user_id).where(
+                InvestmentAccount.id.in_(account_ids)
+            )
+        )
+        user_ids.update(owners.scalars())
+    if not user_ids:
+        return
+
+    session.connection().execute(
+        update(User.__table__)
+        .where(User.__table__.c.id.in_(user_ids))
+        .values(data_version=User.__table__.c.data_version + 1)
+    )
+    session.info.setdefault(_PENDING_KEY, set()).update(user_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _clear_pending_after_commit(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _clear_pending_after_rollback(
+    session: Session, previous_transaction: SessionTransaction
+) -> None:
+    # Rolling back a savepoint leaves the outer transaction's changes pending.
+    if previous_transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
+
+
+async def get_cached_context(
+    session: AsyncSession, user_id: uuid.UUID
+) -> tuple[int | None, dict[str, Any] | None]:
+    """Return ``(version, context)``; version is None when caching is unsafe."""
+    if has_pending_changes(session, user_id):
+        return None, None
+    version = await get_data_version(session, user_id)
+    context = await get_context_cache().get(user_id, version)
+    if context is None:
+        return version, None
+    return version, copy.deepcopy(context)
+
+
+async def store_context(
+    user_id: uuid.UUID, version: int | None, context: dict[str, Any]
+) -> None:
+    if version is None:
+        return
+    await get_context_cache().set(user_id, version, copy.deepcopy(context))
@@ -1,13 +1,15 @@
 import asyncio
 import logging
 import uuid
-from decimal import Decimal
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from decimal import Decimal, localcontext
 from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import delete, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.crypto_wallet import CryptoChain, CryptoWallet
+from app.models.crypto_wallet import CryptoChain, CryptoWallet, CryptoWalletBalance
 from app.schemas.crypto import (
     CryptoAsset,
     CryptoPortfolioResponse,
@@ -15,11 +17,31 @@ from app.schemas.crypto import (
     DeFiPosition,
     DeFiPositionType,
 )
-from app.services.providers.alchemy import alchemy_provider
-from app.services.providers.stock_price import stock_price_service
+from app.services.context_cache import bump_data_version
+from app.services.jobs.cadence import wallet_cadence
+from app.services.market_prices import market_price_service
+from app.services.providers.alchemy import WalletBalances, alchemy_provider
+from app.services.token_metadata import TokenMetadataStore
 
 logger = logging.getLogger(__name__)
 
+# Scale of CryptoWalletBalance.balance, used to compare fetched and stored amounts.
+_BALANCE_QUANTUM = Decimal(1).scaleb(-18)
+
+
+def _strip_zeros(value: Decimal) -> Decimal:
+    """Drop the column's trailing zeros (``2.500…0`` → ``2.5``) without exponents."""
+    if value == value.to_integral():
+        return value.quantize(Decimal(1))
+    return value.normalize()
+
+
+def _as_stored(balance: Decimal) -> Decimal:
+    """Round a balance the way the ``Numeric(36, 18)`` column stores it."""
+    with localcontext() as ctx:
+        ctx.prec = 40
+        return Decimal(balance).quantize(_BALANCE_QUANTUM)
+
 
 class CryptoService:
     """Service to handle crypto wallet aggregation and DeFi positions."""
@@ -115,6 +137,9 @@ class CryptoService:
         wallet = result.scalar_one_or_none()
         if not wallet:
             return False
+        await self.session.execute(
+            delete(CryptoWalletBalance).where(CryptoWalletBalance.wallet_id == wallet.id)
+        )
         await self.session.delete(wallet)
         await self.session.commit()
         return True
@@ -125,17 +150,26 @@ class CryptoService:
             select(CryptoWallet).where(CryptoWallet.user_id == user_id)
         )
         wallets = list(result.scalars().all())
+        if wallets:
+            await self.session.execute(
+                delete(CryptoWalletBalance).where(
+                    CryptoWalletBalance.wallet_id.in_([w.id for w in wallets])
+                )
+            )
         for wallet in wallets:
             await self.session.delete(wallet)
         if wallets:
             await self.session.commit()
         return len(wallets)
 
-    async def get_portfolio(self, user_id: uuid.UUID) -> CryptoPortfolioResponse:
+    async def get_portfolio(
+        self, user_id: uuid.UUID, refresh: bool = False
+    ) -> CryptoPortfolioResponse:
         """
         Aggregate all crypto assets and DeFi positions across all wallets.
-        Uses live wallet balances where providers are configured and gracefully
-        degrades when a provider is unavailable.
+
+        Balances are read from the last sync. Wallets that were never synced
+        are fetched live once; ``refresh`` fetches every wallet live first.
         """
         wallets = await self.list_wallets(user_id)
         if not wallets:
@@ -146,7 +180,20 @@ class CryptoService:
                 defi_positions=[],
             )
 
-        asset_map = await self._build_asset_map(wallets)
+        to_sync = (
+            wallets if refresh else [w for w in wallets if w.last_synced_at is None]
+        )
+        if to_sync:
+            await self.sync_wallets(to_sync)
+            # The bulk update bypasses the loaded objects; read them again.
+            result = await self.session.execute(
+                select(CryptoWallet)
+                .where(CryptoWallet.user_id == user_id)
+                .execution_options(populate_existing=True)
+            )
+            wallets = list(result.scalars().all())
+
+        asset_map = await self._load_asset_map(wallets)
         assets = await self._build_assets(asset_map)
 
         # Sort assets by value descending
@@ -170,75 +217,116 @@ class CryptoService:
             (p.value_usd for p in defi_positions), Decimal("0.00")
         )
 
+        synced_times = [
+            w.last_synced_at.replace(tzinfo=timezone.utc)
+            if w.last_synced_at.tzinfo is None
+            else w.last_synced_at
+            for w in wallets
+            if w.last_synced_at is not None
+        ]
+        balances_as_of = min(synced_times) if synced_times else None
+
         return CryptoPortfolioResponse(
             wallets=wallets,
             total_value_usd=total_value,
             assets=assets,
             defi_positions=defi_positions,
+            balances_as_of=balances_as_of,
+            data_age_seconds=int(
+                (datetime.now(timezone.utc) - balances_as_of).total_seconds()
+            )
+            if balances_as_of
+            else None,
         )
 
-    async def _build_asset_map(
+    async def _load_asset_map(
         self, wallets: list[CryptoWallet]
     ) -> dict[tuple[str, CryptoChain], dict[str, Any]]:
-        wallet_results = await asyncio.gather(
-            *(self._fetch_wallet_assets(wallet) for wallet in wallets)
+        """Aggregate the persisted per-wallet balances by symbol and chain."""
+        chains = {wallet.id: wallet.chain for wallet in wallets}
+        result = await self.session.execute(
+            select(CryptoWalletBalance).where(
+                CryptoWalletBalance.wallet_id.in_(chains)
+            )
+        )
+        return self._aggregate_assets(
+            {
+                "symbol": row.symbol,
+                "name": row.name,
+                "balance": _strip_zeros(row.balance),
+                "chain": chains[row.wallet_id],
+                "logo_url": row.logo_url,
+                "contract_address": row.contract_address,
+            }
+            for row in result.scalars()
         )
+
+    @staticmethod
+    def _aggregate_assets(
+        entries: Iterable[dict[str, Any]],
+    ) -> dict[tuple[str, CryptoChain], dict[str, Any]]:
         asset_map: dict[tuple[str, CryptoChain], dict[str, Any]] = {}
-        for entries in wallet_results:
-            for entry in entries:
-                key = (entry["symbol"], entry["chain"])
-                if key not in asset_map:
-                    asset_map[key] = {
-                        "balance": Decimal("0.0"),
-                        "name": entry["name"],
-                        "logo_url": entry.get("logo_url"),
-                        "contract_address": entry.get("contract_address"),
-                    }
-                asset_map[key]["balance"] += entry["balance"]
-                if not asset_map[key].get("logo_url"):
-                    asset_map[key]["logo_url"] = entry.get("logo_url")
-                if not asset_map[key].get("contract_address"):
-                    asset_map[key]["contract_address"] = entry.get("contract_address")
+        for entry in entries:
+            key = (entry["symbol"], entry["chain"])
+            if key not in asset_map:
+                asset_map[key] = {
+                    "balance": Decimal("0.0"),
+                    "name": entry["name"],
+                    "logo_url": entry.get("logo_url"),
+                    "contract_address": entry.get("contract_address"),
+                }
+            asset_map[key]["balance"] += entry["balance"]
+            if not asset_map[key].get("logo_url"):
+                asset_map[key]["logo_url"] = entry.get("logo_url")
+            if not asset_map[key].get("contract_address"):
+                asset_map[key]["contract_address"] = entry.get("contract_address")
         return asset_map
 
-    async def _fetch_wallet_assets(self, wallet: CryptoWallet) -> list[dict[str, Any]]:
-        assets: list[dict[str, Any]] = []
-        native_metadata = self._get_native_asset_metadata(wallet.chain)
-        native_balance_task = (
-            alchemy_provider.get_balance(wallet.chain, wallet.address)
-            if native_metadata
-            else None
-        )
-        token_balance_task = (
-            alchemy_provider.get_token_balances(wallet.chain, wallet.address)
-            if wallet.chain != CryptoChain.bitcoin
-            else None
+    async def _fetch_balances_by_wallet(
+        self, wallets: list[CryptoWallet]
+    ) -> dict[uuid.UUID, WalletBalances]:
+        by_chain: dict[CryptoChain, list[CryptoWallet]] = {}
+        for wallet in wallets:
+            by_chain.setdefault(wallet.chain, []).append(wallet)
+
+        metadata_store = TokenMetadataStore(self.session)
+        chain_balances = await asyncio.gather(
+            *(
+                alchemy_provider.get_wallet_balances(
+                    chain, [wallet.address for wallet in chain_wallets], metadata_store
+                )
+                for chain, chain_wallets in by_chain.items()
+            )
         )
+        if metadata_store.has_writes:
+            await self.session.commit()
 
-        native_balance = Decimal("0.0")
-        tokens: list[dict[str, Any]] = []
-        if native_balance_task and token_balance_task:
-            native_balance, tokens = await asyncio.gather(
-                native_balance_task, token_balance_task
+        return {
+            wallet.id: balances[wallet.address]
+            for chain_wallets, balances in zip(
+                by_chain.values(), chain_balances, strict=True
             )
-        elif native_balance_task:
-            native_balance = await native_balance_task
-        elif token_balance_task:
-            tokens = await token_balance_task
+            for wallet in chain_wallets
+        }
 
-        if native_metadata and native_balance > 0:
+    def _wallet_asset_entries(
+        self, chain: CryptoChain, balances: WalletBalances
+    ) -> list[dict[str, Any]]:
+        assets: list[dict[str, Any]] = []
+        native_metadata = self._get_native_asset_metadata(chain)
+        if native_metadata and balances.native > 0:
             assets.append(
                 {
                     "symbol": native_metadata["symbol"],
                     "name": native_metadata["name"],
-                    "balance": native_balance,
-                    "chain": wallet.chain,
+                    "balance": balances.native,
+                    "chain": chain,
                     "logo_url": native_metadata["logo_url"],
                     "contract_address": None,
                 }
             )
 
-        for token in tokens:
+        for token in balances.tokens:
             symbol = token.get("symbol")
             balance = token.get("balance")
             if not symbol or not balance or balance <= 0:
@@ -248,7 +336,7 @@ class CryptoService:
                     "symbol": symbol,
                     "name": token.get("name") or symbol,
                     "balance": balance,
-                    "chain": wallet.chain,
+                    "chain": chain,
                     "logo_url": token.get("logo_url") or self._get_token_logo(symbol),
                     "contract_address": token.get("contract_address"),
                 }
@@ -261,11 +349,9 @@ class CryptoService:
         if not asset_map:
             return []
 
-        symbols = sorted({symbol for symbol, _ in asset_map})
-        prices = await asyncio.gather(
-            *(stock_price_service.get_crypto_price(symbol) for symbol in symbols)
+        price_map = await market_price_service.get_prices(
+            sorted({symbol for symbol, _ in asset_map}), kind="crypto"
         )
-        price_map = dict(zip(symbols, prices, strict=True))
 
         assets: list[CryptoAsset] = []
         for (symbol, chain), data in asset_map.items():
@@ -293,26 +379,135 @@ class CryptoService:
     def _get_token_logo(self, symbol: str) -> str | None:
         return self._TOKEN_LOGOS.get(symbol)
 
-    async def sync_wallet(self, wallet: CryptoWallet) -> None:
-        """Fetch latest balances for a wallet and update its last_balance_usd."""
-        assets = await self._fetch_wallet_assets(wallet)
-        if not assets:
-            wallet.last_balance_usd = Decimal("0.0")
-            await self.session.commit()
-            return
+    async def sync_wallets(
+        self, wallets: list[CryptoWallet]
+    ) -> dict[uuid.UUID, Decimal]:
+        """Refresh the stored asset balances and ``last_balance_usd`` of many wallets.
 
-        asset_map = {}
-        for entry in assets:
-            key = (entry["symbol"], entry["chain"])
-            if key not in asset_map:
-                asset_map[key] = {
-                    "balance": Decimal("0.0"),
-                    "name": entry["name"],
-                    "logo_url": entry.get("logo_url"),
-                    "contract_address": entry.get("contract_address"),
+        Balances are fetched in batched provider requests per chain, priced
+        with one batch price lookup, and written with bulk statements.
+        Wallets whose lookup failed keep their previous balances and are
+        rescheduled with a backed-off interval; wallets deleted meanwhile are
+        skipped. Returns the new USD balance of each
+        synced wallet.
+        """
+        balances = await self._fetch_balances_by_wallet(wallets)
+        # Wallets deleted while the lookups ran are dropped: the bulk update by
+        # primary key below would otherwise fail the whole batch.
+        existing = await self.session.execute(
+            select(CryptoWallet.id).where(
+                CryptoWallet.id.in_([wallet.id for wallet in wallets])
+            )
+        )
+        existing_ids = set(existing.scalars())
+        wallets = [wallet for wallet in wallets if wallet.id in existing_ids]
+        synced_at = datetime.now(timezone.utc)
+        cadence = wallet_cadence()
+
+        # Failed lookups back off like unchanged wallets, so an invalid or
+        # persistently failing address is not retried every pass.
+        backoffs = []
+        for wallet in wallets:
+            if balances[wallet.id].fetched:
+                continue
+            interval = cadence.next_interval(wallet.sync_interval_seconds, False)
+            backoffs.append(
+                {
+                    "id": wallet.id,
+                    "sync_interval_seconds": interval,
+                    "next_sync_at": cadence.next_sync_at(synced_at, interval),
                 }
-            asset_map[key]["balance"] += entry["balance"]
+            )
+        if backoffs:
+            await self.session.execute(update(CryptoWallet), backoffs)
+
+        entries = {
+            wallet.id: self._wallet_asset_entries(wallet.chain, balances[wallet.id])
+            for wallet in wallets
+            if balances[wallet.id].fetched
+        }
+        if not entries:
+            if backoffs:
+                await self.session.commit()
+            return {}
 
-        priced_assets = await self._build_assets(asset_map)
-        wallet.last_balance_usd = sum((a.balance_usd for a in priced_assets), Decimal("0.0"))
+        symbols = sorted({e["symbol"] for items in entries.values() for e in items})
+        price_map = (
+            await market_price_service.get_prices(symbols, kind="crypto")
+            if symbols
+            else {}
+        )
+        totals = {
+            wallet_id: sum(
+                (
+                    entry["balance"] * price_map.get(entry["symbol"], Decimal("0.0"))
+                    for entry in items
+                ),
+                Decimal("0.0"),
+            )
+            for wallet_id, items in entries.items()
+        }
+
+        # Price moves alone do not count as changes: the cadence tracks
+        # on-chain activity, not market movement.
+        previous = await self.session.execute(
+            select(
+                CryptoWalletBalance.wallet_id,
+                CryptoWalletBalance.contract_address,
+                CryptoWalletBalance.symbol,
+                CryptoWalletBalance.balance,
+            ).where(CryptoWalletBalance.wallet_id.in_(list(entries)))
+        )
+        previous_holdings: dict[uuid.UUID, set[tuple]] = {}
+        for wallet_id, contract, symbol, balance in previous:
+            previous_holdings.setdefault(wallet_id, set()).add(
+                (contract, symbol, _as_stored(balance))
+            )
+
+        intervals = {wallet.id: wallet.sync_interval_seconds for wallet in wallets}
+        updates = []
+        for wallet_id, total in totals.items():
+            holdings = {
+                (
+                    entry.get("contract_address"),
+                    entry["symbol"][:64],
+                    _as_stored(entry["balance"]),
+                )
+                for entry in entries[wallet_id]
+            }
+            changed = holdings != previous_holdings.get(wallet_id, set())
+            interval = cadence.next_interval(intervals.get(wallet_id), changed)
+            updates.append(
+                {
+                    "id": wallet_id,
+                    "last_balance_usd": total,
+                    "last_synced_at": synced_at,
+                    "sync_interval_seconds": interval,
+                    "next_sync_at": cadence.next_sync_at(synced_at, interval),
+                }
+            )
+        await self.session.execute(update(CryptoWallet), updates)
+        await self.session.execute(
+            delete(CryptoWalletBalance).where(
+                CryptoWalletBalance.wallet_id.in_(list(entries))
+            )
+        )
+        rows = [
+            {
+                "wallet_id": wallet_id,
+                "symbol": entry["symbol"][:64],
+                "name": entry["name"][:255],
+                "balance": entry["balance"],
+                "contract_address": entry.get("contract_address"),
+                "logo_url": entry.get("logo_url"),
+            }
+            for wallet_id, items in entries.items()
+            for entry in items
+        ]
+        if rows:
+            await self.session.execute(insert(CryptoWalletBalance), rows)
+        # Bulk statements bypass the flush hook that invalidates cached context.
+        for user_id in {wallet.user_id for wallet in wallets if wallet.id in totals}:
+            await bump_data_version(self.session, user_id)
         await self.session.commit()
+        return totals
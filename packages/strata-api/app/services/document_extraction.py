@@ -1,5 +1,7 @@
 """Document extraction orchestration service."""
 
+import asyncio
+import contextlib
 import logging
 import uuid
 
@@ -17,7 +19,29 @@ from app.schemas.tax_document import (
     PrefillTaxPlanResponse,
     ValidationIssue,
 )
+from app.services.extraction_cache import (
+    ExtractionCacheKey,
+    get_cached_extraction,
+    store_extraction,
+)
+from app.services.extraction_pages import (
+    PageRange,
+    merge_page_results,
+    page_ranges,
+    pdf_page_count,
+    read_page_range,
+)
+from app.services.jobs.scheduler import ProviderLimiter
 from app.services.providers.base_extraction import ExtractionProvider
+from app.services.tax_document_storage import (
+    StagedUpload,
+    commit_staged_upload,
+    delete_uploads,
+    discard_staged_upload,
+    read_upload,
+    upload_digest,
+    upload_path,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -71,6 +95,12 @@ class DocumentExtractionService:
             )
 
             return TesseractExtractionProvider()
+        elif provider_name == "fake":
+            from app.services.providers.fake_extraction import (
+                FakeExtractionProvider,
+            )
+
+            return FakeExtractionProvider()
         else:
             raise ValueError(f"Unknown extraction provider: {provider_name}")
 
@@ -120,20 +150,54 @@ class DocumentExtractionService:
 
         return issues
 
-    async def process_upload(
+    async def create_document(
         self,
         user_id: uuid.UUID,
-        file_bytes: bytes,
+        upload: StagedUpload,
         filename: str,
         mime_type: str,
         *,
         document_type_hint: str | None = None,
+        prefill_plan_id: uuid.UUID | None = None,
+    ) -> TaxDocument:
+        """Validate a staged upload and record a pending document.
+
+        The staged file becomes the document's stored upload, or is removed
+        if the upload is rejected or an earlier extraction of the same file is
+        reused. Extraction runs later in an extraction job (see
+        ``app.services.extraction_jobs``), which picks the stored file up by
+        document ID.
+        """
+        try:
+            doc = await self._create_document(
+                user_id,
+                upload,
+                filename,
+                mime_type,
+                document_type_hint=document_type_hint,
+                prefill_plan_id=prefill_plan_id,
+            )
+        except BaseException:
+            await discard_staged_upload(upload)
+            raise
+        if doc.status != "pending":
+            await discard_staged_upload(upload)
+        return doc
+
+    async def _create_document(
+        self,
+        user_id: uuid.UUID,
+        upload: StagedUpload,
+        filename: str,
+        mime_type: str,
+        *,
+        document_type_hint: str | None,
+        prefill_plan_id: uuid.UUID | None,
     ) -> TaxDocument:
-        """Process a document upload: validate, extract, store."""
         # Validate file
-        if len(file_bytes) > MAX_FILE_SIZE:
+        if upload.size > MAX_FILE_SIZE:
             raise ValueError(
-                f"File too large: {len(file_bytes)} bytes (max {MAX_FILE_SIZE})"
+                f"File too large: {upload.size} bytes (max {MAX_FILE_SIZE})"
             )
         if mime_type not in ALLOWED_MIME_TYPES:
             raise ValueError(f"Unsupported file type: {mime_type}")
@@ -146,48 +210,149 @@ class DocumentExtractionService:
                 f"{mime_type}. Supported: {', '.join(provider.supported_mime_types())}"
             )
 
-        # Create document record
+        if prefill_plan_id is not None:
+            await self._require_owned_plan(user_id, prefill_plan_id)
+
         doc = TaxDocument(
             user_id=user_id,
             original_filename=filename,
             mime_type=mime_type,
-            file_size_bytes=len(file_bytes),
-            status="processing",
+            file_size_bytes=upload.size,
+            content_sha256=upload.sha256,
+            status="pending",
+            document_type_hint=document_type_hint[:64] if document_type_hint else None,
+            prefill_plan_id=prefill_plan_id,
         )
+
+        # A file this user already had extracted completes immediately.
+        cached = await get_cached_extraction(
+            self._session, user_id, self._cache_key(provider, doc)
+        )
+        if cached is not None:
+            self._apply_result(doc, cached)
+            self._session.add(doc)
+            await self._session.flush()
+            await self._session.refresh(doc)
+            await self._session.commit()
+            return doc
+
         self._session.add(doc)
         await self._session.flush()
 
+        # Store the file before committing so a job never sees a document
+        # without its upload. Refreshing first leaves no transaction open
+        # once the document is committed and handed to a job.
+        await commit_staged_upload(upload, doc.id)
         try:
-            # Extract
-            result = await provider.extract(
-                file_bytes,
-                mime_type,
-                filename,
-                document_type_hint=document_type_hint,
-            )
+            await self._session.refresh(doc)
+            await self._session.commit()
+        except Exception:
+            await delete_uploads(doc.id)
+            raise
+        return doc
 
-            # Validate
-            issues = self.validate_extraction(result)
-            has_errors = any(i.severity == "error" for i in issues)
-
-            # Update document
-            doc.document_type = result.document_type
-            doc.tax_year = result.tax_year
-            doc.provider_used = result.provider_name
-            doc.extracted_data = result.fields
-            doc.confidence_score = result.confidence
-            doc.validation_errors = [i.model_dump() for i in issues] if issues else None
-            doc.status = "needs_review" if has_errors else "completed"
-
-        except Exception as e:
-            logger.exception("Extraction failed for document %s", doc.id)
-            doc.status = "failed"
-            # Sanitize: only expose the exception class name, not internal details
-            doc.error_message = f"Extraction failed: {type(e).__name__}"
+    async def extract_document(
+        self,
+        doc: TaxDocument,
+        provider: ExtractionProvider | None = None,
+        limiter: ProviderLimiter | None = None,
+    ) -> None:
+        """Extract a stored upload and record the result on ``doc``.
+
+        Each provider call holds a ``limiter`` slot, when one is given.
+        Provider errors propagate so the caller can retry them. The caller
+        commits.
+        """
+        provider = provider or self._get_provider()
+        if doc.content_sha256 is None:
+            doc.content_sha256 = await upload_digest(doc.id)
+        cache_key = self._cache_key(provider, doc)
+
+        # An identical upload may have finished while this one was queued.
+        result = await get_cached_extraction(self._session, doc.user_id, cache_key)
+        if result is None:
+            result = await self._extract_upload(doc, provider, limiter)
+            await store_extraction(self._session, doc.user_id, cache_key, result)
+        self._apply_result(doc, result)
+
+    async def _extract_upload(
+        self,
+        doc: TaxDocument,
+        provider: ExtractionProvider,
+        limiter: ProviderLimiter | None,
+    ) -> ExtractionResult:
+        """Extract the stored file, one page range at a time for long PDFs."""
+        path = upload_path(doc.id)
+        ranges: list[PageRange] = []
+        if doc.mime_type == "application/pdf":
+            page_count = await asyncio.to_thread(pdf_page_count, path)
+            per_request = settings.extraction_pdf_pages_per_request
+            if page_count is not None and page_count > per_request:
+                ranges = page_ranges(page_count, per_request)
+
+        def provider_slot() -> contextlib.AbstractAsyncContextManager[None]:
+            return limiter.slot() if limiter else contextlib.nullcontext()
+
+        if not ranges:
+            file_bytes = await read_upload(doc.id)
+            async with provider_slot():
+                return await provider.extract(
+                    file_bytes,
+                    doc.mime_type,
+                    doc.original_filename,
+                    document_type_hint=doc.document_type_hint,
+                )
 
-        await self._session.commit()
-        await self._session.refresh(doc)
-        return doc
+        # Only ranges being extracted are held in memory.
+        range_slots = asyncio.Semaphore(max(1, settings.extraction_pdf_range_concurrency))
+
+        async def extract_range(pages: PageRange) -> tuple[PageRange, ExtractionResult]:
+            async with range_slots:
+                range_bytes = await asyncio.to_thread(read_page_range, path, pages)
+                async with provider_slot():
+                    result = await provider.extract(
+                        range_bytes,
+                        doc.mime_type,
+                        doc.original_filename,
+                        document_type_hint=doc.document_type_hint,
+                    )
+                return pages, result
+
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(extract_range(pages)) for pages in ranges]
+        return merge_page_results([task.result() for task in tasks])
+
+    @staticmethod
+    def _cache_key(provider: ExtractionProvider, doc: TaxDocument) -> ExtractionCacheKey:
+        assert doc.content_sha256 is not None
+        return ExtractionCacheKey.for_provider(
+            provider, doc.content_sha256, doc.document_type_hint
+        )
+
+    def _apply_result(self, doc: TaxDocument, result: ExtractionResult) -> None:
+        # Validate
+        issues = self.validate_extraction(result)
+        has_errors = any(i.severity == "error" for i in issues)
+
+        # Update document
+        doc.document_type = result.document_type
+        doc.tax_year = result.tax_year
+        doc.provider_used = result.provider_name
+        doc.extracted_data = result.fields
+        doc.confidence_score = result.confidence
+        doc.validation_errors = [i.model_dump() for i in issues] if issues else None
+        doc.error_message = None
+        doc.status = "needs_review" if has_errors else "completed"
+
+    async def _require_owned_plan(self, user_id: uuid.UUID, plan_id: uuid.UUID) -> None:
+        plan_result = await self._session.execute(
+            select(TaxPlan.id).where(
+                TaxPlan.id == plan_id,
+                TaxPlan.user_id == user_id,
+            )
+        )
+        if plan_result.scalar_one_or_none() is None:
+            raise ValueError("Tax plan not found or not owned by user")
 
     async def prefill_tax_plan(
         self,
@@ -198,14 +363,7 @@ class DocumentExtractionService:
     ) -> PrefillTaxPlanResponse:
         """Create a TaxPlanVersion pre-filled from extracted document data."""
         # Verify the user owns the target plan
-        plan_result = await self._session.execute(
-            select(TaxPlan).where(
-                TaxPlan.id == plan_id,
-                TaxPlan.user_id == user_id,
-            )
-        )
-        if not plan_result.scalar_one_or_none():
-            raise ValueError("Tax plan not found or not owned by user")
+        await self._require_owned_plan(user_id, plan_id)
 
         # Load documents
         result = await self._session.execute(
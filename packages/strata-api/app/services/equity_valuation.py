@@ -1,4 +1,3 @@
-import asyncio
 import logging
 from datetime import date
 from decimal import Decimal
@@ -7,7 +6,7 @@ from dateutil.relativedelta import relativedelta
 
 from app.models.equity_grant import EquityGrant, EquityGrantType
 from app.schemas.equity import EquityPortfolioSummary, EquityProjection, EquityValuation
-from app.services.providers.stock_price import stock_price_service
+from app.services.market_prices import market_price_service
 
 logger = logging.getLogger(__name__)
 
@@ -15,8 +14,14 @@ logger = logging.getLogger(__name__)
 class EquityValuationService:
     """Service to calculate valuations for equity grants."""
 
-    async def calculate_grant_valuation(self, grant: EquityGrant) -> EquityValuation:
-        """Calculate the current valuation of a single grant."""
+    async def calculate_grant_valuation(
+        self, grant: EquityGrant, market_price: Decimal | None = None
+    ) -> EquityValuation:
+        """Calculate the current valuation of a single grant.
+
+        ``market_price`` is the grant symbol's price when the caller already
+        fetched it; otherwise it is looked up.
+        """
         # For SAFEs and Convertible notes, use amount invested as a baseline value if symbol is empty
         # Real valuation for SAFEs can be complex (based on next round), but amount_invested is a safe floor.
         if grant.grant_type in {EquityGrantType.safe, EquityGrantType.convertible_note}:
@@ -38,7 +43,11 @@ class EquityValuationService:
         # For founder stock, or regular RSUs/Options
         current_price = Decimal("0.00")
         if grant.symbol:
-            current_price = await stock_price_service.get_price(grant.symbol)
+            current_price = (
+                market_price
+                if market_price is not None
+                else await market_price_service.get_price(grant.symbol)
+            )
         elif grant.strike_price and grant.grant_type == EquityGrantType.founder_stock:
             # Founder stock without symbol might use strike_price as the current 409a estimate
             current_price = grant.strike_price
@@ -115,9 +124,14 @@ class EquityValuationService:
         self, grants: list[EquityGrant]
     ) -> EquityPortfolioSummary:
         """Calculate a summary of all equity grants for a user."""
+        prices = await market_price_service.get_prices(
+            {g.symbol for g in grants if g.symbol}
+        )
         valuations = []
         for grant in grants:
-            val = await self.calculate_grant_valuation(grant)
+            val = await self.calculate_grant_valuation(
+                grant, prices.get(grant.symbol) if grant.symbol else None
+            )
             valuations.append(val)
 
         total_vested = sum(v.vested_value for v in valuations)
@@ -138,10 +152,9 @@ class EquityValuationService:
 
         # Get current prices for public grants (those with a ticker symbol) concurrently.
         # Grants without a symbol (private SAFEs, convertible notes, founder stock) are valued separately.
-        symbols = list(set(g.symbol for g in grants if g.symbol))
-        price_tasks = [stock_price_service.get_price(s) for s in symbols]
-        price_results = await asyncio.gather(*price_tasks)
-        prices = dict(zip(symbols, price_results))
+        prices = await market_price_service.get_prices(
+            {g.symbol for g in grants if g.symbol}
+        )
 
         # Pre-calculate intrinsic value per share and total potential value once
         total_potential_value = Decimal("0.00")
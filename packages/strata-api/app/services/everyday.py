@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from datetime import UTC, date, datetime, timedelta
+from datetime import date, timedelta
 from decimal import Decimal
 
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.bank_transaction import BankTransaction
@@ -26,6 +26,7 @@ from app.models.everyday import (
     TransactionRule,
 )
 from app.models.portfolio_snapshot import PortfolioSnapshot
+from app.services.rule_index import RuleIndex, build_rule_index, normalize_match_text
 
 
 def month_window(month_start: date) -> tuple[date, date]:
@@ -45,12 +46,8 @@ def cadence_delta(cadence: RecurringCadence) -> timedelta:
     return timedelta(days=30)
 
 
-def _normalized_tx_text(tx: BankTransaction) -> str:
-    return f"{tx.merchant_name or ''} {tx.name}".strip().lower()
-
-
 def rule_matches(rule: TransactionRule, tx: BankTransaction) -> bool:
-    haystack = _normalized_tx_text(tx)
+    haystack = normalize_match_text(tx)
     needle = rule.match_text.strip().lower()
     if not needle:
         return False
@@ -59,7 +56,16 @@ def rule_matches(rule: TransactionRule, tx: BankTransaction) -> bool:
     return needle in haystack
 
 
-def choose_rule(rules: list[TransactionRule], tx: BankTransaction) -> TransactionRule | None:
+def choose_rule(
+    rules: RuleIndex | list[TransactionRule], tx: BankTransaction
+) -> TransactionRule | None:
+    """Return the earliest active rule matching ``tx``.
+
+    Pass a ``RuleIndex`` (see ``get_rule_index``) when matching many
+    transactions; a plain list is scanned rule by rule.
+    """
+    if isinstance(rules, RuleIndex):
+        return rules.match(tx)
     for rule in rules:
         if rule.is_active and rule_matches(rule, tx):
             return rule
@@ -112,9 +118,14 @@ async def get_transaction_rules(session: AsyncSession, user_id) -> list[Transact
     return list(result.scalars().all())
 
 
+async def get_rule_index(session: AsyncSession, user_id) -> RuleIndex:
+    rules = await get_transaction_rules(session, user_id)
+    return build_rule_index(user_id, rules)
+
+
 async def build_budget_summary(session: AsyncSession, budget: Budget) -> dict:
     period_start, period_end = month_window(budget.month_start)
-    rules = await get_transaction_rules(session, budget.user_id)
+    rules = await get_rule_index(session, budget.user_id)
     tx_result = await session.execute(
         select(BankTransaction)
         .join(CashAccount)
@@ -172,100 +183,18 @@ async def build_budget_summary(session: AsyncSession, budget: Budget) -> dict:
     }
 
 
-async def sync_recurring_items(session: AsyncSession, user_id) -> list[RecurringItem]:
-    rules = await get_transaction_rules(session, user_id)
-    tx_result = await session.execute(
-        select(BankTransaction)
-        .join(CashAccount)
-        .where(
-            CashAccount.user_id == user_id,
-            BankTransaction.amount < 0,
-        )
-        .order_by(BankTransaction.transaction_date.desc())
-    )
-    txs = tx_result.scalars().all()
-
-    grouped: defaultdict[str, list[BankTransaction]] = defaultdict(list)
-    for tx in txs:
-        rule = choose_rule(rules, tx)
-        merchant = effective_merchant(tx, rule)
-        grouped[merchant.lower()].append(tx)
-
-    existing_result = await session.execute(
-        select(RecurringItem).where(RecurringItem.user_id == user_id)
+async def get_recurring_items(session: AsyncSession, user_id) -> list[RecurringItem]:
+    """Recurring items maintained by ``recurring_detection`` at sync time."""
+    result = await session.execute(
+        select(RecurringItem)
+        .where(RecurringItem.user_id == user_id)
+        .order_by(RecurringItem.next_due_date.asc(), RecurringItem.name.asc())
     )
-    existing = {item.merchant_name.lower(): item for item in existing_result.scalars().all()}
-    touched: list[RecurringItem] = []
-
-    for merchant_key, items in grouped.items():
-        if len(items) < 2:
-            continue
-        items.sort(key=lambda tx: tx.transaction_date)
-        intervals = [
-            (items[idx + 1].transaction_date - items[idx].transaction_date).days
-            for idx in range(len(items) - 1)
-        ]
-        avg_interval = sum(intervals) / len(intervals)
-        cadence: RecurringCadence | None = None
-        confidence = Decimal("0.6000")
-        if 6 <= avg_interval <= 8:
-            cadence = RecurringCadence.weekly
-            confidence = Decimal("0.9000")
-        elif 25 <= avg_interval <= 35:
-            cadence = RecurringCadence.monthly
-            confidence = Decimal("0.9500")
-        elif 80 <= avg_interval <= 100:
-            cadence = RecurringCadence.quarterly
-            confidence = Decimal("0.8500")
-        if cadence is None:
-            continue
-
-        latest = items[-1]
-        latest_amount = abs(latest.amount)
-        rule = choose_rule(rules, latest)
-        merchant_name = effective_merchant(latest, rule)
-        category = effective_category(latest, rule)
-        next_due = latest.transaction_date + cadence_delta(cadence)
-        state = RecurringState.active if confidence >= Decimal("0.9000") else RecurringState.review
-
-        record = existing.get(merchant_key)
-        if record is None:
-            record = RecurringItem(
-                user_id=user_id,
-                name=merchant_name,
-                merchant_name=merchant_name,
-                category=category,
-                cadence=cadence,
-                expected_amount=latest_amount,
-                amount_tolerance=(latest_amount * Decimal("0.15")).quantize(Decimal("0.01")),
-                next_due_date=next_due,
-                last_seen_at=datetime.combine(latest.transaction_date, datetime.min.time(), tzinfo=UTC),
-                confidence=confidence,
-                state=state,
-                metadata_json={"source": "transaction_scan"},
-            )
-            session.add(record)
-        else:
-            record.name = record.name or merchant_name
-            record.category = record.category or category
-            record.cadence = cadence
-            record.expected_amount = latest_amount
-            record.amount_tolerance = (latest_amount * Decimal("0.15")).quantize(Decimal("0.01"))
-            record.next_due_date = next_due
-            record.last_seen_at = datetime.combine(latest.transaction_date, datetime.min.time(), tzinfo=UTC)
-            record.confidence = confidence
-            if record.state != RecurringState.dismissed:
-                record.state = state
-        touched.append(record)
-
-    await session.commit()
-    for item in touched:
-        await session.refresh(item)
-    return touched or list(existing.values())
+    return list(result.scalars().all())
 
 
 async def ensure_review_items(session: AsyncSession, user_id) -> list[ReviewItem]:
-    recurring_items = await sync_recurring_items(session, user_id)
+    recurring_items = await get_recurring_items(session, user_id)
     current_result = await session.execute(
         select(ReviewItem).where(
             ReviewItem.user_id == user_id,
@@ -297,7 +226,7 @@ async def ensure_review_items(session: AsyncSession, user_id) -> list[ReviewItem
         )
         created = True
 
-    rules = await get_transaction_rules(session, user_id)
+    rules = await get_rule_index(session, user_id)
     tx_result = await session.execute(
         select(BankTransaction)
         .join(CashAccount)
@@ -487,8 +416,16 @@ async def build_weekly_briefing(session: AsyncSession, user_id) -> dict:
             if goal.monthly_contribution < needed:
                 at_risk_goals += 1
 
-    recurring = await sync_recurring_items(session, user_id)
-    changed_recurring = len([item for item in recurring if item.state == RecurringState.review])
+    changed_recurring = (
+        await session.execute(
+            select(func.count())
+            .select_from(RecurringItem)
+            .where(
+                RecurringItem.user_id == user_id,
+                RecurringItem.state == RecurringState.review,
+            )
+        )
+    ).scalar_one()
 
     return {
         "period_start": week_ago,
@@ -0,0 +1,189 @@
+"""Reuse of extraction results for identical uploads.
+
+Results are keyed by the SHA-256 of the file bytes, the provider and model,
+the document type hint (it changes the prompt), and a version fingerprint of
+the extraction prompt and field schemas. Changing the prompt or a schema
+changes the fingerprint, so older results are never served again; they are
+purged the next time the same file is extracted.
+
+Authenticated uploads are cached per user in ``extraction_cache_entries``.
+Public audits have no user, so their results live in the session store
+(Redis when configured) and expire after
+``extraction_public_cache_ttl_seconds``.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import logging
+import uuid
+from dataclasses import dataclass
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.tax_document import ExtractionCacheEntry
+from app.schemas.tax_document import FIELD_SCHEMAS, REQUIRED_FIELDS, ExtractionResult
+from app.services.providers.base_extraction import (
+    EXTRACTION_SYSTEM_PROMPT,
+    ExtractionProvider,
+)
+from app.services.session_store import SessionStore
+
+logger = logging.getLogger(__name__)
+
+# Bump to drop every cached result when extraction changes in a way the
+# prompt and schemas do not capture, such as response parsing.
+EXTRACTION_CACHE_REVISION = 1
+
+_PUBLIC_KEY_PREFIX = "extraction-cache"
+
+
+@functools.cache
+def extraction_cache_version() -> str:
+    """Fingerprint of the extraction prompt and field schemas."""
+    digest = hashlib.sha256()
+    digest.update(str(EXTRACTION_CACHE_REVISION).encode())
+    digest.update(EXTRACTION_SYSTEM_PROMPT.encode())
+    schemas = {
+        doc_type: schema.model_json_schema() for doc_type, schema in FIELD_SCHEMAS.items()
+    }
+    digest.update(json.dumps(schemas, sort_keys=True).encode())
+    digest.update(json.dumps(REQUIRED_FIELDS, sort_keys=True).encode())
+    digest.update(json.dumps(ExtractionResult.model_json_schema(), sort_keys=True).encode())
+    return digest.hexdigest()[:16]
+
+
+def content_digest(file_bytes: bytes) -> str:
+    return hashlib.sha256(file_bytes).hexdigest()
+
+
+@dataclass(frozen=True)
+class ExtractionCacheKey:
+    content_sha256: str
+    provider_name: str
+    model_name: str
+    cache_version: str
+    document_type_hint: str
+
+    @classmethod
+    def for_provider(
+        cls,
+        provider: ExtractionProvider,
+        content_sha256: str,
+        document_type_hint: str | None = None,
+    ) -> ExtractionCacheKey:
+        hint = (document_type_hint or "").lower()
+        return cls(
+            content_sha256=content_sha256,
+            provider_name=provider.provider_name,
+            model_name=provider.model_name()[:128],
+            cache_version=extraction_cache_version(),
+            document_type_hint=hint if hint in ExtractionProvider._KNOWN_DOC_TYPES else "",
+        )
+
+    def public_key(self) -> str:
+        return ":".join(
+            (
+                _PUBLIC_KEY_PREFIX,
+                self.content_sha256,
+                self.provider_name,
+                self.model_name,
+                self.cache_version,
+                self.document_type_hint,
+            )
+        )
+
+
+def is_cacheable(result: ExtractionResult) -> bool:
+    """Unrecognized documents and unparseable responses are worth retrying."""
+    return result.document_type != "unknown" and result.confidence > 0
+
+
+def _serialize(result: ExtractionResult) -> dict:
+    return result.model_dump(mode="json", exclude={"raw_provider_response"})
+
+
+async def get_cached_extraction(
+    session: AsyncSession, user_id: uuid.UUID, key: ExtractionCacheKey
+) -> ExtractionResult | None:
+    if not settings.extraction_cache_enabled:
+        return None
+    result = await session.execute(
+        select(ExtractionCacheEntry.result).where(
+            ExtractionCacheEntry.user_id == user_id,
+            ExtractionCacheEntry.content_sha256 == key.content_sha256,
+            ExtractionCacheEntry.provider_name == key.provider_name,
+            ExtractionCacheEntry.model_name == key.model_name,
+            ExtractionCacheEntry.cache_version == key.cache_version,
+            ExtractionCacheEntry.document_type_hint == key.document_type_hint,
+        )
+    )
+    cached = result.scalar_one_or_none()
+    if cached is None:
+        return None
+    logger.info("Extraction cache hit for %s", key.content_sha256[:12])
+    return ExtractionResult.model_validate(cached)
+
+
+async def store_extraction(
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    key: ExtractionCacheKey,
+    result: ExtractionResult,
+) -> None:
+    """Remember a result for this user; the caller commits."""
+    if not settings.extraction_cache_enabled or not is_cacheable(result):
+        return
+    # Results for this file from an older prompt or schema are unreachable.
+    await session.execute(
+        delete(ExtractionCacheEntry).where(
+            ExtractionCacheEntry.user_id == user_id,
+            ExtractionCacheEntry.content_sha256 == key.content_sha256,
+            ExtractionCacheEntry.cache_version != key.cache_version,
+        )
+    )
+    try:
+        # A concurrent job may store the same key first; keep its result.
+        async with session.begin_nested():
+            session.add(
+                ExtractionCacheEntry(
+                    user_id=user_id,
+                    content_sha256=key.content_sha256,
+                    provider_name=key.provider_name,
+                    model_name=key.model_name,
+                    cache_version=key.cache_version,
+                    document_type_hint=key.document_type_hint,
+                    result=_serialize(result),
+                )
+            )
+    except IntegrityError:
+        pass
+
+
+async def get_public_extraction(
+    store: SessionStore, key: ExtractionCacheKey
+) -> ExtractionResult | None:
+    if not settings.extraction_cache_enabled:
+        return None
+    cached = await store.get(key.public_key())
+    if cached is None:
+        return None
+    logger.info("Public extraction cache hit for %s", key.content_sha256[:12])
+    return ExtractionResult.model_validate(cached)
+
+
+async def store_public_extraction(
+    store: SessionStore, key: ExtractionCacheKey, result: ExtractionResult
+) -> None:
+    if not settings.extraction_cache_enabled or not is_cacheable(result):
+        return
+    await store.set(
+        key.public_key(),
+        _serialize(result),
+        ttl=settings.extraction_public_cache_ttl_seconds,
+    )
@@ -0,0 +1,301 @@
+"""Background extraction jobs for uploaded tax documents.
+
+An upload is stored and recorded as a ``pending`` TaxDocument, and its ID is
+queued here. A fixed pool of worker tasks claims queued documents, runs the
+configured extraction provider under a per-provider concurrency limit,
+retries transient provider failures with backoff, and writes the result to
+the document. When the upload named a tax plan, the plan is pre-filled once
+extraction succeeds.
+
+The document ID doubles as the job ID: ``status`` moves from ``pending`` to
+``processing`` and ends at ``completed``, ``needs_review`` or ``failed``.
+
+Jobs survive restarts through the database. ``recover_extraction_jobs``
+re-queues pending documents, and ones stuck in ``processing`` for longer
+than ``extraction_job_stale_minutes``, when the API starts. Claiming a job
+is a conditional update, so several API workers may queue the same document
+and only one of them runs it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.core.config import settings
+from app.db.session import async_session_factory
+from app.models.tax_document import TaxDocument
+from app.services.document_extraction import DocumentExtractionService
+from app.services.jobs.scheduler import ProviderLimiter, retry_with_backoff
+from app.services.tax_document_storage import delete_uploads, upload_exists
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = frozenset({"completed", "needs_review", "failed"})
+
+
+class ExtractionJobQueue:
+    """Fixed pool of worker tasks draining a queue of document IDs."""
+
+    def __init__(self, workers: int, provider_concurrency: dict[str, int]) -> None:
+        self._worker_count = max(1, workers)
+        self._provider_concurrency = provider_concurrency
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue[uuid.UUID] | None = None
+        self._workers: list[asyncio.Task[None]] = []
+        self._limiters: dict[str, ProviderLimiter] = {}
+
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._retries = 0
+
+    def _ensure_started(self) -> asyncio.Queue[uuid.UUID]:
+        # Queues, semaphores and tasks bind to one event loop; start a fresh
+        # pool if this one is used from another (e.g. across test cases).
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._limiters = {}
+            self._workers = [
+                loop.create_task(self._work(), name=f"extraction-worker-{i}")
+                for i in range(self._worker_count)
+            ]
+        return self._queue
+
+    def start(self) -> None:
+        self._ensure_started()
+
+    async def enqueue(self, document_id: uuid.UUID) -> None:
+        await self._ensure_started().put(document_id)
+
+    def limiter_for(self, provider_name: str) -> ProviderLimiter:
+        limiter = self._limiters.get(provider_name)
+        if limiter is None:
+            concurrency = self._provider_concurrency.get(
+                provider_name, self._worker_count
+            )
+            limiter = ProviderLimiter(concurrency)
+            self._limiters[provider_name] = limiter
+        return limiter
+
+    async def _work(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        while True:
+            document_id = await queue.get()
+            self._running += 1
+            try:
+                await run_extraction_job(document_id, self)
+            except Exception:
+                logger.exception("Extraction job %s crashed", document_id)
+            finally:
+                self._running -= 1
+                queue.task_done()
+
+    def record(self, status: str, retries: int) -> None:
+        self._retries += retries
+        if status == "failed":
+            self._failed += 1
+        else:
+            self._completed += 1
+
+    async def join(self) -> None:
+        """Wait until every queued job has finished."""
+        if self._queue is not None and self._loop is asyncio.get_running_loop():
+            await self._queue.join()
+
+    async def shutdown(self) -> None:
+        """Cancel the workers; unfinished jobs are recovered on next start."""
+        workers, self._workers = self._workers, []
+        for task in workers:
+            task.cancel()
+        for task in workers:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._queue = None
+        self._loop = None
+
+    def stats(self) -> dict[str, Any]:
+        """Return queue-depth and outcome counters."""
+        return {
+            "workers": self._worker_count,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "running": self._running,
+            "completed": self._completed,
+            "failed": self._failed,
+            "retries": self._retries,
+        }
+
+
+extraction_queue = ExtractionJobQueue(
+    workers=settings.extraction_job_workers,
+    provider_concurrency=settings.extraction_provider_concurrency,
+)
+
+
+async def _claim(document_id: uuid.UUID) -> bool:
+    async with async_session_factory() as session:
+        result = await session.execute(
+            update(TaxDocument)
+            .where(TaxDocument.id == document_id, TaxDocument.status == "pending")
+            .values(
+                status="processing",
+                extraction_attempts=TaxDocument.extraction_attempts + 1,
+            )
+        )
+        await session.commit()
+        return result.rowcount == 1
+
+
+async def run_extraction_job(
+    document_id: uuid.UUID,
+    queue: ExtractionJobQueue | None = None,
+) -> None:
+    """Claim a pending document, extract it, and pre-fill its tax plan."""
+    queue = queue or extraction_queue
+    if not await _claim(document_id):
+        return
+
+    async with async_session_factory() as session:
+        doc = await session.get(TaxDocument, document_id)
+        if doc is None:
+            return
+        service = DocumentExtractionService(session)
+        retries = 0
+
+        def _on_retry(attempt: int, exc: BaseException) -> None:
+            nonlocal retries
+            retries = attempt
+            logger.warning(
+                "Retrying extraction of document %s (attempt %d): %s",
+                document_id,
+                attempt,
+                type(exc).__name__,
+            )
+
+        try:
+            provider = service._get_provider()
+            limiter = queue.limiter_for(provider.provider_name)
+
+            async def _attempt() -> None:
+                await service.extract_document(doc, provider, limiter)
+
+            await retry_with_backoff(
+                _attempt,
+                retries=settings.extraction_job_max_retries,
+                base_delay=settings.extraction_job_retry_base_seconds,
+                on_retry=_on_retry,
+            )
+        except Exception as e:
+            logger.exception("Extraction failed for document %s", document_id)
+            doc.status = "failed"
+            # Sanitize: only expose the exception class name, not internal details
+            doc.error_message = f"Extraction failed: {type(e).__name__}"
+
+        doc.extraction_attempts += retries
+        try:
+            await session.commit()
+        except StaleDataError:
+            # The document was deleted while it was being extracted.
+            await session.rollback()
+            await delete_uploads(document_id)
+            return
+        queue.record(doc.status, retries)
+
+        if doc.status != "failed" and doc.prefill_plan_id is not None:
+            await prefill_tax_plan_from_document(session, service, doc)
+
+    await delete_uploads(document_id)
+
+
+async def prefill_tax_plan_from_document(
+    session: AsyncSession, service: DocumentExtractionService, doc: TaxDocument
+) -> None:
+    """Pre-fill the plan named at upload from an extracted document."""
+    assert doc.prefill_plan_id is not None
+    try:
+        response = await service.prefill_tax_plan(
+            user_id=doc.user_id,
+            document_ids=[doc.id],
+            plan_id=doc.prefill_plan_id,
+            label=f"Imported from {doc.original_filename}"[:200],
+        )
+    except ValueError:
+        logger.warning(
+            "Could not pre-fill tax plan %s from document %s",
+            doc.prefill_plan_id,
+            doc.id,
+            exc_info=True,
+        )
+        return
+    doc.prefill_version_id = response.version_id
+    with contextlib.suppress(StaleDataError):
+        await session.commit()
+
+
+async def recover_extraction_jobs() -> int:
+    """Re-queue unfinished jobs; fail the ones whose upload is gone."""
+    stale_before = datetime.now(timezone.utc) - timedelta(
+        minutes=settings.extraction_job_stale_minutes
+    )
+    async with async_session_factory() as session:
+        await session.execute(
+            update(TaxDocument)
+            .where(
+                TaxDocument.status == "processing",
+                TaxDocument.updated_at < stale_before,
+            )
+            .values(status="pending")
+        )
+        result = await session.execute(
+            select(TaxDocument.id).where(TaxDocument.status == "pending")
+        )
+        pending = list(result.scalars().all())
+
+        missing = [doc_id for doc_id in pending if not await upload_exists(doc_id)]
+        if missing:
+            await session.execute(
+                update(TaxDocument)
+                .where(TaxDocument.id.in_(missing), TaxDocument.status == "pending")
+                .values(
+                    status="failed",
+                    error_message="Extraction failed: upload no longer available",
+                )
+            )
+        await session.commit()
+
+    missing_ids = set(missing)
+    requeued = [doc_id for doc_id in pending if doc_id not in missing_ids]
+    for doc_id in requeued:
+        await extraction_queue.enqueue(doc_id)
+    if requeued or missing:
+        logger.info(
+            "Recovered %d extraction jobs (%d failed: upload missing)",
+            len(requeued),
+            len(missing),
+        )
+    return len(requeued)
+
+
+async def get_job_document(
+    document_id: uuid.UUID, user_id: uuid.UUID
+) -> TaxDocument | None:
+    """Load a job's document in a short-lived session of its own."""
+    async with async_session_factory() as session:
+        result = await session.execute(
+            select(TaxDocument).where(
+                TaxDocument.id == document_id,
+                TaxDocument.user_id == user_id,
+            )
+        )
+        return result.scalar_one_or_none()
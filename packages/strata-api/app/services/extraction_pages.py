@@ -0,0 +1,110 @@
+"""Page-range splitting of PDF uploads and merging of per-range results.
+
+Multi-page PDFs are extracted as several small PDFs of at most
+``extraction_pdf_pages_per_request`` pages each instead of one large
+request. Each range is written out only when its provider call starts, so at
+most ``extraction_pdf_range_concurrency`` ranges are held in memory per
+document; the source PDF is read lazily from disk.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+from collections import Counter
+from pathlib import Path
+
+from pypdf import PdfReader, PdfWriter
+from pypdf.errors import PdfReadError
+
+from app.schemas.tax_document import ExtractionResult
+
+logger = logging.getLogger(__name__)
+
+PageRange = tuple[int, int]
+
+
+def pdf_page_count(path: Path) -> int | None:
+    """Return the number of pages, or None if the file cannot be parsed."""
+    try:
+        return len(PdfReader(path).pages)
+    except (PdfReadError, ValueError, OSError):
+        logger.info("Could not read PDF page count of %s", path.name)
+        return None
+
+
+def page_ranges(page_count: int, pages_per_range: int) -> list[PageRange]:
+    """Split ``page_count`` pages into half-open ranges of at most ``pages_per_range``."""
+    size = max(1, pages_per_range)
+    return [
+        (start, min(start + size, page_count)) for start in range(0, page_count, size)
+    ]
+
+
+def read_page_range(path: Path, pages: PageRange) -> bytes:
+    """Return pages ``[start, end)`` of the PDF at ``path`` as a standalone PDF."""
+    reader = PdfReader(path)
+    writer = PdfWriter()
+    for index in range(*pages):
+        writer.add_page(reader.pages[index])
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def _label(pages: PageRange) -> str:
+    start, end = pages
+    return f"Page {start + 1}" if end - start == 1 else f"Pages {start + 1}-{end}"
+
+
+def merge_page_results(
+    results: list[tuple[PageRange, ExtractionResult]],
+) -> ExtractionResult:
+    """Combine per-range results into one result for the whole document.
+
+    The document type is the one most ranges agree on (earliest range wins a
+    tie). Fields, and the tax year, come from the first range of that type
+    that has a value. Confidence is the lowest of the contributing ranges.
+    Ranges of another type are ignored with a warning.
+    """
+    results = sorted(results, key=lambda item: item[0])
+    known = Counter(
+        result.document_type
+        for _, result in results
+        if result.document_type != "unknown"
+    )
+    if known:
+        # most_common keeps first-seen order among equal counts.
+        doc_type = known.most_common(1)[0][0]
+        matching = [(p, r) for p, r in results if r.document_type == doc_type]
+    else:
+        doc_type = "unknown"
+        matching = results
+
+    fields: dict[str, object] = {}
+    tax_year: int | None = None
+    warnings: list[str] = []
+    for pages, result in results:
+        if result.document_type not in (doc_type, "unknown"):
+            warnings.append(
+                f"{_label(pages)}: looks like a {result.document_type}, not a "
+                f"{doc_type}; ignored"
+            )
+            continue
+        warnings.extend(f"{_label(pages)}: {warning}" for warning in result.warnings)
+        if result.document_type != doc_type:
+            continue
+        if tax_year is None:
+            tax_year = result.tax_year
+        for name, value in result.fields.items():
+            if fields.get(name) is None and value is not None:
+                fields[name] = value
+
+    return ExtractionResult(
+        document_type=doc_type,
+        tax_year=tax_year,
+        fields=fields,
+        confidence=min(result.confidence for _, result in matching),
+        provider_name=results[0][1].provider_name,
+        warnings=warnings,
+    )
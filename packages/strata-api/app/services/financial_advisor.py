@@ -24,6 +24,11 @@ from app.models.memory_event import MemoryEvent, MemoryEventSource
 from app.services.action_policy import ActionPolicyService
 from app.services.agent_guardrails import evaluate_freshness
 from app.services.agent_runtime import AgentRuntime
+from app.services.compute_executor import (
+    ComputeExecutorBusyError,
+    ComputeTimeoutError,
+    compute_executor,
+)
 from app.services.context_quality import evaluate_context_quality
 from app.services.context_renderer import render_context_as_markdown
 from app.services.decision_engine import run_deterministic_checks
@@ -354,7 +359,8 @@ class FinancialAdvisor:
     ) -> AsyncGenerator[str, None]:
         """Send a message and stream the response.
 
-        Yields chunks of assistant text as they arrive.
+        Yields assistant text deltas as the model streams them, plus a
+        ``[TOOL:...]`` marker after each tool call.
         Handles tool calls internally (memory updates, recommendations).
         """
         # Load session
@@ -387,13 +393,20 @@ class FinancialAdvisor:
         while iteration < max_iterations:
             iteration += 1
 
-            response = await self._runtime.create_message(
+            # Forward text as the model produces it; tool calls are handled
+            # once the turn's assembled message arrives.
+            response: dict = {"content": [], "stop_reason": None}
+            async for event in self._runtime.stream_message(
                 model=settings.advisor_model,
                 max_tokens=settings.advisor_max_tokens,
                 system=system_prompt,
                 messages=messages,
                 tools=ADVISOR_TOOLS,
-            )
+            ):
+                if event["type"] == "text_delta":
+                    yield event["text"]
+                elif event["type"] == "message":
+                    response = event["message"]
 
             # Process response content blocks
             has_tool_use = False
@@ -408,7 +421,6 @@ class FinancialAdvisor:
                             "text": block["text"],
                         }
                     )
-                    yield block["text"]
 
                 elif block["type"] == "tool_use":
                     has_tool_use = True
@@ -599,7 +611,10 @@ class FinancialAdvisor:
             return await self._handle_get_portfolio_metrics(user_id)
 
         elif tool_name == "calculate":
-            return self._handle_calculate(tool_input)
+            try:
+                return await compute_executor.run(self._handle_calculate, tool_input)
+            except (ComputeExecutorBusyError, ComputeTimeoutError) as e:
+                return {"error": f"Calculation unavailable: {e}"}
 
         elif tool_name == "ask_user":
             return self._handle_ask_user(tool_input)
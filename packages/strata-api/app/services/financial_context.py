@@ -23,6 +23,7 @@ from app.models.physical_asset import (
 )
 from app.models.security import Security
 from app.models.transaction import Transaction
+from app.services.context_cache import get_cached_context, store_context
 from app.services.equity_valuation import equity_valuation_service
 
 
@@ -31,6 +32,21 @@ def _decimal_to_float(v: Decimal | None) -> float | None:
 
 
 async def build_financial_context(user_id: uuid.UUID, session: AsyncSession) -> dict:
+    """Return the user's financial context, served from cache when current.
+
+    The cache is keyed on the user's data version, which is bumped whenever
+    data read below changes, so repeated reads skip the ~15 queries without
+    going stale after writes.
+    """
+    version, context = await get_cached_context(session, user_id)
+    if context is not None:
+        return context
+    context = await _assemble_financial_context(user_id, session)
+    await store_context(user_id, version, context)
+    return context
+
+
+async def _assemble_financial_context(user_id: uuid.UUID, session: AsyncSession) -> dict:
     """Assemble complete financial context for agent consumption.
 
     Returns a structured dict with sections:
@@ -0,0 +1,292 @@
+"""Shared, pooled HTTP clients for outbound provider calls.
+
+Each upstream service (Alpha Vantage, Alchemy, the brokerage service, ...)
+gets one long-lived ``httpx.AsyncClient`` with its own connection pool,
+keep-alive, and timeout, so calls reuse connections instead of paying a TCP
+and TLS handshake each time. Requests go through an ``UpstreamClient``,
+which adds:
+
+* retries with jittered backoff for transient failures (transport errors,
+  408/429/5xx) on idempotent calls only: GET/HEAD/OPTIONS by default, or any
+  call made with ``idempotent=True`` (e.g. read-only JSON-RPC posts);
+* a circuit breaker that fails fast with ``UpstreamUnavailableError`` after
+  ``http_client_breaker_failure_threshold`` consecutive failures, and lets a
+  single trial request through once ``http_client_breaker_reset_seconds``
+  have passed;
+* request, retry, and pool-utilization counters for the health endpoint.
+
+Clients are created on first use and closed by the API lifespan. Like the
+extraction queue, the registry starts fresh clients when it is used from a
+different event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+import time
+from typing import Any
+
+import httpx
+
+from app.core.config import settings
+from app.services.jobs.scheduler import is_retryable_error, retry_with_backoff
+
+logger = logging.getLogger(__name__)
+
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class UpstreamUnavailableError(httpx.TransportError):
+    """The upstream's circuit is open; the request was not sent."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open trial."""
+
+    def __init__(self, failure_threshold: int, reset_seconds: float) -> None:
+        self._failure_threshold = max(1, failure_threshold)
+        self._reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self._reset_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._trial_in_flight or (
+            self._opened_at is None and self._failures >= self._failure_threshold
+        ):
+            self._opened_at = time.monotonic()
+            self.times_opened += 1
+        self._trial_in_flight = False
+
+
+def _is_failure_status(status_code: int) -> bool:
+    return status_code >= 500 or status_code in (408, 429)
+
+
+class UpstreamClient:
+    """A pooled client for one upstream, with retries and a circuit breaker."""
+
+    def __init__(
+        self, name: str, transport: httpx.AsyncBaseTransport | None = None
+    ) -> None:
+        self.name = name
+        self._timeout = settings.http_client_timeouts.get(
+            name, settings.http_client_default_timeout_seconds
+        )
+        self._max_connections = max(
+            1,
+            settings.http_client_max_connections.get(
+                name, settings.http_client_default_max_connections
+            ),
+        )
+        self._client = httpx.AsyncClient(
+            timeout=self._timeout,
+            limits=httpx.Limits(
+                max_connections=self._max_connections,
+                max_keepalive_connections=self._max_connections,
+                keepalive_expiry=settings.http_client_keepalive_expiry_seconds,
+            ),
+            http2=_http2_enabled(),
+            transport=transport,
+        )
+        self._breaker = CircuitBreaker(
+            settings.http_client_breaker_failure_threshold,
+            settings.http_client_breaker_reset_seconds,
+        )
+        self._in_flight = 0
+        self._requests = 0
+        self._failures = 0
+        self._retries = 0
+        self._rejected = 0
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        idempotent: bool | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Send a request; retry it only if it is idempotent.
+
+        Error responses are returned as usual once retries are exhausted, so
+        callers keep using ``raise_for_status``.
+        """
+        method = method.upper()
+        if idempotent is None:
+            idempotent = method in _IDEMPOTENT_METHODS
+
+        async def _attempt() -> httpx.Response:
+            response = await self._send(method, url, **kwargs)
+            if idempotent and _is_failure_status(response.status_code):
+                response.raise_for_status()
+            return response
+
+        def _on_retry(attempt: int, exc: BaseException) -> None:
+            self._retries += 1
+            logger.info(
+                "Retrying %s %s request (attempt %d): %s",
+                self.name,
+                method,
+                attempt,
+                type(exc).__name__,
+            )
+
+        try:
+            return await retry_with_backoff(
+                _attempt,
+                retries=settings.http_client_retries if idempotent else 0,
+                base_delay=settings.http_client_retry_base_seconds,
+                is_retryable=_is_retryable,
+                on_retry=_on_retry,
+            )
+        except httpx.HTTPStatusError as exc:
+            return exc.response
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def _send(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        if not self._breaker.allow():
+            self._rejected += 1
+            raise UpstreamUnavailableError(
+                f"{self.name} is unavailable (circuit open)"
+            )
+        self._requests += 1
+        self._in_flight += 1
+        try:
+            response = await self._client.request(method, url, **kwargs)
+        except httpx.TransportError:
+            self._failures += 1
+            self._breaker.record_failure()
+            raise
+        except BaseException:
+            # Cancelled or invalid request: says nothing about the upstream.
+            self._breaker.release_trial()
+            raise
+        finally:
+            self._in_flight -= 1
+        if _is_failure_status(response.status_code):
+            self._failures += 1
+            self._breaker.record_failure()
+        else:
+            self._breaker.record_success()
+        return response
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    def _pool_connections(self) -> tuple[int, int]:
+        # httpx does not expose pool state; read httpcore's pool if present.
+        pool = getattr(self._client._transport, "_pool", None)
+        connections = list(getattr(pool, "connections", []))
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return len(connections), idle
+
+    def stats(self) -> dict[str, Any]:
+        open_connections, idle_connections = self._pool_connections()
+        return {
+            "timeout_seconds": self._timeout,
+            "max_connections": self._max_connections,
+            "open_connections": open_connections,
+            "idle_connections": idle_connections,
+            "in_flight": self._in_flight,
+            "pool_utilization": round(self._in_flight / self._max_connections, 3),
+            "requests": self._requests,
+            "failures": self._failures,
+            "retries": self._retries,
+            "rejected": self._rejected,
+            "circuit": self._breaker.state,
+            "circuit_opened": self._breaker.times_opened,
+        }
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    return not isinstance(exc, UpstreamUnavailableError) and is_retryable_error(exc)
+
+
+def _http2_enabled() -> bool:
+    if not settings.http_client_http2:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.warning(
+            "STRATA_HTTP_CLIENT_HTTP2 is set but the 'h2' package is not "
+            "installed (pip install 'httpx[http2]'); using HTTP/1.1"
+        )
+        return False
+    return True
+
+
+class HttpClientRegistry:
+    """One ``UpstreamClient`` per upstream name, created on first use."""
+
+    def __init__(self) -> None:
+        self._clients: dict[str, UpstreamClient] = {}
+        self._transports: dict[str, httpx.AsyncBaseTransport] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def get(self, name: str) -> UpstreamClient:
+        # Pooled connections belong to the event loop that opened them.
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._clients = {}
+        client = self._clients.get(name)
+        if client is None:
+            client = UpstreamClient(name, self._transports.get(name))
+            self._clients[name] = client
+        return client
+
+    def use_transport(
+        self, name: str, transport: httpx.AsyncBaseTransport | None
+    ) -> None:
+        """Route an upstream through ``transport`` (e.g. a test double)."""
+        if transport is None:
+            self._transports.pop(name, None)
+        else:
+            self._transports[name] = transport
+        self._clients.pop(name, None)
+
+    async def aclose(self) -> None:
+        clients, self._clients = self._clients, {}
+        self._loop = None
+        for client in clients.values():
+            await client.aclose()
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        return {name: client.stats() for name, client in self._clients.items()}
+
+
+http_clients = HttpClientRegistry()
@@ -1,17 +1,34 @@
 import asyncio
+import contextlib
 import logging
+import time
+import uuid
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 
-from sqlalchemy import or_, select
+from sqlalchemy import and_, or_, select
 
 from app.core.config import settings
 from app.db.session import async_session_factory
 from app.models.connection import Connection, ConnectionStatus
-from app.models.crypto_wallet import CryptoWallet
+from app.models.crypto_wallet import CryptoChain, CryptoWallet
+from app.services.asset_revaluation import (
+    ValuationLookup,
+    load_due_assets,
+    plan_lookups,
+    remaining_lookup_budget,
+    write_valuations,
+)
 from app.services.banking_sync import sync_banking_connection
 from app.services.connection_sync import sync_connection_accounts
 from app.services.crypto import CryptoService
+from app.services.jobs.cadence import connection_cadence
+from app.services.jobs.leases import LeaseBackend, create_lease_backend
+from app.services.jobs.scheduler import (
+    ProviderLimiter,
+    SyncPassReport,
+    retry_with_backoff,
+)
 from app.services.portfolio_snapshots import create_daily_snapshots
 from app.services.providers.base import BaseProvider
 from app.services.providers.base_banking import BaseBankingProvider
@@ -40,53 +57,141 @@ def _is_banking_provider(provider: BaseProvider | BaseBankingProvider) -> bool:
     return isinstance(provider, BaseBankingProvider)
 
 
-async def run_connection_sync() -> None:
-    cutoff = datetime.now(timezone.utc) - timedelta(minutes=settings.sync_stale_minutes)
+async def _sync_one_connection(conn_id: uuid.UUID) -> None:
+    """Run a single sync attempt for a connection in its own session."""
+    async with async_session_factory() as session:
+        connection = await session.get(Connection, conn_id)
+        if connection is None:
+            return
+        provider = _get_provider_for_connection(connection)
+        if _is_banking_provider(provider):
+            result = await sync_banking_connection(session, connection, provider)
+        else:
+            result = await sync_connection_accounts(session, connection, provider)
+        now = datetime.now(timezone.utc)
+        cadence = connection_cadence()
+        interval = cadence.next_interval(
+            connection.sync_interval_seconds, result.changed
+        )
+        connection.status = ConnectionStatus.active
+        connection.last_synced_at = now
+        connection.sync_interval_seconds = interval
+        connection.next_sync_at = cadence.next_sync_at(now, interval)
+        connection.error_code = None
+        connection.error_message = None
+        await session.commit()
+
+
+async def _mark_connection_failed(
+    conn_id: uuid.UUID, error_code: str, exc: Exception
+) -> None:
+    # A fresh session discards any partial writes from the failed attempt.
+    async with async_session_factory() as session:
+        connection = await session.get(Connection, conn_id)
+        if connection is None:
+            return
+        connection.status = ConnectionStatus.error
+        connection.error_code = error_code
+        connection.error_message = str(exc)[:1000]
+        await session.commit()
+
+
+async def run_connection_sync() -> SyncPassReport:
+    now = datetime.now(timezone.utc)
+    cutoff = now - timedelta(minutes=settings.sync_stale_minutes)
+    report = SyncPassReport(name="connection_sync")
 
-    # Fetch stale connections in a read-only session
+    # Fetch due connections in a read-only session, unscheduled and most
+    # overdue first so a pass that runs long still covers the oldest data.
+    # Connections not yet scheduled by this job fall back to staleness.
     async with async_session_factory() as session:
         result = await session.execute(
-            select(Connection.id, Connection.provider).where(
+            select(Connection.id, Connection.provider)
+            .where(
                 Connection.status == ConnectionStatus.active,
                 or_(
-                    Connection.last_synced_at.is_(None),
-                    Connection.last_synced_at < cutoff,
+                    Connection.next_sync_at <= now,
+                    and_(
+                        Connection.next_sync_at.is_(None),
+                        or_(
+                            Connection.last_synced_at.is_(None),
+                            Connection.last_synced_at < cutoff,
+                        ),
+                    ),
                 ),
             )
+            .order_by(
+                Connection.next_sync_at.is_(None).desc(),
+                Connection.next_sync_at.asc(),
+                Connection.last_synced_at.asc(),
+            )
         )
         stale = result.all()
 
-    # Process each connection in its own session so a failure in one
-    # does not corrupt the session state for subsequent connections.
-    for conn_id, provider_name in stale:
-        async with async_session_factory() as session:
-            connection = await session.get(Connection, conn_id)
-            if connection is None:
-                continue
-            try:
-                provider = _get_provider_for_connection(connection)
-                if _is_banking_provider(provider):
-                    await sync_banking_connection(session, connection, provider)
-                else:
-                    await sync_connection_accounts(session, connection, provider)
-                connection.status = ConnectionStatus.active
-                connection.last_synced_at = datetime.now(timezone.utc)
-                connection.error_code = None
-                connection.error_message = None
-            except BrokerageServiceUnavailableError as exc:
-                logger.warning(
-                    "Brokerage sync skipped for connection %s: %s", conn_id, exc
-                )
-                connection.status = ConnectionStatus.error
-                connection.error_code = "PROVIDER_UNAVAILABLE"
-                connection.error_message = str(exc)[:1000]
-            except Exception as exc:
-                logger.warning("Sync failed for connection %s: %s", conn_id, exc)
-                connection.status = ConnectionStatus.error
-                connection.error_code = "SYNC_FAILED"
-                connection.error_message = str(exc)[:1000]
+    report.total = len(stale)
+    pass_slots = asyncio.Semaphore(max(1, settings.sync_max_concurrency))
+    limiters = {
+        provider_name: ProviderLimiter(
+            settings.sync_provider_concurrency.get(
+                provider_name, settings.sync_max_concurrency
+            ),
+            settings.sync_provider_rate_per_second.get(provider_name),
+        )
+        for provider_name in {provider_name for _, provider_name in stale}
+    }
+
+    def _on_retry(conn_id: uuid.UUID, attempt: int, exc: BaseException) -> None:
+        report.retries += 1
+        logger.info(
+            "Retrying sync for connection %s (attempt %s): %s", conn_id, attempt, exc
+        )
+
+    # Each connection syncs in its own session so a failure in one does not
+    # corrupt the session state for the others.
+    async def _run(conn_id: uuid.UUID, provider_name: str) -> None:
+        duration = 0.0
 
-            await session.commit()
+        # Slots are taken per attempt, provider first: connections queued
+        # behind a saturated provider never hold pass slots, and none are
+        # held during backoff sleeps.
+        async def _attempt() -> None:
+            nonlocal duration
+            async with limiters[provider_name].slot(), pass_slots:
+                started = time.perf_counter()
+                try:
+                    await _sync_one_connection(conn_id)
+                finally:
+                    duration += time.perf_counter() - started
+
+        ok = False
+        try:
+            await retry_with_backoff(
+                _attempt,
+                retries=settings.sync_max_retries,
+                base_delay=settings.sync_retry_base_seconds,
+                on_retry=lambda attempt, exc: _on_retry(conn_id, attempt, exc),
+            )
+            ok = True
+        except BrokerageServiceUnavailableError as exc:
+            logger.warning("Brokerage sync skipped for connection %s: %s", conn_id, exc)
+            await _mark_connection_failed(conn_id, "PROVIDER_UNAVAILABLE", exc)
+        except Exception as exc:
+            logger.warning("Sync failed for connection %s: %s", conn_id, exc)
+            await _mark_connection_failed(conn_id, "SYNC_FAILED", exc)
+        finally:
+            report.record(duration, ok)
+            logger.debug(
+                "Synced connection %s (%s) in %.2fs ok=%s",
+                conn_id,
+                provider_name,
+                duration,
+                ok,
+            )
+
+    await asyncio.gather(
+        *(_run(conn_id, provider_name) for conn_id, provider_name in stale)
+    )
+    return report.finish()
 
 
 async def run_daily_snapshots() -> None:
@@ -95,33 +200,173 @@ async def run_daily_snapshots() -> None:
         logger.info("Created %s portfolio snapshots", created)
 
 
-async def run_crypto_sync() -> None:
-    cutoff = datetime.now(timezone.utc) - timedelta(
-        minutes=settings.crypto_sync_stale_minutes
-    )
+async def _sync_wallet_batch(wallets: list[CryptoWallet]) -> int:
+    """Sync one batch of same-chain wallets in its own session."""
+    async with async_session_factory() as session:
+        synced = await CryptoService(session).sync_wallets(wallets)
+    return len(synced)
+
 
+async def run_crypto_sync() -> SyncPassReport:
+    now = datetime.now(timezone.utc)
+    report = SyncPassReport(name="crypto_sync")
+
+    # Unscheduled wallets first, then the most overdue. Wallets are loaded
+    # once and handed to the batches detached; only their id, chain,
+    # address, and sync interval are read.
     async with async_session_factory() as session:
         result = await session.execute(
-            select(CryptoWallet.id).where(
+            select(CryptoWallet)
+            .where(
                 or_(
-                    CryptoWallet.updated_at < cutoff,
-                    CryptoWallet.last_balance_usd == Decimal("0.0"),
+                    CryptoWallet.next_sync_at.is_(None),
+                    CryptoWallet.next_sync_at <= now,
                 )
             )
+            .order_by(
+                CryptoWallet.next_sync_at.is_(None).desc(),
+                CryptoWallet.next_sync_at.asc(),
+            )
         )
-        stale_wallet_ids = result.scalars().all()
+        stale = list(result.scalars())
 
-    for wallet_id in stale_wallet_ids:
-        async with async_session_factory() as session:
-            wallet = await session.get(CryptoWallet, wallet_id)
-            if not wallet:
-                continue
+    report.total = len(stale)
+    by_chain: dict[CryptoChain, list[CryptoWallet]] = {}
+    for wallet in stale:
+        by_chain.setdefault(wallet.chain, []).append(wallet)
+
+    batch_size = max(1, settings.crypto_sync_batch_size)
+    batches = [
+        (chain, wallets[i : i + batch_size])
+        for chain, wallets in by_chain.items()
+        for i in range(0, len(wallets), batch_size)
+    ]
+    pass_slots = asyncio.Semaphore(max(1, settings.crypto_sync_max_concurrency))
+    limiters = {
+        chain: ProviderLimiter(settings.crypto_sync_chain_concurrency)
+        for chain in by_chain
+    }
+
+    def _on_retry(chain: CryptoChain, attempt: int, exc: BaseException) -> None:
+        report.retries += 1
+        logger.info(
+            "Retrying crypto sync batch on %s (attempt %s): %s", chain, attempt, exc
+        )
+
+    async def _run(chain: CryptoChain, wallets: list[CryptoWallet]) -> None:
+        duration = 0.0
+
+        # As in run_connection_sync: chain limiter first, then a pass slot,
+        # both released before any backoff sleep.
+        async def _attempt() -> int:
+            nonlocal duration
+            async with limiters[chain].slot(), pass_slots:
+                started = time.perf_counter()
+                try:
+                    return await _sync_wallet_batch(wallets)
+                finally:
+                    duration += time.perf_counter() - started
+
+        synced = 0
+        try:
+            synced = await retry_with_backoff(
+                _attempt,
+                retries=settings.sync_max_retries,
+                base_delay=settings.sync_retry_base_seconds,
+                on_retry=lambda attempt, exc: _on_retry(chain, attempt, exc),
+            )
+        except Exception as exc:
+            logger.warning(
+                "Crypto sync failed for %s wallets on %s: %s",
+                len(wallets),
+                chain,
+                exc,
+            )
+        finally:
+            # Wallets whose lookup failed keep their last balance and
+            # count as failed; sync_wallets backs off their next sync.
+            for index in range(len(wallets)):
+                report.record(duration, index < synced)
+            logger.debug(
+                "Synced %s/%s wallets on %s in %.2fs",
+                synced,
+                len(wallets),
+                chain,
+                duration,
+            )
+
+    await asyncio.gather(*(_run(chain, wallets) for chain, wallets in batches))
+    return report.finish()
+
+
+async def run_asset_revaluation() -> SyncPassReport:
+    report = SyncPassReport(name="asset_revaluation")
+
+    # Assets are loaded once and handed to the lookups detached; the
+    # provider calls run outside any session.
+    async with async_session_factory() as session:
+        due = await load_due_assets(session)
+        remaining = await remaining_lookup_budget(session)
+    lookups, deferred = plan_lookups(due, remaining)
+    if deferred:
+        logger.info(
+            "Deferred revaluation of %s assets (daily provider quota)",
+            len(deferred),
+        )
+
+    report.total = sum(len(lookup.assets) for lookup in lookups)
+    limiters = {
+        provider: ProviderLimiter(
+            settings.asset_revaluation_provider_concurrency.get(provider, 1),
+            settings.asset_revaluation_provider_rate_per_second.get(provider),
+        )
+        for provider in {lookup.provider for lookup in lookups}
+    }
+
+    async def _run(lookup: ValuationLookup) -> Decimal | None:
+        async with limiters[lookup.provider].slot():
+            started = time.perf_counter()
+            value = None
             try:
-                crypto_service = CryptoService(session)
-                await crypto_service.sync_wallet(wallet)
-                logger.info("Synced crypto wallet %s", wallet_id)
+                value = await lookup.fetch()
             except Exception as exc:
-                logger.warning("Failed to sync crypto wallet %s: %s", wallet_id, exc)
+                logger.warning(
+                    "Revaluation lookup %s on %s failed: %s",
+                    lookup.key,
+                    lookup.provider,
+                    exc,
+                )
+            finally:
+                # Assets without a value keep their last valuation and are
+                # retried after asset_revaluation_retry_seconds.
+                duration = time.perf_counter() - started
+                for _ in lookup.assets:
+                    report.record(duration, value is not None)
+            return value
+
+    results = await asyncio.gather(*(_run(lookup) for lookup in lookups))
+    if lookups:
+        async with async_session_factory() as session:
+            changed = await write_valuations(session, list(zip(lookups, results)))
+        logger.info(
+            "Revalued %s assets with %s lookups; %s values changed",
+            report.succeeded,
+            len(lookups),
+            changed,
+        )
+    return report.finish()
+
+
+async def _hold_lease(leases: LeaseBackend, name: str, ttl_seconds: float) -> None:
+    """Keep renewing a lease while its task runs so no other worker starts it."""
+    while True:
+        await asyncio.sleep(max(ttl_seconds / 3, 1.0))
+        try:
+            if not await leases.acquire(name, ttl_seconds):
+                logger.warning("Lost lease for background task %s", name)
+                return
+        except Exception as exc:
+            logger.warning("Failed to renew lease for %s: %s", name, exc)
 
 
 async def _run_periodic_task(
@@ -129,10 +374,27 @@ async def _run_periodic_task(
     interval_seconds: int,
     task_fn,
     stop_event: asyncio.Event,
+    leases: LeaseBackend | None = None,
 ) -> None:
     while not stop_event.is_set():
         try:
-            await task_fn()
+            # The lease lasts one interval, so whichever worker takes it runs
+            # the task and every other worker skips until it expires.
+            if leases is None or await leases.acquire(name, interval_seconds):
+                heartbeat = (
+                    asyncio.create_task(_hold_lease(leases, name, interval_seconds))
+                    if leases is not None
+                    else None
+                )
+                try:
+                    await task_fn()
+                finally:
+                    if heartbeat is not None:
+                        heartbeat.cancel()
+                        with contextlib.suppress(asyncio.CancelledError):
+                            await heartbeat
+            else:
+                logger.debug("Skipping %s; lease held by another worker", name)
         except Exception as exc:
             logger.exception("Background task %s failed: %s", name, exc)
 
@@ -142,32 +404,41 @@ async def _run_periodic_task(
             continue
 
 
+_lease_backend: LeaseBackend | None = None
+
+
 async def start_background_tasks() -> tuple[asyncio.Event, list[asyncio.Task]]:
+    global _lease_backend
+    _lease_backend = create_lease_backend(settings.redis_url, async_session_factory)
     stop_event = asyncio.Event()
-    tasks = [
-        asyncio.create_task(
-            _run_periodic_task(
-                "connection_sync",
-                settings.sync_interval_seconds,
-                run_connection_sync,
-                stop_event,
-            )
-        ),
-        asyncio.create_task(
-            _run_periodic_task(
-                "crypto_sync",
-                settings.crypto_sync_interval_seconds,
-                run_crypto_sync,
-                stop_event,
-            )
+    periodic = [
+        ("connection_sync", settings.sync_interval_seconds, run_connection_sync),
+        ("crypto_sync", settings.crypto_sync_interval_seconds, run_crypto_sync),
+        (
+            "asset_revaluation",
+            settings.asset_revaluation_interval_seconds,
+            run_asset_revaluation,
         ),
+        ("portfolio_snapshots", settings.snapshot_interval_seconds, run_daily_snapshots),
+    ]
+    tasks = [
         asyncio.create_task(
-            _run_periodic_task(
-                "portfolio_snapshots",
-                settings.snapshot_interval_seconds,
-                run_daily_snapshots,
-                stop_event,
-            )
-        ),
+            _run_periodic_task(name, interval, task_fn, stop_event, _lease_backend)
+        )
+        for name, interval, task_fn in periodic
     ]
     return stop_event, tasks
+
+
+async def stop_background_tasks(
+    stop_event: asyncio.Event, tasks: list[asyncio.Task]
+) -> None:
+    global _lease_backend
+    stop_event.set()
+    for task in tasks:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    if _lease_backend is not None:
+        await _lease_backend.close()
+        _lease_backend = None
@@ -0,0 +1,104 @@
+"""Adaptive sync cadence for connections and crypto wallets.
+
+Each connection and wallet stores its own ``sync_interval_seconds`` and the
+``next_sync_at`` it is due. A sync that finds changes halves the interval; a
+sync that finds nothing multiplies it by ``sync_backoff_factor``, within
+per-kind bounds. Background passes select only rows whose ``next_sync_at``
+has passed, so dormant accounts are polled rarely and busy ones often.
+
+When a user is active, their connections and wallets are pulled in to be
+due within ``sync_active_user_seconds``, so backing off never leaves an
+active user looking at stale data for long.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.connection import Connection, ConnectionStatus
+from app.models.crypto_wallet import CryptoWallet
+
+# Spread entities synced in the same pass so they do not stay in lockstep.
+_JITTER = 0.1
+
+
+@dataclass(frozen=True)
+class Cadence:
+    initial_seconds: int
+    min_seconds: int
+    max_seconds: int
+
+    def next_interval(self, current: int | None, changed: bool) -> int:
+        """Return the interval to wait after a sync that did or did not change data."""
+        if current is None:
+            interval = self.initial_seconds
+        elif changed:
+            interval = current // 2
+        else:
+            interval = int(current * max(settings.sync_backoff_factor, 1.0))
+        return max(self.min_seconds, min(self.max_seconds, interval))
+
+    def next_sync_at(self, synced_at: datetime, interval: int) -> datetime:
+        jitter = random.uniform(1 - _JITTER, 1 + _JITTER)
+        return synced_at + timedelta(seconds=interval * jitter)
+
+
+def connection_cadence() -> Cadence:
+    return Cadence(
+        initial_seconds=settings.sync_stale_minutes * 60,
+        min_seconds=settings.sync_min_interval_seconds,
+        max_seconds=settings.sync_max_interval_seconds,
+    )
+
+
+def wallet_cadence() -> Cadence:
+    return Cadence(
+        initial_seconds=settings.crypto_sync_stale_minutes * 60,
+        min_seconds=settings.crypto_sync_min_interval_seconds,
+        max_seconds=settings.crypto_sync_max_interval_seconds,
+    )
+
+
+# user id → monotonic time of the last pull-in by this worker.
+_recent_pull_ins: dict[uuid.UUID, float] = {}
+
+
+async def pull_in_user_syncs(session: AsyncSession, user_id: uuid.UUID) -> None:
+    """Make the user's connections and wallets due within the active window.
+
+    Called on dashboard reads. Repeated calls within a third of the window
+    are skipped, so a busy user costs at most a few updates per window.
+    """
+    window = settings.sync_active_user_seconds
+    now_monotonic = time.monotonic()
+    last = _recent_pull_ins.get(user_id)
+    if last is not None and now_monotonic - last < window / 3:
+        return
+    if len(_recent_pull_ins) > 10_000:
+        _recent_pull_ins.clear()
+    _recent_pull_ins[user_id] = now_monotonic
+
+    due_by = datetime.now(timezone.utc) + timedelta(seconds=window)
+    await session.execute(
+        update(Connection)
+        .where(
+            Connection.user_id == user_id,
+            Connection.status == ConnectionStatus.active,
+            Connection.next_sync_at > due_by,
+        )
+        .values(next_sync_at=due_by)
+    )
+    await session.execute(
+        update(CryptoWallet)
+        .where(CryptoWallet.user_id == user_id, CryptoWallet.next_sync_at > due_by)
+        .values(next_sync_at=due_by)
+    )
+    await session.commit()
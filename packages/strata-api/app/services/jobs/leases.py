@@ -0,0 +1,152 @@
+"""Lease-based coordination so each periodic job runs once across workers.
+
+Uses Redis when STRATA_REDIS_URL is configured and falls back to a row in the
+``job_leases`` table otherwise. A worker that acquires a lease keeps it until
+it expires; the same holder may renew it on its next tick.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.job_lease import JobLease
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # pragma: no cover
+    aioredis = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+_ACQUIRE_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+if not current then
+    redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2])
+    return 1
+end
+if current == ARGV[1] then
+    redis.call('PEXPIRE', KEYS[1], ARGV[2])
+    return 1
+end
+return 0
+"""
+
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def default_holder_id() -> str:
+    """Identify this worker process across hosts."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class LeaseBackend(ABC):
+    def __init__(self, holder: str | None = None) -> None:
+        self.holder = holder or default_holder_id()
+
+    @abstractmethod
+    async def acquire(self, name: str, ttl_seconds: float) -> bool:
+        """Take or renew the named lease. Returns False if another holder owns it."""
+
+    @abstractmethod
+    async def release(self, name: str) -> None: ...
+
+    @abstractmethod
+    async def close(self) -> None: ...
+
+
+class RedisLeaseBackend(LeaseBackend):
+    def __init__(self, redis_url: str, holder: str | None = None) -> None:
+        super().__init__(holder)
+        if aioredis is None:
+            raise ImportError(
+                "redis package is required for RedisLeaseBackend: pip install redis[hiredis]"
+            )
+        self._redis = aioredis.from_url(redis_url, decode_responses=True)
+
+    async def acquire(self, name: str, ttl_seconds: float) -> bool:
+        acquired = await self._redis.eval(
+            _ACQUIRE_SCRIPT, 1, f"lease:{name}", self.holder, int(ttl_seconds * 1000)
+        )
+        return bool(acquired)
+
+    async def release(self, name: str) -> None:
+        await self._redis.eval(_RELEASE_SCRIPT, 1, f"lease:{name}", self.holder)
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+class DatabaseLeaseBackend(LeaseBackend):
+    """Lease rows updated with a compare-and-set so only one holder wins."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        holder: str | None = None,
+    ) -> None:
+        super().__init__(holder)
+        self._session_factory = session_factory
+
+    async def acquire(self, name: str, ttl_seconds: float) -> bool:
+        now = datetime.now(timezone.utc)
+        expires_at = now + timedelta(seconds=ttl_seconds)
+
+        async with self._session_factory() as session:
+            result = await session.execute(
+                update(JobLease)
+                .where(
+                    JobLease.name == name,
+                    (JobLease.expires_at <= now) | (JobLease.holder == self.holder),
+                )
+                .values(holder=self.holder, expires_at=expires_at)
+            )
+            if result.rowcount:
+                await session.commit()
+                return True
+
+            session.add(JobLease(name=name, holder=self.holder, expires_at=expires_at))
+            try:
+                await session.commit()
+            except IntegrityError:
+                # The row exists and is held by another worker.
+                await session.rollback()
+                return False
+            return True
+
+    async def release(self, name: str) -> None:
+        async with self._session_factory() as session:
+            await session.execute(
+                delete(JobLease).where(
+                    JobLease.name == name, JobLease.holder == self.holder
+                )
+            )
+            await session.commit()
+
+    async def close(self) -> None:
+        return None
+
+
+def create_lease_backend(
+    redis_url: str,
+    session_factory: async_sessionmaker[AsyncSession],
+) -> LeaseBackend:
+    """Factory: returns a Redis lease backend if URL is set, else database-backed."""
+    if redis_url:
+        logger.info("Using Redis job leases")
+        return RedisLeaseBackend(redis_url)
+    logger.info("Using database job leases")
+    return DatabaseLeaseBackend(session_factory)
@@ -0,0 +1,138 @@
+"""Concurrency, pacing, and retry primitives for background sync passes."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class ProviderLimiter:
+    """Caps concurrent calls to one provider and spaces out their start times.
+
+    ``rate_per_second`` is enforced by reserving evenly spaced start slots, so
+    a burst of waiting jobs is released at the configured rate rather than
+    all at once.
+    """
+
+    def __init__(self, concurrency: int, rate_per_second: float | None = None) -> None:
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._min_interval = 1.0 / rate_per_second if rate_per_second else 0.0
+        self._next_start = 0.0
+        self._lock = asyncio.Lock()
+
+    async def _pace(self) -> None:
+        if not self._min_interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_start)
+            self._next_start = start_at + self._min_interval
+        delay = start_at - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        async with self._semaphore:
+            await self._pace()
+            yield
+
+
+def is_retryable_error(exc: BaseException) -> bool:
+    """Return True for transient provider or network failures."""
+    if isinstance(exc, (httpx.TransportError, TimeoutError, ConnectionError)):
+        return True
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in _RETRYABLE_STATUS_CODES
+    # Plaid's ApiException and similar SDK errors expose an HTTP status;
+    # the LLM SDKs (Anthropic, OpenAI) call it ``status_code``.
+    for attr in ("status", "status_code"):
+        status = getattr(exc, attr, None)
+        if isinstance(status, int) and status in _RETRYABLE_STATUS_CODES:
+            return True
+    return False
+
+
+async def retry_with_backoff(
+    fn: Callable[[], Awaitable[T]],
+    *,
+    retries: int,
+    base_delay: float,
+    max_delay: float = 30.0,
+    is_retryable: Callable[[BaseException], bool] = is_retryable_error,
+    on_retry: Callable[[int, BaseException], None] | None = None,
+) -> T:
+    """Call ``fn`` and retry transient failures with full-jitter backoff."""
+    attempt = 0
+    while True:
+        try:
+            return await fn()
+        except Exception as exc:
+            if attempt >= retries or not is_retryable(exc):
+                raise
+            attempt += 1
+            if on_retry is not None:
+                on_retry(attempt, exc)
+            delay = random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1)))
+            await asyncio.sleep(delay)
+
+
+@dataclass
+class SyncPassReport:
+    """Outcome and timing of one background sync pass."""
+
+    name: str
+    total: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    retries: int = 0
+    durations: list[float] = field(default_factory=list)
+    started_at: float = field(default_factory=time.perf_counter)
+    finished_at: float | None = None
+
+    def record(self, duration: float, ok: bool) -> None:
+        self.durations.append(duration)
+        if ok:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+
+    def finish(self) -> "SyncPassReport":
+        self.finished_at = time.perf_counter()
+        logger.info("Sync pass %s finished: %s", self.name, self.summary())
+        return self
+
+    def summary(self) -> dict[str, Any]:
+        durations = sorted(self.durations)
+
+        def _pct(p: float) -> float:
+            if not durations:
+                return 0.0
+            index = min(len(durations) - 1, int(round(p * (len(durations) - 1))))
+            return round(durations[index], 3)
+
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        return {
+            "total": self.total,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "retries": self.retries,
+            "wall_seconds": round(end - self.started_at, 3),
+            "p50_seconds": _pct(0.5),
+            "p95_seconds": _pct(0.95),
+            "max_seconds": round(durations[-1], 3) if durations else 0.0,
+        }
@@ -0,0 +1,476 @@
+"""Market prices for stocks, crypto, and precious metals.
+
+Every price read goes through ``market_price_service``, which keeps upstream
+calls flat as workers and users grow:
+
+* ``get_prices`` reads a whole batch of symbols from the cache in one round
+  trip and fetches only the misses, concurrently.
+* Concurrent misses for the same symbol share one upstream call
+  (single-flight), so a cold symbol never causes a stampede.
+* Prices are cached in-process and, when ``STRATA_REDIS_URL`` is set, in
+  Redis, shared by all workers. A price older than
+  ``market_price_fresh_seconds`` is still served while one worker refreshes
+  it in the background; it expires after ``market_price_stale_seconds``.
+* Upstream calls take a token from a bucket sized to the provider's quota
+  (shared through Redis when configured). A miss waits briefly for a token;
+  a background refresh skips if none is free.
+
+When no price can be fetched, the provider's mock price is returned as
+before, but it is never cached.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Literal
+
+from app.core.config import settings
+from app.services.providers.metal_price import metal_price_service
+from app.services.providers.stock_price import stock_price_service
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # pragma: no cover
+    aioredis = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+PriceKind = Literal["stock", "crypto", "metal"]
+
+# How long one worker holds the right to refresh a stale price.
+_REFRESH_LOCK_SECONDS = 30
+
+
+@dataclass(frozen=True)
+class CachedPrice:
+    price: Decimal
+    fetched_at: float  # Unix time, comparable across workers
+
+
+@dataclass(frozen=True)
+class _PriceSource:
+    is_configured: Callable[[], bool]
+    fetch: Callable[[str], Awaitable[Decimal | None]]
+    fallback: Callable[[str], Decimal]
+
+
+def _check_metal(metal: str) -> str:
+    if not metal_price_service.supports(metal):
+        raise ValueError(f"Unsupported metal: {metal}")
+    return metal.lower()
+
+
+# Looked up on each call so the provider singletons can be swapped in tests.
+_SOURCES: dict[str, _PriceSource] = {
+    "stock": _PriceSource(
+        is_configured=lambda: stock_price_service.is_configured,
+        fetch=lambda symbol: stock_price_service.fetch_price(symbol),
+        fallback=lambda _symbol: stock_price_service.MOCK_STOCK_PRICE,
+    ),
+    "crypto": _PriceSource(
+        is_configured=lambda: stock_price_service.is_configured,
+        fetch=lambda symbol: stock_price_service.fetch_crypto_price(symbol),
+        fallback=lambda symbol: stock_price_service.mock_crypto_price(symbol),
+    ),
+    "metal": _PriceSource(
+        is_configured=lambda: metal_price_service.is_configured,
+        fetch=lambda metal: metal_price_service.fetch_spot_price(metal),
+        fallback=lambda metal: metal_price_service.mock_price(metal),
+    ),
+}
+
+
+class TokenBucket:
+    """Client-side rate limit: ``burst`` tokens, refilled at a steady rate."""
+
+    def __init__(self, rate_per_minute: float, burst: int) -> None:
+        self._rate = max(rate_per_minute, 0.001) / 60.0
+        self._burst = max(1, burst)
+        self._tokens = float(self._burst)
+        self._updated = time.monotonic()
+
+    async def try_acquire(self) -> bool:
+        now = time.monotonic()
+        self._tokens = min(
+            self._burst, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    async def acquire(self, timeout: float) -> bool:
+        """Wait up to ``timeout`` seconds for a token."""
+        deadline = time.monotonic() + timeout
+        while not await self.try_acquire():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            await asyncio.sleep(min(remaining, 1.0 / self._rate))
+        return True
+
+    async def close(self) -> None:
+        pass
+
+
+# Refill and take one token atomically; returns 1 if a token was taken.
+_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local taken = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+  taken = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return taken
+"""
+
+
+class RedisTokenBucket(TokenBucket):
+    """Token bucket shared by every worker through Redis."""
+
+    def __init__(
+        self, redis_url: str, key: str, rate_per_minute: float, burst: int
+    ) -> None:
+        if aioredis is None:
+            raise ImportError(
+                "redis package is required for RedisTokenBucket: pip install redis[hiredis]"
+            )
+        super().__init__(rate_per_minute, burst)
+        self._redis = aioredis.from_url(redis_url)
+        self._key = key
+        self._script = self._redis.register_script(_TOKEN_BUCKET_SCRIPT)
+
+    async def try_acquire(self) -> bool:
+        try:
+            taken = await self._script(
+                keys=[self._key], args=[self._rate, self._burst, time.time()]
+            )
+        except Exception:
+            logger.warning("Shared price rate limit unavailable", exc_info=True)
+            return await super().try_acquire()
+        return bool(taken)
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+class PriceStore(ABC):
+    @abstractmethod
+    async def get_many(self, keys: list[str]) -> dict[str, CachedPrice]: ...
+
+    @abstractmethod
+    async def set(self, key: str, entry: CachedPrice) -> None: ...
+
+    async def try_lock(self, key: str, ttl_seconds: int) -> bool:
+        """Claim the background refresh of ``key`` across workers."""
+        return True
+
+    @abstractmethod
+    async def close(self) -> None: ...
+
+
+class InMemoryPriceStore(PriceStore):
+    """LRU of prices, dropping entries older than the stale limit."""
+
+    def __init__(self, max_entries: int, max_age_seconds: float) -> None:
+        self._max_entries = max_entries
+        self._max_age_seconds = max_age_seconds
+        self._entries: OrderedDict[str, CachedPrice] = OrderedDict()
+
+    async def get_many(self, keys: list[str]) -> dict[str, CachedPrice]:
+        now = time.time()
+        found: dict[str, CachedPrice] = {}
+        for key in keys:
+            entry = self._entries.get(key)
+            if entry is None:
+                continue
+            if now - entry.fetched_at > self._max_age_seconds:
+                del self._entries[key]
+                continue
+            self._entries.move_to_end(key)
+            found[key] = entry
+        return found
+
+    async def set(self, key: str, entry: CachedPrice) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def close(self) -> None:
+        self._entries.clear()
+
+
+class RedisPriceStore(PriceStore):
+    """Prices shared across workers in Redis, fronted by a local LRU."""
+
+    def __init__(self, redis_url: str, local: InMemoryPriceStore) -> None:
+        if aioredis is None:
+            raise ImportError(
+                "redis package is required for RedisPriceStore: pip install redis[hiredis]"
+            )
+        self._redis = aioredis.from_url(redis_url)
+        self._local = local
+        self._ttl_seconds = max(1, int(settings.market_price_stale_seconds))
+
+    @staticmethod
+    def _key(key: str) -> str:
+        return f"market_price:{key}"
+
+    async def get_many(self, keys: list[str]) -> dict[str, CachedPrice]:
+        found = await self._local.get_many(keys)
+        # Only fresh local entries are final; stale ones may have been
+        # refreshed by another worker.
+        now = time.time()
+        remote_keys = [
+            key
+            for key in keys
+            if key not in found
+            or now - found[key].fetched_at >= settings.market_price_fresh_seconds
+        ]
+        if not remote_keys:
+            return found
+        try:
+            raw_values = await self._redis.mget([self._key(k) for k in remote_keys])
+        except Exception:
+            logger.warning("Market price cache read failed", exc_info=True)
+            return found
+        for key, raw in zip(remote_keys, raw_values, strict=True):
+            if raw is None:
+                continue
+            data = json.loads(raw)
+            entry = CachedPrice(Decimal(data["price"]), float(data["fetched_at"]))
+            current = found.get(key)
+            if current is None or entry.fetched_at > current.fetched_at:
+                found[key] = entry
+                await self._local.set(key, entry)
+        return found
+
+    async def set(self, key: str, entry: CachedPrice) -> None:
+        await self._local.set(key, entry)
+        try:
+            await self._redis.set(
+                self._key(key),
+                json.dumps({"price": str(entry.price), "fetched_at": entry.fetched_at}),
+                ex=self._ttl_seconds,
+            )
+        except Exception:
+            logger.warning("Market price cache write failed", exc_info=True)
+
+    async def try_lock(self, key: str, ttl_seconds: int) -> bool:
+        try:
+            return bool(
+                await self._redis.set(
+                    f"market_price_refresh:{key}", "1", nx=True, ex=ttl_seconds
+                )
+            )
+        except Exception:
+            return True
+
+    async def close(self) -> None:
+        await self._local.close()
+        await self._redis.aclose()
+
+
+class MarketPriceService:
+    """Batched, coalesced, cached price reads; see the module docstring."""
+
+    def __init__(self) -> None:
+        self._store: PriceStore | None = None
+        self._bucket: TokenBucket | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._inflight: dict[str, asyncio.Task[Decimal | None]] = {}
+
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._upstream_calls = 0
+        self._upstream_failures = 0
+        self._throttled = 0
+
+    def _ensure_started(self) -> None:
+        # Tasks belong to one event loop; start over if used from another.
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._inflight = {}
+            self._store = None
+            self._bucket = None
+        if self._store is None:
+            local = InMemoryPriceStore(
+                max_entries=settings.market_price_max_local_entries,
+                max_age_seconds=settings.market_price_stale_seconds,
+            )
+            self._store = (
+                RedisPriceStore(settings.redis_url, local)
+                if settings.redis_url
+                else local
+            )
+        if self._bucket is None:
+            rate = settings.market_price_upstream_rate_per_minute
+            burst = settings.market_price_upstream_burst
+            self._bucket = (
+                RedisTokenBucket(
+                    settings.redis_url, "market_price_quota:alpha_vantage", rate, burst
+                )
+                if settings.redis_url
+                else TokenBucket(rate, burst)
+            )
+
+    async def get_price(self, symbol: str, kind: PriceKind = "stock") -> Decimal:
+        prices = await self.get_prices([symbol], kind)
+        return next(iter(prices.values()))
+
+    async def get_prices(
+        self, symbols: Iterable[str], kind: PriceKind = "stock"
+    ) -> dict[str, Decimal]:
+        """Return a price for every symbol, keyed by the symbol as given."""
+        source = _SOURCES[kind]
+        requested = list(dict.fromkeys(symbols))
+        normalized = {
+            symbol: _check_metal(symbol) if kind == "metal" else symbol.upper()
+            for symbol in requested
+        }
+        if not source.is_configured():
+            logger.warning("Market price API key not set, using mock %s prices", kind)
+            return {symbol: source.fallback(normalized[symbol]) for symbol in requested}
+
+        self._ensure_started()
+        assert self._store is not None
+        unique = list(dict.fromkeys(normalized.values()))
+        keys = {symbol: f"{kind}:{symbol}" for symbol in unique}
+        cached = await self._store.get_many(list(keys.values()))
+
+        now = time.time()
+        prices: dict[str, Decimal] = {}
+        missing: list[str] = []
+        for symbol, key in keys.items():
+            entry = cached.get(key)
+            if entry is None:
+                self._misses += 1
+                missing.append(symbol)
+                continue
+            prices[symbol] = entry.price
+            if now - entry.fetched_at < settings.market_price_fresh_seconds:
+                self._hits += 1
+            else:
+                self._stale_hits += 1
+                self._refresh_in_background(kind, symbol)
+
+        if missing:
+            fetched = await asyncio.gather(
+                *(self._load(kind, symbol) for symbol in missing)
+            )
+            for symbol, price in zip(missing, fetched, strict=True):
+                prices[symbol] = price if price is not None else source.fallback(symbol)
+
+        return {symbol: prices[normalized[symbol]] for symbol in requested}
+
+    def _start_fetch(
+        self, kind: str, symbol: str, *, wait: float, claim: bool
+    ) -> asyncio.Task[Decimal | None]:
+        key = f"{kind}:{symbol}"
+        task = self._inflight.get(key)
+        if task is not None:
+            self._coalesced += 1
+            return task
+        task = asyncio.get_running_loop().create_task(
+            self._fetch(kind, symbol, wait=wait, claim=claim),
+            name=f"market-price-{key}",
+        )
+        self._inflight[key] = task
+
+        def _done(finished: asyncio.Task[Decimal | None]) -> None:
+            if self._inflight.get(key) is finished:
+                del self._inflight[key]
+
+        task.add_done_callback(_done)
+        return task
+
+    async def _load(self, kind: str, symbol: str) -> Decimal | None:
+        task = self._start_fetch(
+            kind,
+            symbol,
+            wait=settings.market_price_rate_limit_wait_seconds,
+            claim=False,
+        )
+        # Shielded so a cancelled caller does not cancel the shared fetch.
+        return await asyncio.shield(task)
+
+    def _refresh_in_background(self, kind: str, symbol: str) -> None:
+        self._start_fetch(kind, symbol, wait=0.0, claim=True)
+
+    async def _fetch(
+        self, kind: str, symbol: str, *, wait: float, claim: bool
+    ) -> Decimal | None:
+        assert self._store is not None and self._bucket is not None
+        key = f"{kind}:{symbol}"
+        if claim and not await self._store.try_lock(key, _REFRESH_LOCK_SECONDS):
+            return None  # Another worker is refreshing it.
+        if not await self._bucket.acquire(wait):
+            self._throttled += 1
+            logger.info("Market price quota exhausted; not fetching %s", key)
+            return None
+
+        self._upstream_calls += 1
+        try:
+            price = await _SOURCES[kind].fetch(symbol)
+        except Exception as e:
+            self._upstream_failures += 1
+            logger.error("Error fetching %s price for %s: %s", kind, symbol, str(e))
+            return None
+        if price is None:
+            self._upstream_failures += 1
+            return None
+        await self._store.set(key, CachedPrice(price, time.time()))
+        return price
+
+    async def close(self) -> None:
+        tasks, self._inflight = list(self._inflight.values()), {}
+        for task in tasks:
+            task.cancel()
+        if self._loop is asyncio.get_running_loop():
+            for task in tasks:
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        store, self._store = self._store, None
+        bucket, self._bucket = self._bucket, None
+        if store is not None:
+            await store.close()
+        if bucket is not None:
+            await bucket.close()
+        self._loop = None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "hits": self._hits,
+            "stale_hits": self._stale_hits,
+            "misses": self._misses,
+            "coalesced": self._coalesced,
+            "refreshing": len(self._inflight),
+            "upstream_calls": self._upstream_calls,
+            "upstream_failures": self._upstream_failures,
+            "throttled": self._throttled,
+        }
+
+
+market_price_service = MarketPriceService()
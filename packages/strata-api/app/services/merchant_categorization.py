@@ -1,6 +1,14 @@
+import asyncio
 import logging
+import re
+import uuid
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.db.upsert import dialect_insert
+from app.models.merchant_category import MerchantCategory, MerchantCategoryVote
 from app.services.agent_runtime import AgentRuntime
 
 logger = logging.getLogger(__name__)
@@ -34,82 +42,355 @@ Each object must have the following keys:
 - "category": One of the exact standardized categories.
 """
 
+BATCH_SIZE = 50
+MAX_KEY_LENGTH = 100
+
+# Descriptions that can name a person; these are never shared across users.
+_PERSONAL_PATTERN = re.compile(
+    r"\b(ZELLE|VENMO|CASH ?APP|P2P|XFER|WIRE|TRANSFER (TO|FROM)|PAYMENT (TO|FROM)"
+    r"|CHECK|DEPOSIT|PAYROLL|DIRECT DEP)\b"
+)
+# Card processor prefixes such as "SQ *", "TST* " and "PAYPAL *".
+_PROCESSOR_PREFIX = re.compile(r"^(SQ|TST|SP|PY|PP|PAYPAL|IN|CKE|DD|LS|GOOGLE|APL)\s?\*\s?")
+# Reference codes after an asterisk, as in "AMZN MKTP US*2K3AB".
+_STAR_SUFFIX = re.compile(r"\*\S*")
+_NOISE_WORDS = {
+    "POS", "DEBIT", "PURCHASE", "CHECKCARD", "CARD", "RECURRING", "VISA", "ACH",
+}
+_US_STATES = {
+    "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "DC", "FL", "GA", "HI", "ID",
+    "IL", "IN", "IA", "KS", "KY", "LA", "ME", "MD", "MA", "MI", "MN", "MS", "MO",
+    "MT", "NE", "NV", "NH", "NJ", "NM", "NY", "NC", "ND", "OH", "OK", "OR", "PA",
+    "RI", "SC", "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY",
+}
+
+
+def normalize_merchant_key(raw_name: str) -> str | None:
+    """Reduce a raw transaction description to a merchant key.
+
+    Store numbers, reference codes, processor prefixes, and trailing state
+    codes are stripped so that "STARBUCKS #1234" and "STARBUCKS #998" share a
+    key. Returns None for person-to-person and payroll descriptions, which may
+    contain names and must not be shared across users.
+    """
+    name = raw_name.upper().strip()
+    if not name or _PERSONAL_PATTERN.search(name):
+        return None
+
+    name = _PROCESSOR_PREFIX.sub("", name)
+    name = _STAR_SUFFIX.sub(" ", name)
+    name = re.sub(r"[^A-Z0-9&' ]+", " ", name)
+    tokens = [
+        token
+        for token in name.split()
+        if token not in _NOISE_WORDS and not any(ch.isdigit() for ch in token)
+    ]
+    if len(tokens) > 1 and tokens[-1] in _US_STATES:
+        tokens.pop()
+
+    key = " ".join(tokens)[:MAX_KEY_LENGTH].strip()
+    return key if len(key) >= 2 else None
+
+
+async def lookup_merchant_categories(
+    session: AsyncSession, merchant_keys: set[str]
+) -> dict[str, MerchantCategory]:
+    if not merchant_keys:
+        return {}
+    result = await session.execute(
+        select(MerchantCategory).where(MerchantCategory.merchant_key.in_(merchant_keys))
+    )
+    return {row.merchant_key: row for row in result.scalars()}
+
+
+async def store_merchant_categories(
+    session: AsyncSession,
+    entries: dict[str, dict[str, str]],
+    *,
+    source: str = "llm",
+) -> None:
+    """Write merchant key → category entries.
+
+    Model output never replaces an existing entry; categories agreed on by
+    user votes replace whatever is stored.
+    """
+    rows = [
+        {
+            "merchant_key": key,
+            "clean_merchant_name": data["clean_merchant_name"][:255],
+            "category": data["category"],
+            "source": source,
+        }
+        for key, data in entries.items()
+        if data.get("category") in STANDARD_CATEGORIES
+    ]
+    if not rows:
+        return
+
+    insert = dialect_insert(session)
+    if insert is None:
+        existing = await lookup_merchant_categories(session, {r["merchant_key"] for r in rows})
+        for row in rows:
+            current = existing.get(row["merchant_key"])
+            if current is None:
+                session.add(MerchantCategory(**row))
+            elif source != "llm":
+                current.category = row["category"]
+                current.source = source
+        await session.flush()
+        return
+
+    stmt = insert(MerchantCategory).values(rows)
+    if source != "llm":
+        # Only the category is replaced; the stored display name stays.
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["merchant_key"],
+            set_={
+                "category": stmt.excluded.category,
+                "source": stmt.excluded.source,
+                "updated_at": func.now(),
+            },
+        )
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=["merchant_key"])
+    await session.execute(stmt)
+
+
+async def lookup_user_votes(
+    session: AsyncSession, user_id: uuid.UUID, merchant_keys: set[str]
+) -> dict[str, str]:
+    """Return the user's own category corrections by merchant key."""
+    if not merchant_keys:
+        return {}
+    result = await session.execute(
+        select(MerchantCategoryVote.merchant_key, MerchantCategoryVote.category).where(
+            MerchantCategoryVote.user_id == user_id,
+            MerchantCategoryVote.merchant_key.in_(merchant_keys),
+        )
+    )
+    return dict(result.all())
+
+
+async def record_merchant_correction(
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    raw_name: str,
+    category: str,
+) -> bool:
+    """Record a user's category for a merchant as their vote.
+
+    The vote categorizes the user's own future transactions for the merchant.
+    The shared dictionary takes the category only once
+    ``merchant_category_vote_threshold`` users agree on it and no other
+    category has as many votes. User-entered merchant names are never shared.
+    Only standard categories (in any case) on shareable merchant keys are
+    recorded; custom user categories stay on the user's own transaction.
+    """
+    key = normalize_merchant_key(raw_name)
+    # Clients send Plaid-style uppercase categories ("FOOD_AND_DRINK").
+    category = category.strip().lower()
+    if key is None or category not in STANDARD_CATEGORIES:
+        return False
+
+    vote = await session.get(MerchantCategoryVote, (key, user_id))
+    if vote is None:
+        session.add(MerchantCategoryVote(merchant_key=key, user_id=user_id, category=category))
+    else:
+        vote.category = category
+    await session.flush()
+
+    tally = await session.execute(
+        select(MerchantCategoryVote.category, func.count())
+        .where(MerchantCategoryVote.merchant_key == key)
+        .group_by(MerchantCategoryVote.category)
+        .order_by(func.count().desc())
+        .limit(2)
+    )
+    leaders = tally.all()
+    winner, votes = leaders[0]
+    runner_up = leaders[1][1] if len(leaders) > 1 else 0
+    if votes >= settings.merchant_category_vote_threshold and votes > runner_up:
+        await store_merchant_categories(
+            session,
+            {key: {"clean_merchant_name": key.title(), "category": winner}},
+            source="votes",
+        )
+    return True
+
+
 class MerchantCategorizationService:
     def __init__(self):
         self.runtime = AgentRuntime()
 
-    async def categorize_transactions(self, raw_names: list[str]) -> dict[str, dict[str, str]]:
+    async def categorize_transactions(
+        self,
+        raw_names: list[str],
+        session: AsyncSession | None = None,
+        user_id: uuid.UUID | None = None,
+    ) -> dict[str, dict[str, str]]:
         """
         Batch categorizes a list of raw transaction names.
         Returns a mapping from raw_name -> {"clean_merchant_name": ..., "category": ...}
+
+        With a session, the shared merchant dictionary is consulted first and
+        filled from the LLM's answers, so each merchant is only sent once.
+        With a user as well, that user's own corrections override the category.
         """
         if not raw_names:
             return {}
 
         # Deduplicate to save tokens
-        unique_names = list(set(raw_names))
+        unique_names = list(dict.fromkeys(raw_names))
+        keys = {name: normalize_merchant_key(name) for name in unique_names}
+
+        results: dict[str, dict[str, str]] = {}
+        if session is not None:
+            cached = await lookup_merchant_categories(
+                session, {key for key in keys.values() if key}
+            )
+            for name, key in keys.items():
+                entry = cached.get(key) if key else None
+                if entry is not None:
+                    results[name] = {
+                        "clean_merchant_name": entry.clean_merchant_name,
+                        "category": entry.category,
+                    }
+
+        cache_hits = len(results)
+
+        # Send one representative description per uncached merchant key.
+        names_by_key: dict[str, list[str]] = {}
+        to_send: list[str] = []
+        for name in unique_names:
+            if name in results:
+                continue
+            key = keys[name]
+            if key is None:
+                to_send.append(name)
+            elif key in names_by_key:
+                names_by_key[key].append(name)
+            else:
+                names_by_key[key] = [name]
+                to_send.append(name)
+
+        if not to_send:
+            logger.info("Categorized %d descriptions from merchant cache", cache_hits)
+            return await self._apply_user_votes(results, keys, session, user_id)
+
+        semaphore = asyncio.Semaphore(max(1, settings.merchant_categorization_max_concurrency))
+
+        async def run_batch(batch: list[str]) -> tuple[dict[str, dict[str, str]], bool]:
+            async with semaphore:
+                return await self._categorize_batch(batch)
+
+        batches = [to_send[i:i + BATCH_SIZE] for i in range(0, len(to_send), BATCH_SIZE)]
+        batch_results = await asyncio.gather(*(run_batch(batch) for batch in batches))
+
+        learned: dict[str, dict[str, str]] = {}
+        for categorized, from_llm in batch_results:
+            for name, data in categorized.items():
+                key = keys.get(name)
+                if key is None:
+                    results[name] = data
+                    continue
+                for same_merchant in names_by_key.get(key, [name]):
+                    results[same_merchant] = data
+                if from_llm:
+                    learned[key] = data
+
+        if session is not None and learned:
+            await store_merchant_categories(session, learned, source="llm")
+
+        logger.info(
+            "Categorized %d descriptions: %d from merchant cache, %d sent to LLM in %d batches",
+            len(unique_names),
+            cache_hits,
+            len(to_send),
+            len(batches),
+        )
+        return await self._apply_user_votes(results, keys, session, user_id)
+
+    @staticmethod
+    async def _apply_user_votes(
+        results: dict[str, dict[str, str]],
+        keys: dict[str, str | None],
+        session: AsyncSession | None,
+        user_id: uuid.UUID | None,
+    ) -> dict[str, dict[str, str]]:
+        if session is None or user_id is None:
+            return results
+        votes = await lookup_user_votes(
+            session, user_id, {key for key in keys.values() if key}
+        )
+        for name, data in results.items():
+            key = keys.get(name)
+            if key in votes:
+                results[name] = {**data, "category": votes[key]}
+        return results
+
+    async def _categorize_batch(
+        self, batch: list[str]
+    ) -> tuple[dict[str, dict[str, str]], bool]:
+        """Categorize one batch. The flag is False when fallbacks were used."""
+        prompt = "Please categorize the following transaction descriptions:\n"
+        for name in batch:
+            prompt += f"- {name}\n"
 
-        # If there are too many, batching would be needed in production.
-        # For MVP, we'll process up to 50 at a time.
         results = {}
-        batch_size = 50
-
-        for i in range(0, len(unique_names), batch_size):
-            batch = unique_names[i:i + batch_size]
-            prompt = "Please categorize the following transaction descriptions:\n"
-            for name in batch:
-                prompt += f"- {name}\n"
-
-            try:
-                response = await self.runtime.create_message(
-                    model=settings.advisor_model,
-                    max_tokens=4000,
-                    system=SYSTEM_PROMPT.format(categories=", ".join(STANDARD_CATEGORIES)),
-                    messages=[{"role": "user", "content": prompt}],
-                    tools=[{
-                        "name": "submit_categorization",
-                        "description": "Submit the cleaned merchant names and categories",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "categorizations": {
-                                    "type": "array",
-                                    "items": {
-                                        "type": "object",
-                                        "properties": {
-                                            "raw_name": {"type": "string"},
-                                            "clean_merchant_name": {"type": "string"},
-                                            "category": {"type": "string", "enum": STANDARD_CATEGORIES}
-                                        },
-                                        "required": ["raw_name", "clean_merchant_name", "category"]
-                                    }
+        try:
+            response = await self.runtime.create_message(
+                model=settings.advisor_model,
+                max_tokens=4000,
+                system=SYSTEM_PROMPT.format(categories=", ".join(STANDARD_CATEGORIES)),
+                messages=[{"role": "user", "content": prompt}],
+                tools=[{
+                    "name": "submit_categorization",
+                    "description": "Submit the cleaned merchant names and categories",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "categorizations": {
+                                "type": "array",
+                                "items": {
+                                    "type": "object",
+                                    "properties": {
+                                        "raw_name": {"type": "string"},
+                                        "clean_merchant_name": {"type": "string"},
+                                        "category": {"type": "string", "enum": STANDARD_CATEGORIES}
+                                    },
+                                    "required": ["raw_name", "clean_merchant_name", "category"]
                                 }
-                            },
-                            "required": ["categorizations"]
-                        }
-                    }]
-                )
-
-                # Extract the tool call
-                content = response.get("content", [])
-                for block in content:
-                    if block.get("type") == "tool_use" and block.get("name") == "submit_categorization":
-                        inputs = block.get("input", {})
-                        categorizations = inputs.get("categorizations", [])
-                        for cat in categorizations:
-                            results[cat["raw_name"]] = {
-                                "clean_merchant_name": cat["clean_merchant_name"],
-                                "category": cat["category"]
                             }
-            except Exception as e:
-                logger.error(f"Failed to categorize batch: {e}")
-                # Provide fallbacks
-                for name in batch:
-                    results[name] = {
-                        "clean_merchant_name": name.title()[:50],  # naive fallback
-                        "category": "uncategorized"
+                        },
+                        "required": ["categorizations"]
                     }
+                }]
+            )
 
-        return results
+            # Extract the tool call
+            content = response.get("content", [])
+            for block in content:
+                if block.get("type") == "tool_use" and block.get("name") == "submit_categorization":
+                    inputs = block.get("input", {})
+                    categorizations = inputs.get("categorizations", [])
+                    for cat in categorizations:
+                        if cat["raw_name"] not in batch:
+                            continue
+                        results[cat["raw_name"]] = {
+                            "clean_merchant_name": cat["clean_merchant_name"],
+                            "category": cat["category"]
+                        }
+        except Exception as e:
+            logger.error(f"Failed to categorize batch: {e}")
+            # Provide fallbacks
+            return {
+                name: {
+                    "clean_merchant_name": name.title()[:50],  # naive fallback
+                    "category": "uncategorized"
+                }
+                for name in batch
+            }, False
+
+        return results, True
 
 merchant_categorization_service = MerchantCategorizationService()
@@ -16,72 +16,72 @@ class MonteCarloService:
         inflation_mean: float = 0.025,
         inflation_std: float = 0.01,
         iterations: int = 1000,
+        seed: int | None = None,
     ) -> Dict:
         """
         Run a Monte Carlo simulation for retirement success probability.
-        """
-        results = []
-
-        for _ in range(iterations):
-            balance = current_savings
-            cumulative_inflation = 1.0
-            success = True
-            path = []
-
-            # 1. Accumulation Phase
-            for year in range(years_to_retirement):
-                # Annual return with volatility
-                annual_return = np.random.normal(
-                    expected_return_mean, expected_return_std
-                )
-                # Annual inflation
-                annual_inflation = np.random.normal(inflation_mean, inflation_std)
-                cumulative_inflation *= 1 + annual_inflation
-
-                # Update balance
-                balance = balance * (1 + annual_return) + (monthly_contribution * 12)
-                path.append(balance)
-
-            # 2. Decumulation Phase
-            for year in range(retirement_duration_years):
-                annual_return = np.random.normal(
-                    expected_return_mean * 0.8, expected_return_std * 0.5
-                )  # More conservative in retirement
-                annual_inflation = np.random.normal(inflation_mean, inflation_std)
-                cumulative_inflation *= 1 + annual_inflation
-
-                # Adjust withdrawal for cumulative inflation
-                withdrawal = desired_annual_income * cumulative_inflation
-
-                balance = balance * (1 + annual_return) - withdrawal
-                path.append(max(0, balance))
-
-                if balance <= 0:
-                    success = False
-                    break
-
-            results.append(
-                {"success": success, "final_balance": max(0, balance), "path": path}
-            )
-
-        success_count = sum(1 for r in results if r["success"])
-        success_rate = success_count / iterations
-
-        # Calculate percentiles for paths
-        all_paths = [r["path"] for r in results]
-        max_len = max(len(p) for p in all_paths)
-
-        # Pad paths that ended early
-        padded_paths = []
-        for p in all_paths:
-            padded_paths.append(p + [0] * (max_len - len(p)))
-
-        path_array = np.array(padded_paths)
 
+        All paths are simulated at once: the full return and inflation
+        matrices are drawn up front (stored year-major, one row per year
+        across every iteration) and each year is applied as a single vector
+        operation. Passing ``seed`` makes results reproducible.
+        """
+        rng = np.random.default_rng(seed)
+        total_years = years_to_retirement + retirement_duration_years
+
+        # 1. Accumulation Phase
+        accumulation_returns = rng.normal(
+            expected_return_mean,
+            expected_return_std,
+            size=(years_to_retirement, iterations),
+        )
+        # 2. Decumulation Phase (more conservative in retirement)
+        decumulation_returns = rng.normal(
+            expected_return_mean * 0.8,
+            expected_return_std * 0.5,
+            size=(retirement_duration_years, iterations),
+        )
+        annual_inflation = rng.normal(
+            inflation_mean, inflation_std, size=(total_years, iterations)
+        )
+        cumulative_inflation = np.cumprod(1 + annual_inflation, axis=0)
+        # Withdrawals are adjusted for inflation accumulated over the whole
+        # horizon, including the accumulation years.
+        withdrawals = (
+            desired_annual_income * cumulative_inflation[years_to_retirement:]
+        )
+
+        path_array = np.zeros((total_years, iterations))
+        balance = np.full(iterations, float(current_savings))
+        annual_contribution = monthly_contribution * 12
+
+        for year in range(years_to_retirement):
+            balance = balance * (1 + accumulation_returns[year]) + annual_contribution
+            path_array[year] = balance
+
+        # Paths that run out of money stop at zero and stay there.
+        depleted = np.zeros(iterations, dtype=bool)
+        depleted_at = np.full(iterations, retirement_duration_years)
+        for year in range(retirement_duration_years):
+            balance = balance * (1 + decumulation_returns[year]) - withdrawals[year]
+            newly_depleted = ~depleted & (balance <= 0)
+            depleted_at[newly_depleted] = year + 1
+            depleted |= newly_depleted
+            balance = np.where(depleted, 0.0, balance)
+            path_array[years_to_retirement + year] = balance
+
+        success_rate = float(np.count_nonzero(~depleted)) / iterations
+
+        # Trim the horizon to the longest simulated path so the output matches
+        # the per-path semantics when every path fails early.
+        max_len = years_to_retirement + int(depleted_at.max(initial=0))
+        path_array = path_array[:max_len]
+
+        p10, p50, p90 = np.percentile(path_array, [10, 50, 90], axis=1)
         percentiles = {
-            "p10": np.percentile(path_array, 10, axis=0).tolist(),
-            "p50": np.percentile(path_array, 50, axis=0).tolist(),
-            "p90": np.percentile(path_array, 90, axis=0).tolist(),
+            "p10": p10.tolist(),
+            "p50": p50.tolist(),
+            "p90": p90.tolist(),
         }
 
         return {
@@ -34,7 +34,8 @@ from app.schemas.physical_asset import (
     VehicleAssetUpdate,
     VehicleSearchResult,
 )
-from app.services.providers.metal_price import metal_price_service
+from app.services.context_cache import bump_data_version
+from app.services.market_prices import market_price_service
 
 logger = logging.getLogger(__name__)
 
@@ -144,12 +145,13 @@ class PhysicalAssetService:
     async def create_real_estate_asset(
         self, user_id: uuid.UUID, data: RealEstateAssetCreate
     ) -> RealEstateAsset:
+        # Auto-valued properties are valued by the background revaluation job
+        # (app/services/asset_revaluation.py), never inside this request.
         return await self._create_asset(
             user_id=user_id,
             asset_model=RealEstateAsset,
             asset_type=AssetType.real_estate,
             data=data,
-            refresh_func=self.refresh_real_estate_valuation,
         )
 
     async def update_real_estate_asset(
@@ -190,6 +192,8 @@ class PhysicalAssetService:
                 RealEstateAsset.id == asset_id, RealEstateAsset.user_id == user_id
             )
         )
+        if result.rowcount:
+            await bump_data_version(self.session, user_id)
         await self.session.commit()
         return result.rowcount > 0
 
@@ -204,12 +208,12 @@ class PhysicalAssetService:
     async def create_vehicle_asset(
         self, user_id: uuid.UUID, data: VehicleAssetCreate
     ) -> VehicleAsset:
+        # Valued by the background revaluation job, like real estate.
         return await self._create_asset(
             user_id=user_id,
             asset_model=VehicleAsset,
             asset_type=AssetType.vehicle,
             data=data,
-            refresh_func=self.refresh_vehicle_valuation,
         )
 
     async def update_vehicle_asset(
@@ -250,6 +254,8 @@ class PhysicalAssetService:
                 VehicleAsset.id == asset_id, VehicleAsset.user_id == user_id
             )
         )
+        if result.rowcount:
+            await bump_data_version(self.session, user_id)
         await self.session.commit()
         return result.rowcount > 0
 
@@ -312,6 +318,8 @@ class PhysicalAssetService:
                 CollectibleAsset.id == asset_id, CollectibleAsset.user_id == user_id
             )
         )
+        if result.rowcount:
+            await bump_data_version(self.session, user_id)
         await self.session.commit()
         return result.rowcount > 0
 
@@ -363,6 +371,8 @@ class PhysicalAssetService:
                 PreciousMetalAsset.id == asset_id, PreciousMetalAsset.user_id == user_id
             )
         )
+        if result.rowcount:
+            await bump_data_version(self.session, user_id)
         await self.session.commit()
         return result.rowcount > 0
 
@@ -425,6 +435,8 @@ class PhysicalAssetService:
                 AlternativeAsset.id == asset_id, AlternativeAsset.user_id == user_id
             )
         )
+        if result.rowcount:
+            await bump_data_version(self.session, user_id)
         await self.session.commit()
         return result.rowcount > 0
 
@@ -676,7 +688,9 @@ class PhysicalAssetService:
                 "remaining": cooldown,
             }
 
-        spot_price = await metal_price_service.get_spot_price(asset.metal_type.value)
+        spot_price = await market_price_service.get_price(
+            asset.metal_type.value, kind="metal"
+        )
         if not spot_price:
             return {"status": "failed", "message": "Could not fetch spot price"}
 
@@ -9,11 +9,7 @@ from app.models.holding import Holding
 from app.models.investment_account import InvestmentAccount
 from app.models.equity_grant import EquityGrant
 from app.services.equity_valuation import equity_valuation_service
-from app.services.portfolio_metrics import (
-    get_cash_and_debt_totals,
-    get_physical_asset_total,
-    get_investment_total,
-)
+from app.services.portfolio_metrics import BalanceTotals, get_balance_totals
 
 class PortfolioService:
     """Service for calculating portfolio-wide metrics and totals."""
@@ -22,24 +18,17 @@ class PortfolioService:
         self.session = session
         self.user_id = user_id
 
-    async def get_cash_and_debt_totals(self) -> tuple[Decimal, Decimal]:
-        """Return (total_cash, total_debt) for the user."""
-        return await get_cash_and_debt_totals(self.session, self.user_id)
-
-    async def get_physical_asset_total(self) -> Decimal:
-        """Return total market value of all physical assets."""
-        return await get_physical_asset_total(self.session, self.user_id)
-
-    async def get_investment_total(self) -> Decimal:
-        """Return total market value of all investment accounts."""
-        return await get_investment_total(self.session, self.user_id)
+    async def get_balance_totals(self) -> BalanceTotals:
+        """Return cash, debt, investment, and physical asset totals for the user."""
+        return await get_balance_totals(self.session, self.user_id)
 
     async def get_portfolio_summary_data(self) -> dict:
         """
         Calculate the complex summary data for the portfolio.
         Moves business logic out of the API layer.
         """
-        total_cash, total_debt = await self.get_cash_and_debt_totals()
+        totals = await self.get_balance_totals()
+        total_cash, total_debt = totals.cash, totals.debt
         
         # Get equity grants and calculate valuation
         equity_result = await self.session.execute(
@@ -94,7 +83,7 @@ class PortfolioService:
                     "account_name": account.name,
                 })
 
-        total_physical = await self.get_physical_asset_total()
+        total_physical = totals.physical
         net_worth = (
             total_cash
             + total_investment
@@ -7,7 +7,7 @@ from sqlalchemy.orm import selectinload
 
 from app.models.holding import Holding
 from app.models.investment_account import InvestmentAccount
-from app.services.portfolio_metrics import get_cash_and_debt_totals, get_investment_total
+from app.services.portfolio_metrics import get_balance_totals
 from app.services.runway import RunwayService
 
 
@@ -20,11 +20,10 @@ class PortfolioAnalysisService:
         Calculates Cash Drag, Tax Drag, and Concentration Risk.
         Returns a dict conforming to PortfolioAnalysisMetrics schema.
         """
-        total_cash_decimal, _ = await get_cash_and_debt_totals(self.session, user_id)
-        total_investment_decimal = await get_investment_total(self.session, user_id)
+        totals = await get_balance_totals(self.session, user_id)
 
-        total_cash = float(total_cash_decimal)
-        total_investment = float(total_investment_decimal)
+        total_cash = float(totals.cash)
+        total_investment = float(totals.investment)
         total_portfolio = total_cash + total_investment
 
         # 1. Cash Drag: Identify if cash exceeds 2 months of burn
@@ -1,8 +1,8 @@
-import asyncio
 import uuid
+from dataclasses import dataclass
 from decimal import Decimal
 
-from sqlalchemy import select
+from sqlalchemy import func, literal, select, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.cash_account import CashAccount
@@ -16,61 +16,67 @@ from app.models.physical_asset import (
     VehicleAsset,
 )
 
+_ZERO = Decimal("0.00")
 
-async def get_cash_and_debt_totals(
-    session: AsyncSession,
-    user_id: uuid.UUID,
-) -> tuple[Decimal, Decimal]:
-    """Return (total_cash, total_debt) for a user."""
-    cash_result = await session.execute(
-        select(CashAccount).where(CashAccount.user_id == user_id)
-    )
-    total_cash = sum((a.balance for a in cash_result.scalars().all()), Decimal("0.00"))
-
-    debt_result = await session.execute(
-        select(DebtAccount).where(DebtAccount.user_id == user_id)
-    )
-    total_debt = sum((a.balance for a in debt_result.scalars().all()), Decimal("0.00"))
-
-    return total_cash, total_debt
+# (category, summed column) pairs aggregated by get_balance_totals.
+_CATEGORY_COLUMNS = (
+    ("cash", CashAccount.balance),
+    ("debt", DebtAccount.balance),
+    ("investment", InvestmentAccount.balance),
+    ("real_estate", RealEstateAsset.market_value),
+    ("vehicles", VehicleAsset.market_value),
+    ("collectibles", CollectibleAsset.market_value),
+    ("precious_metals", PreciousMetalAsset.market_value),
+    ("alternatives", AlternativeAsset.market_value),
+)
 
 
-async def get_physical_asset_total(
-    session: AsyncSession,
-    user_id: uuid.UUID,
-) -> Decimal:
-    """Return total market value of all physical assets (real estate + vehicles + collectibles + metals + alternatives)."""
-    re_result, v_result, c_result, m_result, a_result = await asyncio.gather(
-        session.execute(
-            select(RealEstateAsset).where(RealEstateAsset.user_id == user_id)
-        ),
-        session.execute(select(VehicleAsset).where(VehicleAsset.user_id == user_id)),
-        session.execute(
-            select(CollectibleAsset).where(CollectibleAsset.user_id == user_id)
-        ),
-        session.execute(
-            select(PreciousMetalAsset).where(PreciousMetalAsset.user_id == user_id)
-        ),
-        session.execute(
-            select(AlternativeAsset).where(AlternativeAsset.user_id == user_id)
-        ),
-    )
+@dataclass(frozen=True)
+class BalanceTotals:
+    """Summed balances for every net worth category of one user."""
 
-    total_re = sum((a.market_value for a in re_result.scalars().all()), Decimal("0.00"))
-    total_v = sum((a.market_value for a in v_result.scalars().all()), Decimal("0.00"))
-    total_c = sum((a.market_value for a in c_result.scalars().all()), Decimal("0.00"))
-    total_m = sum((a.market_value for a in m_result.scalars().all()), Decimal("0.00"))
-    total_a = sum((a.market_value for a in a_result.scalars().all()), Decimal("0.00"))
+    cash: Decimal = _ZERO
+    debt: Decimal = _ZERO
+    investment: Decimal = _ZERO
+    real_estate: Decimal = _ZERO
+    vehicles: Decimal = _ZERO
+    collectibles: Decimal = _ZERO
+    precious_metals: Decimal = _ZERO
+    alternatives: Decimal = _ZERO
 
-    return total_re + total_v + total_c + total_m + total_a
+    @property
+    def physical(self) -> Decimal:
+        """Real estate, vehicles, collectibles, metals, and alternatives."""
+        return (
+            self.real_estate
+            + self.vehicles
+            + self.collectibles
+            + self.precious_metals
+            + self.alternatives
+        )
 
 
-async def get_investment_total(
+async def get_balance_totals(
     session: AsyncSession,
     user_id: uuid.UUID,
-) -> Decimal:
-    result = await session.execute(
-        select(InvestmentAccount).where(InvestmentAccount.user_id == user_id)
+) -> BalanceTotals:
+    """Return every balance total for a user in a single round trip.
+
+    Each category is a ``SUM`` over its table, combined with ``UNION ALL``
+    so the database returns one row per category.
+    """
+    statement = union_all(
+        *(
+            select(
+                literal(category).label("category"),
+                func.coalesce(func.sum(column), 0).label("total"),
+            ).where(column.class_.user_id == user_id)
+            for category, column in _CATEGORY_COLUMNS
+        )
     )
-    accounts = result.scalars().all()
-    return sum((a.balance for a in accounts), Decimal("0.00"))
+    result = await session.execute(statement)
+    totals = {
+        category: Decimal(total).quantize(_ZERO)
+        for category, total in result.all()
+    }
+    return BalanceTotals(**totals)
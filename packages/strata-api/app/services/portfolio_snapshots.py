@@ -6,10 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.portfolio_snapshot import PortfolioSnapshot
 from app.models.user import User
-from app.services.portfolio_metrics import (
-    get_cash_and_debt_totals,
-    get_investment_total,
-)
+from app.services.portfolio_metrics import get_balance_totals
 
 
 async def create_snapshot_for_user(
@@ -29,17 +26,16 @@ async def create_snapshot_for_user(
     if snapshot:
         return snapshot, False
 
-    total_cash, total_debt = await get_cash_and_debt_totals(session, user_id)
-    total_investment = await get_investment_total(session, user_id)
-    net_worth = total_cash + total_investment - total_debt
+    totals = await get_balance_totals(session, user_id)
+    net_worth = totals.cash + totals.investment - totals.debt
 
     snapshot = PortfolioSnapshot(
         user_id=user_id,
         snapshot_date=snapshot_date,
         net_worth=net_worth,
-        total_investment_value=total_investment,
-        total_cash_value=total_cash,
-        total_debt_value=total_debt,
+        total_investment_value=totals.investment,
+        total_cash_value=totals.cash,
+        total_debt_value=totals.debt,
     )
     session.add(snapshot)
     await session.flush()
@@ -1,16 +1,34 @@
+from __future__ import annotations
+
 import asyncio
 import logging
+from dataclasses import dataclass, field
 from decimal import Decimal
-from typing import Any
-
-import httpx
+from typing import TYPE_CHECKING, Any
 
 from app.core.config import settings
 from app.models.crypto_wallet import CryptoChain
+from app.services.http_clients import http_clients
+
+if TYPE_CHECKING:
+    from app.services.token_metadata import TokenMetadataStore
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class WalletBalances:
+    """Native balance and non-native token balances of one address.
+
+    ``fetched`` is False when the upstream lookup failed, so the zero
+    balances should not be taken as the wallet's real state.
+    """
+
+    native: Decimal = Decimal("0.0")
+    tokens: list[dict[str, Any]] = field(default_factory=list)
+    fetched: bool = True
+
+
 class AlchemyProvider:
     """Fetch blockchain balances via Alchemy RPC APIs and public indexers."""
 
@@ -33,23 +51,59 @@ class AlchemyProvider:
         # BTC uses a separate indexer for simple address balance lookups.
         self._btc_url = "https://blockchain.info/q/addressbalance/"
 
-    async def get_balance(self, chain: CryptoChain, address: str) -> Decimal:
-        """Fetch the native token balance for a given address on a specific chain."""
-        if chain == CryptoChain.bitcoin:
-            return await self._get_btc_balance(address)
+    @staticmethod
+    async def _rpc_batch(
+        url: str, calls: list[tuple[str, list[Any]]]
+    ) -> list[Any | None]:
+        """Send JSON-RPC calls as batch requests; return each call's result.
 
-        if not self._api_key:
-            logger.warning(
-                "Alchemy API key not set, returning mock balance for %s on %s",
-                address,
-                chain,
-            )
-            return Decimal("0.0")
+        Calls are split into batches of ``alchemy_rpc_batch_size`` sent
+        concurrently. A call that failed, or whose batch failed, gets None.
+        """
+        size = max(1, settings.alchemy_rpc_batch_size)
+        chunks = [calls[i : i + size] for i in range(0, len(calls), size)]
+
+        async def _send(chunk: list[tuple[str, list[Any]]]) -> list[Any | None]:
+            payload = [
+                {"jsonrpc": "2.0", "id": index, "method": method, "params": params}
+                for index, (method, params) in enumerate(chunk)
+            ]
+            try:
+                # Every method called here is a read, so the batch is safe
+                # to retry.
+                response = await http_clients.get("alchemy").post(
+                    url, json=payload, idempotent=True
+                )
+                response.raise_for_status()
+                data = response.json()
+            except Exception as e:
+                logger.error("Alchemy batch request failed: %s", str(e))
+                return [None] * len(chunk)
+            if not isinstance(data, list):
+                error = data.get("error") if isinstance(data, dict) else data
+                logger.error("Alchemy batch request rejected: %s", error)
+                return [None] * len(chunk)
+
+            results: list[Any | None] = [None] * len(chunk)
+            for item in data:
+                index = item.get("id")
+                if not isinstance(index, int) or not 0 <= index < len(chunk):
+                    continue
+                if "error" in item:
+                    logger.warning(
+                        "Alchemy %s call failed: %s", chunk[index][0], item["error"]
+                    )
+                    continue
+                results[index] = item.get("result")
+            return results
 
-        if chain == CryptoChain.solana:
-            return await self._get_solana_balance(address)
-        else:
-            return await self._get_evm_balance(chain, address)
+        batches = await asyncio.gather(*(_send(chunk) for chunk in chunks))
+        return [result for batch in batches for result in batch]
+
+    async def get_balance(self, chain: CryptoChain, address: str) -> Decimal:
+        """Fetch the native token balance for a given address on a specific chain."""
+        balances = await self.get_wallet_balances(chain, [address])
+        return balances[address].native
 
     async def get_token_balances(
         self, chain: CryptoChain, address: str
@@ -58,219 +112,199 @@ class AlchemyProvider:
         Discover and fetch balances for non-native tokens (ERC-20, SPL).
         Returns a list of dicts with {symbol, balance, name, logo_url}.
         """
+        balances = await self.get_wallet_balances(chain, [address])
+        return balances[address].tokens
+
+    async def get_wallet_balances(
+        self,
+        chain: CryptoChain,
+        addresses: list[str],
+        metadata_store: TokenMetadataStore | None = None,
+    ) -> dict[str, WalletBalances]:
+        """Fetch native and token balances for many addresses on one chain.
+
+        EVM and Solana lookups for all addresses go out as one JSON-RPC batch,
+        plus one batch for token metadata not yet in ``metadata_store``, so the
+        number of round trips does not grow with wallets or tokens (up to
+        ``alchemy_rpc_batch_size`` calls per request).
+        """
+        addresses = list(dict.fromkeys(addresses))
+        if chain == CryptoChain.bitcoin:
+            btc_balances = await asyncio.gather(
+                *(self._get_btc_balance(address) for address in addresses)
+            )
+            return {
+                address: WalletBalances(native=balance)
+                if balance is not None
+                else WalletBalances(fetched=False)
+                for address, balance in zip(addresses, btc_balances, strict=True)
+            }
+
         if not self._api_key:
-            return []
+            logger.warning(
+                "Alchemy API key not set, returning empty balances on %s", chain
+            )
+            return {address: WalletBalances() for address in addresses}
 
         if chain == CryptoChain.solana:
-            return await self._get_solana_token_balances(address)
-        elif chain in [
-            CryptoChain.ethereum,
-            CryptoChain.polygon,
-            CryptoChain.arbitrum,
-            CryptoChain.base,
-            CryptoChain.optimism,
-        ]:
-            return await self._get_evm_token_balances(chain, address)
-
-        return []
-
-    async def _get_btc_balance(self, address: str) -> Decimal:
-        """Fetch BTC balance from blockchain.info indexer."""
+            return await self._get_solana_wallets(addresses)
+        return await self._get_evm_wallets(chain, addresses, metadata_store)
+
+    async def _get_btc_balance(self, address: str) -> Decimal | None:
+        """Fetch BTC balance from blockchain.info indexer; None on failure."""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{self._btc_url}{address}")
-                response.raise_for_status()
-                # Returns balance in satoshis
-                satoshis = int(response.text)
-                return Decimal(satoshis) / Decimal(10**8)
+            response = await http_clients.get("blockchain_info").get(
+                f"{self._btc_url}{address}"
+            )
+            response.raise_for_status()
+            # Returns balance in satoshis
+            satoshis = int(response.text)
+            return Decimal(satoshis) / Decimal(10**8)
         except Exception as e:
             logger.error("Error fetching BTC balance for %s: %s", address, str(e))
-            return Decimal("0.0")
+            return None
 
-    async def _get_evm_balance(self, chain: CryptoChain, address: str) -> Decimal:
-        """Fetch balance for EVM-compatible chains (ETH, Polygon, Arbitrum, etc.)."""
+    async def _get_evm_wallets(
+        self,
+        chain: CryptoChain,
+        addresses: list[str],
+        metadata_store: TokenMetadataStore | None,
+    ) -> dict[str, WalletBalances]:
+        """Fetch ETH-style native balances and ERC-20 balances in batches."""
         url = self._base_urls.get(chain)
         if not url:
-            return Decimal("0.0")
-
-        payload = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "eth_getBalance",
-            "params": [address, "latest"],
-        }
-
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(url, json=payload)
-                response.raise_for_status()
-                data = response.json()
-
-            if "result" in data:
-                hex_val = data["result"]
-                wei = int(hex_val, 16)
-                return Decimal(wei) / Decimal(10**18)
-            return Decimal("0.0")
-        except Exception as e:
-            logger.error(
-                "Error fetching EVM balance for %s on %s: %s", address, chain, str(e)
+            return {address: WalletBalances() for address in addresses}
+
+        calls: list[tuple[str, list[Any]]] = []
+        for address in addresses:
+            calls.append(("eth_getBalance", [address, "latest"]))
+            calls.append(("alchemy_getTokenBalances", [address]))
+        results = await self._rpc_batch(url, calls)
+
+        wallets: dict[str, WalletBalances] = {}
+        raw_tokens: dict[str, list[tuple[str, int]]] = {}
+        for index, address in enumerate(addresses):
+            native_hex, token_result = results[2 * index], results[2 * index + 1]
+            wallets[address] = WalletBalances(
+                native=Decimal(_hex_to_int(native_hex)) / Decimal(10**18),
+                fetched=native_hex is not None and token_result is not None,
             )
-            return Decimal("0.0")
-
-    async def _get_evm_token_balances(
-        self, chain: CryptoChain, address: str
-    ) -> list[dict[str, Any]]:
-        """Fetch ERC-20 token balances using Alchemy's token API."""
-        url = self._base_urls.get(chain)
-        if not url:
-            return []
-
-        payload = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "alchemy_getTokenBalances",
-            "params": [address],
-        }
-
-        tokens: list[dict[str, Any]] = []
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(url, json=payload)
-                response.raise_for_status()
-                data = response.json()
-
-            if "result" in data and "tokenBalances" in data["result"]:
-                token_balances = [
-                    item
-                    for item in data["result"]["tokenBalances"]
-                    if item["tokenBalance"]
-                    != (
-                        "0x000000000000000000000000000000000000000000000000"
-                        "0000000000000000"
-                    )
-                ]
-                metadata_results = await asyncio.gather(
-                    *(
-                        self._get_evm_token_metadata(chain, item["contractAddress"])
-                        for item in token_balances
+            raw_tokens[address] = [
+                (item["contractAddress"].lower(), raw_balance)
+                for item in (token_result or {}).get("tokenBalances", [])
+                if (raw_balance := _hex_to_int(item.get("tokenBalance"))) > 0
+            ]
+
+        contracts = {contract for held in raw_tokens.values() for contract, _ in held}
+        metadata = await self._get_evm_token_metadata(
+            chain, url, contracts, metadata_store
+        )
+
+        for address, held in raw_tokens.items():
+            for contract, raw_balance in held:
+                token = metadata.get(contract)
+                if not token or token.get("decimals") is None:
+                    continue
+                balance = Decimal(raw_balance) / Decimal(10 ** token["decimals"])
+                if balance > 0:
+                    wallets[address].tokens.append(
+                        {
+                            "symbol": token.get("symbol"),
+                            "name": token.get("name"),
+                            "balance": balance,
+                            "logo_url": token.get("logo"),
+                            "contract_address": contract,
+                        }
                     )
-                )
-
-                for item, metadata in zip(
-                    token_balances, metadata_results, strict=True
-                ):
-                    if not metadata:
-                        continue
-
-                    decimals = metadata.get("decimals")
-                    if decimals is None:
-                        continue
-
-                    raw_balance = int(item["tokenBalance"], 16)
-                    balance = Decimal(raw_balance) / Decimal(10**decimals)
-
-                    if balance > 0:
-                        tokens.append(
-                            {
-                                "symbol": metadata.get("symbol"),
-                                "name": metadata.get("name"),
-                                "balance": balance,
-                                "logo_url": metadata.get("logo"),
-                                "contract_address": item["contractAddress"],
-                            }
-                        )
-            return tokens
-        except Exception as e:
-            logger.error(
-                "Error fetching EVM tokens for %s on %s: %s", address, chain, str(e)
-            )
-            return []
+        return wallets
 
     async def _get_evm_token_metadata(
-        self, chain: CryptoChain, contract: str
-    ) -> dict[str, Any] | None:
-        """Fetch ERC-20 token metadata (symbol, decimals, logo)."""
-        url = self._base_urls.get(chain)
-        payload = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "alchemy_getTokenMetadata",
-            "params": [contract],
-        }
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(url, json=payload)
-                response.raise_for_status()
-                data = response.json()
-                return data.get("result")
-        except Exception:
-            return None
-
-    async def _get_solana_balance(self, address: str) -> Decimal:
-        """Fetch balance for Solana."""
-        url = self._base_urls.get(CryptoChain.solana)
-        payload = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "getBalance",
-            "params": [address],
-        }
-
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(url, json=payload)
-                response.raise_for_status()
-                data = response.json()
-
-            if "result" in data and "value" in data["result"]:
-                lamports = data["result"]["value"]
-                return Decimal(lamports) / Decimal(10**9)
-            return Decimal("0.0")
-        except Exception as e:
-            logger.error("Error fetching Solana balance for %s: %s", address, str(e))
-            return Decimal("0.0")
-
-    async def _get_solana_token_balances(self, address: str) -> list[dict[str, Any]]:
-        """Fetch SPL token balances for Solana."""
-        url = self._base_urls.get(CryptoChain.solana)
-        payload = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "getTokenAccountsByOwner",
-            "params": [
-                address,
-                {"programId": "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"},
-                {"encoding": "jsonParsed"},
-            ],
+        self,
+        chain: CryptoChain,
+        url: str,
+        contracts: set[str],
+        metadata_store: TokenMetadataStore | None,
+    ) -> dict[str, dict[str, Any]]:
+        """Return metadata (symbol, decimals, logo) for ERC-20 contracts.
+
+        Contracts already in ``metadata_store`` are not fetched again; newly
+        fetched metadata is written back to it.
+        """
+        if not contracts:
+            return {}
+        known = (
+            await metadata_store.get_many(chain, contracts) if metadata_store else {}
+        )
+        missing = sorted(contracts - known.keys())
+        if not missing:
+            return known
+
+        results = await self._rpc_batch(
+            url, [("alchemy_getTokenMetadata", [contract]) for contract in missing]
+        )
+        fetched = {
+            contract: result
+            for contract, result in zip(missing, results, strict=True)
+            if isinstance(result, dict)
         }
+        if metadata_store:
+            await metadata_store.put_many(chain, fetched)
+        return {**known, **fetched}
+
+    async def _get_solana_wallets(
+        self, addresses: list[str]
+    ) -> dict[str, WalletBalances]:
+        """Fetch SOL and SPL token balances for many addresses in one batch."""
+        url = self._base_urls[CryptoChain.solana]
+        calls: list[tuple[str, list[Any]]] = []
+        for address in addresses:
+            calls.append(("getBalance", [address]))
+            calls.append(
+                (
+                    "getTokenAccountsByOwner",
+                    [
+                        address,
+                        {"programId": "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"},
+                        {"encoding": "jsonParsed"},
+                    ],
+                )
+            )
+        results = await self._rpc_batch(url, calls)
+
+        wallets: dict[str, WalletBalances] = {}
+        for index, address in enumerate(addresses):
+            balance_result, token_result = results[2 * index], results[2 * index + 1]
+            lamports = (balance_result or {}).get("value")
+            wallet = WalletBalances(
+                native=Decimal(lamports) / Decimal(10**9)
+                if lamports
+                else Decimal("0.0"),
+                fetched=balance_result is not None and token_result is not None,
+            )
+            for item in (token_result or {}).get("value", []):
+                info = item["account"]["data"]["parsed"]["info"]
+                mint = info["mint"]
+                ui_amount = info["tokenAmount"]["uiAmount"]
+
+                if ui_amount and ui_amount > 0:
+                    symbol = self._SOLANA_TOKEN_SYMBOLS.get(mint, mint[:8])
+                    wallet.tokens.append(
+                        {
+                            "symbol": symbol,
+                            "name": symbol,
+                            "balance": Decimal(str(ui_amount)),
+                            "contract_address": mint,
+                        }
+                    )
+            wallets[address] = wallet
+        return wallets
 
-        tokens: list[dict[str, Any]] = []
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(url, json=payload)
-                response.raise_for_status()
-                data = response.json()
 
-            if "result" in data and "value" in data["result"]:
-                for item in data["result"]["value"]:
-                    info = item["account"]["data"]["parsed"]["info"]
-                    mint = info["mint"]
-                    ui_amount = info["tokenAmount"]["uiAmount"]
-
-                    if ui_amount and ui_amount > 0:
-                        symbol = self._SOLANA_TOKEN_SYMBOLS.get(mint, mint[:8])
-                        tokens.append(
-                            {
-                                "symbol": symbol,
-                                "name": symbol,
-                                "balance": Decimal(str(ui_amount)),
-                                "contract_address": mint,
-                            }
-                        )
-            return tokens
-        except Exception as e:
-            logger.error("Error fetching Solana tokens for %s: %s", address, str(e))
-            return []
+def _hex_to_int(value: Any) -> int:
+    try:
+        return int(value, 16)
+    except (TypeError, ValueError):
+        return 0
 
 
 # Global instance
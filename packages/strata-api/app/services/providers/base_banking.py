@@ -1,12 +1,46 @@
+import asyncio
+import functools
 from abc import ABC, abstractmethod
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import date
 from decimal import Decimal
+from typing import Any, TypeVar
 
+from app.core.config import settings
 from app.models.cash_account import CashAccountType
 from app.models.connection import Connection
 from app.schemas.action_capability import ActionCapability
 
+T = TypeVar("T")
+
+# Shared by every banking provider so blocking SDK calls never run on the
+# event loop and total in-flight provider calls stay bounded per worker.
+_blocking_executor: ThreadPoolExecutor | None = None
+
+
+class BankingProviderTimeoutError(TimeoutError):
+    """Raised when a provider call exceeds banking_provider_timeout_seconds."""
+
+
+def _get_blocking_executor() -> ThreadPoolExecutor:
+    global _blocking_executor
+    if _blocking_executor is None:
+        _blocking_executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.banking_provider_max_concurrency),
+            thread_name_prefix="banking-provider",
+        )
+    return _blocking_executor
+
+
+def shutdown_blocking_executor() -> None:
+    """Stop the shared provider thread pool. Called on app shutdown."""
+    global _blocking_executor
+    if _blocking_executor is not None:
+        _blocking_executor.shutdown(wait=False, cancel_futures=True)
+        _blocking_executor = None
+
 
 @dataclass
 class LinkSession:
@@ -49,10 +83,51 @@ class NormalizedBankTransaction:
     iso_currency_code: str = "USD"
 
 
+@dataclass
+class BankTransactionUpdates:
+    """Transaction changes since a provider sync cursor."""
+
+    added: list[NormalizedBankTransaction]
+    modified: list[NormalizedBankTransaction]
+    removed: list[str]  # provider transaction IDs
+    next_cursor: str
+
+
 class BaseBankingProvider(ABC):
     """Base class for banking data providers (e.g., Plaid)."""
 
     provider_name: str = "base_banking"
+    # Providers that can return deltas from a stored cursor override
+    # get_transaction_updates and set this to True.
+    supports_transaction_cursor: bool = False
+
+    async def run_blocking(
+        self,
+        fn: Callable[..., T],
+        /,
+        *args: Any,
+        timeout: float | None = None,
+        **kwargs: Any,
+    ) -> T:
+        """Run a synchronous SDK call on the shared provider thread pool.
+
+        Calls queue when the pool is saturated; the timeout covers queue time
+        plus execution, after which the caller gets BankingProviderTimeoutError.
+        """
+        call_timeout = (
+            settings.banking_provider_timeout_seconds if timeout is None else timeout
+        )
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            _get_blocking_executor(), functools.partial(fn, *args, **kwargs)
+        )
+        try:
+            return await asyncio.wait_for(future, timeout=call_timeout)
+        except TimeoutError as exc:
+            raise BankingProviderTimeoutError(
+                f"{self.provider_name} call {getattr(fn, '__name__', fn)} "
+                f"timed out after {call_timeout:g}s"
+            ) from exc
 
     @abstractmethod
     def get_capabilities(self) -> list[ActionCapability]:
@@ -127,6 +202,25 @@ class BaseBankingProvider(ABC):
         """
         ...
 
+    async def get_transaction_updates(
+        self,
+        connection: Connection,
+        cursor: str | None,
+    ) -> BankTransactionUpdates:
+        """Get transactions added, modified, or removed since ``cursor``.
+
+        Args:
+            connection: The connection object with credentials.
+            cursor: Cursor returned by the previous call, or None to start
+                from the beginning of the available history.
+
+        Returns:
+            The changes plus the cursor to store for the next call.
+        """
+        raise NotImplementedError(
+            f"{self.provider_name} does not support cursor-based transaction sync"
+        )
+
     @abstractmethod
     async def delete_connection(
         self,
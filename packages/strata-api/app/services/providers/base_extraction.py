@@ -63,6 +63,10 @@ class ExtractionProvider(ABC):
         """Return list of MIME types this provider can handle."""
         ...
 
+    def model_name(self) -> str:
+        """Return the model this provider calls, or "" if it has none."""
+        return ""
+
     # --- Shared helpers for LLM-based providers ---
 
     _KNOWN_DOC_TYPES = {"w2", "1099-int", "1099-div", "1099-b", "k-1", "1040"}
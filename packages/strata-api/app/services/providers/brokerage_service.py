@@ -5,7 +5,6 @@ from datetime import date
 from decimal import Decimal
 from typing import Any
 
-import httpx
 from pydantic import BaseModel, Field
 
 from app.core.config import settings
@@ -14,6 +13,7 @@ from app.models.investment_account import InvestmentAccountType
 from app.models.security import SecurityType
 from app.models.transaction import TransactionType
 from app.schemas.action_capability import ActionCapability
+from app.services.http_clients import UpstreamUnavailableError, http_clients
 from app.services.providers.base import (
     BaseProvider,
     LinkSession,
@@ -108,12 +108,14 @@ class BrokerageServiceProvider(BaseProvider):
         return [ActionCapability.READ_ONLY, ActionCapability.INTERNAL_REBALANCE]
 
     async def _post(self, path: str, payload: dict[str, Any]) -> Any:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
+        try:
+            response = await http_clients.get("brokerage_service").post(
                 f"{self._base_url}{path}",
                 json=payload,
                 headers=self._headers,
             )
+        except UpstreamUnavailableError as e:
+            raise BrokerageServiceUnavailableError(str(e)) from e
         if not response.is_success:
             detail = response.text
             try:
@@ -51,6 +51,9 @@ class ClaudeExtractionProvider(ExtractionProvider):
         )
         return CLAUDE_DEFAULT_MODEL
 
+    def model_name(self) -> str:
+        return self._resolve_model()
+
     def supported_mime_types(self) -> list[str]:
         return [
             "image/png",
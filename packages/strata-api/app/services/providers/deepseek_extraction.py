@@ -49,6 +49,9 @@ class DeepSeekExtractionProvider(ExtractionProvider):
             )
         return self._client
 
+    def model_name(self) -> str:
+        return settings.deepseek_model
+
     def supported_mime_types(self) -> list[str]:
         return [
             "image/png",
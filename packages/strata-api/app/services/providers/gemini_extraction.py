@@ -65,6 +65,9 @@ class GeminiExtractionProvider(ExtractionProvider):
             return _fallback_types_module()
         return types
 
+    def model_name(self) -> str:
+        return self._resolve_model()
+
     def supported_mime_types(self) -> list[str]:
         return ["image/png", "image/jpeg", "image/webp", "application/pdf"]
 
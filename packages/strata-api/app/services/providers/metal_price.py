@@ -1,24 +1,22 @@
 import logging
-import time
 from decimal import Decimal
 
-import httpx
-
 from app.core.config import settings
+from app.services.http_clients import http_clients
 
 logger = logging.getLogger(__name__)
 
 
 class MetalPriceService:
-    """Service to fetch real-time precious metal prices using Alpha Vantage."""
+    """Fetch precious metal spot prices from Alpha Vantage.
+
+    Calls go straight to the upstream; read prices through
+    ``app.services.market_prices.market_price_service`` instead.
+    """
 
     def __init__(self):
         self._api_key = settings.alpha_vantage_api_key
         self._base_url = "https://www.alphavantage.co/query"
-        self._client = httpx.AsyncClient(timeout=10.0)
-        # symbol -> (price, timestamp)
-        self._cache: dict[str, tuple[Decimal, float]] = {}
-        self._cache_ttl = 3600  # 1 hour
 
         # Metal symbols to Alpha Vantage currency codes
         self._symbol_map = {
@@ -36,30 +34,23 @@ class MetalPriceService:
             "palladium": Decimal("1050.00"),
         }
 
-    async def close(self):
-        await self._client.aclose()
+    @property
+    def is_configured(self) -> bool:
+        return bool(self._api_key)
+
+    def supports(self, metal: str) -> bool:
+        return metal.lower() in self._symbol_map
 
-    async def get_spot_price(self, metal: str) -> Decimal:
-        """Fetch the current spot price per troy ounce in USD."""
+    def mock_price(self, metal: str) -> Decimal:
+        return self._mock_prices.get(metal.lower(), Decimal("0.00"))
+
+    async def fetch_spot_price(self, metal: str) -> Decimal | None:
+        """Fetch the spot price per troy ounce in USD; None if unavailable."""
         metal = metal.lower()
         av_symbol = self._symbol_map.get(metal)
-
         if not av_symbol:
             raise ValueError(f"Unsupported metal: {metal}")
 
-        # Check cache
-        now = time.time()
-        if av_symbol in self._cache:
-            price, timestamp = self._cache[av_symbol]
-            if now - timestamp < self._cache_ttl:
-                return price
-
-        if not self._api_key:
-            logger.warning(
-                "Alpha Vantage API key not set, using mock price for %s", metal
-            )
-            return self._mock_prices.get(metal, Decimal("0.00"))
-
         params = {
             "function": "CURRENCY_EXCHANGE_RATE",
             "from_currency": av_symbol,
@@ -67,30 +58,20 @@ class MetalPriceService:
             "apikey": self._api_key,
         }
 
-        try:
-            response = await self._client.get(self._base_url, params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            rate_data = data.get("Realtime Currency Exchange Rate")
-            if rate_data and "5. Exchange Rate" in rate_data:
-                price = Decimal(rate_data["5. Exchange Rate"])
-                self._cache[av_symbol] = (price, now)
-                return price
-
-            # Error handling
-            if "Note" in data:
-                logger.warning("Alpha Vantage rate limit hit: %s", data["Note"])
-
-            # Fallback to cache if expired
-            if av_symbol in self._cache:
-                return self._cache[av_symbol][0]
+        response = await http_clients.get("alpha_vantage").get(
+            self._base_url, params=params
+        )
+        response.raise_for_status()
+        data = response.json()
 
-            return self._mock_prices.get(metal, Decimal("0.00"))
+        rate_data = data.get("Realtime Currency Exchange Rate")
+        if rate_data and "5. Exchange Rate" in rate_data:
+            return Decimal(rate_data["5. Exchange Rate"])
 
-        except Exception as e:
-            logger.error("Error fetching metal price for %s: %s", metal, str(e))
-            return self._mock_prices.get(metal, Decimal("0.00"))
+        # Error handling
+        if "Note" in data:
+            logger.warning("Alpha Vantage rate limit hit: %s", data["Note"])
+        return None
 
 
 # Global instance
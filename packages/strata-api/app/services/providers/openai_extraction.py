@@ -73,6 +73,9 @@ class OpenAIExtractionProvider(ExtractionProvider):
         )
         return OPENAI_DEFAULT_MODEL
 
+    def model_name(self) -> str:
+        return self._resolve_model()
+
     def supported_mime_types(self) -> list[str]:
         # OpenAI Chat Completions vision supports images only — not PDF.
         return [
@@ -1,5 +1,6 @@
 import hashlib
 import logging
+from collections.abc import Callable
 from datetime import date
 from decimal import Decimal
 from typing import Any
@@ -17,11 +18,13 @@ try:
     from plaid.model.item_remove_request import ItemRemoveRequest
     from plaid.model.link_token_create_request import LinkTokenCreateRequest
     from plaid.model.link_token_create_request_user import LinkTokenCreateRequestUser
+    from plaid.model.link_token_transactions import LinkTokenTransactions
     from plaid.model.products import Products
     from plaid.model.transactions_get_request import TransactionsGetRequest
     from plaid.model.transactions_get_request_options import (
         TransactionsGetRequestOptions,
     )
+    from plaid.model.transactions_sync_request import TransactionsSyncRequest
 except ModuleNotFoundError:  # pragma: no cover
     # Plaid is an optional dependency for development/test environments.
     plaid_api = None  # type: ignore[assignment]
@@ -34,15 +37,18 @@ except ModuleNotFoundError:  # pragma: no cover
     ItemRemoveRequest = None  # type: ignore[assignment]
     LinkTokenCreateRequest = None  # type: ignore[assignment]
     LinkTokenCreateRequestUser = None  # type: ignore[assignment]
+    LinkTokenTransactions = None  # type: ignore[assignment]
     Products = None  # type: ignore[assignment]
     TransactionsGetRequest = None  # type: ignore[assignment]
     TransactionsGetRequestOptions = None  # type: ignore[assignment]
+    TransactionsSyncRequest = None  # type: ignore[assignment]
 
 from app.core.config import settings
 from app.models.cash_account import CashAccountType
 from app.models.connection import Connection
 from app.schemas.action_capability import ActionCapability
 from app.services.providers.base_banking import (
+    BankTransactionUpdates,
     BaseBankingProvider,
     LinkSession,
     NormalizedBankAccount,
@@ -51,6 +57,9 @@ from app.services.providers.base_banking import (
 
 logger = logging.getLogger(__name__)
 
+_SYNC_PAGE_SIZE = 500
+_MAX_SYNC_RESTARTS = 3
+
 
 def _safe_get(obj: Any, *keys: str, default: Any = None) -> Any:
     """Safely get nested attributes or dict keys from an object."""
@@ -64,10 +73,31 @@ def _safe_get(obj: Any, *keys: str, default: Any = None) -> Any:
     return obj if obj is not None else default
 
 
+_shared_clients: dict[tuple[str, str, str], Any] = {}
+
+
+def _get_shared_client(host: str, client_id: str, secret: str) -> Any:
+    """Return a process-wide PlaidApi so its HTTP connection pool is reused."""
+    key = (host, client_id, secret)
+    client = _shared_clients.get(key)
+    if client is None:
+        configuration = Configuration(
+            host=host,
+            api_key={"clientId": client_id, "secret": secret},
+        )
+        configuration.connection_pool_maxsize = max(
+            1, settings.banking_provider_max_concurrency
+        )
+        client = plaid_api.PlaidApi(ApiClient(configuration))
+        _shared_clients[key] = client
+    return client
+
+
 class PlaidProvider(BaseBankingProvider):
     """Plaid banking provider implementation."""
 
     provider_name: str = "plaid"
+    supports_transaction_cursor: bool = True
 
     def get_capabilities(self) -> list[ActionCapability]:
         """Return Plaid capabilities."""
@@ -102,15 +132,18 @@ class PlaidProvider(BaseBankingProvider):
         host = self._ENVIRONMENT_HOSTS.get(
             settings.plaid_environment, self._ENVIRONMENT_HOSTS["sandbox"]
         )
-        configuration = Configuration(
-            host=host,
-            api_key={
-                "clientId": settings.plaid_client_id,
-                "secret": settings.plaid_secret,
-            },
+        self.client = _get_shared_client(
+            host, settings.plaid_client_id, settings.plaid_secret
+        )
+
+    async def _call(self, method: Callable[..., Any], request: Any) -> Any:
+        """Invoke a blocking PlaidApi method off the event loop with a timeout."""
+        return await self.run_blocking(
+            method,
+            request,
+            # Socket-level timeout so the worker thread is freed as well.
+            _request_timeout=settings.banking_provider_timeout_seconds,
         )
-        api_client = ApiClient(configuration)
-        self.client = plaid_api.PlaidApi(api_client)
 
     def _get_plaid_user_id(self, user_id: str) -> str:
         """Generate deterministic Plaid client_user_id from internal user ID."""
@@ -131,9 +164,13 @@ class PlaidProvider(BaseBankingProvider):
             country_codes=[CountryCode("US")],
             language="en",
             redirect_uri=redirect_uri,
+            # History available to the first /transactions/sync call.
+            transactions=LinkTokenTransactions(
+                days_requested=min(settings.banking_history_days, 730)
+            ),
         )
 
-        response = self.client.link_token_create(request)
+        response = await self._call(self.client.link_token_create, request)
 
         return LinkSession(
             link_token=response.link_token,
@@ -147,7 +184,9 @@ class PlaidProvider(BaseBankingProvider):
     ) -> dict:
         """Exchange a public token for an access token."""
         request = ItemPublicTokenExchangeRequest(public_token=public_token)
-        response = self.client.item_public_token_exchange(request)
+        response = await self._call(
+            self.client.item_public_token_exchange, request
+        )
 
         return {
             "access_token": response.access_token,
@@ -237,7 +276,7 @@ class PlaidProvider(BaseBankingProvider):
         access_token = self._get_credentials(connection)
 
         request = AccountsGetRequest(access_token=access_token)
-        response = self.client.accounts_get(request)
+        response = await self._call(self.client.accounts_get, request)
 
         # Get institution name from item if available
         institution_name = None
@@ -249,7 +288,9 @@ class PlaidProvider(BaseBankingProvider):
                         institution_id=institution_id,
                         country_codes=[CountryCode("US")],
                     )
-                    inst_response = self.client.institutions_get_by_id(inst_request)
+                    inst_response = await self._call(
+                        self.client.institutions_get_by_id, inst_request
+                    )
                     institution_name = inst_response.institution.name
                 except Exception as e:
                     logger.warning(f"Failed to get institution name: {e}")
@@ -310,7 +351,7 @@ class PlaidProvider(BaseBankingProvider):
                     offset=offset,
                 ),
             )
-            response = self.client.transactions_get(request)
+            response = await self._call(self.client.transactions_get, request)
             total_transactions = response.total_transactions
 
             for txn in response.transactions:
@@ -321,6 +362,61 @@ class PlaidProvider(BaseBankingProvider):
 
         return all_transactions
 
+    async def get_transaction_updates(
+        self,
+        connection: Connection,
+        cursor: str | None,
+    ) -> BankTransactionUpdates:
+        """Page through /transactions/sync from ``cursor`` until caught up."""
+        access_token = self._get_credentials(connection)
+
+        for _ in range(_MAX_SYNC_RESTARTS):
+            added: list[NormalizedBankTransaction] = []
+            modified: list[NormalizedBankTransaction] = []
+            removed: list[str] = []
+            next_cursor = cursor
+            has_more = True
+
+            try:
+                while has_more:
+                    request_kwargs: dict[str, Any] = {
+                        "access_token": access_token,
+                        "count": _SYNC_PAGE_SIZE,
+                    }
+                    if next_cursor:
+                        request_kwargs["cursor"] = next_cursor
+                    response = await self._call(
+                        self.client.transactions_sync,
+                        TransactionsSyncRequest(**request_kwargs),
+                    )
+                    added.extend(self._normalize_transaction(t) for t in response.added)
+                    modified.extend(
+                        self._normalize_transaction(t) for t in response.modified
+                    )
+                    removed.extend(
+                        t.transaction_id for t in response.removed if t.transaction_id
+                    )
+                    next_cursor = response.next_cursor
+                    has_more = response.has_more
+            except Exception as e:
+                # Plaid asks clients to restart pagination from the original
+                # cursor when data changes mid-pagination.
+                if "TRANSACTIONS_SYNC_MUTATION_DURING_PAGINATION" in str(
+                    getattr(e, "body", "")
+                ):
+                    logger.info("Plaid data changed during pagination; restarting")
+                    continue
+                raise
+
+            return BankTransactionUpdates(
+                added=added,
+                modified=modified,
+                removed=removed,
+                next_cursor=next_cursor or "",
+            )
+
+        raise RuntimeError("Plaid transactions kept changing during pagination")
+
     async def delete_connection(
         self,
         connection: Connection,
@@ -334,7 +430,7 @@ class PlaidProvider(BaseBankingProvider):
 
         try:
             request = ItemRemoveRequest(access_token=access_token)
-            self.client.item_remove(request)
+            await self._call(self.client.item_remove, request)
         except Exception as e:
             # Log but don't fail if we can't delete from Plaid
             logger.warning(f"Failed to remove Plaid Item: {e}")
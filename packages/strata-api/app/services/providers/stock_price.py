@@ -1,17 +1,21 @@
 import logging
-import time
 from decimal import Decimal
 
-import httpx
-from fastapi import HTTPException
-
 from app.core.config import settings
+from app.services.http_clients import http_clients
 
 logger = logging.getLogger(__name__)
 
 
 class StockPriceService:
-    """Service to fetch real-time stock prices using Alpha Vantage."""
+    """Fetch stock quotes and crypto exchange rates from Alpha Vantage.
+
+    Calls go straight to the upstream. Callers should read prices through
+    ``app.services.market_prices.market_price_service``, which caches them
+    across workers and keeps within the free-tier quota.
+    """
+
+    MOCK_STOCK_PRICE = Decimal("150.00")
 
     _MOCK_CRYPTO_PRICES: dict[str, Decimal] = {
         "ETH": Decimal("2300.00"),
@@ -25,118 +29,62 @@ class StockPriceService:
     def __init__(self):
         self._api_key = settings.alpha_vantage_api_key
         self._base_url = "https://www.alphavantage.co/query"
-        # Simple in-memory cache to stay within free tier limits
-        # symbol -> (price, timestamp)
-        self._cache: dict[str, tuple[Decimal, float]] = {}
-        self._cache_ttl = 3600  # 1 hour cache for demo purposes
 
-    async def get_price(self, symbol: str) -> Decimal:
-        """Fetch the current price for a stock symbol."""
-        symbol = symbol.upper()
+    @property
+    def is_configured(self) -> bool:
+        return bool(self._api_key)
 
-        # Check cache
-        now = time.time()
-        if symbol in self._cache:
-            price, timestamp = self._cache[symbol]
-            if now - timestamp < self._cache_ttl:
-                return price
-
-        if not self._api_key:
-            logger.warning(
-                "Alpha Vantage API key not set, using mock price for %s", symbol
-            )
-            return Decimal("150.00")  # Mock fallback
+    def mock_crypto_price(self, symbol: str) -> Decimal:
+        return self._MOCK_CRYPTO_PRICES.get(symbol.upper(), Decimal("1.00"))
 
+    async def fetch_price(self, symbol: str) -> Decimal | None:
+        """Fetch the current price for a stock symbol; None if unavailable."""
+        symbol = symbol.upper()
         params = {"function": "GLOBAL_QUOTE", "symbol": symbol, "apikey": self._api_key}
 
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(self._base_url, params=params)
-                response.raise_for_status()
-                data = response.json()
-
-            if "Global Quote" in data and "05. price" in data["Global Quote"]:
-                price_str = data["Global Quote"]["05. price"]
-                price = Decimal(price_str)
-                self._cache[symbol] = (price, now)
-                return price
-
-            # Handle rate limiting or error messages from Alpha Vantage
-            if "Note" in data:
-                logger.warning("Alpha Vantage rate limit hit: %s", data["Note"])
-            elif "Error Message" in data:
-                logger.error(
-                    "Alpha Vantage error for %s: %s", symbol, data["Error Message"]
-                )
-
-            # Fallback if cache exists but is expired
-            if symbol in self._cache:
-                return self._cache[symbol][0]
-
-            raise HTTPException(
-                status_code=503, detail="Stock price service unavailable"
-            )
-
-        except Exception as e:
-            logger.error("Error fetching stock price for %s: %s", symbol, str(e))
-            # Mock fallback for demo if everything fails
-            return Decimal("150.00")
-
-    async def get_crypto_price(self, symbol: str, market: str = "USD") -> Decimal:
-        """Fetch the current price for a cryptocurrency in a target market."""
+        response = await http_clients.get("alpha_vantage").get(
+            self._base_url, params=params
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        if "Global Quote" in data and "05. price" in data["Global Quote"]:
+            return Decimal(data["Global Quote"]["05. price"])
+
+        # Handle rate limiting or error messages from Alpha Vantage
+        if "Note" in data:
+            logger.warning("Alpha Vantage rate limit hit: %s", data["Note"])
+        elif "Error Message" in data:
+            logger.error("Alpha Vantage error for %s: %s", symbol, data["Error Message"])
+        return None
+
+    async def fetch_crypto_price(
+        self, symbol: str, market: str = "USD"
+    ) -> Decimal | None:
+        """Fetch a cryptocurrency's rate in ``market``; None if unavailable."""
         symbol = symbol.upper()
-        market = market.upper()
-        cache_key = f"CRYPTO_{symbol}_{market}"
-
-        # Check cache
-        now = time.time()
-        if cache_key in self._cache:
-            price, timestamp = self._cache[cache_key]
-            if now - timestamp < self._cache_ttl:
-                return price
-
-        if not self._api_key:
-            logger.warning(
-                "Alpha Vantage API key not set, using mock price for %s", symbol
-            )
-            return self._MOCK_CRYPTO_PRICES.get(symbol, Decimal("1.00"))
-
         params = {
             "function": "CURRENCY_EXCHANGE_RATE",
             "from_currency": symbol,
-            "to_currency": market,
+            "to_currency": market.upper(),
             "apikey": self._api_key,
         }
 
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(self._base_url, params=params)
-                response.raise_for_status()
-                data = response.json()
-
-            rate_key = "Realtime Currency Exchange Rate"
-            if rate_key in data and "5. Exchange Rate" in data[rate_key]:
-                price_str = data[rate_key]["5. Exchange Rate"]
-                price = Decimal(price_str)
-                self._cache[cache_key] = (price, now)
-                return price
-
-            if "Note" in data:
-                logger.warning("Alpha Vantage rate limit hit: %s", data["Note"])
-            elif "Error Message" in data:
-                logger.error(
-                    "Alpha Vantage error for %s: %s", symbol, data["Error Message"]
-                )
-
-            if cache_key in self._cache:
-                return self._cache[cache_key][0]
-
-            # Fallback for common cryptos if service is down and no cache
-            return self._MOCK_CRYPTO_PRICES.get(symbol, Decimal("1.00"))
-
-        except Exception as e:
-            logger.error("Error fetching crypto price for %s: %s", symbol, str(e))
-            return self._MOCK_CRYPTO_PRICES.get(symbol, Decimal("1.00"))
+        response = await http_clients.get("alpha_vantage").get(
+            self._base_url, params=params
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        rate_key = "Realtime Currency Exchange Rate"
+        if rate_key in data and "5. Exchange Rate" in data[rate_key]:
+            return Decimal(data[rate_key]["5. Exchange Rate"])
+
+        if "Note" in data:
+            logger.warning("Alpha Vantage rate limit hit: %s", data["Note"])
+        elif "Error Message" in data:
+            logger.error("Alpha Vantage error for %s: %s", symbol, data["Error Message"])
+        return None
 
 
 # Global instance
@@ -6,6 +6,7 @@ import httpx
 
 from app.core.config import settings
 from app.schemas.physical_asset import VehicleSearchResult
+from app.services.http_clients import http_clients
 
 logger = logging.getLogger(__name__)
 
@@ -16,10 +17,6 @@ class VehicleValuationService:
     def __init__(self):
         self._api_key = settings.kbb_api_key  # Reusing the KBB key slot for now
         self._base_url = "https://marketcheck-prod.apigee.net/v2/stats/car"
-        self._client = httpx.AsyncClient(timeout=10.0)
-
-    async def close(self):
-        await self._client.aclose()
 
     async def get_market_value(
         self, make: str, model: str, year: int, mileage: Optional[int] = None
@@ -42,7 +39,9 @@ class VehicleValuationService:
         }
 
         try:
-            response = await self._client.get(self._base_url, params=params)
+            response = await http_clients.get("marketcheck").get(
+                self._base_url, params=params
+            )
             response.raise_for_status()
             data = response.json()
 
@@ -81,7 +80,9 @@ class VehicleValuationService:
         try:
             # Marketcheck VIN specs endpoint
             url = f"https://marketcheck-prod.apigee.net/v2/specs/{vin}"
-            response = await self._client.get(url, params={"api_key": self._api_key})
+            response = await http_clients.get("marketcheck").get(
+                url, params={"api_key": self._api_key}
+            )
             response.raise_for_status()
             data = response.json()
 
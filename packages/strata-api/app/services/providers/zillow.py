@@ -6,6 +6,7 @@ import httpx
 
 from app.core.config import settings
 from app.schemas.physical_asset import PropertySearchResult
+from app.services.http_clients import http_clients
 
 logger = logging.getLogger(__name__)
 
@@ -17,10 +18,6 @@ class ZillowService:
         self._api_key = settings.zillow_api_key
         # Note: In a real production app, we might use Bridge Interactive (Zillow-owned)
         self._base_url = "https://api.bridgeinteractive.com/api/v1/zestimate"
-        self._client = httpx.AsyncClient(timeout=10.0)
-
-    async def close(self):
-        await self._client.aclose()
 
     async def get_zestimate(self, zpid: str) -> Optional[Decimal]:
         """Fetch the Zestimate for a specific Zillow Property ID."""
@@ -34,7 +31,9 @@ class ZillowService:
         params = {"zpid": zpid, "access_token": self._api_key}
 
         try:
-            response = await self._client.get(self._base_url, params=params)
+            response = await http_clients.get("zillow").get(
+                self._base_url, params=params
+            )
             response.raise_for_status()
             data = response.json()
 
@@ -82,7 +81,7 @@ class ZillowService:
             # Example search endpoint (Bridge API Search)
             search_url = "https://api.bridgeinteractive.com/api/v1/zestimate/search"
             params = {"address": address, "access_token": self._api_key}
-            response = await self._client.get(search_url, params=params)
+            response = await http_clients.get("zillow").get(search_url, params=params)
             response.raise_for_status()
             data = response.json()
 
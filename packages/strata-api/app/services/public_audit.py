@@ -5,6 +5,13 @@ from decimal import Decimal
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.services.document_extraction import DocumentExtractionService
+from app.services.extraction_cache import (
+    ExtractionCacheKey,
+    content_digest,
+    get_public_extraction,
+    store_public_extraction,
+)
+from app.services.session_store import SessionStore
 from app.schemas.agent import DecisionTracePayload, DecisionTraceRuleCheck, ContextQualityResponse, FreshnessStatus
 
 logger = logging.getLogger(__name__)
@@ -14,20 +21,36 @@ class PublicAuditService:
         self._session = session
         self._extraction_service = DocumentExtractionService(session)
 
-    async def run_public_tax_audit(self, file_bytes: bytes, filename: str, mime_type: str) -> DecisionTracePayload:
+    async def run_public_tax_audit(
+        self,
+        file_bytes: bytes,
+        filename: str,
+        mime_type: str,
+        cache: SessionStore | None = None,
+    ) -> DecisionTracePayload:
         """
         Runs an end-to-end tax audit for an unauthenticated user.
-        1. Extract data from document
+        1. Extract data from document (reusing a recent result for the same file
+           from ``cache``, when given)
         2. Run deterministic tax rules
         3. Generate a sanitized Decision Trace
         """
         # 1. Extraction
-        # Note: In a real public scenario, we might want a light version of process_upload
-        # that doesn't persist to the main TaxDocument table if we want true ephemerality.
+        # Nothing is persisted to the TaxDocument table; cached results expire
+        # from the session store after extraction_public_cache_ttl_seconds.
         extracted_data: dict[str, Any] = {}
         try:
             provider = self._extraction_service._get_provider()
-            result = await provider.extract(file_bytes, mime_type, filename)
+            if cache is None:
+                result = await provider.extract(file_bytes, mime_type, filename)
+            else:
+                key = ExtractionCacheKey.for_provider(
+                    provider, content_digest(file_bytes)
+                )
+                result = await get_public_extraction(cache, key)
+                if result is None:
+                    result = await provider.extract(file_bytes, mime_type, filename)
+                    await store_public_extraction(cache, key, result)
             extracted_data = result.fields
         except Exception:
             logger.exception("Public extraction failed for %s", filename)
@@ -0,0 +1,285 @@
+"""Incremental detection of recurring charges from bank transactions.
+
+Debits are grouped by effective merchant into ``RecurringMerchantStats`` rows
+holding the first and last charge dates, the charge count, and amount
+statistics, which is all the cadence check needs: the average interval is
+``(last_date - first_date) / (count - 1)``. Each user has a watermark on
+``bank_transactions.created_at``; a detection pass reads only rows created
+after it, folds them into the stats, and refreshes the ``RecurringItem`` rows
+of the merchants it touched.
+
+Detection runs when a banking sync ingests transactions, so read endpoints
+only select stored rows. Changes that regroup history (removed transactions,
+edited rules or merchant names, deleted accounts) call
+``rebuild_recurring_items`` to start over from a full scan.
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.bank_transaction import BankTransaction
+from app.models.cash_account import CashAccount
+from app.models.everyday import (
+    RecurringCadence,
+    RecurringDetectionCursor,
+    RecurringItem,
+    RecurringMerchantStats,
+    RecurringState,
+)
+from app.services.everyday import (
+    cadence_delta,
+    choose_rule,
+    effective_category,
+    effective_merchant,
+    get_rule_index,
+)
+
+_MERCHANT_LENGTH = 200
+_RECENT_IDS = 24
+_LOOKUP_CHUNK_SIZE = 1000
+
+
+@dataclass
+class RecurringDetectionResult:
+    """Counts from one detection pass."""
+
+    transactions_scanned: int = 0
+    merchants_updated: int = 0
+    items_updated: int = 0
+
+
+def classify_interval(avg_interval: float) -> tuple[RecurringCadence, Decimal] | None:
+    """Map an average charge interval in days to a cadence and confidence."""
+    if 6 <= avg_interval <= 8:
+        return RecurringCadence.weekly, Decimal("0.9000")
+    if 25 <= avg_interval <= 35:
+        return RecurringCadence.monthly, Decimal("0.9500")
+    if 80 <= avg_interval <= 100:
+        return RecurringCadence.quarterly, Decimal("0.8500")
+    return None
+
+
+async def _get_cursor(session: AsyncSession, user_id: uuid.UUID) -> RecurringDetectionCursor:
+    result = await session.execute(
+        select(RecurringDetectionCursor).where(RecurringDetectionCursor.user_id == user_id)
+    )
+    cursor = result.scalar_one_or_none()
+    if cursor is None:
+        cursor = RecurringDetectionCursor(user_id=user_id, scanned_through=None)
+        session.add(cursor)
+    return cursor
+
+
+async def _load_stats(
+    session: AsyncSession, user_id: uuid.UUID, keys: list[str]
+) -> dict[str, RecurringMerchantStats]:
+    loaded: dict[str, RecurringMerchantStats] = {}
+    for i in range(0, len(keys), _LOOKUP_CHUNK_SIZE):
+        result = await session.execute(
+            select(RecurringMerchantStats).where(
+                RecurringMerchantStats.user_id == user_id,
+                RecurringMerchantStats.merchant_key.in_(keys[i : i + _LOOKUP_CHUNK_SIZE]),
+            )
+        )
+        loaded.update((stats.merchant_key, stats) for stats in result.scalars())
+    return loaded
+
+
+async def _load_items(
+    session: AsyncSession, user_id: uuid.UUID, keys: list[str]
+) -> dict[str, RecurringItem]:
+    loaded: dict[str, RecurringItem] = {}
+    for i in range(0, len(keys), _LOOKUP_CHUNK_SIZE):
+        result = await session.execute(
+            select(RecurringItem).where(
+                RecurringItem.user_id == user_id,
+                func.lower(RecurringItem.merchant_name).in_(keys[i : i + _LOOKUP_CHUNK_SIZE]),
+            )
+        )
+        loaded.update((item.merchant_name.lower(), item) for item in result.scalars())
+    return loaded
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite returns naive datetimes for timezone-aware columns.
+    return value if value.tzinfo is not None else value.replace(tzinfo=UTC)
+
+
+def _fold(stats: RecurringMerchantStats, entries: list[tuple[BankTransaction, str, str]]) -> None:
+    recent = list(stats.recent_transaction_ids or [])
+    for tx, merchant, category in entries:
+        amount = abs(tx.amount)
+        stats.occurrence_count += 1
+        stats.amount_total += amount
+        stats.first_date = min(stats.first_date, tx.transaction_date)
+        if tx.transaction_date >= stats.last_date:
+            stats.last_date = tx.transaction_date
+            stats.last_amount = amount
+            stats.merchant_name = merchant
+            stats.category = category
+        recent.append(str(tx.id))
+    stats.recent_transaction_ids = recent[-_RECENT_IDS:]
+
+
+def _apply_stats(
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    stats: RecurringMerchantStats,
+    record: RecurringItem | None,
+) -> bool:
+    """Create or update the recurring item for a merchant; False if not recurring."""
+    if stats.occurrence_count < 2:
+        return False
+    avg_interval = (stats.last_date - stats.first_date).days / (stats.occurrence_count - 1)
+    classified = classify_interval(avg_interval)
+    if classified is None:
+        return False
+    cadence, confidence = classified
+
+    latest_amount = stats.last_amount
+    tolerance = (latest_amount * Decimal("0.15")).quantize(Decimal("0.01"))
+    next_due = stats.last_date + cadence_delta(cadence)
+    last_seen_at = datetime.combine(stats.last_date, datetime.min.time(), tzinfo=UTC)
+    state = RecurringState.active if confidence >= Decimal("0.9000") else RecurringState.review
+
+    if record is None:
+        session.add(
+            RecurringItem(
+                user_id=user_id,
+                name=stats.merchant_name,
+                merchant_name=stats.merchant_name,
+                category=stats.category,
+                cadence=cadence,
+                expected_amount=latest_amount,
+                amount_tolerance=tolerance,
+                next_due_date=next_due,
+                last_seen_at=last_seen_at,
+                confidence=confidence,
+                state=state,
+                metadata_json={"source": "transaction_scan"},
+            )
+        )
+        return True
+
+    record.name = record.name or stats.merchant_name
+    record.category = record.category or stats.category
+    record.cadence = cadence
+    record.expected_amount = latest_amount
+    record.amount_tolerance = tolerance
+    record.next_due_date = next_due
+    record.last_seen_at = last_seen_at
+    record.confidence = confidence
+    if record.state != RecurringState.dismissed:
+        record.state = state
+    return True
+
+
+async def detect_recurring_items(
+    session: AsyncSession, user_id: uuid.UUID
+) -> RecurringDetectionResult:
+    """Fold debits created since the user's watermark into the recurring state.
+
+    The caller commits. Postgres stamps ``created_at`` with each transaction's
+    start time, so a sync that committed after the previous pass can hold rows
+    dated slightly before the watermark; rows are therefore re-read over
+    ``recurring_detection_overlap_seconds`` and skipped if their id is in the
+    cursor's ``overlap_transaction_ids``.
+    """
+    result = RecurringDetectionResult()
+    cursor = await _get_cursor(session, user_id)
+
+    query = (
+        select(BankTransaction)
+        .join(CashAccount)
+        .where(CashAccount.user_id == user_id, BankTransaction.amount < 0)
+    )
+    if cursor.scanned_through is not None:
+        overlap = timedelta(seconds=settings.recurring_detection_overlap_seconds)
+        query = query.where(BankTransaction.created_at > cursor.scanned_through - overlap)
+    tx_result = await session.execute(
+        query.order_by(BankTransaction.transaction_date, BankTransaction.created_at)
+    )
+    txs = tx_result.scalars().all()
+    result.transactions_scanned = len(txs)
+    if not txs:
+        return result
+
+    rules = await get_rule_index(session, user_id)
+    grouped: defaultdict[str, list[tuple[BankTransaction, str, str]]] = defaultdict(list)
+    for tx in txs:
+        rule = choose_rule(rules, tx)
+        merchant = effective_merchant(tx, rule)[:_MERCHANT_LENGTH]
+        grouped[merchant.lower()].append((tx, merchant, effective_category(tx, rule)))
+
+    existing_stats = await _load_stats(session, user_id, list(grouped))
+    counted_in_overlap = set(cursor.overlap_transaction_ids or [])
+    touched: list[RecurringMerchantStats] = []
+    for key, entries in grouped.items():
+        stats = existing_stats.get(key)
+        counted = counted_in_overlap | set(
+            stats.recent_transaction_ids or [] if stats else []
+        )
+        new_entries = [entry for entry in entries if str(entry[0].id) not in counted]
+        if not new_entries:
+            continue
+        if stats is None:
+            first_tx, merchant, category = new_entries[0]
+            stats = RecurringMerchantStats(
+                user_id=user_id,
+                merchant_key=key,
+                merchant_name=merchant,
+                category=category,
+                first_date=first_tx.transaction_date,
+                last_date=first_tx.transaction_date,
+                occurrence_count=0,
+                amount_total=Decimal("0.00"),
+                last_amount=Decimal("0.00"),
+                recent_transaction_ids=[],
+            )
+            session.add(stats)
+        _fold(stats, new_entries)
+        touched.append(stats)
+
+    newest = max(tx.created_at for tx in txs)
+    if cursor.scanned_through is None or newest > cursor.scanned_through:
+        cursor.scanned_through = newest
+    # Every row read is now counted, and the read covered the whole window
+    # the next pass will re-read, so this is the full set to skip next time.
+    window_start = cursor.scanned_through - timedelta(
+        seconds=settings.recurring_detection_overlap_seconds
+    )
+    cursor.overlap_transaction_ids = [
+        str(tx.id) for tx in txs if _as_utc(tx.created_at) > _as_utc(window_start)
+    ]
+
+    result.merchants_updated = len(touched)
+    if touched:
+        items = await _load_items(session, user_id, [stats.merchant_key for stats in touched])
+        for stats in touched:
+            if _apply_stats(session, user_id, stats, items.get(stats.merchant_key)):
+                result.items_updated += 1
+
+    await session.flush()
+    return result
+
+
+async def rebuild_recurring_items(
+    session: AsyncSession, user_id: uuid.UUID
+) -> RecurringDetectionResult:
+    """Discard the user's merchant stats and watermark, then rescan all debits."""
+    await session.execute(
+        delete(RecurringMerchantStats).where(RecurringMerchantStats.user_id == user_id)
+    )
+    await session.execute(
+        delete(RecurringDetectionCursor).where(RecurringDetectionCursor.user_id == user_id)
+    )
+    return await detect_recurring_items(session, user_id)
@@ -0,0 +1,163 @@
+"""Compiled matcher for a user's transaction rules.
+
+Rules match on the lowercased ``"<merchant> <name>"`` text of a transaction,
+either exactly or as a substring, and the earliest active rule wins. Instead
+of testing every rule against every transaction, the contains-rules are
+compiled into an Aho-Corasick automaton so one pass over the text finds the
+winning rule regardless of how many rules the user has.
+
+Compiled automata are cached per user in an in-process LRU keyed on a
+fingerprint of the rules that affect matching, so a stale entry is never
+used even when another worker edited the rules. The rule CRUD endpoints also
+drop the entry eagerly via ``invalidate_rule_index``.
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections import OrderedDict, deque
+from collections.abc import Sequence
+from typing import Protocol
+
+from app.core.config import settings
+from app.models.everyday import RuleMatchMode, TransactionRule
+
+# Sentinel position meaning "no rule"; larger than any real rule position.
+_NO_MATCH = 1 << 62
+
+_Fingerprint = tuple[tuple[uuid.UUID, str, str, bool], ...]
+
+
+class _MatchableTransaction(Protocol):
+    merchant_name: str | None
+    name: str
+
+
+def normalize_match_text(tx: _MatchableTransaction) -> str:
+    return f"{tx.merchant_name or ''} {tx.name}".strip().lower()
+
+
+def _needle(rule: TransactionRule) -> str:
+    return rule.match_text.strip().lower()
+
+
+def rule_fingerprint(rules: Sequence[TransactionRule]) -> _Fingerprint:
+    """Everything about an ordered rule list that changes which rule matches."""
+    return tuple(
+        (rule.id, rule.match_text, RuleMatchMode(rule.match_mode).value, rule.is_active)
+        for rule in rules
+    )
+
+
+class RuleAutomaton:
+    """Rule positions reachable from match text, independent of rule objects.
+
+    Each automaton node stores the lowest rule position among the needles
+    ending there, merged along failure links at build time, so matching
+    is a single pass that keeps a running minimum.
+    """
+
+    def __init__(self, rules: Sequence[TransactionRule]) -> None:
+        self._exact: dict[str, int] = {}
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._best: list[int] = [_NO_MATCH]
+
+        for position, rule in enumerate(rules):
+            needle = _needle(rule)
+            if not rule.is_active or not needle:
+                continue
+            if rule.match_mode == RuleMatchMode.exact:
+                self._exact.setdefault(needle, position)
+            else:
+                self._insert(needle, position)
+        self._link()
+
+    def _insert(self, needle: str, position: int) -> None:
+        node = 0
+        for char in needle:
+            nxt = self._goto[node].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._best.append(_NO_MATCH)
+            node = nxt
+        self._best[node] = min(self._best[node], position)
+
+    def _link(self) -> None:
+        goto, fail, best = self._goto, self._fail, self._best
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in goto[node].items():
+                queue.append(child)
+                state = fail[node]
+                while state and char not in goto[state]:
+                    state = fail[state]
+                target = goto[state].get(char, 0)
+                fail[child] = target if target != child else 0
+                best[child] = min(best[child], best[fail[child]])
+
+    @property
+    def is_empty(self) -> bool:
+        return not self._exact and len(self._goto) == 1
+
+    def match_position(self, text: str) -> int | None:
+        """Lowest position of an active rule matching ``text``, if any."""
+        found = self._exact.get(text, _NO_MATCH)
+        goto, fail, best = self._goto, self._fail, self._best
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if best[node] < found:
+                found = best[node]
+        return None if found == _NO_MATCH else found
+
+
+class RuleIndex:
+    """A user's current rules paired with their compiled automaton."""
+
+    def __init__(self, rules: Sequence[TransactionRule], automaton: RuleAutomaton) -> None:
+        self.rules = list(rules)
+        self._automaton = automaton
+
+    @classmethod
+    def compile(cls, rules: Sequence[TransactionRule]) -> RuleIndex:
+        return cls(rules, RuleAutomaton(rules))
+
+    def match(self, tx: _MatchableTransaction) -> TransactionRule | None:
+        if self._automaton.is_empty:
+            return None
+        position = self._automaton.match_position(normalize_match_text(tx))
+        return None if position is None else self.rules[position]
+
+
+_cache: OrderedDict[uuid.UUID, tuple[_Fingerprint, RuleAutomaton]] = OrderedDict()
+
+
+def build_rule_index(user_id: uuid.UUID, rules: Sequence[TransactionRule]) -> RuleIndex:
+    """Return an index for ``rules``, reusing the user's cached automaton."""
+    fingerprint = rule_fingerprint(rules)
+    entry = _cache.get(user_id)
+    if entry is not None and entry[0] == fingerprint:
+        _cache.move_to_end(user_id)
+        return RuleIndex(rules, entry[1])
+
+    automaton = RuleAutomaton(rules)
+    _cache[user_id] = (fingerprint, automaton)
+    _cache.move_to_end(user_id)
+    while len(_cache) > settings.transaction_rule_index_max_entries:
+        _cache.popitem(last=False)
+    return RuleIndex(rules, automaton)
+
+
+def invalidate_rule_index(user_id: uuid.UUID) -> None:
+    _cache.pop(user_id, None)
+
+
+def clear_rule_index_cache() -> None:
+    _cache.clear()
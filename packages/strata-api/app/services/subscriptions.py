@@ -1,13 +1,11 @@
 import logging
 import uuid
-from collections import defaultdict
 from decimal import Decimal
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.bank_transaction import BankTransaction
-from app.models.cash_account import CashAccount
+from app.models.everyday import RecurringCadence, RecurringItem, RecurringState
 
 logger = logging.getLogger(__name__)
 
@@ -17,80 +15,47 @@ class SubscriptionService:
         self._session = session
 
     async def detect_subscriptions(self, user_id: uuid.UUID) -> dict:
-        """Scan transactions for recurring billing patterns."""
-        # 1. Fetch last 120 days of transactions to find patterns
+        """Summarize recurring billing patterns found at sync time.
+
+        Charges are detected incrementally by ``recurring_detection`` as
+        transactions are ingested; this reads the resulting recurring items
+        the user has not dismissed.
+        """
         result = await self._session.execute(
-            select(BankTransaction)
-            .join(CashAccount)
-            .where(
-                CashAccount.user_id == user_id,
-                BankTransaction.amount < 0,  # Only debits
+            select(RecurringItem).where(
+                RecurringItem.user_id == user_id,
+                RecurringItem.state != RecurringState.dismissed,
             )
-            .order_by(BankTransaction.transaction_date.desc())
         )
-        transactions = result.scalars().all()
-
-        # 2. Group by merchant/name
-        merchant_groups = defaultdict(list)
-        for tx in transactions:
-            key = tx.merchant_name or tx.name
-            merchant_groups[key.lower()].append(tx)
 
         subscriptions = []
         total_monthly_burn = Decimal("0.00")
 
-        # 3. Analyze groups for recurrence
-        for merchant, txs in merchant_groups.items():
-            if len(txs) < 2:
-                continue
-
-            # Sort by date
-            txs.sort(key=lambda x: x.transaction_date)
-
-            # Check intervals
-            intervals = []
-            for i in range(len(txs) - 1):
-                delta = (txs[i + 1].transaction_date - txs[i].transaction_date).days
-                intervals.append(delta)
-
-            # Simple check for monthly (25-35 days) or weekly (6-8 days) patterns
-            avg_interval = sum(intervals) / len(intervals)
-            is_recurring = False
-            frequency = "unknown"
-
-            if 25 <= avg_interval <= 35:
-                is_recurring = True
-                frequency = "monthly"
-            elif 6 <= avg_interval <= 8:
-                is_recurring = True
-                frequency = "weekly"
-            elif 80 <= avg_interval <= 100:
-                is_recurring = True
-                frequency = "quarterly"
-
-            if is_recurring:
-                latest_amount = abs(txs[-1].amount)
-                monthly_impact = (
-                    latest_amount
-                    if frequency == "monthly"
-                    else (
-                        latest_amount * 4
-                        if frequency == "weekly"
-                        else latest_amount / 3
-                    )
+        for item in result.scalars().all():
+            amount = item.expected_amount
+            monthly_impact = (
+                amount
+                if item.cadence == RecurringCadence.monthly
+                else (
+                    amount * 4
+                    if item.cadence == RecurringCadence.weekly
+                    else amount / 3
                 )
+            )
 
-                subscriptions.append(
-                    {
-                        "merchant": txs[-1].merchant_name or txs[-1].name,
-                        "amount": float(latest_amount),
-                        "frequency": frequency,
-                        "last_date": txs[-1].transaction_date.isoformat(),
-                        "monthly_impact": float(monthly_impact),
-                        "category": txs[-1].primary_category,
-                    }
-                )
-                total_monthly_burn += monthly_impact
+            subscriptions.append(
+                {
+                    "merchant": item.merchant_name,
+                    "amount": float(amount),
+                    "frequency": item.cadence.value,
+                    "last_date": (
+                        item.last_seen_at.date().isoformat() if item.last_seen_at else None
+                    ),
+                    "monthly_impact": float(monthly_impact),
+                    "category": item.category,
+                }
+            )
+            total_monthly_burn += monthly_impact
 
         # Sort by impact
         subscriptions.sort(key=lambda x: x["monthly_impact"], reverse=True)
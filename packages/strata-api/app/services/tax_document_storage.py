@@ -0,0 +1,146 @@
+"""Local file storage for uploaded tax documents awaiting extraction.
+
+Uploads are written under ``settings.extraction_upload_dir`` (a temporary
+directory by default), named by document ID, and removed once the document's
+extraction job finishes or the document is deleted. The directory must be
+shared by every API worker that can pick up extraction jobs.
+
+Request bodies are streamed to a staging file in the same directory in
+fixed-size chunks, hashing and counting bytes as they arrive, so an upload
+never has to fit in memory. Once its document exists, the staged file is
+renamed into place.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import os
+import tempfile
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.core.config import settings
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MB
+
+
+class UploadTooLargeError(ValueError):
+    """The upload exceeded the size limit while it was being streamed."""
+
+
+@dataclass(frozen=True)
+class StagedUpload:
+    path: Path
+    size: int
+    sha256: str
+
+
+def upload_dir() -> Path:
+    if settings.extraction_upload_dir:
+        return Path(settings.extraction_upload_dir)
+    return Path(tempfile.gettempdir()) / "strata-tax-uploads"
+
+
+def upload_path(document_id: uuid.UUID) -> Path:
+    return upload_dir() / f"{document_id}.bin"
+
+
+def _write(document_id: uuid.UUID, file_bytes: bytes) -> None:
+    path = upload_path(document_id)
+    path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    # Write to a sibling and rename so a worker never reads a partial file.
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".upload-")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(file_bytes)
+        os.replace(tmp_name, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp_name)
+        raise
+
+
+def _remove(document_ids: list[uuid.UUID]) -> None:
+    for document_id in document_ids:
+        with contextlib.suppress(FileNotFoundError):
+            upload_path(document_id).unlink()
+
+
+async def save_upload(document_id: uuid.UUID, file_bytes: bytes) -> None:
+    await asyncio.to_thread(_write, document_id, file_bytes)
+
+
+async def read_upload(document_id: uuid.UUID) -> bytes:
+    """Return the stored bytes; raises FileNotFoundError if they are gone."""
+    return await asyncio.to_thread(upload_path(document_id).read_bytes)
+
+
+async def upload_digest(document_id: uuid.UUID) -> str:
+    """Return the SHA-256 of a stored upload, read in chunks."""
+
+    def _digest() -> str:
+        with upload_path(document_id).open("rb") as handle:
+            return hashlib.file_digest(handle, "sha256").hexdigest()
+
+    return await asyncio.to_thread(_digest)
+
+
+async def upload_exists(document_id: uuid.UUID) -> bool:
+    return await asyncio.to_thread(upload_path(document_id).exists)
+
+
+async def delete_uploads(*document_ids: uuid.UUID) -> None:
+    await asyncio.to_thread(_remove, list(document_ids))
+
+
+def _open_staging() -> tuple[int, str]:
+    directory = upload_dir()
+    directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+    return tempfile.mkstemp(dir=directory, prefix=".staging-")
+
+
+def _unlink(path: Path | str) -> None:
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(path)
+
+
+async def stage_upload(
+    read: Callable[[int], Awaitable[bytes]],
+    max_size: int,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+) -> StagedUpload:
+    """Stream ``read(chunk_size)`` chunks to a staging file until it returns b"".
+
+    Raises UploadTooLargeError as soon as more than ``max_size`` bytes arrive;
+    the partial file is removed.
+    """
+    fd, tmp_name = await asyncio.to_thread(_open_staging)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            while chunk := await read(chunk_size):
+                size += len(chunk)
+                if size > max_size:
+                    raise UploadTooLargeError(
+                        f"File too large (max {max_size // (1024 * 1024)} MB)"
+                    )
+                digest.update(chunk)
+                await asyncio.to_thread(handle.write, chunk)
+    except BaseException:
+        await asyncio.to_thread(_unlink, tmp_name)
+        raise
+    return StagedUpload(path=Path(tmp_name), size=size, sha256=digest.hexdigest())
+
+
+async def commit_staged_upload(staged: StagedUpload, document_id: uuid.UUID) -> None:
+    """Move a staged upload into place as the document's stored file."""
+    await asyncio.to_thread(os.replace, staged.path, upload_path(document_id))
+
+
+async def discard_staged_upload(staged: StagedUpload) -> None:
+    await asyncio.to_thread(_unlink, staged.path)
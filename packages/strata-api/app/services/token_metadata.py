@@ -0,0 +1,132 @@
+"""Persistent cache of token metadata (symbol, name, decimals, logo).
+
+Metadata never changes for a deployed contract, so entries never expire.
+Lookups check a process-local memo first, then the ``token_metadata`` table;
+only contracts missing from both are fetched from the provider.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.upsert import dialect_insert
+from app.models.crypto_wallet import CryptoChain
+from app.models.token_metadata import TokenMetadata
+
+_MEMO_MAX_ENTRIES = 10_000
+
+# (chain, contract address) → metadata in the provider's shape.
+_memo: OrderedDict[tuple[str, str], dict[str, Any]] = OrderedDict()
+
+
+def _remember(chain: str, contract: str, metadata: dict[str, Any]) -> None:
+    _memo[(chain, contract)] = metadata
+    _memo.move_to_end((chain, contract))
+    while len(_memo) > _MEMO_MAX_ENTRIES:
+        _memo.popitem(last=False)
+
+
+def _as_metadata(row: TokenMetadata) -> dict[str, Any]:
+    return {
+        "symbol": row.symbol,
+        "name": row.name,
+        "decimals": row.decimals,
+        "logo": row.logo_url,
+    }
+
+
+class TokenMetadataStore:
+    """Token metadata lookups and writes on one session.
+
+    Safe to share between concurrently fetched chains: database access is
+    serialized, since an ``AsyncSession`` allows one operation at a time.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+        self._lock = asyncio.Lock()
+        self.has_writes = False
+
+    async def get_many(
+        self, chain: CryptoChain, contracts: Iterable[str]
+    ) -> dict[str, dict[str, Any]]:
+        """Return cached metadata for the given (lowercased) contract addresses."""
+        found: dict[str, dict[str, Any]] = {}
+        missing: list[str] = []
+        for contract in dict.fromkeys(contracts):
+            metadata = _memo.get((chain.value, contract))
+            if metadata is None:
+                missing.append(contract)
+            else:
+                _memo.move_to_end((chain.value, contract))
+                found[contract] = metadata
+        if not missing:
+            return found
+
+        async with self._lock:
+            result = await self._session.execute(
+                select(TokenMetadata).where(
+                    TokenMetadata.chain == chain.value,
+                    TokenMetadata.contract_address.in_(missing),
+                )
+            )
+            rows = list(result.scalars())
+        for row in rows:
+            metadata = _as_metadata(row)
+            _remember(chain.value, row.contract_address, metadata)
+            found[row.contract_address] = metadata
+        return found
+
+    async def put_many(
+        self, chain: CryptoChain, entries: dict[str, dict[str, Any]]
+    ) -> None:
+        """Persist newly fetched metadata. Existing entries are left as they are."""
+        rows = [
+            {
+                "chain": chain.value,
+                "contract_address": contract,
+                "symbol": _truncate(metadata.get("symbol"), 64),
+                "name": _truncate(metadata.get("name"), 255),
+                "decimals": metadata.get("decimals"),
+                "logo_url": _truncate(metadata.get("logo"), 1024),
+            }
+            for contract, metadata in entries.items()
+        ]
+        if not rows:
+            return
+        for contract, metadata in entries.items():
+            _remember(chain.value, contract, metadata)
+
+        async with self._lock:
+            insert = dialect_insert(self._session)
+            if insert is None:
+                existing = await self._session.execute(
+                    select(TokenMetadata.contract_address).where(
+                        TokenMetadata.chain == chain.value,
+                        TokenMetadata.contract_address.in_(entries),
+                    )
+                )
+                known = set(existing.scalars())
+                self._session.add_all(
+                    TokenMetadata(**row)
+                    for row in rows
+                    if row["contract_address"] not in known
+                )
+                await self._session.flush()
+            else:
+                stmt = insert(TokenMetadata).values(rows)
+                stmt = stmt.on_conflict_do_nothing(
+                    index_elements=["chain", "contract_address"]
+                )
+                await self._session.execute(stmt)
+            self.has_writes = True
+
+
+def _truncate(value: Any, length: int) -> str | None:
+    return str(value)[:length] if value is not None else None
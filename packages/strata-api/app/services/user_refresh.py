@@ -4,6 +4,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.financial_memory import FinancialMemory
+from app.services.context_cache import bump_data_version
 from app.services.memory_derivation import derive_memory_from_accounts
 from app.services.portfolio_snapshots import create_snapshot_for_user
 
@@ -32,6 +33,9 @@ async def refresh_user_financials(
     commit: bool = True,
 ) -> FinancialMemory:
     memory = await get_or_create_memory(user_id, session)
+    # Syncs write holdings and transactions with bulk statements that the
+    # context cache's flush hook does not see.
+    await bump_data_version(session, user_id)
     await derive_memory_from_accounts(user_id, memory, session)
     await create_snapshot_for_user(session, user_id)
 
@@ -0,0 +1,76 @@
+"""Compare compiled rule matching against the linear rule scan.
+
+Usage: STRATA_DEBUG=true python scripts/benchmark_rule_index.py [--rules 500] [--transactions 50000]
+"""
+
+import argparse
+import random
+import string
+import sys
+import time
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.models.everyday import RuleMatchMode  # noqa: E402
+from app.services.everyday import choose_rule  # noqa: E402
+from app.services.rule_index import RuleIndex  # noqa: E402
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 9)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rules", type=int, default=500)
+    parser.add_argument("--transactions", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    merchants = [f"{_word(rng)} {_word(rng)}" for _ in range(args.rules * 2)]
+    rules = [
+        SimpleNamespace(
+            id=uuid.uuid4(),
+            match_text=rng.choice(merchants).split()[rng.randint(0, 1)],
+            match_mode=RuleMatchMode.exact if rng.random() < 0.1 else RuleMatchMode.contains,
+            is_active=rng.random() > 0.05,
+        )
+        for _ in range(args.rules)
+    ]
+    transactions = [
+        SimpleNamespace(
+            merchant_name=rng.choice(merchants).upper(),
+            name=f"POS DEBIT {rng.randint(1000, 9999)} {rng.choice(merchants)}",
+        )
+        for _ in range(args.transactions)
+    ]
+
+    started = time.perf_counter()
+    index = RuleIndex.compile(rules)
+    compile_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    indexed = [choose_rule(index, tx) for tx in transactions]
+    indexed_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    linear = [choose_rule(rules, tx) for tx in transactions]
+    linear_seconds = time.perf_counter() - started
+
+    mismatches = sum(a is not b for a, b in zip(indexed, linear))
+    matched = sum(rule is not None for rule in indexed)
+    print(f"{args.rules} rules x {args.transactions} transactions ({matched} matched)")
+    print(f"compile:  {compile_seconds * 1000:8.1f} ms")
+    print(f"indexed:  {indexed_seconds * 1000:8.1f} ms")
+    print(f"linear:   {linear_seconds * 1000:8.1f} ms  ({linear_seconds / indexed_seconds:.1f}x)")
+    if mismatches:
+        print(f"ERROR: {mismatches} transactions matched a different rule")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Tests for batched Alchemy JSON-RPC calls and the token metadata cache."""
+
+import json
+from decimal import Decimal
+
+import httpx
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.crypto_wallet import CryptoChain
+from app.models.token_metadata import TokenMetadata
+from app.services import token_metadata
+from app.services.http_clients import http_clients
+from app.services.providers.alchemy import alchemy_provider
+from app.services.token_metadata import TokenMetadataStore
+
+ADDRESSES = [f"0x{n:040x}" for n in (1, 2, 3)]
+TOKEN_COUNT = 50
+
+
+def _contract(n: int) -> str:
+    return f"0xA{n:039X}"
+
+
+class JsonRpcStub:
+    """Local Alchemy stand-in that answers JSON-RPC batch requests."""
+
+    def __init__(self) -> None:
+        self.posts: list[list[str]] = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        batch = json.loads(request.content)
+        self.posts.append([call["method"] for call in batch])
+        return httpx.Response(200, json=[self._answer(call) for call in batch])
+
+    def _answer(self, call: dict) -> dict:
+        method, params = call["method"], call["params"]
+        if method == "eth_getBalance":
+            result: object = hex(2 * 10**18)
+        elif method == "alchemy_getTokenBalances":
+            balances = [
+                {"contractAddress": _contract(n), "tokenBalance": hex(n * 10**6)}
+                for n in range(TOKEN_COUNT)
+            ]
+            result = {"address": params[0], "tokenBalances": balances}
+        elif method == "alchemy_getTokenMetadata":
+            n = int(params[0][3:], 16)
+            result = {"symbol": f"TK{n}", "name": f"Token {n}", "decimals": 6}
+        else:
+            return {"jsonrpc": "2.0", "id": call["id"], "error": {"code": -32601}}
+        return {"jsonrpc": "2.0", "id": call["id"], "result": result}
+
+
+@pytest.fixture
+async def rpc_stub(monkeypatch: pytest.MonkeyPatch):
+    stub = JsonRpcStub()
+    monkeypatch.setattr(alchemy_provider, "_api_key", "test-key")
+    http_clients.use_transport("alchemy", httpx.MockTransport(stub.handler))
+    token_metadata._memo.clear()
+    yield stub
+    http_clients.use_transport("alchemy", None)
+    await http_clients.aclose()
+    token_metadata._memo.clear()
+
+
+@pytest.mark.asyncio
+async def test_many_wallets_and_tokens_need_constant_round_trips(
+    rpc_stub: JsonRpcStub, session: AsyncSession
+) -> None:
+    balances = await alchemy_provider.get_wallet_balances(
+        CryptoChain.ethereum, ADDRESSES, TokenMetadataStore(session)
+    )
+
+    assert len(rpc_stub.posts) == 2
+    assert rpc_stub.posts[1] == ["alchemy_getTokenMetadata"] * (TOKEN_COUNT - 1)
+    for address in ADDRESSES:
+        assert balances[address].native == Decimal("2")
+        tokens = balances[address].tokens
+        assert len(tokens) == TOKEN_COUNT - 1  # the zero balance is dropped
+        assert tokens[0]["symbol"] == "TK1"
+        assert tokens[0]["balance"] == Decimal("1")
+        assert tokens[0]["contract_address"] == _contract(1).lower()
+
+
+@pytest.mark.asyncio
+async def test_token_metadata_is_persisted_and_not_refetched(
+    rpc_stub: JsonRpcStub, session: AsyncSession
+) -> None:
+    await alchemy_provider.get_wallet_balances(
+        CryptoChain.ethereum, ADDRESSES[:1], TokenMetadataStore(session)
+    )
+    await session.commit()
+    stored = await session.scalar(select(func.count()).select_from(TokenMetadata))
+    assert stored == TOKEN_COUNT - 1
+
+    # A fresh process: only the database knows the metadata.
+    token_metadata._memo.clear()
+    rpc_stub.posts.clear()
+    balances = await alchemy_provider.get_wallet_balances(
+        CryptoChain.ethereum, ADDRESSES, TokenMetadataStore(session)
+    )
+
+    assert rpc_stub.posts == [["eth_getBalance", "alchemy_getTokenBalances"] * 3]
+    assert len(balances[ADDRESSES[2]].tokens) == TOKEN_COUNT - 1
+
+
+@pytest.mark.asyncio
+async def test_batches_are_split_and_failed_calls_degrade_to_empty(
+    rpc_stub: JsonRpcStub, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "alchemy_rpc_batch_size", 4)
+
+    balances = await alchemy_provider.get_wallet_balances(
+        CryptoChain.solana, ADDRESSES
+    )
+
+    assert [len(post) for post in rpc_stub.posts] == [4, 2]
+    assert all(b.native == Decimal("0.0") and not b.tokens for b in balances.values())
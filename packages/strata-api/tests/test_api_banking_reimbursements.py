@@ -3,10 +3,17 @@ from decimal import Decimal
 
 import pytest
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.main import app
-from app.models import BankTransaction, CashAccount, CashAccountType, User
+from app.models import (
+    BankTransaction,
+    CashAccount,
+    CashAccountType,
+    MerchantCategoryVote,
+    User,
+)
 
 
 @pytest.fixture
@@ -103,3 +110,29 @@ async def test_patch_reimbursement_requires_ownership(
             json={"reimbursed": True, "memo": "nope"},
         )
         assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_patch_category_records_a_merchant_vote(
+    session: AsyncSession,
+    banking_user: User,
+    headers: dict,
+    bank_tx: BankTransaction,
+) -> None:
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        resp = await client.patch(
+            f"/api/v1/banking/transactions/{bank_tx.id}",
+            headers=headers,
+            json={"primary_category": "TRANSPORTATION"},
+        )
+        assert resp.status_code == 200
+
+    result = await session.execute(
+        select(MerchantCategoryVote).where(
+            MerchantCategoryVote.user_id == banking_user.id
+        )
+    )
+    vote = result.scalar_one()
+    assert vote.category == "transportation"
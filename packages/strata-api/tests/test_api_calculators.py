@@ -0,0 +1,84 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.main import app
+from app.models.user import User
+from app.services.monte_carlo import MonteCarloService
+
+
+@pytest.fixture
+async def calculator_user(session: AsyncSession) -> User:
+    user = User(clerk_id="calculator_user", email="calculator@example.com")
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
+    return user
+
+
+def test_monte_carlo_seed_is_reproducible() -> None:
+    kwargs = dict(
+        current_savings=250_000,
+        monthly_contribution=1_500,
+        years_to_retirement=20,
+        retirement_duration_years=25,
+        desired_annual_income=60_000,
+        iterations=5_000,
+    )
+    first = MonteCarloService.run_retirement_simulation(**kwargs, seed=42)
+    second = MonteCarloService.run_retirement_simulation(**kwargs, seed=42)
+
+    assert first == second
+    assert 0.0 <= first["success_rate"] <= 1.0
+    assert first["years"] == list(range(45))
+    assert len(first["percentiles"]["p50"]) == 45
+    assert first["percentiles"]["p10"][0] <= first["percentiles"]["p90"][0]
+
+
+def test_monte_carlo_depleted_paths_stop_at_zero() -> None:
+    result = MonteCarloService.run_retirement_simulation(
+        current_savings=0,
+        monthly_contribution=0,
+        years_to_retirement=5,
+        retirement_duration_years=10,
+        desired_annual_income=1_000_000,
+        iterations=200,
+        seed=7,
+    )
+
+    # Every path is exhausted in the first retirement year.
+    assert result["success_rate"] == 0.0
+    assert result["years"] == list(range(6))
+    assert result["percentiles"]["p90"][-1] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_retirement_monte_carlo_endpoint(calculator_user: User) -> None:
+    params = {
+        "current_savings": 100000,
+        "monthly_contribution": 1000,
+        "years_to_retirement": 25,
+        "retirement_duration_years": 30,
+        "desired_annual_income": 50000,
+        "iterations": 20000,
+        "seed": 11,
+    }
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        first = await client.get(
+            "/api/v1/calculators/retirement-monte-carlo",
+            params=params,
+            headers={"x-clerk-user-id": calculator_user.clerk_id},
+        )
+        second = await client.get(
+            "/api/v1/calculators/retirement-monte-carlo",
+            params=params,
+            headers={"x-clerk-user-id": calculator_user.clerk_id},
+        )
+
+    assert first.status_code == 200
+    data = first.json()
+    assert data["iterations"] == 20000
+    assert len(data["years"]) == 55
+    assert data == second.json()
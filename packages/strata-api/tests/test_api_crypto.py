@@ -5,9 +5,10 @@ from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.main import app
+from app.models.crypto_wallet import CryptoChain
 from app.models.user import User
-from app.services.providers.alchemy import alchemy_provider
-from app.services.providers.stock_price import stock_price_service
+from app.services.market_prices import market_price_service
+from app.services.providers.alchemy import WalletBalances, alchemy_provider
 
 
 def _url(name: str, **path_params: str) -> str:
@@ -75,31 +76,36 @@ async def test_get_portfolio_aggregates_native_and_token_balances(
         "label": "My ETH Wallet",
     }
 
-    async def fake_get_balance(chain: str, address: str) -> Decimal:
-        assert address == wallet_data["address"]
-        return Decimal("2.5")
+    async def fake_get_wallet_balances(
+        chain: CryptoChain, addresses: list[str], metadata_store=None
+    ) -> dict[str, WalletBalances]:
+        assert addresses == [wallet_data["address"]]
+        return {
+            wallet_data["address"]: WalletBalances(
+                native=Decimal("2.5"),
+                tokens=[
+                    {
+                        "symbol": "USDC",
+                        "name": "USD Coin",
+                        "balance": Decimal("125.5"),
+                        "logo_url": "https://example.com/usdc.png",
+                        "contract_address": (
+                            "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48"
+                        ),
+                    }
+                ],
+            )
+        }
 
-    async def fake_get_token_balances(
-        chain: str, address: str
-    ) -> list[dict[str, object]]:
-        assert address == wallet_data["address"]
-        return [
-            {
-                "symbol": "USDC",
-                "name": "USD Coin",
-                "balance": Decimal("125.5"),
-                "logo_url": "https://example.com/usdc.png",
-                "contract_address": "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48",
-            }
-        ]
-
-    async def fake_get_crypto_price(symbol: str, market: str = "USD") -> Decimal:
+    async def fake_get_prices(symbols, kind="stock") -> dict[str, Decimal]:
+        assert kind == "crypto"
         prices = {"ETH": Decimal("2000"), "USDC": Decimal("1")}
-        return prices[symbol]
+        return {symbol: prices[symbol] for symbol in symbols}
 
-    monkeypatch.setattr(alchemy_provider, "get_balance", fake_get_balance)
-    monkeypatch.setattr(alchemy_provider, "get_token_balances", fake_get_token_balances)
-    monkeypatch.setattr(stock_price_service, "get_crypto_price", fake_get_crypto_price)
+    monkeypatch.setattr(
+        alchemy_provider, "get_wallet_balances", fake_get_wallet_balances
+    )
+    monkeypatch.setattr(market_price_service, "get_prices", fake_get_prices)
 
     async with AsyncClient(
         transport=ASGITransport(app=app), base_url="http://test"
@@ -138,16 +144,17 @@ async def test_add_bitcoin_wallet_and_portfolio(
         "label": "Satoshi Wallet",
     }
 
-    async def fake_get_balance(chain: str, address: str) -> Decimal:
+    async def fake_get_btc_balance(address: str) -> Decimal:
         assert address == wallet_data["address"]
         return Decimal("1.25")
 
-    async def fake_get_crypto_price(symbol: str, market: str = "USD") -> Decimal:
-        assert symbol == "BTC"
-        return Decimal("64000")
+    async def fake_get_prices(symbols, kind="stock") -> dict[str, Decimal]:
+        assert kind == "crypto"
+        assert list(symbols) == ["BTC"]
+        return {"BTC": Decimal("64000")}
 
-    monkeypatch.setattr(alchemy_provider, "get_balance", fake_get_balance)
-    monkeypatch.setattr(stock_price_service, "get_crypto_price", fake_get_crypto_price)
+    monkeypatch.setattr(alchemy_provider, "_get_btc_balance", fake_get_btc_balance)
+    monkeypatch.setattr(market_price_service, "get_prices", fake_get_prices)
 
     async with AsyncClient(
         transport=ASGITransport(app=app), base_url="http://test"
@@ -199,3 +206,55 @@ async def test_delete_all_wallets_clears_tracked_wallets(test_user: User) -> Non
 
     assert list_response.status_code == 200
     assert list_response.json() == []
+
+
+@pytest.mark.asyncio
+async def test_portfolio_reads_stored_balances_unless_refreshed(
+    monkeypatch: pytest.MonkeyPatch, test_user: User
+) -> None:
+    wallet_data = {
+        "address": "0x742d35Cc6634C0532925a3b844Bc454e4438f44e",
+        "chain": "ethereum",
+    }
+    lookups: list[list[str]] = []
+    native = {"balance": Decimal("1.5")}
+
+    async def fake_get_wallet_balances(
+        chain: CryptoChain, addresses: list[str], metadata_store=None
+    ) -> dict[str, WalletBalances]:
+        lookups.append(addresses)
+        return {address: WalletBalances(native=native["balance"]) for address in addresses}
+
+    async def fake_get_prices(symbols, kind="stock") -> dict[str, Decimal]:
+        return {symbol: Decimal("2000") for symbol in symbols}
+
+    monkeypatch.setattr(
+        alchemy_provider, "get_wallet_balances", fake_get_wallet_balances
+    )
+    monkeypatch.setattr(market_price_service, "get_prices", fake_get_prices)
+    headers = {"x-clerk-user-id": test_user.clerk_id}
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        await client.post(_url("add_crypto_wallet"), json=wallet_data, headers=headers)
+        # Never synced: fetched live once, then stored.
+        first = (await client.get(_url("get_crypto_portfolio"), headers=headers)).json()
+        native["balance"] = Decimal("3")
+        cached = (await client.get(_url("get_crypto_portfolio"), headers=headers)).json()
+        refreshed = (
+            await client.get(
+                _url("get_crypto_portfolio"),
+                params={"refresh": "true"},
+                headers=headers,
+            )
+        ).json()
+
+    assert len(lookups) == 2
+    assert first["total_value_usd"] == cached["total_value_usd"] == "3000.00"
+    assert cached["assets"][0]["balance"] == "1.5"
+    assert cached["balances_as_of"] is not None
+    assert cached["data_age_seconds"] >= 0
+    assert cached["wallets"][0]["last_synced_at"] is not None
+    assert refreshed["total_value_usd"] == "6000.00"
+    assert refreshed["wallets"][0]["last_balance_usd"].startswith("6000")
@@ -149,6 +149,44 @@ async def test_transaction_override_updates_spending_summary(
         assert [row["category"] for row in data["categories"]] == ["FOOD_AND_DRINK"]
 
 
+@pytest.mark.asyncio
+async def test_transaction_rule_changes_apply_to_spending_summary(
+    headers: dict[str, str],
+    current_month_transactions: list[BankTransaction],
+) -> None:
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        created = await client.post(
+            "/api/v1/transaction-rules",
+            headers=headers,
+            json={
+                "name": "Lunch",
+                "match_text": "sweetgreen",
+                "primary_category_override": "LUNCH",
+            },
+        )
+        assert created.status_code == 201
+        rule_id = created.json()["id"]
+
+        spending = await client.get("/api/v1/banking/spending-summary?months=1", headers=headers)
+        assert {row["category"] for row in spending.json()["categories"]} == {"LUNCH", "SHOPPING"}
+
+        updated = await client.patch(
+            f"/api/v1/transaction-rules/{rule_id}",
+            headers=headers,
+            json={"match_text": "target"},
+        )
+        assert updated.status_code == 200
+        spending = await client.get("/api/v1/banking/spending-summary?months=1", headers=headers)
+        assert {row["category"] for row in spending.json()["categories"]} == {"FOOD_AND_DRINK", "LUNCH"}
+
+        deleted = await client.delete(f"/api/v1/transaction-rules/{rule_id}", headers=headers)
+        assert deleted.status_code == 200
+        spending = await client.get("/api/v1/banking/spending-summary?months=1", headers=headers)
+        assert {row["category"] for row in spending.json()["categories"]} == {"FOOD_AND_DRINK", "SHOPPING"}
+
+
 @pytest.mark.asyncio
 async def test_consumer_home_includes_goal_and_inbox_signal(
     session: AsyncSession,
@@ -1,3 +1,4 @@
+import uuid
 from datetime import date, timedelta
 from decimal import Decimal
 
@@ -7,6 +8,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.main import app
 from app.models import (
+    CashAccount,
+    CashAccountType,
+    DebtAccount,
+    DebtType,
     Holding,
     Institution,
     InvestmentAccount,
@@ -16,6 +21,13 @@ from app.models import (
     SecurityType,
     User,
 )
+from app.models.physical_asset import (
+    MetalType,
+    PreciousMetalAsset,
+    RealEstateAsset,
+    RealEstateType,
+)
+from app.services.portfolio_metrics import BalanceTotals, get_balance_totals
 
 
 @pytest.fixture
@@ -293,3 +305,70 @@ async def test_portfolio_analysis(
         assert isinstance(data["concentration_risk"]["has_risk"], bool)
         assert isinstance(data["cash_drag"]["has_drag"], bool)
         assert isinstance(data["tax_drag"]["has_drag"], bool)
+
+
+@pytest.mark.asyncio
+async def test_get_balance_totals_sums_every_category(
+    session: AsyncSession,
+    portfolio_user: User,
+    portfolio_data: dict,
+) -> None:
+    other_user = User(clerk_id="portfolio_other", email="other@example.com")
+    session.add(other_user)
+    await session.flush()
+    session.add_all(
+        [
+            CashAccount(
+                user_id=portfolio_user.id,
+                name="Checking",
+                account_type=CashAccountType.checking,
+                balance=Decimal("1500.25"),
+            ),
+            CashAccount(
+                user_id=portfolio_user.id,
+                name="Savings",
+                account_type=CashAccountType.savings,
+                balance=Decimal("500.50"),
+            ),
+            CashAccount(
+                user_id=other_user.id,
+                name="Not mine",
+                account_type=CashAccountType.checking,
+                balance=Decimal("999.00"),
+            ),
+            DebtAccount(
+                user_id=portfolio_user.id,
+                name="Card",
+                debt_type=DebtType.credit_card,
+                balance=Decimal("300.00"),
+                interest_rate=Decimal("24.99"),
+            ),
+            RealEstateAsset(
+                user_id=portfolio_user.id,
+                name="Home",
+                address="1 Main St",
+                property_type=RealEstateType.primary_residence,
+                market_value=Decimal("400000.00"),
+            ),
+            PreciousMetalAsset(
+                user_id=portfolio_user.id,
+                name="Gold",
+                metal_type=MetalType.gold,
+                weight_oz=Decimal("2"),
+                market_value=Decimal("4000.00"),
+            ),
+        ]
+    )
+    await session.commit()
+
+    totals = await get_balance_totals(session, portfolio_user.id)
+
+    assert totals.cash == Decimal("2000.75")
+    assert totals.debt == Decimal("300.00")
+    assert totals.investment == Decimal("100000.00")
+    assert totals.real_estate == Decimal("400000.00")
+    assert totals.vehicles == Decimal("0.00")
+    assert totals.physical == Decimal("404000.00")
+
+    empty = await get_balance_totals(session, uuid.uuid4())
+    assert empty == BalanceTotals()
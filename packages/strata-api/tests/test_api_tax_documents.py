@@ -6,9 +6,31 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 from httpx import ASGITransport, AsyncClient
 
+from app.core.config import settings
 from app.main import app
 from app.schemas.tax_document import ExtractionResult
+from app.services import extraction_jobs
 from app.services.document_extraction import DocumentExtractionService
+from app.services.extraction_jobs import extraction_queue
+from tests.conftest import TestSessionFactory
+
+
+@pytest.fixture(autouse=True)
+async def extraction_workers(monkeypatch: pytest.MonkeyPatch, tmp_path):
+    monkeypatch.setattr(extraction_jobs, "async_session_factory", TestSessionFactory)
+    monkeypatch.setattr(settings, "extraction_upload_dir", str(tmp_path))
+    yield
+    await extraction_queue.shutdown()
+
+
+async def _finished_document(client: AsyncClient, headers: dict, job: dict) -> dict:
+    """Wait for queued extraction jobs, then fetch the job's document."""
+    await extraction_queue.join()
+    resp = await client.get(
+        f"/api/v1/tax-documents/{job['document_id']}", headers=headers
+    )
+    assert resp.status_code == 200
+    return resp.json()
 
 
 def _make_mock_extract(doc_type: str = "w2", confidence: float = 0.9):
@@ -57,8 +79,12 @@ async def test_upload_and_list_tax_documents() -> None:
                 },
                 data={"document_type_hint": "w2"},
             )
-            assert upload_resp.status_code == 200
-            doc = upload_resp.json()
+            assert upload_resp.status_code == 202
+            job = upload_resp.json()
+            assert job["status"] == "pending"
+            assert job["job_id"] == job["document_id"]
+
+            doc = await _finished_document(client, headers, job)
             assert doc["status"] in ("completed", "needs_review")
             assert doc["document_type"] == "w2"
             assert doc["tax_year"] == 2025
@@ -132,8 +158,8 @@ async def test_extraction_failure_sets_failed_status() -> None:
                 headers=headers,
                 files={"file": ("w2.pdf", io.BytesIO(b"fake pdf"), "application/pdf")},
             )
-            assert resp.status_code == 200
-            doc = resp.json()
+            assert resp.status_code == 202
+            doc = await _finished_document(client, headers, resp.json())
             assert doc["status"] == "failed"
             assert doc["error_message"] is not None
 
@@ -144,6 +170,7 @@ def test_provider_factory_returns_correct_providers() -> None:
     service = DocumentExtractionService(session_mock)
 
     for name, cls_name in [
+        ("fake", "FakeExtractionProvider"),
         ("claude", "ClaudeExtractionProvider"),
         ("openai", "OpenAIExtractionProvider"),
         ("gemini", "GeminiExtractionProvider"),
@@ -303,7 +330,7 @@ async def test_extraction_error_message_is_sanitized() -> None:
                 headers=headers,
                 files={"file": ("w2.png", io.BytesIO(b"fake"), "image/png")},
             )
-            doc = resp.json()
+            doc = await _finished_document(client, headers, resp.json())
             assert doc["status"] == "failed"
             # Should only contain the exception class name, not the secret URL/key
             assert "sk-abc123" not in doc["error_message"]
@@ -637,8 +664,9 @@ async def test_delete_tax_document() -> None:
                 headers=headers,
                 files={"file": ("w2_del.png", io.BytesIO(b"fake image"), "image/png")},
             )
-            assert upload_resp.status_code == 200
-            doc_id = upload_resp.json()["id"]
+            assert upload_resp.status_code == 202
+            doc_id = upload_resp.json()["document_id"]
+            await extraction_queue.join()
 
             # Delete it
             del_resp = await client.delete(
@@ -0,0 +1,706 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import httpx
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.connection import Connection, ConnectionStatus
+from app.models.crypto_wallet import CryptoChain, CryptoWallet
+from app.models.physical_asset import (
+    AssetValuation,
+    AssetValuationLookup,
+    RealEstateAsset,
+    ValuationType,
+    VehicleAsset,
+)
+from app.models.user import User
+from app.schemas.physical_asset import PropertySearchResult
+from app.services import asset_revaluation
+from app.services.connection_sync import ChangeCounts, ConnectionSyncResult
+from app.services.jobs import background, cadence
+from app.services.jobs.leases import DatabaseLeaseBackend
+from app.services.market_prices import market_price_service
+from app.services.providers.alchemy import WalletBalances, alchemy_provider
+from app.services.providers.vehicle_valuation import vehicle_valuation_service
+from app.services.providers.zillow import zillow_service
+from tests.conftest import TestSessionFactory
+
+
+@pytest.fixture
+async def sync_user(session: AsyncSession) -> User:
+    user = User(clerk_id="sync_scheduler_user", email="sync@example.com")
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
+    return user
+
+
+@pytest.fixture
+def fast_sync_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(background, "async_session_factory", TestSessionFactory)
+    monkeypatch.setattr(settings, "sync_max_concurrency", 3)
+    monkeypatch.setattr(settings, "sync_provider_concurrency", {"snaptrade": 3})
+    monkeypatch.setattr(settings, "sync_provider_rate_per_second", {})
+    monkeypatch.setattr(settings, "sync_max_retries", 2)
+    monkeypatch.setattr(settings, "sync_retry_base_seconds", 0.0)
+    monkeypatch.setattr(
+        background, "_get_provider_for_connection", lambda connection: object()
+    )
+
+
+@pytest.mark.asyncio
+async def test_run_connection_sync_is_bounded_and_retries(
+    session: AsyncSession,
+    sync_user: User,
+    fast_sync_settings: None,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    now = datetime.now(timezone.utc)
+    connections = [
+        Connection(
+            user_id=sync_user.id,
+            provider="snaptrade",
+            provider_user_id=f"user-{i}",
+            status=ConnectionStatus.active,
+            last_synced_at=now - timedelta(hours=2 + i),
+        )
+        for i in range(8)
+    ]
+    session.add_all(connections)
+    await session.commit()
+    flaky_id = connections[0].id
+
+    in_flight = 0
+    peak = 0
+    attempts: dict = {}
+
+    async def fake_sync(session, connection, provider) -> ConnectionSyncResult:
+        nonlocal in_flight, peak
+        attempts[connection.id] = attempts.get(connection.id, 0) + 1
+        in_flight += 1
+        peak = max(peak, in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if connection.id == flaky_id and attempts[connection.id] == 1:
+                raise httpx.ConnectError("temporary")
+        finally:
+            in_flight -= 1
+        return ConnectionSyncResult()
+
+    monkeypatch.setattr(background, "sync_connection_accounts", fake_sync)
+
+    report = await background.run_connection_sync()
+
+    assert report.total == 8
+    assert report.succeeded == 8
+    assert report.retries == 1
+    assert len(report.durations) == 8
+    assert peak <= 3
+    assert attempts[flaky_id] == 2
+
+    session.expire_all()
+    result = await session.execute(select(Connection))
+    for connection in result.scalars():
+        assert connection.status == ConnectionStatus.active
+        assert connection.last_synced_at is not None
+
+
+@pytest.mark.asyncio
+async def test_run_connection_sync_does_not_queue_behind_a_busy_provider(
+    session: AsyncSession,
+    sync_user: User,
+    fast_sync_settings: None,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "sync_max_concurrency", 2)
+    monkeypatch.setattr(
+        settings, "sync_provider_concurrency", {"snaptrade": 1, "plaid": 1}
+    )
+    now = datetime.now(timezone.utc)
+    # The busy provider's connections are the most overdue, so they are
+    # scheduled first.
+    session.add_all(
+        [
+            Connection(
+                user_id=sync_user.id,
+                provider=provider,
+                provider_user_id=f"{provider}-{i}",
+                status=ConnectionStatus.active,
+                last_synced_at=now - timedelta(hours=10 - i),
+            )
+            for i, provider in enumerate(["snaptrade"] * 4 + ["plaid"])
+        ]
+    )
+    await session.commit()
+
+    events: list[tuple[str, str]] = []
+
+    async def fake_sync(session, connection, provider) -> ConnectionSyncResult:
+        events.append(("start", connection.provider))
+        await asyncio.sleep(0.02)
+        events.append(("end", connection.provider))
+        return ConnectionSyncResult()
+
+    monkeypatch.setattr(background, "sync_connection_accounts", fake_sync)
+
+    report = await background.run_connection_sync()
+
+    assert report.succeeded == 5
+    assert events.index(("start", "plaid")) < events.index(("end", "snaptrade"))
+
+
+@pytest.mark.asyncio
+async def test_run_connection_sync_marks_permanent_failures(
+    session: AsyncSession,
+    sync_user: User,
+    fast_sync_settings: None,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    connection = Connection(
+        user_id=sync_user.id,
+        provider="snaptrade",
+        provider_user_id="broken",
+        status=ConnectionStatus.active,
+    )
+    session.add(connection)
+    await session.commit()
+
+    calls = 0
+
+    async def failing_sync(session, connection, provider) -> None:
+        nonlocal calls
+        calls += 1
+        raise ValueError("bad payload")
+
+    monkeypatch.setattr(background, "sync_connection_accounts", failing_sync)
+
+    report = await background.run_connection_sync()
+
+    assert report.failed == 1
+    assert calls == 1  # non-transient errors are not retried
+    await session.refresh(connection)
+    assert connection.status == ConnectionStatus.error
+    assert connection.error_code == "SYNC_FAILED"
+    assert connection.error_message == "bad payload"
+
+
+@pytest.mark.asyncio
+async def test_run_crypto_sync_batches_wallets_per_chain(
+    session: AsyncSession,
+    sync_user: User,
+    fast_sync_settings: None,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "crypto_sync_batch_size", 2)
+    monkeypatch.setattr(settings, "crypto_sync_max_concurrency", 2)
+    wallets = [
+        CryptoWallet(user_id=sync_user.id, address=f"0x{i:040x}", chain=chain)
+        for i, chain in enumerate([CryptoChain.ethereum] * 5 + [CryptoChain.bitcoin])
+    ]
+    unreachable = wallets[1].address
+    session.add_all(wallets)
+    await session.commit()
+
+    lookups: list[tuple[CryptoChain, list[str]]] = []
+
+    async def fake_get_wallet_balances(chain, addresses, metadata_store=None):
+        lookups.append((chain, addresses))
+        return {
+            address: WalletBalances(fetched=False)
+            if address == unreachable
+            else WalletBalances(native=Decimal(2 if address.endswith("0") else 0))
+            for address in addresses
+        }
+
+    async def fake_get_prices(symbols, kind="stock"):
+        return {symbol: Decimal("1000") for symbol in symbols}
+
+    monkeypatch.setattr(
+        alchemy_provider, "get_wallet_balances", fake_get_wallet_balances
+    )
+    monkeypatch.setattr(market_price_service, "get_prices", fake_get_prices)
+
+    report = await background.run_crypto_sync()
+
+    assert sorted(len(addresses) for _, addresses in lookups) == [1, 1, 2, 2]
+    assert report.total == 6
+    assert report.succeeded == 5
+    assert report.failed == 1
+
+    session.expire_all()
+    result = await session.execute(select(CryptoWallet))
+    synced = {wallet.address: wallet for wallet in result.scalars()}
+    assert synced[wallets[0].address].last_balance_usd == Decimal("2000")
+    assert synced[wallets[2].address].last_balance_usd == Decimal("0")
+    assert synced[wallets[2].address].last_synced_at is not None
+    assert synced[unreachable].last_synced_at is None
+
+    # Synced wallets, including empty ones, are not due again yet, and the
+    # failed lookup backs off instead of being retried every pass.
+    assert synced[wallets[2].address].next_sync_at is not None
+    assert synced[unreachable].next_sync_at is not None
+    lookups.clear()
+    report = await background.run_crypto_sync()
+    assert lookups == []
+
+    # Each further failure doubles the wait, up to the maximum.
+    first_interval = synced[unreachable].sync_interval_seconds
+    unreachable_wallet = synced[unreachable]
+    unreachable_wallet.next_sync_at = datetime.now(timezone.utc) - timedelta(days=1)
+    await session.commit()
+    await background.run_crypto_sync()
+    assert lookups == [(CryptoChain.ethereum, [unreachable])]
+    await session.refresh(unreachable_wallet)
+    assert unreachable_wallet.sync_interval_seconds == min(
+        first_interval * 2, settings.crypto_sync_max_interval_seconds
+    )
+
+
+@pytest.mark.asyncio
+async def test_run_crypto_sync_does_not_queue_behind_a_busy_chain(
+    session: AsyncSession,
+    sync_user: User,
+    fast_sync_settings: None,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "crypto_sync_batch_size", 1)
+    monkeypatch.setattr(settings, "crypto_sync_max_concurrency", 2)
+    monkeypatch.setattr(settings, "crypto_sync_chain_concurrency", 1)
+    now = datetime.now(timezone.utc)
+    # The busy chain's wallets are the most overdue, so they are scheduled
+    # first.
+    session.add_all(
+        [
+            CryptoWallet(
+                user_id=sync_user.id,
+                address=f"0x{i:040x}",
+                chain=chain,
+                next_sync_at=now - timedelta(hours=10 - i),
+            )
+            for i, chain in enumerate(
+                [CryptoChain.ethereum] * 4 + [CryptoChain.bitcoin]
+            )
+        ]
+    )
+    await session.commit()
+
+    events: list[tuple[str, CryptoChain]] = []
+
+    async def slow_get_wallet_balances(chain, addresses, metadata_store=None):
+        events.append(("start", chain))
+        await asyncio.sleep(0.02)
+        events.append(("end", chain))
+        return {address: WalletBalances() for address in addresses}
+
+    monkeypatch.setattr(
+        alchemy_provider, "get_wallet_balances", slow_get_wallet_balances
+    )
+
+    report = await background.run_crypto_sync()
+
+    assert report.succeeded == 5
+    bitcoin_start = events.index(("start", CryptoChain.bitcoin))
+    assert bitcoin_start < events.index(("end", CryptoChain.ethereum))
+
+
+@pytest.mark.asyncio
+async def test_run_crypto_sync_skips_wallets_deleted_mid_batch(
+    session: AsyncSession,
+    sync_user: User,
+    fast_sync_settings: None,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    wallets = [
+        CryptoWallet(
+            user_id=sync_user.id, address=f"0x{i:040x}", chain=CryptoChain.ethereum
+        )
+        for i in range(2)
+    ]
+    session.add_all(wallets)
+    await session.commit()
+    deleted_id, kept_id = wallets[0].id, wallets[1].id
+
+    async def deleting_get_wallet_balances(chain, addresses, metadata_store=None):
+        # The user removes a wallet while its batch's lookup is in flight.
+        async with TestSessionFactory() as other:
+            await other.delete(await other.get(CryptoWallet, deleted_id))
+            await other.commit()
+        return {address: WalletBalances(native=Decimal("1")) for address in addresses}
+
+    async def fake_get_prices(symbols, kind="stock"):
+        return {symbol: Decimal("1000") for symbol in symbols}
+
+    monkeypatch.setattr(
+        alchemy_provider, "get_wallet_balances", deleting_get_wallet_balances
+    )
+    monkeypatch.setattr(market_price_service, "get_prices", fake_get_prices)
+
+    report = await background.run_crypto_sync()
+
+    assert report.retries == 0
+    assert report.succeeded == 1
+    session.expire_all()
+    result = await session.execute(select(CryptoWallet))
+    remaining = result.scalars().all()
+    assert [wallet.id for wallet in remaining] == [kept_id]
+    assert remaining[0].last_balance_usd == Decimal("1000")
+
+
+@pytest.mark.asyncio
+async def test_connection_cadence_adapts_and_active_users_pull_in(
+    session: AsyncSession,
+    sync_user: User,
+    fast_sync_settings: None,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "sync_stale_minutes", 60)
+    monkeypatch.setattr(settings, "sync_min_interval_seconds", 900)
+    monkeypatch.setattr(settings, "sync_max_interval_seconds", 86400)
+    monkeypatch.setattr(settings, "sync_backoff_factor", 2.0)
+    monkeypatch.setattr(settings, "sync_active_user_seconds", 600)
+    monkeypatch.setattr(cadence, "_recent_pull_ins", {})
+    connection = Connection(
+        user_id=sync_user.id,
+        provider="snaptrade",
+        provider_user_id="adaptive",
+        status=ConnectionStatus.active,
+        last_synced_at=datetime.now(timezone.utc) - timedelta(days=1),
+    )
+    session.add(connection)
+    await session.commit()
+
+    outcomes = [
+        ConnectionSyncResult(),
+        ConnectionSyncResult(),
+        ConnectionSyncResult(transactions=ChangeCounts(inserted=3)),
+    ]
+
+    async def fake_sync(session, connection, provider) -> ConnectionSyncResult:
+        return outcomes.pop(0)
+
+    monkeypatch.setattr(background, "sync_connection_accounts", fake_sync)
+
+    intervals = []
+    for _ in range(3):
+        report = await background.run_connection_sync()
+        assert report.total == 1
+        await session.refresh(connection)
+        intervals.append(connection.sync_interval_seconds)
+        # Not due until its next_sync_at, so the next pass is a no-op.
+        assert (await background.run_connection_sync()).total == 0
+        connection.next_sync_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+        await session.commit()
+
+    # Starts at the stale interval, backs off when idle, tightens on change.
+    assert intervals == [3600, 7200, 3600]
+
+    connection.next_sync_at = datetime.now(timezone.utc) + timedelta(days=1)
+    await session.commit()
+    await cadence.pull_in_user_syncs(session, sync_user.id)
+    await session.refresh(connection)
+    next_sync_at = connection.next_sync_at.replace(tzinfo=timezone.utc)
+    assert next_sync_at <= datetime.now(timezone.utc) + timedelta(seconds=600)
+
+
+@pytest.mark.asyncio
+async def test_run_asset_revaluation_shares_lookups_within_daily_quota(
+    session: AsyncSession,
+    sync_user: User,
+    fast_sync_settings: None,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(
+        settings, "asset_revaluation_provider_daily_quota", {"marketcheck": 2}
+    )
+    monkeypatch.setattr(settings, "asset_revaluation_provider_rate_per_second", {})
+    auto = ValuationType.auto
+    recent = datetime.now(timezone.utc) - timedelta(hours=1)
+    homes = [
+        RealEstateAsset(
+            user_id=sync_user.id,
+            name="Home",
+            address="1 Main St",
+            city="Austin",
+            valuation_type=auto,
+            market_value=Decimal("400000"),
+        ),
+        RealEstateAsset(
+            user_id=sync_user.id,
+            name="Same home",
+            address=" 1  MAIN st ",
+            city="austin",
+            valuation_type=auto,
+        ),
+        RealEstateAsset(
+            user_id=sync_user.id,
+            name="Listed",
+            address="9 Elm St",
+            zillow_zpid="42",
+            valuation_type=auto,
+            market_value=Decimal("300000"),
+        ),
+        RealEstateAsset(
+            user_id=sync_user.id,
+            name="Unlisted",
+            address="3 Pine St",
+            zillow_zpid="43",
+            valuation_type=auto,
+        ),
+        RealEstateAsset(
+            user_id=sync_user.id,
+            name="Fresh",
+            address="5 Oak St",
+            valuation_type=auto,
+            last_valuation_at=recent,
+        ),
+    ]
+    cars = [
+        VehicleAsset(
+            user_id=sync_user.id,
+            name="Car",
+            make="Honda",
+            model="Civic",
+            year=2020,
+            mileage=12_000,
+            valuation_type=auto,
+        ),
+        VehicleAsset(
+            user_id=sync_user.id,
+            name="Twin",
+            make="honda",
+            model="Civic ",
+            year=2020,
+            mileage=18_500,
+            valuation_type=auto,
+        ),
+        VehicleAsset(
+            user_id=sync_user.id,
+            name="Over quota",
+            make="Ford",
+            model="F-150",
+            year=2019,
+            valuation_type=auto,
+        ),
+        VehicleAsset(
+            user_id=sync_user.id,
+            name="Manual",
+            make="Honda",
+            model="Civic",
+            year=2020,
+            market_value=Decimal("15000"),
+        ),
+    ]
+    # One marketcheck lookup is still inside the rolling window; the older
+    # one no longer counts and is pruned.
+    now = datetime.now(timezone.utc)
+    session.add_all(
+        [
+            AssetValuationLookup(provider="marketcheck", looked_up_at=recent),
+            AssetValuationLookup(
+                provider="marketcheck", looked_up_at=now - timedelta(days=2)
+            ),
+        ]
+    )
+    session.add_all(homes + cars)
+    await session.commit()
+
+    calls: list[tuple] = []
+
+    async def search_by_address(address):
+        calls.append(("address", address))
+        return [
+            PropertySearchResult(
+                zillow_zpid="7",
+                address=address,
+                city="Austin",
+                state="TX",
+                zip_code="78701",
+                market_value=Decimal("410000"),
+            )
+        ]
+
+    async def get_zestimate(zpid):
+        calls.append(("zpid", zpid))
+        return Decimal("300000.00") if zpid == "42" else None
+
+    async def get_market_value(make, model, year, mileage=None):
+        calls.append(("vehicle", make, model, year, mileage))
+        return Decimal("21000.004")
+
+    monkeypatch.setattr(zillow_service, "search_by_address", search_by_address)
+    monkeypatch.setattr(zillow_service, "get_zestimate", get_zestimate)
+    monkeypatch.setattr(vehicle_valuation_service, "get_market_value", get_market_value)
+
+    report = await background.run_asset_revaluation()
+
+    assert sorted(calls) == [
+        ("address", "1 main st, austin"),
+        ("vehicle", "Honda", "Civic", 2020, 10_000),
+        ("zpid", "42"),
+        ("zpid", "43"),
+    ]
+    assert report.total == 6
+    assert report.succeeded == 5
+
+    session.expire_all()
+    for asset in homes[:2]:
+        await session.refresh(asset)
+        assert asset.market_value == Decimal("410000")
+    for asset in cars[:2]:
+        await session.refresh(asset)
+        assert asset.market_value == Decimal("21000.00")
+        assert asset.last_valuation_at is not None
+    await session.refresh(homes[3])
+    assert homes[3].last_valuation_at is None
+    assert homes[3].last_valuation_attempt_at is not None
+    await session.refresh(cars[2])
+    assert cars[2].last_valuation_at is None
+    assert cars[2].last_valuation_attempt_at is None
+
+    # The unchanged zestimate refreshes the timestamp without a history row.
+    result = await session.execute(select(AssetValuation))
+    history = {(row.asset_id, row.source) for row in result.scalars()}
+    assert history == {
+        (homes[0].id, "Zillow"),
+        (homes[1].id, "Zillow"),
+        (cars[0].id, "VehicleValuation"),
+        (cars[1].id, "VehicleValuation"),
+    }
+
+    # The next pass neither retries the failed lookup nor exceeds the
+    # marketcheck budget, which the previous pass used up.
+    calls.clear()
+    report = await background.run_asset_revaluation()
+    assert calls == []
+    assert report.total == 0
+    result = await session.execute(select(AssetValuationLookup.provider))
+    assert sorted(result.scalars()) == ["marketcheck"] * 2 + ["zillow"] * 3
+
+
+@pytest.mark.asyncio
+async def test_write_valuations_skips_assets_edited_during_lookups(
+    session: AsyncSession, sync_user: User
+) -> None:
+    auto = ValuationType.auto
+    switched = VehicleAsset(
+        user_id=sync_user.id,
+        name="Switched",
+        make="Honda",
+        model="Civic",
+        year=2020,
+        valuation_type=auto,
+        market_value=Decimal("20000"),
+    )
+    revalued = RealEstateAsset(
+        user_id=sync_user.id,
+        name="Revalued",
+        address="1 Main St",
+        valuation_type=auto,
+        market_value=Decimal("400000"),
+    )
+    untouched = RealEstateAsset(
+        user_id=sync_user.id,
+        name="Untouched",
+        address="2 Main St",
+        valuation_type=auto,
+        market_value=Decimal("300000"),
+    )
+    deleted = RealEstateAsset(
+        user_id=sync_user.id,
+        name="Deleted",
+        address="3 Main St",
+        valuation_type=auto,
+        market_value=Decimal("200000"),
+    )
+    session.add_all([switched, revalued, untouched, deleted])
+    await session.commit()
+
+    async with TestSessionFactory() as loader:
+        due = await asset_revaluation.load_due_assets(loader)
+        values = {
+            "Switched": Decimal("21000"),
+            "Revalued": Decimal("410000"),
+            "Untouched": Decimal("300000"),
+            "Deleted": Decimal("210000"),
+        }
+
+        # The user edits or deletes assets while the provider calls are in
+        # flight.
+        switched.valuation_type = ValuationType.manual
+        switched.market_value = Decimal("18000")
+        revalued.market_value = Decimal("425000")
+        revalued.last_valuation_at = datetime.now(timezone.utc)
+        await session.delete(deleted)
+        await session.commit()
+
+        changed = await asset_revaluation.write_valuations(
+            loader,
+            [
+                (lookup, values[lookup.assets[0].name])
+                for lookup in asset_revaluation.plan_lookups(due, {})[0]
+            ],
+        )
+
+    assert changed == 0
+    session.expire_all()
+    for asset, value in ((switched, "18000"), (revalued, "425000")):
+        await session.refresh(asset)
+        assert asset.market_value == Decimal(value)
+    await session.refresh(untouched)
+    assert untouched.last_valuation_at is not None
+    assert untouched.last_valuation_attempt_at is not None
+    result = await session.execute(select(AssetValuation))
+    assert result.scalars().all() == []
+    # Every lookup still counts against the daily quota.
+    result = await session.execute(select(AssetValuationLookup))
+    assert len(result.scalars().all()) == 4
+
+
+@pytest.mark.asyncio
+async def test_database_lease_is_exclusive_until_expiry() -> None:
+    first = DatabaseLeaseBackend(TestSessionFactory, holder="worker-a")
+    second = DatabaseLeaseBackend(TestSessionFactory, holder="worker-b")
+
+    assert await first.acquire("connection_sync", ttl_seconds=60) is True
+    assert await second.acquire("connection_sync", ttl_seconds=60) is False
+    # The holder can renew its own lease.
+    assert await first.acquire("connection_sync", ttl_seconds=60) is True
+
+    await first.release("connection_sync")
+    assert await second.acquire("connection_sync", ttl_seconds=0) is True
+    # A zero-length lease has already expired, so another worker may take it.
+    assert await first.acquire("connection_sync", ttl_seconds=60) is True
+
+
+@pytest.mark.asyncio
+async def test_periodic_task_runs_once_across_workers() -> None:
+    runs: list[str] = []
+    stop_event = asyncio.Event()
+
+    def make_task(worker: str):
+        async def task() -> None:
+            runs.append(worker)
+
+        return task
+
+    workers = [
+        asyncio.create_task(
+            background._run_periodic_task(
+                "portfolio_snapshots",
+                3600,
+                make_task(worker),
+                stop_event,
+                DatabaseLeaseBackend(TestSessionFactory, holder=worker),
+            )
+        )
+        for worker in ("worker-a", "worker-b", "worker-c")
+    ]
+    await asyncio.sleep(0.2)
+    stop_event.set()
+    await asyncio.gather(*workers)
+
+    assert len(runs) == 1
@@ -0,0 +1,230 @@
+import asyncio
+import time
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import (
+    BankTransaction,
+    CashAccount,
+    CashAccountType,
+    Connection,
+    ConnectionStatus,
+    User,
+)
+from app.schemas.action_capability import ActionCapability
+from app.services.banking_sync import sync_banking_connection, upsert_bank_transactions
+from app.services.providers.base_banking import (
+    BankingProviderTimeoutError,
+    BankTransactionUpdates,
+    BaseBankingProvider,
+    NormalizedBankAccount,
+    NormalizedBankTransaction,
+)
+
+
+@pytest.fixture
+async def plaid_account(session: AsyncSession) -> CashAccount:
+    user = User(clerk_id="banking_sync_user", email="banking_sync@example.com")
+    session.add(user)
+    await session.flush()
+    account = CashAccount(
+        user_id=user.id,
+        name="Checking",
+        account_type=CashAccountType.checking,
+        balance=Decimal("5000.00"),
+        provider_account_id="plaid_acc_1",
+    )
+    session.add(account)
+    await session.commit()
+    await session.refresh(account)
+    return account
+
+
+def _tx(
+    provider_transaction_id: str,
+    amount: str,
+    *,
+    pending: bool = False,
+    account_id: str = "plaid_acc_1",
+) -> NormalizedBankTransaction:
+    tx = NormalizedBankTransaction(
+        provider_transaction_id=provider_transaction_id,
+        amount=Decimal(amount),
+        transaction_date=date(2026, 3, 2),
+        name=f"Merchant {provider_transaction_id}",
+        merchant_name=f"Merchant {provider_transaction_id}",
+        primary_category="FOOD_AND_DRINK",
+        pending=pending,
+    )
+    tx._account_id = account_id  # type: ignore[attr-defined]
+    return tx
+
+
+@pytest.mark.asyncio
+async def test_upsert_bank_transactions_reports_counts(
+    session: AsyncSession, plaid_account: CashAccount
+) -> None:
+    account_map = {"plaid_acc_1": plaid_account}
+
+    first = await upsert_bank_transactions(
+        session,
+        account_map,
+        [_tx("tx_1", "-10.00", pending=True), _tx("tx_2", "-20.00"), _tx("tx_3", "-5.50")],
+    )
+    await session.commit()
+    assert (first.inserted, first.updated, first.unchanged) == (3, 0, 0)
+
+    second = await upsert_bank_transactions(
+        session,
+        account_map,
+        [
+            _tx("tx_1", "-10.00", pending=False),  # posted since last sync
+            _tx("tx_2", "-20.00"),
+            _tx("tx_3", "-5.50"),
+            _tx("tx_4", "-7.25"),
+            _tx("tx_5", "-1.00", account_id="unknown_account"),
+        ],
+    )
+    await session.commit()
+    assert (second.inserted, second.updated, second.unchanged) == (1, 1, 2)
+    assert second.total == 4
+
+    result = await session.execute(
+        select(BankTransaction)
+        .where(BankTransaction.cash_account_id == plaid_account.id)
+        .order_by(BankTransaction.provider_transaction_id)
+        .execution_options(populate_existing=True)
+    )
+    rows = result.scalars().all()
+    assert [row.provider_transaction_id for row in rows] == [
+        "tx_1",
+        "tx_2",
+        "tx_3",
+        "tx_4",
+    ]
+    assert rows[0].pending is False
+    assert rows[3].amount == Decimal("-7.25")
+    assert rows[3].iso_currency_code == "USD"
+
+
+class _CursorBankingProvider(BaseBankingProvider):
+    """Serves scripted /transactions/sync-style pages keyed by cursor."""
+
+    provider_name = "fake_cursor_bank"
+    supports_transaction_cursor = True
+
+    def __init__(self, pages: dict[str | None, BankTransactionUpdates]) -> None:
+        self.pages = pages
+        self.cursors_seen: list[str | None] = []
+
+    def get_capabilities(self) -> list[ActionCapability]:
+        return [ActionCapability.READ_ONLY]
+
+    async def create_link_token(self, user_id, redirect_uri=None):
+        raise NotImplementedError
+
+    async def exchange_public_token(self, user_id, public_token):
+        raise NotImplementedError
+
+    async def get_accounts(self, connection) -> list[NormalizedBankAccount]:
+        return [
+            NormalizedBankAccount(
+                provider_account_id="plaid_acc_1",
+                name="Checking",
+                account_type=CashAccountType.checking,
+                balance=Decimal("5000.00"),
+            )
+        ]
+
+    async def get_transactions(self, connection, start_date, end_date):
+        raise AssertionError("window fetch should not be used with a cursor")
+
+    async def get_transaction_updates(self, connection, cursor):
+        self.cursors_seen.append(cursor)
+        return self.pages[cursor]
+
+    async def delete_connection(self, connection) -> None:
+        return None
+
+
+@pytest.mark.asyncio
+async def test_sync_banking_connection_applies_cursor_deltas(
+    session: AsyncSession,
+) -> None:
+    user = User(clerk_id="cursor_sync_user", email="cursor_sync@example.com")
+    session.add(user)
+    await session.flush()
+    connection = Connection(
+        user_id=user.id,
+        provider="fake_cursor_bank",
+        provider_user_id="item-1",
+        status=ConnectionStatus.active,
+    )
+    session.add(connection)
+    await session.commit()
+
+    provider = _CursorBankingProvider(
+        {
+            None: BankTransactionUpdates(
+                added=[_tx("tx_1", "-10.00", pending=True), _tx("tx_2", "-20.00")],
+                modified=[],
+                removed=[],
+                next_cursor="cursor-1",
+            ),
+            "cursor-1": BankTransactionUpdates(
+                added=[_tx("tx_3", "-3.00")],
+                modified=[_tx("tx_1", "-10.00", pending=False)],
+                removed=["tx_2"],
+                next_cursor="cursor-2",
+            ),
+        }
+    )
+
+    await sync_banking_connection(session, connection, provider)
+    await session.commit()
+    assert connection.sync_cursor == "cursor-1"
+    # Food spend on a business account is flagged by the sync itself.
+    account = (await session.execute(select(CashAccount))).scalar_one()
+    account.is_business = True
+    await session.commit()
+
+    await sync_banking_connection(session, connection, provider)
+    await session.commit()
+    assert connection.sync_cursor == "cursor-2"
+    assert provider.cursors_seen == [None, "cursor-1"]
+
+    result = await session.execute(
+        select(BankTransaction)
+        .order_by(BankTransaction.provider_transaction_id)
+        .execution_options(populate_existing=True)
+    )
+    rows = result.scalars().all()
+    assert [row.provider_transaction_id for row in rows] == ["tx_1", "tx_3"]
+    assert rows[0].pending is False
+    assert [row.is_commingled for row in rows] == [True, True]
+
+
+@pytest.mark.asyncio
+async def test_run_blocking_keeps_event_loop_free_and_times_out() -> None:
+    provider = _CursorBankingProvider({})
+    ticks = 0
+
+    async def ticker() -> None:
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker_task = asyncio.create_task(ticker())
+    try:
+        assert await provider.run_blocking(time.sleep, 0.2) is None
+        assert ticks >= 5
+
+        with pytest.raises(BankingProviderTimeoutError):
+            await provider.run_blocking(time.sleep, 0.5, timeout=0.05)
+    finally:
+        ticker_task.cancel()
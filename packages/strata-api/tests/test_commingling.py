@@ -0,0 +1,109 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models import BankTransaction, CashAccount, CashAccountType, User
+from app.services.commingling import ComminglingDetectionEngine, is_commingled
+
+_SYNCED_AT = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def test_compiled_merchant_matching() -> None:
+    assert is_commingled(True, "Netflix.com", None)
+    assert is_commingled(True, "Acme", "FOOD_AND_DRINK")
+    assert not is_commingled(True, "Amazon Web Services", None)
+    assert is_commingled(False, "AMAZON WEB SERVICES", None)
+    assert is_commingled(False, "GitHub Sponsors", None)
+    assert not is_commingled(False, "Corner Grocer", "GROCERIES")
+
+
+@pytest.mark.asyncio
+async def test_scan_only_evaluates_changed_transactions(
+    session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "commingling_scan_overlap_seconds", 0.0)
+    user = User(clerk_id="commingling_user", email="commingling@example.com")
+    session.add(user)
+    await session.flush()
+    business = CashAccount(
+        user_id=user.id,
+        name="Operating",
+        account_type=CashAccountType.checking,
+        balance=Decimal("10000.00"),
+        is_business=True,
+    )
+    personal = CashAccount(
+        user_id=user.id,
+        name="Personal",
+        account_type=CashAccountType.checking,
+        balance=Decimal("2000.00"),
+    )
+    session.add_all([business, personal])
+    await session.flush()
+
+    def debit(account: CashAccount, key: str, merchant: str, amount: str) -> BankTransaction:
+        return BankTransaction(
+            cash_account_id=account.id,
+            provider_transaction_id=key,
+            transaction_date=date(2026, 2, 1 + len(key)),
+            name=merchant,
+            merchant_name=merchant,
+            amount=Decimal(amount),
+            primary_category="GENERAL_MERCHANDISE",
+            created_at=_SYNCED_AT,
+            updated_at=_SYNCED_AT,
+        )
+
+    grocery = debit(personal, "p2", "Corner Grocer", "-60.00")
+    session.add_all(
+        [
+            debit(business, "b1", "Netflix", "-15.49"),
+            debit(business, "b2", "AWS", "-300.00"),
+            debit(personal, "p1", "GitHub", "-4.00"),
+            grocery,
+        ]
+    )
+    await session.commit()
+    engine = ComminglingDetectionEngine(session)
+
+    first = await engine.scan_and_flag(user.id)
+    assert first == {
+        "total_count": 4,
+        "commingled_count": 2,
+        "commingled_amount": Decimal("19.49"),
+        "scanned_count": 4,
+    }
+
+    report = await engine.get_vulnerability_report(user.id)
+    assert report["commingled_count"] == 2
+    assert report["total_analyzed"] == 4
+
+    quiet = await engine.scan_and_flag(user.id)
+    assert quiet["scanned_count"] == 0
+
+    grocery.primary_category = "MARKETING"
+    await session.commit()
+    # The report reads the stored flags; it never scans.
+    report = await engine.get_vulnerability_report(user.id)
+    assert report["commingled_count"] == 2
+    changed = await engine.scan_and_flag(user.id)
+    assert changed["scanned_count"] == 1
+    assert changed["commingled_count"] == 3
+    report = await engine.get_vulnerability_report(user.id)
+    assert report["commingled_count"] == 3
+
+    # Reclassifying an account invalidates every stored flag.
+    personal.is_business = True
+    await session.commit()
+    reclassified = await engine.scan_and_flag(user.id)
+    assert reclassified["scanned_count"] == 4
+    flags = await session.execute(
+        select(BankTransaction.provider_transaction_id)
+        .where(BankTransaction.is_commingled.is_(True))
+        .order_by(BankTransaction.provider_transaction_id)
+    )
+    assert flags.scalars().all() == ["b1"]
@@ -0,0 +1,62 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services.compute_executor import (
+    ComputeExecutor,
+    ComputeExecutorBusyError,
+    ComputeTimeoutError,
+)
+
+
+def _square(value: int) -> int:
+    return value * value
+
+
+def _sleep(seconds: float) -> float:
+    time.sleep(seconds)
+    return seconds
+
+
+@pytest.fixture
+def executor():
+    executor = ComputeExecutor(max_workers=1, max_queue=1, job_timeout_seconds=10)
+    yield executor
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_compute_executor_runs_job_and_records_metrics(
+    executor: ComputeExecutor,
+) -> None:
+    assert await executor.run(_square, 12) == 144
+
+    stats = executor.stats()
+    assert stats["completed"] == 1
+    assert stats["queue_depth"] == 0
+    assert stats["running"] == 0
+
+
+@pytest.mark.asyncio
+async def test_compute_executor_rejects_when_queue_full(
+    executor: ComputeExecutor,
+) -> None:
+    running = asyncio.create_task(executor.run(_sleep, 0.5))
+    queued = asyncio.create_task(executor.run(_sleep, 0.1))
+    await asyncio.sleep(0.05)
+
+    with pytest.raises(ComputeExecutorBusyError):
+        await executor.run(_square, 2)
+
+    assert await running == 0.5
+    assert await queued == 0.1
+    assert executor.stats()["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_compute_executor_times_out(executor: ComputeExecutor) -> None:
+    with pytest.raises(ComputeTimeoutError):
+        await executor.run(_sleep, 1.0, timeout=0.2)
+
+    assert executor.stats()["timed_out"] == 1
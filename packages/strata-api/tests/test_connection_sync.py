@@ -0,0 +1,167 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import (
+    Connection,
+    ConnectionStatus,
+    Holding,
+    Security,
+    Transaction,
+    User,
+)
+from app.models.investment_account import InvestmentAccountType
+from app.models.security import SecurityType
+from app.models.transaction import TransactionType
+from app.services.connection_sync import sync_connection_accounts
+from app.services.providers.base import (
+    NormalizedAccount,
+    NormalizedHolding,
+    NormalizedSecurity,
+    NormalizedTransaction,
+)
+
+_AS_OF = datetime(2026, 3, 2, 16, 0, tzinfo=timezone.utc)
+
+
+def _security(ticker: str) -> NormalizedSecurity:
+    return NormalizedSecurity(
+        ticker=ticker,
+        name=f"{ticker} Inc",
+        security_type=SecurityType.stock,
+        close_price=Decimal("100.00"),
+        close_price_as_of=_AS_OF,
+    )
+
+
+def _holding(ticker: str, quantity: str) -> NormalizedHolding:
+    return NormalizedHolding(
+        security=_security(ticker),
+        quantity=Decimal(quantity),
+        cost_basis=Decimal("1000.00"),
+        market_value=Decimal(quantity) * 100,
+        as_of=_AS_OF,
+    )
+
+
+def _buy(provider_id: str | None, ticker: str, amount: str) -> NormalizedTransaction:
+    return NormalizedTransaction(
+        provider_transaction_id=provider_id,
+        transaction_type=TransactionType.buy,
+        quantity=Decimal("1"),
+        price=Decimal(amount),
+        amount=Decimal(amount),
+        trade_date=date(2026, 3, 1),
+        settlement_date=None,
+        currency="USD",
+        description=f"Buy {ticker}",
+        security=_security(ticker),
+    )
+
+
+class _ScriptedProvider:
+    provider_name = "fake_brokerage"
+
+    def __init__(self) -> None:
+        self.holdings: list[NormalizedHolding] = []
+        self.transactions: list[NormalizedTransaction] = []
+
+    async def get_accounts(self, connection) -> list[NormalizedAccount]:
+        return [
+            NormalizedAccount(
+                provider_account_id="acct-1",
+                name="Brokerage",
+                account_type=InvestmentAccountType.brokerage,
+                balance=Decimal("10000.00"),
+            )
+        ]
+
+    async def get_holdings(self, connection, account_id):
+        return self.holdings
+
+    async def get_transactions(self, connection, account_id):
+        return self.transactions
+
+
+@pytest.mark.asyncio
+async def test_sync_connection_accounts_writes_only_changed_rows(
+    session: AsyncSession,
+) -> None:
+    user = User(clerk_id="investment_sync_user", email="investment_sync@example.com")
+    session.add(user)
+    await session.flush()
+    connection = Connection(
+        user_id=user.id,
+        provider="fake_brokerage",
+        provider_user_id="brokerage-user",
+        status=ConnectionStatus.active,
+    )
+    session.add(connection)
+    await session.commit()
+
+    provider = _ScriptedProvider()
+    provider.holdings = [_holding("AAPL", "10"), _holding("MSFT", "5")]
+    provider.transactions = [
+        _buy("tx-1", "AAPL", "150.00"),
+        _buy("tx-2", "MSFT", "300.00"),
+        _buy(None, "AAPL", "151.00"),
+    ]
+
+    first = await sync_connection_accounts(session, connection, provider)
+    await session.commit()
+    assert first.holdings.inserted == 2
+    assert first.transactions.inserted == 3
+    assert first.securities_created == 2
+
+    holdings = await session.execute(select(Holding))
+    ids_before = {h.security_id: h.id for h in holdings.scalars()}
+    txns = await session.execute(select(Transaction))
+    txn_ids_before = {t.id for t in txns.scalars()}
+
+    unchanged = await sync_connection_accounts(session, connection, provider)
+    await session.commit()
+    assert unchanged.holdings.unchanged == 2
+    assert unchanged.transactions.unchanged == 3
+    assert (unchanged.holdings.inserted, unchanged.holdings.updated) == (0, 0)
+    assert unchanged.holdings.deleted == unchanged.transactions.deleted == 0
+    assert unchanged.securities_created == 0
+
+    provider.holdings = [_holding("AAPL", "12"), _holding("GOOG", "1")]
+    provider.transactions = [
+        _buy("tx-1", "AAPL", "150.00"),
+        _buy("tx-2", "MSFT", "305.00"),
+    ]
+    changed = await sync_connection_accounts(session, connection, provider)
+    await session.commit()
+    assert (
+        changed.holdings.inserted,
+        changed.holdings.updated,
+        changed.holdings.deleted,
+    ) == (1, 1, 1)
+    assert (
+        changed.transactions.updated,
+        changed.transactions.unchanged,
+        changed.transactions.deleted,
+    ) == (1, 1, 1)
+
+    securities = await session.execute(select(Security))
+    by_id = {s.id: s.ticker for s in securities.scalars()}
+    holdings = await session.execute(
+        select(Holding).execution_options(populate_existing=True)
+    )
+    rows = {by_id[h.security_id]: h for h in holdings.scalars()}
+    assert set(rows) == {"AAPL", "GOOG"}
+    aapl_id = next(sid for sid, ticker in by_id.items() if ticker == "AAPL")
+    assert rows["AAPL"].id == ids_before[aapl_id]
+    assert rows["AAPL"].quantity == Decimal("12")
+
+    txns = await session.execute(
+        select(Transaction).execution_options(populate_existing=True)
+    )
+    remaining = {t.provider_transaction_id: t for t in txns.scalars()}
+    assert set(remaining) == {"tx-1", "tx-2"}
+    assert {t.id for t in remaining.values()} <= txn_ids_before
+    assert remaining["tx-2"].amount == Decimal("305.00")
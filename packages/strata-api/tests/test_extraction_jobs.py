@@ -0,0 +1,322 @@
+"""End-to-end tests for the tax document extraction job pipeline."""
+
+import asyncio
+import io
+import json
+import uuid
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.main import app
+from app.models import ExtractionCacheEntry, TaxDocument, TaxPlanVersion, User
+from app.services import extraction_jobs
+from app.services.extraction_jobs import extraction_queue, recover_extraction_jobs
+from app.services.providers.fake_extraction import FakeExtractionProvider
+from app.services.public_audit import PublicAuditService
+from app.services.session_store import InMemorySessionStore
+from app.services.tax_document_storage import save_upload, upload_path
+from tests.conftest import TestSessionFactory
+
+
+@pytest.fixture(autouse=True)
+async def fake_extraction(monkeypatch: pytest.MonkeyPatch, tmp_path):
+    monkeypatch.setattr(extraction_jobs, "async_session_factory", TestSessionFactory)
+    monkeypatch.setattr(settings, "extraction_upload_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "extraction_provider", "fake")
+    monkeypatch.setattr(settings, "extraction_job_retry_base_seconds", 0.0)
+    yield
+    await extraction_queue.shutdown()
+
+
+def _upload(name: str) -> dict:
+    # Distinct bytes per name so uploads never hit the extraction cache.
+    return {"file": (name, io.BytesIO(name.encode()), "image/png")}
+
+
+@pytest.mark.asyncio
+async def test_upload_runs_extraction_and_prefills_tax_plan(
+    session: AsyncSession,
+) -> None:
+    headers = {"x-clerk-user-id": "extraction_job_user_1"}
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        plan_resp = await client.post(
+            "/api/v1/tax-plan-workspace/plans",
+            headers=headers,
+            json={"name": "2025 plan"},
+        )
+        plan_id = plan_resp.json()["id"]
+
+        upload_resp = await client.post(
+            "/api/v1/tax-documents/upload",
+            headers=headers,
+            files=_upload("w2_2025.png"),
+            data={"plan_id": plan_id},
+        )
+        assert upload_resp.status_code == 202
+        job_id = upload_resp.json()["job_id"]
+        assert upload_path(job_id).exists()
+
+        await extraction_queue.join()
+
+        job = (
+            await client.get(f"/api/v1/tax-documents/jobs/{job_id}", headers=headers)
+        ).json()
+        assert job["status"] == "completed"
+        assert job["attempts"] == 1
+        assert job["prefill_version_id"] is not None
+        assert not upload_path(job_id).exists()
+
+        doc = (
+            await client.get(f"/api/v1/tax-documents/{job_id}", headers=headers)
+        ).json()
+        assert doc["document_type"] == "w2"
+        assert doc["tax_year"] == 2025
+        assert doc["provider_used"] == "fake"
+        assert doc["extracted_data"]["wages_tips_compensation"] == 85000.0
+
+    version = await session.get(TaxPlanVersion, uuid.UUID(job["prefill_version_id"]))
+    assert version.inputs["wagesIncome"] == 85000.0
+    assert version.source == "import"
+
+
+@pytest.mark.asyncio
+async def test_upload_rejects_unknown_plan() -> None:
+    headers = {"x-clerk-user-id": "extraction_job_user_2"}
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        resp = await client.post(
+            "/api/v1/tax-documents/upload",
+            headers=headers,
+            files=_upload("w2.png"),
+            data={"plan_id": "00000000-0000-0000-0000-000000000000"},
+        )
+        assert resp.status_code == 422
+
+        missing = await client.get(
+            "/api/v1/tax-documents/jobs/00000000-0000-0000-0000-000000000000",
+            headers=headers,
+        )
+        assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_transient_failures_are_retried_within_provider_limit(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    headers = {"x-clerk-user-id": "extraction_job_user_3"}
+    monkeypatch.setattr(extraction_queue, "_provider_concurrency", {"fake": 1})
+    original_extract = FakeExtractionProvider.extract
+    state = {"calls": 0, "flaky_calls": 0, "in_flight": 0, "peak": 0}
+
+    async def flaky_extract(self, file_bytes, mime_type, filename, **kwargs):
+        state["calls"] += 1
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        try:
+            await asyncio.sleep(0.01)
+            if filename.startswith("flaky"):
+                state["flaky_calls"] += 1
+                if state["flaky_calls"] <= 2:
+                    raise ConnectionError("provider reset the connection")
+            return await original_extract(self, file_bytes, mime_type, filename, **kwargs)
+        finally:
+            state["in_flight"] -= 1
+
+    monkeypatch.setattr(FakeExtractionProvider, "extract", flaky_extract)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        job_ids = []
+        for name in ("flaky_w2.png", "1099_int.png", "1099_div.png"):
+            resp = await client.post(
+                "/api/v1/tax-documents/upload", headers=headers, files=_upload(name)
+            )
+            job_ids.append(resp.json()["job_id"])
+
+        await extraction_queue.join()
+
+        jobs = [
+            (
+                await client.get(f"/api/v1/tax-documents/jobs/{job_id}", headers=headers)
+            ).json()
+            for job_id in job_ids
+        ]
+
+    assert [job["status"] for job in jobs] == ["completed"] * 3
+    assert jobs[0]["attempts"] == 3
+    assert state["calls"] == 5
+    assert state["peak"] == 1
+    assert extraction_queue.stats()["retries"] >= 2
+
+
+@pytest.mark.asyncio
+async def test_job_events_stream_until_finished() -> None:
+    headers = {"x-clerk-user-id": "extraction_job_user_4"}
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        resp = await client.post(
+            "/api/v1/tax-documents/upload",
+            headers=headers,
+            files=_upload("1099-b_2024.pdf"),
+        )
+        job_id = resp.json()["job_id"]
+        await extraction_queue.join()
+
+        events_resp = await client.get(
+            f"/api/v1/tax-documents/jobs/{job_id}/events", headers=headers
+        )
+
+    assert events_resp.headers["content-type"].startswith("text/event-stream")
+    lines = [
+        line[len("data: ") :]
+        for line in events_resp.text.splitlines()
+        if line.startswith("data: ")
+    ]
+    assert lines[-1] == "[DONE]"
+    assert json.loads(lines[-2])["status"] == "completed"
+
+
+@pytest.mark.asyncio
+async def test_recover_requeues_pending_documents(session: AsyncSession) -> None:
+    user = User(clerk_id="extraction_job_user_5", email="jobs5@example.com")
+    session.add(user)
+    await session.flush()
+    stored = TaxDocument(
+        user_id=user.id,
+        original_filename="w2_2023.png",
+        mime_type="image/png",
+        file_size_bytes=4,
+        status="pending",
+    )
+    lost = TaxDocument(
+        user_id=user.id,
+        original_filename="k-1.png",
+        mime_type="image/png",
+        file_size_bytes=4,
+        status="pending",
+    )
+    session.add_all([stored, lost])
+    await session.commit()
+    await save_upload(stored.id, b"data")
+
+    assert await recover_extraction_jobs() == 1
+    await extraction_queue.join()
+
+    session.expire_all()
+    result = await session.execute(
+        select(TaxDocument.original_filename, TaxDocument.status, TaxDocument.tax_year)
+        .order_by(TaxDocument.original_filename)
+    )
+    assert result.all() == [
+        ("k-1.png", "failed", None),
+        ("w2_2023.png", "completed", 2023),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_duplicate_upload_reuses_cached_extraction(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    original_extract = FakeExtractionProvider.extract
+    calls = []
+
+    async def counting_extract(self, file_bytes, mime_type, filename, **kwargs):
+        calls.append(filename)
+        return await original_extract(self, file_bytes, mime_type, filename, **kwargs)
+
+    monkeypatch.setattr(FakeExtractionProvider, "extract", counting_extract)
+    owner = {"x-clerk-user-id": "extraction_job_user_6"}
+    other = {"x-clerk-user-id": "extraction_job_user_7"}
+
+    def same_file() -> dict:
+        return {"file": ("w2_2025.png", io.BytesIO(b"same w2 bytes"), "image/png")}
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        first = await client.post(
+            "/api/v1/tax-documents/upload", headers=owner, files=same_file()
+        )
+        assert first.json()["status"] == "pending"
+        await extraction_queue.join()
+        assert len(calls) == 1
+
+        duplicate = await client.post(
+            "/api/v1/tax-documents/upload", headers=owner, files=same_file()
+        )
+        assert duplicate.status_code == 202
+        assert duplicate.json()["status"] == "completed"
+        assert not upload_path(duplicate.json()["job_id"]).exists()
+        doc = (
+            await client.get(
+                f"/api/v1/tax-documents/{duplicate.json()['job_id']}", headers=owner
+            )
+        ).json()
+        assert doc["document_type"] == "w2"
+        assert doc["extracted_data"]["wages_tips_compensation"] == 85000.0
+        assert len(calls) == 1
+
+        # Other users never see this user's results.
+        await client.post(
+            "/api/v1/tax-documents/upload", headers=other, files=same_file()
+        )
+        await extraction_queue.join()
+        assert len(calls) == 2
+
+        # A new prompt or schema version invalidates the cached result.
+        monkeypatch.setattr(
+            "app.services.extraction_cache.extraction_cache_version", lambda: "next"
+        )
+        changed = await client.post(
+            "/api/v1/tax-documents/upload", headers=owner, files=same_file()
+        )
+        assert changed.json()["status"] == "pending"
+        await extraction_queue.join()
+        assert len(calls) == 3
+
+    async with TestSessionFactory() as session:
+        versions = await session.execute(
+            select(ExtractionCacheEntry.cache_version)
+            .join(User, User.id == ExtractionCacheEntry.user_id)
+            .where(User.clerk_id == "extraction_job_user_6")
+        )
+        assert versions.scalars().all() == ["next"]
+
+
+@pytest.mark.asyncio
+async def test_public_audit_reuses_cached_extraction(
+    session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    original_extract = FakeExtractionProvider.extract
+    calls = []
+
+    async def counting_extract(self, file_bytes, mime_type, filename, **kwargs):
+        calls.append(filename)
+        return await original_extract(self, file_bytes, mime_type, filename, **kwargs)
+
+    monkeypatch.setattr(FakeExtractionProvider, "extract", counting_extract)
+    store = InMemorySessionStore()
+    service = PublicAuditService(session)
+
+    first = await service.run_public_tax_audit(
+        b"public w2", "w2.png", "image/png", cache=store
+    )
+    second = await service.run_public_tax_audit(
+        b"public w2", "w2.png", "image/png", cache=store
+    )
+
+    assert len(calls) == 1
+    assert second == first
+    assert first.deterministic["wages_detected"] == 85000.0
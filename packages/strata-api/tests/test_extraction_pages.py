@@ -0,0 +1,153 @@
+"""Tests for streamed uploads and page-range PDF extraction."""
+
+import asyncio
+import hashlib
+import io
+
+import pytest
+from fpdf import FPDF
+from httpx import ASGITransport, AsyncClient
+from pypdf import PdfReader
+
+from app.core.config import settings
+from app.main import app
+from app.schemas.tax_document import ExtractionResult
+from app.services import extraction_jobs
+from app.services.extraction_jobs import extraction_queue
+from app.services.extraction_pages import merge_page_results, page_ranges
+from app.services.providers.fake_extraction import FakeExtractionProvider
+from app.services.tax_document_storage import (
+    UploadTooLargeError,
+    stage_upload,
+    upload_dir,
+)
+from tests.conftest import TestSessionFactory
+
+
+@pytest.fixture(autouse=True)
+async def fake_extraction(monkeypatch: pytest.MonkeyPatch, tmp_path):
+    monkeypatch.setattr(extraction_jobs, "async_session_factory", TestSessionFactory)
+    monkeypatch.setattr(settings, "extraction_upload_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "extraction_provider", "fake")
+    yield
+    await extraction_queue.shutdown()
+
+
+def _pdf(pages: int) -> bytes:
+    pdf = FPDF()
+    pdf.set_font("helvetica", size=12)
+    for number in range(1, pages + 1):
+        pdf.add_page()
+        pdf.cell(text=f"Page {number}")
+    return bytes(pdf.output())
+
+
+def _reader(data: bytes):
+    stream = io.BytesIO(data)
+
+    async def read(size: int) -> bytes:
+        return stream.read(size)
+
+    return read
+
+
+def _result(doc_type: str, fields: dict, **kwargs) -> ExtractionResult:
+    return ExtractionResult(
+        document_type=doc_type,
+        fields=fields,
+        confidence=kwargs.pop("confidence", 0.9),
+        provider_name="fake",
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_stage_upload_hashes_chunks_and_enforces_size() -> None:
+    data = b"0123456789" * 100
+
+    staged = await stage_upload(_reader(data), max_size=len(data), chunk_size=64)
+    assert staged.size == len(data)
+    assert staged.sha256 == hashlib.sha256(data).hexdigest()
+    assert staged.path.read_bytes() == data
+
+    with pytest.raises(UploadTooLargeError):
+        await stage_upload(_reader(data), max_size=len(data) - 1, chunk_size=64)
+    assert [p.name for p in upload_dir().iterdir()] == [staged.path.name]
+
+
+def test_page_ranges_cover_every_page() -> None:
+    assert page_ranges(5, 2) == [(0, 2), (2, 4), (4, 5)]
+    assert page_ranges(2, 4) == [(0, 2)]
+
+
+def test_merge_page_results_prefers_majority_type_and_first_values() -> None:
+    merged = merge_page_results(
+        [
+            ((2, 4), _result("w2", {"wages_tips_compensation": 1.0, "state": "CA"})),
+            (
+                (0, 2),
+                _result(
+                    "w2",
+                    {"wages_tips_compensation": 85000.0, "state": None},
+                    tax_year=2025,
+                ),
+            ),
+            ((4, 5), _result("1099-int", {"interest_income": 12.0}, confidence=0.99)),
+            ((5, 6), _result("unknown", {}, confidence=0.1, warnings=["blank page"])),
+        ]
+    )
+
+    assert merged.document_type == "w2"
+    assert merged.tax_year == 2025
+    assert merged.fields == {"wages_tips_compensation": 85000.0, "state": "CA"}
+    assert merged.confidence == 0.9
+    assert merged.warnings == [
+        "Page 5: looks like a 1099-int, not a w2; ignored",
+        "Page 6: blank page",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_multi_page_pdf_is_extracted_in_concurrent_page_ranges(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "extraction_pdf_pages_per_request", 2)
+    monkeypatch.setattr(settings, "extraction_pdf_range_concurrency", 2)
+    original_extract = FakeExtractionProvider.extract
+    state = {"page_counts": [], "in_flight": 0, "peak": 0}
+
+    async def tracking_extract(self, file_bytes, mime_type, filename, **kwargs):
+        state["page_counts"].append(len(PdfReader(io.BytesIO(file_bytes)).pages))
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        try:
+            await asyncio.sleep(0.01)
+            return await original_extract(self, file_bytes, mime_type, filename, **kwargs)
+        finally:
+            state["in_flight"] -= 1
+
+    monkeypatch.setattr(FakeExtractionProvider, "extract", tracking_extract)
+    headers = {"x-clerk-user-id": "extraction_pages_user_1"}
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        resp = await client.post(
+            "/api/v1/tax-documents/upload",
+            headers=headers,
+            files={"file": ("w2_2025.pdf", io.BytesIO(_pdf(5)), "application/pdf")},
+        )
+        assert resp.status_code == 202
+        await extraction_queue.join()
+        doc = (
+            await client.get(
+                f"/api/v1/tax-documents/{resp.json()['document_id']}", headers=headers
+            )
+        ).json()
+
+    assert sorted(state["page_counts"]) == [1, 2, 2]
+    assert state["peak"] == 2
+    assert doc["status"] == "completed"
+    assert doc["document_type"] == "w2"
+    assert doc["tax_year"] == 2025
+    assert doc["extracted_data"]["wages_tips_compensation"] == 85000.0
@@ -1,12 +1,16 @@
 """Tests for the Financial Advisor API endpoints and service."""
 
+import asyncio
+import json
 import uuid
+from types import SimpleNamespace
 
 import pytest
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.main import app
 from app.models import (
     AgentSession,
@@ -18,6 +22,7 @@ from app.models import (
 )
 from app.models.agent_session import RecommendationStatus, SessionStatus
 from app.models.recommendation_review import RecommendationReviewType
+from app.services.agent_runtime import AgentRuntime
 from app.services.financial_advisor import FinancialAdvisor
 
 
@@ -680,3 +685,190 @@ async def test_advisor_handle_tool_ask_user_no_options(
     assert result["type"] == "question"
     assert result["question"] == "Tell me about your financial goals."
     assert result["options"] == []
+
+
+# --- streaming ---
+
+
+def _event(type_: str, **fields) -> SimpleNamespace:
+    return SimpleNamespace(type=type_, **fields)
+
+
+class _FakeAnthropicStream:
+    """Replays raw Messages API stream events, counting how many were sent."""
+
+    def __init__(self, events: list[SimpleNamespace]) -> None:
+        self._events = events
+        self.emitted = 0
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for event in self._events:
+            self.emitted += 1
+            yield event
+            await asyncio.sleep(0)
+
+
+class _FakeAnthropicClient:
+    def __init__(self, turns: list[list[SimpleNamespace]]) -> None:
+        self.streams = [_FakeAnthropicStream(events) for events in turns]
+        self.calls: list[dict] = []
+        self.messages = self
+
+    async def create(self, **kwargs) -> _FakeAnthropicStream:
+        assert kwargs["stream"] is True
+        self.calls.append(kwargs)
+        return self.streams[len(self.calls) - 1]
+
+
+def _text_turn(*, index: int, parts: list[str]) -> list[SimpleNamespace]:
+    return [
+        _event(
+            "content_block_start",
+            index=index,
+            content_block=SimpleNamespace(type="text", text=""),
+        ),
+        *[
+            _event(
+                "content_block_delta",
+                index=index,
+                delta=SimpleNamespace(type="text_delta", text=part),
+            )
+            for part in parts
+        ],
+        _event("content_block_stop", index=index),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_send_message_streams_text_deltas_and_tool_calls(
+    session: AsyncSession,
+    test_user: User,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "agent_runtime_mode", "in_process")
+    monkeypatch.setattr(settings, "advisor_provider", "anthropic")
+
+    tool_turn = [
+        _event("message_start", message=SimpleNamespace(id="msg_1")),
+        *_text_turn(index=0, parts=["Let me ", "ask. "]),
+        _event(
+            "content_block_start",
+            index=1,
+            content_block=SimpleNamespace(
+                type="tool_use", id="toolu_1", name="ask_user", input={}
+            ),
+        ),
+        _event(
+            "content_block_delta",
+            index=1,
+            delta=SimpleNamespace(
+                type="input_json_delta", partial_json='{"question": "Target '
+            ),
+        ),
+        _event(
+            "content_block_delta",
+            index=1,
+            delta=SimpleNamespace(type="input_json_delta", partial_json='age?"}'),
+        ),
+        _event("content_block_stop", index=1),
+        _event("message_delta", delta=SimpleNamespace(stop_reason="tool_use")),
+        _event("message_stop"),
+    ]
+    final_turn = [
+        *_text_turn(index=0, parts=["Thanks", "!"]),
+        _event("message_delta", delta=SimpleNamespace(stop_reason="end_turn")),
+        _event("message_stop"),
+    ]
+    client = _FakeAnthropicClient([tool_turn, final_turn])
+
+    advisor = FinancialAdvisor(session)
+    advisor._runtime._client = client
+    agent_session = await advisor.start_session(test_user.id)
+
+    chunks: list[str] = []
+    emitted_at_first_chunk = None
+    async for chunk in advisor.send_message(
+        agent_session.id, test_user.id, "When should I retire?"
+    ):
+        if emitted_at_first_chunk is None:
+            emitted_at_first_chunk = client.streams[0].emitted
+        chunks.append(chunk)
+
+    tool_result = {"type": "question", "question": "Target age?", "options": []}
+    assert chunks == [
+        "Let me ",
+        "ask. ",
+        f"\n[TOOL:ask_user:{json.dumps(tool_result)}]\n",
+        "Thanks",
+        "!",
+    ]
+    # The first delta reached the caller before the model finished its turn.
+    assert emitted_at_first_chunk < len(tool_turn)
+
+    # The tool-use turn is replayed to the model with its JSON input assembled.
+    assert client.calls[1]["messages"][1]["content"] == [
+        {"type": "text", "text": "Let me ask. "},
+        {
+            "type": "tool_use",
+            "id": "toolu_1",
+            "name": "ask_user",
+            "input": {"question": "Target age?"},
+        },
+    ]
+
+    await session.refresh(agent_session)
+    assert agent_session.messages[-1] == {
+        "role": "assistant",
+        "content": [{"type": "text", "text": "Thanks!"}],
+    }
+
+
+@pytest.mark.asyncio
+async def test_openai_stream_assembles_tool_calls_from_fragments() -> None:
+    def chunk(content=None, tool_calls=None, finish_reason=None):
+        delta = SimpleNamespace(content=content, tool_calls=tool_calls)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(delta=delta, finish_reason=finish_reason)]
+        )
+
+    def call_fragment(index, *, id=None, name=None, arguments=None):
+        return SimpleNamespace(
+            index=index,
+            id=id,
+            function=SimpleNamespace(name=name, arguments=arguments),
+        )
+
+    async def stream():
+        yield chunk(content="Checking")
+        yield chunk(content=" now")
+        yield chunk(tool_calls=[call_fragment(0, id="call_1", name="calculate")])
+        yield chunk(tool_calls=[call_fragment(0, arguments='{"calculation_')])
+        yield chunk(tool_calls=[call_fragment(0, arguments='type": "loan"}')])
+        yield chunk(finish_reason="tool_calls")
+
+    events = [
+        event async for event in AgentRuntime._assemble_openai_stream(stream())
+    ]
+
+    assert events[:2] == [
+        {"type": "text_delta", "text": "Checking"},
+        {"type": "text_delta", "text": " now"},
+    ]
+    assert events[-1] == {
+        "type": "message",
+        "message": {
+            "content": [
+                {"type": "text", "text": "Checking now"},
+                {
+                    "type": "tool_use",
+                    "id": "call_1",
+                    "name": "calculate",
+                    "input": {"calculation_type": "loan"},
+                },
+            ],
+            "stop_reason": "tool_calls",
+        },
+    }
@@ -1,5 +1,7 @@
 """Tests for financial context building and markdown rendering."""
 
+import pickle
+import uuid
 from decimal import Decimal
 
 import pytest
@@ -16,12 +18,26 @@ from app.models import (
     User,
 )
 from app.models.cash_account import CashAccountType
+from app.models.crypto_wallet import CryptoChain, CryptoWallet
 from app.models.debt_account import DebtType
 from app.models.financial_memory import FilingStatus
 from app.models.investment_account import InvestmentAccountType
+from app.models.physical_asset import (
+    AlternativeAsset,
+    CollectibleAsset,
+    MetalType,
+    PreciousMetalAsset,
+    RealEstateAsset,
+    VehicleAsset,
+)
 from app.models.security import SecurityType
+from app.services import context_cache, financial_context
 from app.services.context_renderer import render_context_as_markdown
+from app.services.crypto import CryptoService
 from app.services.financial_context import build_financial_context
+from app.services.market_prices import market_price_service
+from app.services.physical_asset import PhysicalAssetService
+from app.services.providers.alchemy import WalletBalances, alchemy_provider
 
 
 @pytest.fixture
@@ -191,6 +207,63 @@ async def test_context_portfolio_metrics(
     assert profile.get("average_monthly_expenses") == 5000.00
 
 
+# --- context cache ---
+
+
+@pytest.mark.asyncio
+async def test_context_cache_serves_repeat_reads_until_data_changes(
+    session: AsyncSession,
+    user: User,
+    memory: FinancialMemory,
+    accounts_and_holdings: dict,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    builds = 0
+    assemble = financial_context._assemble_financial_context
+
+    async def counting_assemble(user_id, session):
+        nonlocal builds
+        builds += 1
+        return await assemble(user_id, session)
+
+    monkeypatch.setattr(
+        financial_context, "_assemble_financial_context", counting_assemble
+    )
+
+    user_id = user.id
+    first = await build_financial_context(user_id, session)
+    first["portfolio_metrics"]["net_worth"] = -1  # callers get their own copy
+    second = await build_financial_context(user_id, session)
+    assert builds == 1
+    assert second["portfolio_metrics"]["total_cash_value"] == 5000.00
+    assert second["portfolio_metrics"]["net_worth"] != -1
+
+    # Uncommitted changes are visible but never cached.
+    cash = accounts_and_holdings["cash"]
+    cash.balance = Decimal("7000.00")
+    await session.flush()
+    pending = await build_financial_context(user_id, session)
+    assert pending["portfolio_metrics"]["total_cash_value"] == 7000.00
+    await session.rollback()
+
+    # Rolling back restores the committed version, whose entry is still valid.
+    rolled_back = await build_financial_context(user_id, session)
+    assert rolled_back["portfolio_metrics"]["total_cash_value"] == 5000.00
+    assert builds == 2
+
+    # Account-owned rows invalidate their owner's context too.
+    holding = accounts_and_holdings["holding"]
+    await session.refresh(holding)
+    holding.market_value = Decimal("120000.00")
+    await session.commit()
+    updated = await build_financial_context(user_id, session)
+    assert updated["holdings"][0]["market_value"] == 120000.00
+    assert builds == 3
+
+    await build_financial_context(user_id, session)
+    assert builds == 3
+
+
 # --- render_context_as_markdown ---
 
 
@@ -215,3 +288,110 @@ async def test_markdown_empty_context(session: AsyncSession, user: User) -> None
     ctx = await build_financial_context(user.id, session)
     md = render_context_as_markdown(ctx)
     assert isinstance(md, str)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("asset_model", "fields", "delete_method"),
+    [
+        (RealEstateAsset, {"address": "1 Main St"}, "delete_real_estate_asset"),
+        (
+            VehicleAsset,
+            {"make": "Honda", "model": "Civic", "year": 2020},
+            "delete_vehicle_asset",
+        ),
+        (CollectibleAsset, {}, "delete_collectible_asset"),
+        (
+            PreciousMetalAsset,
+            {"metal_type": MetalType.gold, "weight_oz": Decimal("1")},
+            "delete_precious_metal_asset",
+        ),
+        (AlternativeAsset, {}, "delete_alternative_asset"),
+    ],
+)
+async def test_context_cache_drops_deleted_physical_assets(
+    session: AsyncSession, user: User, asset_model, fields, delete_method
+) -> None:
+    asset = asset_model(
+        user_id=user.id, name="Asset", market_value=Decimal("1000.00"), **fields
+    )
+    session.add(asset)
+    await session.commit()
+
+    before = await build_financial_context(user.id, session)
+    assert before["portfolio_metrics"]["net_worth"] == 1000.00
+
+    service = PhysicalAssetService(session)
+    assert await getattr(service, delete_method)(asset.id, user.id)
+    after = await build_financial_context(user.id, session)
+    assert after["portfolio_metrics"]["net_worth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_context_cache_sees_crypto_wallet_syncs(
+    session: AsyncSession, user: User, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    wallet = CryptoWallet(
+        user_id=user.id,
+        address="0x742d35cc6634c0532925a3b844bc454e4438f44e",
+        chain=CryptoChain.ethereum,
+        last_balance_usd=Decimal("10"),
+    )
+    session.add(wallet)
+    await session.commit()
+
+    async def fake_get_wallet_balances(chain, addresses, metadata_store=None):
+        return {address: WalletBalances(native=Decimal("2.5")) for address in addresses}
+
+    async def fake_get_prices(symbols, kind="stock"):
+        return {symbol: Decimal("2000") for symbol in symbols}
+
+    monkeypatch.setattr(alchemy_provider, "get_wallet_balances", fake_get_wallet_balances)
+    monkeypatch.setattr(market_price_service, "get_prices", fake_get_prices)
+
+    before = await build_financial_context(user.id, session)
+    assert before["portfolio_metrics"]["net_worth"] == 10.00
+
+    await CryptoService(session).sync_wallets([wallet])
+    after = await build_financial_context(user.id, session)
+    assert after["portfolio_metrics"]["net_worth"] == 5000.00
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.values: dict[str, bytes] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        return self.values.get(key)
+
+    async def set(self, key: str, value: str | bytes, ex: int | None = None) -> None:
+        self.values[key] = value.encode() if isinstance(value, str) else value
+
+    async def aclose(self) -> None:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_redis_context_cache_stores_json_and_never_unpickles() -> None:
+    redis = _FakeRedis()
+
+    def worker() -> context_cache.RedisContextCache:
+        cache = context_cache.RedisContextCache(
+            "redis://localhost:6379/0",
+            context_cache.InMemoryContextCache(max_entries=8, ttl_seconds=60),
+        )
+        cache._redis = redis
+        return cache
+
+    user_id = uuid.uuid4()
+    await worker().set(
+        user_id, 3, {"portfolio_metrics": {"net_worth": 1.5}, "cash": Decimal("2")}
+    )
+    # Another worker, with an empty local LRU, reads the shared entry.
+    assert await worker().get(user_id, 3) == {
+        "portfolio_metrics": {"net_worth": 1.5},
+        "cash": "2",
+    }
+
+    redis.values[f"financial_context:{user_id}:4"] = pickle.dumps({"x": 1})
+    assert await worker().get(user_id, 4) is None
@@ -0,0 +1,142 @@
+"""Tests for the shared outbound HTTP client registry."""
+
+import asyncio
+from decimal import Decimal
+
+import httpx
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.core.config import settings
+from app.main import app
+from app.services.http_clients import UpstreamUnavailableError, http_clients
+from app.services.providers.brokerage_service import (
+    BrokerageServiceProvider,
+    BrokerageServiceUnavailableError,
+)
+from app.services.providers.stock_price import StockPriceService
+
+
+@pytest.fixture(autouse=True)
+async def fast_retries(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(settings, "http_client_retry_base_seconds", 0.0)
+    monkeypatch.setattr(settings, "http_client_retries", 2)
+    monkeypatch.setattr(settings, "http_client_breaker_failure_threshold", 3)
+    monkeypatch.setattr(settings, "http_client_breaker_reset_seconds", 30.0)
+    yield
+    for name in ("test_upstream", "alpha_vantage", "brokerage_service"):
+        http_clients.use_transport(name, None)
+    await http_clients.aclose()
+
+
+def _sequence(*statuses: int) -> tuple[httpx.MockTransport, list[str]]:
+    calls: list[str] = []
+    remaining = list(statuses)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        status = remaining.pop(0) if len(remaining) > 1 else remaining[0]
+        return httpx.Response(status, json={"status": status})
+
+    return httpx.MockTransport(handler), calls
+
+
+@pytest.mark.asyncio
+async def test_registry_reuses_one_client_per_upstream() -> None:
+    first = http_clients.get("test_upstream")
+    assert http_clients.get("test_upstream") is first
+    assert http_clients.get("alchemy") is not first
+
+
+@pytest.mark.asyncio
+async def test_idempotent_calls_retry_transient_failures() -> None:
+    transport, calls = _sequence(503, 502, 200)
+    http_clients.use_transport("test_upstream", transport)
+    client = http_clients.get("test_upstream")
+
+    response = await client.get("https://upstream.test/quote")
+
+    assert response.status_code == 200
+    assert calls == ["GET", "GET", "GET"]
+    assert client.stats()["retries"] == 2
+
+
+@pytest.mark.asyncio
+async def test_non_idempotent_posts_are_not_retried() -> None:
+    transport, calls = _sequence(503, 200)
+    http_clients.use_transport("test_upstream", transport)
+    client = http_clients.get("test_upstream")
+
+    response = await client.post("https://upstream.test/orders", json={})
+    assert response.status_code == 503
+    assert calls == ["POST"]
+
+    response = await client.post(
+        "https://upstream.test/rpc", json={}, idempotent=True
+    )
+    assert response.status_code == 200
+    assert calls == ["POST", "POST"]
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_after_consecutive_failures_and_recovers(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "http_client_retries", 0)
+    monkeypatch.setattr(settings, "http_client_breaker_reset_seconds", 0.05)
+    transport, calls = _sequence(500, 500, 500, 200)
+    http_clients.use_transport("test_upstream", transport)
+    client = http_clients.get("test_upstream")
+
+    for _ in range(3):
+        assert (await client.get("https://upstream.test/")).status_code == 500
+    with pytest.raises(UpstreamUnavailableError):
+        await client.get("https://upstream.test/")
+    assert len(calls) == 3
+    assert client.stats()["circuit"] == "open"
+    assert client.stats()["rejected"] == 1
+
+    await asyncio.sleep(0.06)
+    assert client.stats()["circuit"] == "half_open"
+    assert (await client.get("https://upstream.test/")).status_code == 200
+    assert client.stats()["circuit"] == "closed"
+
+
+@pytest.mark.asyncio
+async def test_stock_price_service_uses_shared_client(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.params["symbol"] == "AAPL"
+        return httpx.Response(200, json={"Global Quote": {"05. price": "187.25"}})
+
+    http_clients.use_transport("alpha_vantage", httpx.MockTransport(handler))
+    service = StockPriceService()
+    monkeypatch.setattr(service, "_api_key", "test-key")
+
+    assert await service.fetch_price("aapl") == Decimal("187.25")
+    assert http_clients.stats()["alpha_vantage"]["requests"] == 1
+
+
+@pytest.mark.asyncio
+async def test_brokerage_post_fails_fast_while_circuit_is_open(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "http_client_breaker_failure_threshold", 1)
+    transport, calls = _sequence(503)
+    http_clients.use_transport("brokerage_service", transport)
+    provider = BrokerageServiceProvider(
+        base_url="http://brokerage.test", internal_token="secret"
+    )
+
+    with pytest.raises(BrokerageServiceUnavailableError):
+        await provider._post("/accounts", {})
+    with pytest.raises(BrokerageServiceUnavailableError, match="circuit open"):
+        await provider._post("/accounts", {})
+    assert calls == ["POST"]
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        resp = await client.get("/api/v1/health/http-clients")
+    assert resp.json()["brokerage_service"]["circuit"] == "open"
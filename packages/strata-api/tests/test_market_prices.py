@@ -0,0 +1,108 @@
+"""Tests for the shared market price service."""
+
+import asyncio
+import time
+from decimal import Decimal
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.core.config import settings
+from app.main import app
+from app.services.market_prices import CachedPrice, market_price_service
+from app.services.providers.stock_price import stock_price_service
+
+
+@pytest.fixture(autouse=True)
+async def configured_prices(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(stock_price_service, "_api_key", "test-key")
+    monkeypatch.setattr(settings, "redis_url", None)
+    yield
+    await market_price_service.close()
+
+
+def _fake_upstream(monkeypatch: pytest.MonkeyPatch, delay: float = 0.0) -> list[str]:
+    calls: list[str] = []
+
+    async def fetch_price(symbol: str) -> Decimal:
+        calls.append(symbol)
+        await asyncio.sleep(delay)
+        return Decimal(len(calls) * 100)
+
+    monkeypatch.setattr(stock_price_service, "fetch_price", fetch_price)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_upstream_call(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    calls = _fake_upstream(monkeypatch, delay=0.02)
+    before = market_price_service.stats()
+
+    results = await asyncio.gather(
+        market_price_service.get_prices(["aapl", "MSFT", "AAPL"]),
+        market_price_service.get_price("AAPL"),
+        market_price_service.get_price("aapl"),
+    )
+
+    assert sorted(calls) == ["AAPL", "MSFT"]
+    aapl = results[0]["aapl"]
+    assert results[0]["AAPL"] == aapl
+    assert results[1] == results[2] == aapl
+    assert set(results[0]) == {"aapl", "MSFT", "AAPL"}
+
+    assert await market_price_service.get_price("msft") == results[0]["MSFT"]
+    stats = market_price_service.stats()
+    assert stats["upstream_calls"] - before["upstream_calls"] == 2
+    assert stats["coalesced"] - before["coalesced"] == 2
+    assert stats["hits"] - before["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_price_is_served_while_refreshing(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    calls = _fake_upstream(monkeypatch)
+    before = market_price_service.stats()
+    assert await market_price_service.get_price("AAPL") == Decimal("100")
+
+    stale_at = time.time() - settings.market_price_fresh_seconds - 1
+    await market_price_service._store.set(
+        "stock:AAPL", CachedPrice(Decimal("100"), stale_at)
+    )
+    assert await market_price_service.get_price("AAPL") == Decimal("100")
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert calls == ["AAPL", "AAPL"]
+    assert await market_price_service.get_price("AAPL") == Decimal("200")
+    assert market_price_service.stats()["stale_hits"] - before["stale_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_exhausted_quota_falls_back_to_mock_without_caching(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "market_price_upstream_burst", 1)
+    monkeypatch.setattr(settings, "market_price_upstream_rate_per_minute", 0.001)
+    monkeypatch.setattr(settings, "market_price_rate_limit_wait_seconds", 0.0)
+    calls = _fake_upstream(monkeypatch)
+    before = market_price_service.stats()
+
+    prices = await market_price_service.get_prices(["AAPL", "MSFT"])
+
+    assert len(calls) == 1
+    assert sorted(prices.values()) == [
+        Decimal("100"),
+        stock_price_service.MOCK_STOCK_PRICE,
+    ]
+    assert market_price_service.stats()["throttled"] - before["throttled"] == 1
+    cached = await market_price_service._store.get_many(["stock:AAPL", "stock:MSFT"])
+    assert len(cached) == 1
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        resp = await client.get("/api/v1/health/market-prices")
+    assert resp.json() == market_price_service.stats()
@@ -0,0 +1,153 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models import MerchantCategory, User
+from app.services.merchant_categorization import (
+    MerchantCategorizationService,
+    normalize_merchant_key,
+    record_merchant_correction,
+    store_merchant_categories,
+)
+
+
+@pytest.mark.parametrize(
+    ("raw_name", "expected"),
+    [
+        ("STARBUCKS #1234", "STARBUCKS"),
+        ("Starbucks Store 00998 Seattle WA", "STARBUCKS STORE SEATTLE"),
+        ("AMZN Mktp US*2K3AB12", "AMZN MKTP US"),
+        ("SQ *BLUE BOTTLE COFFEE", "BLUE BOTTLE COFFEE"),
+        ("POS DEBIT TRADER JOE'S #552 03/02", "TRADER JOE'S"),
+        ("ZELLE TO JANE DOE", None),
+        ("VENMO PAYMENT 1029384", None),
+        ("#1234", None),
+    ],
+)
+def test_normalize_merchant_key(raw_name: str, expected: str | None) -> None:
+    assert normalize_merchant_key(raw_name) == expected
+
+
+class _FakeRuntime:
+    """Answers categorization prompts and records how many calls were made."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.in_flight = 0
+        self.peak = 0
+
+    async def create_message(self, *, messages, **kwargs) -> dict:
+        self.calls += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.in_flight -= 1
+        names = [
+            line[2:]
+            for line in messages[0]["content"].splitlines()
+            if line.startswith("- ")
+        ]
+        return {
+            "content": [
+                {
+                    "type": "tool_use",
+                    "name": "submit_categorization",
+                    "input": {
+                        "categorizations": [
+                            {
+                                "raw_name": name,
+                                "clean_merchant_name": name.split("#")[0].strip().title(),
+                                "category": "food_and_drink",
+                            }
+                            for name in names
+                        ]
+                    },
+                }
+            ]
+        }
+
+
+@pytest.mark.asyncio
+async def test_categorize_transactions_learns_merchants(
+    session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "merchant_categorization_max_concurrency", 2)
+    service = MerchantCategorizationService()
+    runtime = _FakeRuntime()
+    service.runtime = runtime
+
+    names = [f"CAFE Q{chr(65 + i // 26)}{chr(65 + i % 26)} #{i}" for i in range(150)]
+    names += ["CAFE QAA #9999", "ZELLE TO JANE DOE"]
+
+    first = await service.categorize_transactions(names, session=session)
+    await session.commit()
+
+    # 150 merchant keys plus the unshareable transfer -> 4 batches of <= 50.
+    assert runtime.calls == 4
+    assert runtime.peak == 2
+    assert first["CAFE QAA #9999"] == first["CAFE QAA #0"]
+    assert len(first) == len(names)
+
+    stored = await session.execute(select(MerchantCategory))
+    assert len(stored.scalars().all()) == 150  # the Zelle payment is not shared
+
+    # A later sync with new store numbers for known merchants needs no LLM
+    # call except for the unshareable person-to-person transfer.
+    second = await service.categorize_transactions(
+        ["CAFE QAB #77", "CAFE QBC #78", "ZELLE TO JANE DOE"], session=session
+    )
+    assert runtime.calls == 5
+    assert second["CAFE QAB #77"]["category"] == "food_and_drink"
+
+
+@pytest.mark.asyncio
+async def test_user_corrections_stay_private_until_enough_users_agree(
+    session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "merchant_category_vote_threshold", 2)
+    service = MerchantCategorizationService()
+    service.runtime = _FakeRuntime()
+    users = [User(clerk_id=f"voter_{i}", email=f"voter{i}@example.com") for i in range(3)]
+    session.add_all(users)
+    await session.flush()
+
+    await service.categorize_transactions(["UBER TRIP #123"], session=session)
+    assert await record_merchant_correction(
+        session, users[0].id, "UBER TRIP #456", "transportation"
+    )
+    assert not await record_merchant_correction(
+        session, users[0].id, "UBER TRIP #456", "my custom bucket"
+    )
+    await session.commit()
+
+    # The correction applies to its author only.
+    mine = await service.categorize_transactions(
+        ["UBER TRIP #789"], session=session, user_id=users[0].id
+    )
+    theirs = await service.categorize_transactions(
+        ["UBER TRIP #789"], session=session, user_id=users[1].id
+    )
+    assert mine["UBER TRIP #789"]["category"] == "transportation"
+    assert theirs["UBER TRIP #789"]["category"] == "food_and_drink"
+
+    # A second user agreeing changes the shared category, but not its name.
+    await record_merchant_correction(session, users[1].id, "UBER TRIP #1", "transportation")
+    await session.commit()
+    result = await service.categorize_transactions(["UBER TRIP #789"], session=session)
+    assert result["UBER TRIP #789"] == {
+        "clean_merchant_name": "Uber Trip",
+        "category": "transportation",
+    }
+
+    # Model output does not overwrite the agreed category.
+    await store_merchant_categories(
+        session,
+        {"UBER TRIP": {"clean_merchant_name": "Uber", "category": "travel"}},
+    )
+    entry = await session.get(MerchantCategory, "UBER TRIP")
+    assert (entry.category, entry.source) == ("transportation", "votes")
@@ -0,0 +1,265 @@
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models import (
+    BankTransaction,
+    CashAccount,
+    CashAccountType,
+    Connection,
+    ConnectionStatus,
+    RecurringCadence,
+    RecurringItem,
+    RecurringMerchantStats,
+    RecurringState,
+    User,
+)
+from app.schemas.action_capability import ActionCapability
+from app.services.banking_sync import sync_banking_connection
+from app.services.everyday import get_recurring_items
+from app.services.providers.base_banking import (
+    BaseBankingProvider,
+    NormalizedBankAccount,
+    NormalizedBankTransaction,
+)
+from app.services.recurring_detection import (
+    detect_recurring_items,
+    rebuild_recurring_items,
+)
+from app.services.subscriptions import SubscriptionService
+
+_CREATED = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+async def checking(session: AsyncSession) -> CashAccount:
+    user = User(clerk_id="recurring_user", email="recurring@example.com")
+    session.add(user)
+    await session.flush()
+    account = CashAccount(
+        user_id=user.id,
+        name="Checking",
+        account_type=CashAccountType.checking,
+        balance=Decimal("2500.00"),
+        is_manual=True,
+    )
+    session.add(account)
+    await session.commit()
+    await session.refresh(account)
+    return account
+
+
+def _debit(
+    account: CashAccount, key: str, merchant: str, day: date, amount: str, created_at: datetime
+) -> BankTransaction:
+    return BankTransaction(
+        cash_account_id=account.id,
+        provider_transaction_id=key,
+        transaction_date=day,
+        name=merchant.upper(),
+        merchant_name=merchant,
+        amount=Decimal(amount),
+        primary_category="ENTERTAINMENT",
+        created_at=created_at,
+    )
+
+
+@pytest.mark.asyncio
+async def test_detection_only_reads_transactions_past_the_watermark(
+    session: AsyncSession, checking: CashAccount, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "recurring_detection_overlap_seconds", 0.0)
+    user_id = checking.user_id
+    session.add_all(
+        [
+            _debit(checking, "n1", "Netflix", date(2026, 1, 5), "-15.49", _CREATED),
+            _debit(checking, "n2", "Netflix", date(2026, 2, 5), "-15.49", _CREATED),
+            _debit(checking, "g1", "Gym", date(2026, 1, 2), "-40.00", _CREATED),
+        ]
+    )
+    await session.commit()
+
+    first = await detect_recurring_items(session, user_id)
+    await session.commit()
+    assert (first.transactions_scanned, first.merchants_updated, first.items_updated) == (3, 2, 1)
+    items = await get_recurring_items(session, user_id)
+    assert [(item.merchant_name, item.cadence) for item in items] == [
+        ("Netflix", RecurringCadence.monthly)
+    ]
+
+    later = _CREATED + timedelta(days=30)
+    session.add_all(
+        [
+            _debit(checking, "n3", "Netflix", date(2026, 3, 5), "-17.99", later),
+            _debit(checking, "g2", "Gym", date(2026, 1, 9), "-40.00", later),
+        ]
+    )
+    await session.commit()
+
+    second = await detect_recurring_items(session, user_id)
+    await session.commit()
+    assert (second.transactions_scanned, second.items_updated) == (2, 2)
+    items = {item.merchant_name: item for item in await get_recurring_items(session, user_id)}
+    assert items["Netflix"].expected_amount == Decimal("17.99")
+    assert items["Netflix"].next_due_date == date(2026, 4, 4)
+    assert items["Gym"].cadence == RecurringCadence.weekly
+
+    # Rows re-read inside the overlap window are not counted twice.
+    monkeypatch.setattr(settings, "recurring_detection_overlap_seconds", 86400.0)
+    overlap = await detect_recurring_items(session, user_id)
+    assert overlap.transactions_scanned == 2
+    assert overlap.merchants_updated == 0
+    stats = await session.execute(
+        select(RecurringMerchantStats).where(RecurringMerchantStats.merchant_key == "netflix")
+    )
+    assert stats.scalar_one().occurrence_count == 3
+
+    # Removing history needs a rescan; the weekly gym pattern disappears.
+    await session.execute(
+        delete(BankTransaction).where(BankTransaction.provider_transaction_id == "g2")
+    )
+    rebuilt = await rebuild_recurring_items(session, user_id)
+    await session.commit()
+    assert rebuilt.transactions_scanned == 4
+    stats = await session.execute(
+        select(RecurringMerchantStats).where(RecurringMerchantStats.merchant_key == "gym")
+    )
+    assert stats.scalar_one().occurrence_count == 1
+
+
+class _WindowBankingProvider(BaseBankingProvider):
+    provider_name = "fake_window_bank"
+
+    def __init__(self, transactions: list[NormalizedBankTransaction]) -> None:
+        self.transactions = transactions
+
+    def get_capabilities(self) -> list[ActionCapability]:
+        return [ActionCapability.READ_ONLY]
+
+    async def create_link_token(self, user_id, redirect_uri=None):
+        raise NotImplementedError
+
+    async def exchange_public_token(self, user_id, public_token):
+        raise NotImplementedError
+
+    async def get_accounts(self, connection) -> list[NormalizedBankAccount]:
+        return [
+            NormalizedBankAccount(
+                provider_account_id="window_acc",
+                name="Checking",
+                account_type=CashAccountType.checking,
+                balance=Decimal("1000.00"),
+            )
+        ]
+
+    async def get_transactions(self, connection, start_date, end_date):
+        return self.transactions
+
+    async def delete_connection(self, connection) -> None:
+        return None
+
+
+def _normalized(key: str, day: date) -> NormalizedBankTransaction:
+    tx = NormalizedBankTransaction(
+        provider_transaction_id=key,
+        amount=Decimal("-9.99"),
+        transaction_date=day,
+        name="SPOTIFY USA",
+        merchant_name="Spotify",
+        primary_category="ENTERTAINMENT",
+    )
+    tx._account_id = "window_acc"  # type: ignore[attr-defined]
+    return tx
+
+
+@pytest.mark.asyncio
+async def test_rescanning_the_overlap_never_recounts_many_debits(
+    session: AsyncSession, checking: CashAccount, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "recurring_detection_overlap_seconds", 900.0)
+    user_id = checking.user_id
+    # More debits for one merchant than the per-merchant recent-id list holds,
+    # all created inside the overlap window.
+    session.add_all(
+        _debit(
+            checking,
+            f"w{i}",
+            "Weekly Box",
+            date(2025, 1, 1) + timedelta(days=7 * i),
+            "-20.00",
+            _CREATED + timedelta(seconds=i),
+        )
+        for i in range(30)
+    )
+    await session.commit()
+
+    for _ in range(3):
+        await detect_recurring_items(session, user_id)
+        await session.commit()
+        stats = await session.execute(
+            select(RecurringMerchantStats).where(
+                RecurringMerchantStats.merchant_key == "weekly box"
+            )
+        )
+        assert stats.scalar_one().occurrence_count == 30
+
+    session.add(
+        _debit(
+            checking, "w30", "Weekly Box", date(2025, 7, 30), "-20.00", _CREATED
+        )
+    )
+    await session.commit()
+    late = await detect_recurring_items(session, user_id)
+    assert late.merchants_updated == 1
+    stats = await session.execute(
+        select(RecurringMerchantStats).where(
+            RecurringMerchantStats.merchant_key == "weekly box"
+        )
+    )
+    assert stats.scalar_one().occurrence_count == 31
+
+
+@pytest.mark.asyncio
+async def test_banking_sync_maintains_recurring_items(session: AsyncSession) -> None:
+    user = User(clerk_id="recurring_sync_user", email="recurring_sync@example.com")
+    session.add(user)
+    await session.flush()
+    connection = Connection(
+        user_id=user.id,
+        provider="fake_window_bank",
+        provider_user_id="item-window",
+        status=ConnectionStatus.active,
+    )
+    session.add(connection)
+    await session.commit()
+    user_id = user.id
+
+    provider = _WindowBankingProvider(
+        [_normalized("s1", date(2026, 1, 10)), _normalized("s2", date(2026, 2, 10))]
+    )
+    await sync_banking_connection(session, connection, provider)
+    await session.commit()
+
+    items = await get_recurring_items(session, user_id)
+    assert len(items) == 1
+    assert items[0].state == RecurringState.active
+    summary = await SubscriptionService(session).detect_subscriptions(user_id)
+    assert summary["subscriptions"][0]["merchant"] == "Spotify"
+    assert summary["total_monthly_subscription_burn"] == 9.99
+
+    items[0].state = RecurringState.dismissed
+    await session.commit()
+    summary = await SubscriptionService(session).detect_subscriptions(user_id)
+    assert summary["subscription_count"] == 0
+
+    # A repeat sync of the same rows leaves the stored item untouched.
+    await sync_banking_connection(session, connection, provider)
+    await session.commit()
+    stored = await session.execute(
+        select(RecurringItem).execution_options(populate_existing=True)
+    )
+    assert stored.scalar_one().state == RecurringState.dismissed
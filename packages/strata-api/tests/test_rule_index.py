@@ -0,0 +1,81 @@
+import random
+import uuid
+from types import SimpleNamespace
+
+from app.models.everyday import RuleMatchMode, TransactionRule
+from app.services import rule_index
+from app.services.everyday import choose_rule
+from app.services.rule_index import RuleIndex, build_rule_index
+
+
+def _rule(text: str, mode: RuleMatchMode = RuleMatchMode.contains, active: bool = True):
+    return TransactionRule(
+        id=uuid.uuid4(),
+        name=text,
+        match_text=text,
+        match_mode=mode,
+        is_active=active,
+    )
+
+
+def _tx(name: str, merchant: str | None = None) -> SimpleNamespace:
+    return SimpleNamespace(name=name, merchant_name=merchant)
+
+
+def test_index_matches_linear_scan() -> None:
+    rng = random.Random(7)
+    alphabet = "abc "
+    rules = [
+        _rule(
+            "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 4))),
+            rng.choice(list(RuleMatchMode)),
+            active=rng.random() > 0.2,
+        )
+        for _ in range(60)
+    ]
+    rules.append(_rule("  ABC  "))  # needles are trimmed and lowercased
+    index = RuleIndex.compile(rules)
+
+    for _ in range(2000):
+        tx = _tx(
+            "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 12))),
+            rng.choice([None, "", "Ab", "CAB"]),
+        )
+        assert choose_rule(index, tx) is choose_rule(rules, tx)
+
+
+def test_earliest_rule_wins_across_overlapping_needles() -> None:
+    rules = [
+        _rule("netflix.com", RuleMatchMode.exact),
+        _rule("flix"),
+        _rule("netflix"),
+        _rule("x", active=False),
+    ]
+    index = RuleIndex.compile(rules)
+
+    assert choose_rule(index, _tx("NETFLIX.COM")) is rules[0]
+    assert choose_rule(index, _tx("Netflix Monthly")) is rules[1]
+    assert choose_rule(index, _tx("Xbox")) is None
+
+
+def test_cached_automaton_is_rebuilt_when_rules_change() -> None:
+    user_id = uuid.uuid4()
+    rules = [_rule("coffee"), _rule("bean")]
+
+    first = build_rule_index(user_id, rules)
+    assert build_rule_index(user_id, rules)._automaton is first._automaton
+
+    # Override fields do not affect matching, so the automaton is reused
+    # while the returned rule objects are the current ones.
+    rules[1].primary_category_override = "Groceries"
+    reused = build_rule_index(user_id, rules)
+    assert reused._automaton is first._automaton
+    assert choose_rule(reused, _tx("Bean Market")).primary_category_override == "Groceries"
+
+    rules[0].is_active = False
+    rebuilt = build_rule_index(user_id, rules)
+    assert rebuilt._automaton is not first._automaton
+    assert choose_rule(rebuilt, _tx("Coffee Bean")) is rules[1]
+
+    rule_index.invalidate_rule_index(user_id)
+    assert build_rule_index(user_id, rules)._automaton is not rebuilt._automaton
@@ -132,6 +132,7 @@ import type {
   SVPAttestation,
   TaxDocumentResponse,
   TaxDocumentListResponse,
+  ExtractionJobResponse,
   PrefillTaxPlanRequest,
   PrefillTaxPlanResponse,
   CryptoWallet,
@@ -326,7 +327,13 @@ export interface StrataClientInterface {
   listTaxPlanEvents(planId: string, params?: { limit?: number }): Promise<TaxPlanEvent[]>;
   generateTaxOptimizationReport(planId: string, versionId: string): Promise<any>;
   // Tax Documents
-  uploadTaxDocument(file: File | Blob, filename: string, documentTypeHint?: string): Promise<TaxDocumentResponse>;
+  uploadTaxDocument(
+    file: File | Blob,
+    filename: string,
+    documentTypeHint?: string,
+    planId?: string
+  ): Promise<ExtractionJobResponse>;
+  getExtractionJob(jobId: string): Promise<ExtractionJobResponse>;
   listTaxDocuments(limit?: number): Promise<TaxDocumentListResponse[]>;
   getTaxDocument(documentId: string): Promise<TaxDocumentResponse>;
   deleteTaxDocument(documentId: string): Promise<void>;
@@ -350,7 +357,7 @@ export interface StrataClientInterface {
   addCryptoWallet(data: CryptoWalletCreate): Promise<CryptoWallet>;
   deleteCryptoWallet(walletId: string): Promise<void>;
   deleteAllCryptoWallets(): Promise<void>;
-  getCryptoPortfolio(): Promise<CryptoPortfolioResponse>;
+  getCryptoPortfolio(params?: { refresh?: boolean }): Promise<CryptoPortfolioResponse>;
   // Physical Assets
   getPhysicalAssetsSummary(): Promise<PhysicalAssetsSummary>;
   searchProperties(request: PropertySearchRequest): Promise<PropertySearchResult[]>;
@@ -1427,8 +1434,9 @@ export class StrataClient implements StrataClientInterface {
   async uploadTaxDocument(
     file: File | Blob,
     filename: string,
-    documentTypeHint?: string
-  ): Promise<TaxDocumentResponse> {
+    documentTypeHint?: string,
+    planId?: string
+  ): Promise<ExtractionJobResponse> {
     const headers = this.authHeaders();
 
     const formData = new FormData();
@@ -1436,6 +1444,9 @@ export class StrataClient implements StrataClientInterface {
     if (documentTypeHint) {
       formData.append('document_type_hint', documentTypeHint);
     }
+    if (planId) {
+      formData.append('plan_id', planId);
+    }
 
     const response = await fetch(`${this.baseUrl}/api/v1/tax-documents/upload`, {
       method: 'POST',
@@ -1452,6 +1463,10 @@ export class StrataClient implements StrataClientInterface {
     return response.json();
   }
 
+  async getExtractionJob(jobId: string): Promise<ExtractionJobResponse> {
+    return this.request<ExtractionJobResponse>(`/api/v1/tax-documents/jobs/${jobId}`);
+  }
+
   async listTaxDocuments(limit?: number): Promise<TaxDocumentListResponse[]> {
     return this.request<TaxDocumentListResponse[]>(
       this.buildUrl('/api/v1/tax-documents/', { limit })
@@ -1570,8 +1585,12 @@ export class StrataClient implements StrataClientInterface {
     });
   }
 
-  async getCryptoPortfolio(): Promise<CryptoPortfolioResponse> {
-    return this.request<CryptoPortfolioResponse>('/api/v1/crypto/portfolio');
+  async getCryptoPortfolio(params?: { refresh?: boolean }): Promise<CryptoPortfolioResponse> {
+    return this.request<CryptoPortfolioResponse>(
+      this.buildUrl('/api/v1/crypto/portfolio', {
+        refresh: params?.refresh ? "true" : undefined,
+      })
+    );
   }
 
   // === Physical Assets ===
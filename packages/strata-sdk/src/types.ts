@@ -2153,6 +2153,17 @@ export interface TaxDocumentResponse {
   updated_at: string;
 }
 
+export interface ExtractionJobResponse {
+  job_id: string;
+  document_id: string;
+  status: TaxDocumentStatus;
+  attempts: number;
+  error_message: string | null;
+  prefill_plan_id: string | null;
+  prefill_version_id: string | null;
+  updated_at: string;
+}
+
 export interface TaxDocumentListResponse {
   id: string;
   original_filename: string;
@@ -2332,6 +2343,7 @@ export interface CryptoWallet {
   chain: CryptoChain;
   label: string | null;
   last_balance_usd: number | null;
+  last_synced_at: string | null;
   created_at: string;
   updated_at: string;
 }
@@ -2366,6 +2378,8 @@ export interface CryptoPortfolioResponse {
   total_value_usd: number;
   assets: CryptoAsset[];
   defi_positions: DeFiPosition[];
+  balances_as_of: string | null;
+  data_age_seconds: number | null;
 }
 
 // === Strata Verification Protocol (SVP) ===
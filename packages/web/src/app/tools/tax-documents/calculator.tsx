@@ -355,6 +355,11 @@ export function DocumentManager() {
   const documentsQuery = useQuery({
     queryKey: ["tax-documents"],
     queryFn: () => client.listTaxDocuments(100),
+    // Extraction runs in the background; keep polling until it settles.
+    refetchInterval: (query) =>
+      query.state.data?.some((d) => d.status === "pending" || d.status === "processing")
+        ? 2000
+        : false,
   });
 
   const startUpload = useCallback(
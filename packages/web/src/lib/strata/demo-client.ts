@@ -81,6 +81,7 @@ import type {
   SpendingSummary,
   TaxDocumentListResponse,
   TaxDocumentResponse,
+  ExtractionJobResponse,
   FinancialMemoryUpdate,
   DataHealthResponse,
   TransparencyPayload,
@@ -411,6 +412,19 @@ function writeDemoShareReports(reports: DemoShareReportRecord[]): void {
   writeStorageJson(DEMO_SHARE_REPORTS_STORAGE_KEY, reports);
 }
 
+function demoExtractionJob(document: TaxDocumentResponse): ExtractionJobResponse {
+  return {
+    job_id: document.id,
+    document_id: document.id,
+    status: document.status,
+    attempts: 1,
+    error_message: document.error_message,
+    prefill_plan_id: null,
+    prefill_version_id: null,
+    updated_at: document.updated_at,
+  };
+}
+
 function readDemoTaxDocuments(): TaxDocumentResponse[] {
   return readStorageJson<TaxDocumentResponse[]>(DEMO_TAX_DOCS_STORAGE_KEY, []);
 }
@@ -755,6 +769,7 @@ export class DemoStrataClient implements StrataClientInterface {
       chain: "ethereum",
       label: "Main ETH Wallet",
       last_balance_usd: 45200.50,
+      last_synced_at: new Date().toISOString(),
       created_at: new Date().toISOString(),
       updated_at: new Date().toISOString(),
     },
@@ -765,6 +780,7 @@ export class DemoStrataClient implements StrataClientInterface {
       chain: "solana",
       label: "Solana Phantom",
       last_balance_usd: 12450.75,
+      last_synced_at: new Date().toISOString(),
       created_at: new Date().toISOString(),
       updated_at: new Date().toISOString(),
     }
@@ -2267,7 +2283,12 @@ export class DemoStrataClient implements StrataClientInterface {
 
   // === Tax Documents ===
 
-  async uploadTaxDocument(_file: File | Blob, _filename: string, _typeHint?: string): Promise<TaxDocumentResponse> {
+  async uploadTaxDocument(
+    _file: File | Blob,
+    _filename: string,
+    _typeHint?: string,
+    _planId?: string
+  ): Promise<ExtractionJobResponse> {
     await delay(1500);
     const now = new Date().toISOString();
     const documentType = inferDemoTaxDocumentType(_filename, _typeHint);
@@ -2295,7 +2316,14 @@ export class DemoStrataClient implements StrataClientInterface {
       updated_at: now,
     };
     writeDemoTaxDocuments([document, ...readDemoTaxDocuments()]);
-    return document;
+    return demoExtractionJob(document);
+  }
+
+  async getExtractionJob(_jobId: string): Promise<ExtractionJobResponse> {
+    await delay(300);
+    const document = readDemoTaxDocuments().find((item) => item.id === _jobId);
+    if (!document) throw new Error("tax-document-not-found");
+    return demoExtractionJob(document);
   }
 
   async listTaxDocuments(limit?: number): Promise<TaxDocumentListResponse[]> {
@@ -2525,6 +2553,7 @@ export class DemoStrataClient implements StrataClientInterface {
       chain: data.chain,
       label: data.label ?? "Added Wallet",
       last_balance_usd: 12500.00, // Simulated initial balance
+      last_synced_at: new Date().toISOString(),
       created_at: new Date().toISOString(),
       updated_at: new Date().toISOString(),
     };
@@ -2542,12 +2571,12 @@ export class DemoStrataClient implements StrataClientInterface {
     this.cryptoWallets = [];
   }
 
-  async getCryptoPortfolio(): Promise<CryptoPortfolioResponse> {
+  async getCryptoPortfolio(_params?: { refresh?: boolean }): Promise<CryptoPortfolioResponse> {
     await delay(600);
     return {
       wallets: [
-        { id: "wallet-1", user_id: "demo-user", address: "0x1234...abcd", chain: "ethereum", label: "Main ETH Wallet", last_balance_usd: 15420.5, created_at: new Date().toISOString(), updated_at: new Date().toISOString() },
-        { id: "wallet-2", user_id: "demo-user", address: "5Kabc...xyz", chain: "solana", label: "Solana Degen", last_balance_usd: 8500.0, created_at: new Date().toISOString(), updated_at: new Date().toISOString() }
+        { id: "wallet-1", user_id: "demo-user", address: "0x1234...abcd", chain: "ethereum", label: "Main ETH Wallet", last_balance_usd: 15420.5, last_synced_at: new Date().toISOString(), created_at: new Date().toISOString(), updated_at: new Date().toISOString() },
+        { id: "wallet-2", user_id: "demo-user", address: "5Kabc...xyz", chain: "solana", label: "Solana Degen", last_balance_usd: 8500.0, last_synced_at: new Date().toISOString(), created_at: new Date().toISOString(), updated_at: new Date().toISOString() }
       ],
       total_value_usd: 28920.5,
       assets: [
@@ -2565,7 +2594,9 @@ export class DemoStrataClient implements StrataClientInterface {
             { symbol: "USDC", name: "USD Coin", balance: 5000.0, balance_usd: 5000.0, current_price: 1.0, chain: "ethereum", contract_address: "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48", logo_url: "https://assets.coingecko.com/coins/images/6319/small/USD_Coin_icon.png" }
           ]
         }
-      ]
+      ],
+      balances_as_of: new Date().toISOString(),
+      data_age_seconds: 0,
     };
   }
 